@@ -0,0 +1,106 @@
+"""particionar RegistroAsistencia por mes
+
+Convierte "RegistroAsistencia" en una tabla particionada por RANGE mensual sobre
+la nueva columna `fecha_sesion` (hora de inicio de la sesión). Crea una partición
+por cada mes con datos más los próximos 3 meses, y una partición DEFAULT.
+
+Revision ID: 5ea34245f2f0
+Revises: 478ee06edecd
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ea34245f2f0'
+down_revision: Union[str, Sequence[str], None] = '478ee06edecd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('ALTER TABLE "RegistroAsistencia" RENAME TO "RegistroAsistencia_legacy"')
+    op.execute('ALTER TABLE "RegistroAsistencia_legacy" RENAME CONSTRAINT "RegistroAsistencia_pkey" TO "RegistroAsistencia_legacy_pkey"')
+
+    # Se reutiliza la secuencia existente para conservar los IDs
+    op.execute("""
+        CREATE TABLE "RegistroAsistencia" (
+            id INTEGER NOT NULL DEFAULT nextval('"RegistroAsistencia_id_seq"'),
+            fecha_sesion TIMESTAMP NOT NULL,
+            hora_entrada TIMESTAMP NULL,
+            hora_salida TIMESTAMP NULL,
+            estado_asistencia estadoasistencia NOT NULL,
+            id_sesion_clase INTEGER NOT NULL REFERENCES "SesionDeClase"(id),
+            id_estudiante INTEGER NOT NULL REFERENCES "Estudiante"(id),
+            CONSTRAINT "RegistroAsistencia_pkey" PRIMARY KEY (id, fecha_sesion)
+        ) PARTITION BY RANGE (fecha_sesion)
+    """)
+    op.create_index(
+        'ix_RegistroAsistencia_sesion_estudiante',
+        'RegistroAsistencia',
+        ['id_sesion_clase', 'id_estudiante']
+    )
+
+    # Particiones mensuales: desde el mes de la sesión más antigua hasta 3 meses adelante
+    op.execute("""
+        DO $$
+        DECLARE
+            mes DATE;
+            ultimo DATE := date_trunc('month', now())::date + INTERVAL '3 months';
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(hora_inicio), now()))::date
+              INTO mes FROM "SesionDeClase";
+            WHILE mes <= ultimo LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF "RegistroAsistencia" FOR VALUES FROM (%L) TO (%L)',
+                    'RegistroAsistencia_p' || to_char(mes, 'YYYY_MM'),
+                    mes,
+                    (mes + INTERVAL '1 month')::date
+                );
+                mes := (mes + INTERVAL '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute('CREATE TABLE "RegistroAsistencia_default" PARTITION OF "RegistroAsistencia" DEFAULT')
+
+    op.execute("""
+        INSERT INTO "RegistroAsistencia"
+            (id, fecha_sesion, hora_entrada, hora_salida, estado_asistencia, id_sesion_clase, id_estudiante)
+        SELECT r.id, s.hora_inicio, r.hora_entrada, r.hora_salida, r.estado_asistencia, r.id_sesion_clase, r.id_estudiante
+        FROM "RegistroAsistencia_legacy" r
+        JOIN "SesionDeClase" s ON s.id = r.id_sesion_clase
+    """)
+
+    op.execute('ALTER SEQUENCE "RegistroAsistencia_id_seq" OWNED BY "RegistroAsistencia".id')
+    op.drop_table('RegistroAsistencia_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE "RegistroAsistencia" RENAME TO "RegistroAsistencia_particionada"')
+    op.execute('ALTER TABLE "RegistroAsistencia_particionada" RENAME CONSTRAINT "RegistroAsistencia_pkey" TO "RegistroAsistencia_particionada_pkey"')
+    op.create_table('RegistroAsistencia',
+    sa.Column('id', sa.Integer(), server_default=sa.text('nextval(\'"RegistroAsistencia_id_seq"\')'), nullable=False),
+    sa.Column('hora_entrada', sa.TIMESTAMP(), nullable=True),
+    sa.Column('hora_salida', sa.TIMESTAMP(), nullable=True),
+    sa.Column('estado_asistencia', postgresql.ENUM('Presente', 'Ausente', 'Tarde', name='estadoasistencia', create_type=False), nullable=False),
+    sa.Column('id_sesion_clase', sa.Integer(), nullable=False),
+    sa.Column('id_estudiante', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_estudiante'], ['Estudiante.id'], ),
+    sa.ForeignKeyConstraint(['id_sesion_clase'], ['SesionDeClase.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO "RegistroAsistencia"
+            (id, hora_entrada, hora_salida, estado_asistencia, id_sesion_clase, id_estudiante)
+        SELECT id, hora_entrada, hora_salida, estado_asistencia, id_sesion_clase, id_estudiante
+        FROM "RegistroAsistencia_particionada"
+    """)
+    op.execute('ALTER SEQUENCE "RegistroAsistencia_id_seq" OWNED BY "RegistroAsistencia".id')
+    op.execute('DROP TABLE "RegistroAsistencia_particionada" CASCADE')
@@ -0,0 +1,55 @@
+"""bandeja de salida MensajeSaliente
+
+Tabla "MensajeSaliente" (transactional outbox): los mensajes para sistemas
+externos se escriben en la misma transacción que el cambio que los origina y
+un procesador de fondo los entrega por lotes. El índice parcial solo cubre los
+pendientes, que es lo que recorre el procesador.
+
+Revision ID: a58c2e7d4f13
+Revises: d7a3f19c5b82
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a58c2e7d4f13'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f19c5b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('MensajeSaliente',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('destino', sa.VARCHAR(length=30), nullable=False),
+    sa.Column('tipo', sa.VARCHAR(length=50), nullable=False),
+    sa.Column('clave', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('datos', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('estado', sa.Enum('Pendiente', 'Enviado', 'Fallido', name='estadomensaje'), nullable=False),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('creado_en', sa.TIMESTAMP(), nullable=False),
+    sa.Column('disponible_en', sa.TIMESTAMP(), nullable=False),
+    sa.Column('enviado_en', sa.TIMESTAMP(), nullable=True),
+    sa.Column('ultimo_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_MensajeSaliente_pendientes',
+        'MensajeSaliente',
+        ['destino', 'disponible_en', 'id'],
+        postgresql_where=sa.text("estado = 'Pendiente'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_MensajeSaliente_pendientes', table_name='MensajeSaliente')
+    op.drop_table('MensajeSaliente')
+    op.execute('DROP TYPE estadomensaje')
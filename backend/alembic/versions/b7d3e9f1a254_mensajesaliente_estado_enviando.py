@@ -0,0 +1,59 @@
+"""MensajeSaliente estado Enviando
+
+Los mensajes reservados por un procesador pasan a "Enviando" en lugar de seguir
+"Pendiente": quedan fuera del índice único de pendientes por clave, así que los
+eventos que se acumulan mientras se envían van a un mensaje nuevo en vez de
+fundirse en uno que se marcará como enviado sin incluirlos. El índice de
+candidatos cubre también los "Enviando" (reservas caducadas).
+
+Revision ID: b7d3e9f1a254
+Revises: f5c8a1e3b624
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9f1a254'
+down_revision: Union[str, Sequence[str], None] = 'f5c8a1e3b624'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # El valor nuevo solo se puede usar (predicado del índice) una vez confirmado
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE estadomensaje ADD VALUE IF NOT EXISTS 'Enviando' AFTER 'Pendiente'")
+    op.drop_index('ix_MensajeSaliente_pendientes', table_name='MensajeSaliente')
+    op.create_index(
+        'ix_MensajeSaliente_pendientes',
+        'MensajeSaliente',
+        ['destino', 'disponible_en', 'id'],
+        postgresql_where=sa.text("estado IN ('Pendiente', 'Enviando')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL no elimina valores de un enum: 'Enviando' queda en el tipo sin usarse.
+    # Los que se estaban enviando vuelven a pendientes (fallidos si ya hay uno con su clave)
+    op.execute("""
+        UPDATE "MensajeSaliente" m
+        SET estado = CASE WHEN EXISTS (
+            SELECT 1 FROM "MensajeSaliente" p
+            WHERE p.estado = 'Pendiente' AND p.destino = m.destino AND p.clave = m.clave
+        ) THEN 'Fallido'::estadomensaje ELSE 'Pendiente'::estadomensaje END
+        WHERE m.estado = 'Enviando'
+    """)
+    op.drop_index('ix_MensajeSaliente_pendientes', table_name='MensajeSaliente')
+    op.create_index(
+        'ix_MensajeSaliente_pendientes',
+        'MensajeSaliente',
+        ['destino', 'disponible_en', 'id'],
+        postgresql_where=sa.text("estado = 'Pendiente'")
+    )
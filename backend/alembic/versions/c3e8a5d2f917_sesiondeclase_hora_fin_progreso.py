@@ -0,0 +1,35 @@
+"""SesionDeClase hora_fin_progreso
+
+Hora en que la sesión dejó de estar "EnProgreso" (de aceptar taps). Con ella se
+busca la sesión que estaba en curso a la hora original de un tap reenviado desde
+el spool, aunque ahora esté en validación o cerrada. Las sesiones ya cerradas
+toman su hora_fin; las que están en validación no tienen una hora fiable y
+quedan sin ella.
+
+Revision ID: c3e8a5d2f917
+Revises: b7d3e9f1a254
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a5d2f917'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9f1a254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('SesionDeClase', sa.Column('hora_fin_progreso', sa.TIMESTAMP(), nullable=True))
+    op.execute('UPDATE "SesionDeClase" SET hora_fin_progreso = hora_fin WHERE estado = \'Cerrada\'')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('SesionDeClase', 'hora_fin_progreso')
@@ -0,0 +1,35 @@
+"""indices para paginacion por cursor
+
+Índices compuestos que siguen el orden de los listados paginados por cursor
+(keyset): cada página es un recorrido de rango sobre el índice, sin ordenar
+la tabla completa.
+
+Revision ID: c41d7e2a9b60
+Revises: 5ea34245f2f0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2a9b60'
+down_revision: Union[str, Sequence[str], None] = '5ea34245f2f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_Estudiante_nombre_completo_id', 'Estudiante', ['nombre_completo', 'id'])
+    op.create_index('ix_Usuario_nombre_completo_id', 'Usuario', ['nombre_completo', 'id'])
+    op.create_index('ix_Horario_dia_semana_hora_inicio_id', 'Horario', ['dia_semana', 'hora_inicio', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Horario_dia_semana_hora_inicio_id', table_name='Horario')
+    op.drop_index('ix_Usuario_nombre_completo_id', table_name='Usuario')
+    op.drop_index('ix_Estudiante_nombre_completo_id', table_name='Estudiante')
@@ -0,0 +1,64 @@
+"""feed de cambios de RegistroAsistencia
+
+Columna `xid_cambio` (xid8) con la transacción que escribió cada fila por última
+vez: DEFAULT pg_current_xact_id() en el INSERT y un trigger en el UPDATE. El
+mismo trigger avisa por NOTIFY (canal "registro_asistencia_cambios") del ID de
+la sesión. El índice (id_sesion_clase, xid_cambio) convierte "lo que cambió en
+la sesión desde el cursor" en un recorrido de rango.
+
+La columna se añade sin valor para las filas existentes (no reescribe la tabla):
+NULL equivale a "escrita antes de cualquier cursor". Requiere PostgreSQL 13+.
+
+Revision ID: d7a3f19c5b82
+Revises: c41d7e2a9b60
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f19c5b82'
+down_revision: Union[str, Sequence[str], None] = 'c41d7e2a9b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('ALTER TABLE "RegistroAsistencia" ADD COLUMN xid_cambio xid8')
+    # El DEFAULT se fija aparte para que solo aplique a las filas nuevas
+    op.execute('ALTER TABLE "RegistroAsistencia" ALTER COLUMN xid_cambio SET DEFAULT pg_current_xact_id()')
+    op.create_index(
+        'ix_RegistroAsistencia_sesion_xid_cambio',
+        'RegistroAsistencia',
+        ['id_sesion_clase', 'xid_cambio']
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION registro_asistencia_cambio() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW.xid_cambio := pg_current_xact_id();
+            END IF;
+            PERFORM pg_notify('registro_asistencia_cambios', NEW.id_sesion_clase::text);
+            RETURN NEW;
+        END $$
+    """)
+    op.execute(
+        'CREATE TRIGGER "RegistroAsistencia_cambio" BEFORE INSERT OR UPDATE ON "RegistroAsistencia" '
+        'FOR EACH ROW EXECUTE FUNCTION registro_asistencia_cambio()'
+    )
+    # La tabla fría del archivo se crea con LIKE y se llena con SELECT *: mismas columnas
+    op.execute('ALTER TABLE IF EXISTS archivo."RegistroAsistenciaHistorico" ADD COLUMN IF NOT EXISTS xid_cambio xid8')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE IF EXISTS archivo."RegistroAsistenciaHistorico" DROP COLUMN IF EXISTS xid_cambio')
+    op.execute('DROP TRIGGER "RegistroAsistencia_cambio" ON "RegistroAsistencia"')
+    op.execute('DROP FUNCTION registro_asistencia_cambio()')
+    op.drop_index('ix_RegistroAsistencia_sesion_xid_cambio', table_name='RegistroAsistencia')
+    op.execute('ALTER TABLE "RegistroAsistencia" DROP COLUMN xid_cambio')
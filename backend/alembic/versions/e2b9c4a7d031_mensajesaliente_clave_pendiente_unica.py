@@ -0,0 +1,38 @@
+"""MensajeSaliente clave pendiente unica
+
+Índice único parcial (destino, clave) sobre los mensajes pendientes: permite
+acumular en un único mensaje pendiente los avisos que van al mismo destinatario
+el mismo día (INSERT ... ON CONFLICT DO UPDATE).
+
+Revision ID: e2b9c4a7d031
+Revises: a58c2e7d4f13
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9c4a7d031'
+down_revision: Union[str, Sequence[str], None] = 'a58c2e7d4f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ux_MensajeSaliente_clave_pendiente',
+        'MensajeSaliente',
+        ['destino', 'clave'],
+        unique=True,
+        postgresql_where=sa.text("estado = 'Pendiente'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_MensajeSaliente_clave_pendiente', table_name='MensajeSaliente')
@@ -0,0 +1,61 @@
+"""cola de trabajos Trabajo
+
+Tabla "Trabajo": operaciones pesadas (p. ej. completar el cierre de una sesión)
+que las peticiones encolan en su transacción y ejecutan en segundo plano los
+workers de cada proceso. El índice parcial solo cubre los trabajos activos, que
+es lo que recorren los workers.
+
+Revision ID: f5c8a1e3b624
+Revises: e2b9c4a7d031
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c8a1e3b624'
+down_revision: Union[str, Sequence[str], None] = 'e2b9c4a7d031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('Trabajo',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('tipo', sa.VARCHAR(length=50), nullable=False),
+    sa.Column('parametros', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('estado', sa.Enum('Pendiente', 'EnCurso', 'Completado', 'Fallido', name='estadotrabajo'), nullable=False),
+    sa.Column('progreso_actual', sa.Integer(), nullable=False),
+    sa.Column('progreso_total', sa.Integer(), nullable=True),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('creado_en', sa.TIMESTAMP(), nullable=False),
+    sa.Column('disponible_en', sa.TIMESTAMP(), nullable=False),
+    sa.Column('iniciado_en', sa.TIMESTAMP(), nullable=True),
+    sa.Column('terminado_en', sa.TIMESTAMP(), nullable=True),
+    sa.Column('ultimo_error', sa.Text(), nullable=True),
+    sa.Column('resultado', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('id_usuario', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_usuario'], ['Usuario.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_Trabajo_activos',
+        'Trabajo',
+        ['disponible_en', 'id'],
+        postgresql_where=sa.text("estado IN ('Pendiente', 'EnCurso')")
+    )
+    op.create_index('ix_Trabajo_usuario', 'Trabajo', ['id_usuario', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_Trabajo_usuario', table_name='Trabajo')
+    op.drop_index('ix_Trabajo_activos', table_name='Trabajo')
+    op.drop_table('Trabajo')
+    op.execute('DROP TYPE estadotrabajo')
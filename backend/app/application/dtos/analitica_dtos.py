@@ -0,0 +1,69 @@
+"""
+DTOs de salida de la analítica de asistencia.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class DistribucionLlegada(BaseModel):
+    """Distribución de los minutos de llegada (respecto al inicio de la sesión)."""
+    p50_minutos: Optional[float] = None
+    p90_minutos: Optional[float] = None
+    promedio_minutos: Optional[float] = None
+    histograma: Dict[str, int] = Field(default_factory=dict, description="Taps por tramo de minutos, ej. '0-5'")
+
+
+class EstadisticasEstudiante(BaseModel):
+    """Estadísticas de un estudiante (en una asignatura o en un conjunto de ellas)."""
+    id_estudiante: int
+    nombre_completo: Optional[str] = None
+    id_asignatura: Optional[int] = None
+    registros: int
+    presentes: int
+    tardes: int
+    ausentes: int
+    tasa_asistencia: float = Field(..., description="(presentes + tardes) / registros")
+    tasa_tardanza: float = Field(..., description="tardes / (presentes + tardes)")
+    promedio_minutos_llegada: Optional[float] = None
+    en_riesgo: bool
+
+
+class EstadisticasAsignatura(BaseModel):
+    """Estadísticas agregadas de una asignatura en el periodo."""
+    id_asignatura: int
+    sesiones: int
+    registros: int
+    presentes: int
+    tardes: int
+    ausentes: int
+    tasa_asistencia: float
+    tasa_tardanza: float
+    distribucion_llegada: DistribucionLlegada
+    estudiantes_en_riesgo: List[int] = Field(default_factory=list)
+
+
+class ReporteAnaliticaAsignatura(BaseModel):
+    """Reporte de una asignatura con el detalle por estudiante."""
+    desde: datetime
+    hasta: datetime
+    asignatura: EstadisticasAsignatura
+    estudiantes: List[EstadisticasEstudiante]
+
+
+class ReporteAnaliticaDocente(BaseModel):
+    """Reporte de todas las asignaturas de un docente."""
+    desde: datetime
+    hasta: datetime
+    asignaturas: List[EstadisticasAsignatura]
+    estudiantes_en_riesgo: List[EstadisticasEstudiante]
+
+
+class ReporteAnaliticaEstudiante(BaseModel):
+    """Reporte de un estudiante, desglosado por asignatura."""
+    desde: datetime
+    hasta: datetime
+    id_estudiante: int
+    nombre_completo: Optional[str] = None
+    asignaturas: List[EstadisticasEstudiante]
@@ -0,0 +1,221 @@
+"""
+Servicio: motor de analítica de asistencia (vectorizado con NumPy).
+
+Los registros llegan del repositorio en lotes de tuplas planas; aquí se convierten
+en columnas NumPy y todas las estadísticas se calculan con operaciones agrupadas
+(np.unique + np.bincount), sin bucles por registro ni consultas por sesión.
+"""
+
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+from app.application.dtos.analitica_dtos import (
+    DistribucionLlegada, EstadisticasAsignatura, EstadisticasEstudiante
+)
+from app.domain.repositories.analitica_asistencia_repository import FilaAsistencia
+
+# Códigos de estado (ver IAnaliticaAsistenciaRepository)
+PRESENTE, TARDE, AUSENTE = 0, 1, 2
+
+# Tramos del histograma de llegada, en minutos desde el inicio de la sesión
+_TRAMOS = np.array([0, 5, 10, 15, 30, 60, np.inf])
+_ETIQUETAS_TRAMOS = ["0-5", "5-10", "10-15", "15-30", "30-60", "60+"]
+
+
+@dataclass
+class ColumnasAsistencia:
+    """Registros de asistencia en formato columnar (una fila por registro)."""
+    id_estudiante: np.ndarray
+    id_asignatura: np.ndarray
+    id_sesion: np.ndarray
+    estado: np.ndarray
+    minutos: np.ndarray  # NaN si no hubo tap
+
+    def __len__(self) -> int:
+        return len(self.estado)
+
+
+async def cargar_columnas(lotes: AsyncIterator[List[FilaAsistencia]]) -> ColumnasAsistencia:
+    """Convierte los lotes de tuplas del repositorio en columnas NumPy."""
+    partes = []
+    async for lote in lotes:
+        if not lote:
+            continue
+        n = len(lote)
+        est, asig, ses, cod, mins = zip(*lote)
+        partes.append((
+            np.fromiter(est, dtype=np.int64, count=n),
+            np.fromiter(asig, dtype=np.int64, count=n),
+            np.fromiter(ses, dtype=np.int64, count=n),
+            np.fromiter(cod, dtype=np.int8, count=n),
+            np.array(mins, dtype=np.float64),  # None -> NaN
+        ))
+
+    if not partes:
+        vacio_int = np.empty(0, dtype=np.int64)
+        return ColumnasAsistencia(vacio_int, vacio_int, vacio_int, np.empty(0, dtype=np.int8), np.empty(0))
+
+    return ColumnasAsistencia(*(np.concatenate(columna) for columna in zip(*partes)))
+
+
+# ==================== AGRUPACIÓN ====================
+
+@dataclass
+class _Grupos:
+    claves: np.ndarray
+    inverso: np.ndarray
+    registros: np.ndarray
+    presentes: np.ndarray
+    tardes: np.ndarray
+    ausentes: np.ndarray
+    promedio_minutos: np.ndarray  # NaN si el grupo no tiene taps
+
+    @property
+    def tasa_asistencia(self) -> np.ndarray:
+        return _dividir(self.presentes + self.tardes, self.registros)
+
+    @property
+    def tasa_tardanza(self) -> np.ndarray:
+        return _dividir(self.tardes, self.presentes + self.tardes)
+
+
+def _dividir(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.zeros(len(num), dtype=np.float64), where=den > 0)
+
+
+def _agrupar(claves: np.ndarray, cols: ColumnasAsistencia) -> _Grupos:
+    unicas, inverso = np.unique(claves, return_inverse=True)
+    n = len(unicas)
+
+    def contar(estado: int) -> np.ndarray:
+        return np.bincount(inverso, weights=(cols.estado == estado), minlength=n).astype(np.int64)
+
+    con_tap = ~np.isnan(cols.minutos)
+    suma_minutos = np.bincount(inverso[con_tap], weights=cols.minutos[con_tap], minlength=n)
+    taps = np.bincount(inverso[con_tap], minlength=n)
+    promedio = np.divide(suma_minutos, taps, out=np.full(n, np.nan), where=taps > 0)
+
+    return _Grupos(
+        claves=unicas,
+        inverso=inverso,
+        registros=np.bincount(inverso, minlength=n),
+        presentes=contar(PRESENTE),
+        tardes=contar(TARDE),
+        ausentes=contar(AUSENTE),
+        promedio_minutos=promedio,
+    )
+
+
+def _clave_compuesta(alta: np.ndarray, baja: np.ndarray) -> np.ndarray:
+    """Empaqueta dos IDs enteros positivos en un int64 (para agrupar por pares)."""
+    return (alta << 32) | baja
+
+
+def _opcional(valor: float) -> Optional[float]:
+    return None if np.isnan(valor) else round(float(valor), 2)
+
+
+def _distribucion(minutos: np.ndarray) -> DistribucionLlegada:
+    minutos = minutos[~np.isnan(minutos)]
+    if len(minutos) == 0:
+        return DistribucionLlegada()
+    p50, p90 = np.percentile(minutos, [50, 90])
+    conteos, _ = np.histogram(np.clip(minutos, 0, None), bins=_TRAMOS)
+    return DistribucionLlegada(
+        p50_minutos=round(float(p50), 2),
+        p90_minutos=round(float(p90), 2),
+        promedio_minutos=round(float(minutos.mean()), 2),
+        histograma=dict(zip(_ETIQUETAS_TRAMOS, conteos.tolist())),
+    )
+
+
+# ==================== ESTADÍSTICAS ====================
+
+def estadisticas_estudiantes(
+        cols: ColumnasAsistencia,
+        umbral_riesgo: float,
+        min_registros: int,
+        nombres: Optional[Dict[int, str]] = None,
+        por_asignatura: bool = True,
+) -> List[EstadisticasEstudiante]:
+    """
+    Estadísticas por estudiante (por defecto, por par estudiante-asignatura).
+    Un estudiante está en riesgo si su tasa de asistencia es menor que `umbral_riesgo`
+    y tiene al menos `min_registros` registros (para no marcar a quien acaba de empezar).
+    """
+    if len(cols) == 0:
+        return []
+
+    nombres = nombres or {}
+    claves = _clave_compuesta(cols.id_asignatura, cols.id_estudiante) if por_asignatura else cols.id_estudiante
+    grupos = _agrupar(claves, cols)
+    tasa_asistencia = grupos.tasa_asistencia
+    tasa_tardanza = grupos.tasa_tardanza
+    en_riesgo = (tasa_asistencia < umbral_riesgo) & (grupos.registros >= min_registros)
+
+    id_estudiantes = grupos.claves & 0xFFFFFFFF if por_asignatura else grupos.claves
+    id_asignaturas = grupos.claves >> 32 if por_asignatura else None
+
+    resultado = []
+    for i in range(len(grupos.claves)):
+        id_estudiante = int(id_estudiantes[i])
+        resultado.append(EstadisticasEstudiante(
+            id_estudiante=id_estudiante,
+            nombre_completo=nombres.get(id_estudiante),
+            id_asignatura=int(id_asignaturas[i]) if id_asignaturas is not None else None,
+            registros=int(grupos.registros[i]),
+            presentes=int(grupos.presentes[i]),
+            tardes=int(grupos.tardes[i]),
+            ausentes=int(grupos.ausentes[i]),
+            tasa_asistencia=round(float(tasa_asistencia[i]), 4),
+            tasa_tardanza=round(float(tasa_tardanza[i]), 4),
+            promedio_minutos_llegada=_opcional(grupos.promedio_minutos[i]),
+            en_riesgo=bool(en_riesgo[i]),
+        ))
+    return resultado
+
+
+def estadisticas_asignaturas(
+        cols: ColumnasAsistencia,
+        umbral_riesgo: float,
+        min_registros: int,
+) -> List[EstadisticasAsignatura]:
+    """Estadísticas agregadas por asignatura (incluye la distribución de llegada)."""
+    if len(cols) == 0:
+        return []
+
+    grupos = _agrupar(cols.id_asignatura, cols)
+    tasa_asistencia = grupos.tasa_asistencia
+    tasa_tardanza = grupos.tasa_tardanza
+
+    # Sesiones distintas por asignatura
+    pares_sesion = np.unique(_clave_compuesta(cols.id_asignatura, cols.id_sesion))
+    sesiones = np.bincount(np.searchsorted(grupos.claves, pares_sesion >> 32), minlength=len(grupos.claves))
+
+    # Estudiantes en riesgo por asignatura
+    riesgo_por_asignatura: Dict[int, List[int]] = {}
+    for est in estadisticas_estudiantes(cols, umbral_riesgo, min_registros):
+        if est.en_riesgo:
+            riesgo_por_asignatura.setdefault(est.id_asignatura, []).append(est.id_estudiante)
+
+    # Minutos de llegada agrupados por asignatura (un corte por grupo, sin filtrar por fila)
+    orden = np.argsort(grupos.inverso, kind="stable")
+    minutos_por_grupo = np.split(cols.minutos[orden], np.cumsum(grupos.registros)[:-1])
+
+    resultado = []
+    for i, id_asignatura in enumerate(grupos.claves.tolist()):
+        resultado.append(EstadisticasAsignatura(
+            id_asignatura=id_asignatura,
+            sesiones=int(sesiones[i]),
+            registros=int(grupos.registros[i]),
+            presentes=int(grupos.presentes[i]),
+            tardes=int(grupos.tardes[i]),
+            ausentes=int(grupos.ausentes[i]),
+            tasa_asistencia=round(float(tasa_asistencia[i]), 4),
+            tasa_tardanza=round(float(tasa_tardanza[i]), 4),
+            distribucion_llegada=_distribucion(minutos_por_grupo[i]),
+            estudiantes_en_riesgo=sorted(riesgo_por_asignatura.get(id_asignatura, [])),
+        ))
+    return resultado
@@ -0,0 +1,139 @@
+"""
+Servicio: avisos por correo de ausencias y llegadas tarde.
+
+Al cerrar una sesión (o su validación) se encola, en la misma transacción, un
+evento para cada estudiante ausente o que llegó tarde y otro para el docente con
+el resumen de la sesión. Nada se envía durante la petición: los eventos se
+acumulan en la bandeja de salida (destino "correo") en un único resumen por
+destinatario y día de clase (fecha local de la sesión), que sale a la siguiente
+hora AVISOS_CORREO_HORA_RESUMEN y entrega el procesador de la bandeja con
+EmisorCorreo. Una clase que termina después de esa hora sale al día siguiente,
+pero con su propia fecha.
+
+Los eventos de una sesión llevan su ID como clave: si la sesión se cierra dos
+veces (validación y cierre), el segundo reemplaza al primero.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.domain.entities.mensaje_saliente import MensajeSaliente, MensajeSalienteCreate
+from app.domain.entities.registro_asistencia import EstadoAsistencia, RegistroAsistenciaDetalle
+from app.domain.entities.sesion_de_clase import SesionDeClase
+from app.domain.repositories.bandeja_salida_repository import IBandejaSalidaRepository
+from app.domain.repositories.usuario_repository import IUsuarioRepository
+
+DESTINO_CORREO = "correo"
+TIPO_RESUMEN_ASISTENCIA = "resumen_asistencia"
+
+_AVISABLES = (EstadoAsistencia.AUSENTE, EstadoAsistencia.TARDE)
+
+
+class AvisosAsistencia:
+    """Encola los avisos de asistencia de una sesión cerrada en el resumen del día."""
+
+    def __init__(self,
+                 bandeja: IBandejaSalidaRepository,
+                 usuario_repo: IUsuarioRepository,
+                 hora_resumen: int = 18,
+                 zona_horaria: str = "America/Bogota"):
+        self.bandeja = bandeja
+        self.usuario_repo = usuario_repo
+        self.hora_resumen = hora_resumen
+        self.zona = ZoneInfo(zona_horaria)
+
+    def proximo_resumen(self, ahora: Optional[datetime] = None) -> datetime:
+        """Próxima hora de envío de los resúmenes (hora local, con zona): su `disponible_en`."""
+        ahora = ahora or datetime.now(self.zona)
+        envio = ahora.replace(hour=self.hora_resumen, minute=0, second=0, microsecond=0)
+        return envio if envio > ahora else envio + timedelta(days=1)
+
+    async def encolar_sesion(self, sesion: SesionDeClase, registros: List[RegistroAsistenciaDetalle]) -> int:
+        """Acumula los avisos de la sesión en los resúmenes pendientes. Retorna los destinatarios."""
+        avisables = [r for r in registros if r.estado_asistencia in _AVISABLES]
+        if not avisables:
+            return 0
+
+        # El resumen es el del día de la clase, no el del envío
+        fecha = self._fecha_local(sesion.hora_inicio)
+        asignatura = sesion.clase_programada.asignatura
+        clave_evento = f"sesion:{sesion.id}"
+        evento = {
+            "fecha": fecha,
+            "asignatura": asignatura.nombre_materia,
+            "grupo": asignatura.grupo,
+            "hora": self._hora_local(sesion.hora_inicio),
+        }
+
+        mensajes = [
+            self._resumen("estudiante", r.id_estudiante, r.email_estudiante, r.nombre_estudiante, fecha,
+                          {clave_evento: {**evento, "estado": r.estado_asistencia.value,
+                                          "hora_entrada": self._hora_local(r.hora_entrada)}})
+            for r in avisables
+        ]
+        docente = await self.usuario_repo.get_by_id(asignatura.id_docente)
+        if docente:
+            mensajes.append(self._resumen(
+                "docente", docente.id, docente.email, docente.nombre_completo, fecha,
+                {clave_evento: {
+                    **evento,
+                    "inscritos": len(registros),
+                    "ausentes": sorted(r.nombre_estudiante for r in avisables
+                                       if r.estado_asistencia == EstadoAsistencia.AUSENTE),
+                    "tarde": sorted(r.nombre_estudiante for r in avisables
+                                    if r.estado_asistencia == EstadoAsistencia.TARDE),
+                }}
+            ))
+
+        envio = self.proximo_resumen()
+        await self.bandeja.acumular(mensajes, envio.astimezone(timezone.utc).replace(tzinfo=None))
+        return len(mensajes)
+
+    def _local(self, momento: datetime) -> datetime:
+        return momento.replace(tzinfo=timezone.utc).astimezone(self.zona)
+
+    def _fecha_local(self, momento: datetime) -> str:
+        return self._local(momento).date().isoformat()
+
+    def _hora_local(self, momento: Optional[datetime]) -> Optional[str]:
+        if momento is None:
+            return None
+        return self._local(momento).strftime("%H:%M")
+
+    @staticmethod
+    def _resumen(rol: str, id_: int, email: str, nombre: str, fecha: str, eventos: Dict) -> MensajeSalienteCreate:
+        return MensajeSalienteCreate(
+            destino=DESTINO_CORREO,
+            tipo=TIPO_RESUMEN_ASISTENCIA,
+            clave=f"resumen:{rol}:{id_}:{fecha}",
+            datos={"destinatario": email, "nombre": nombre, "rol": rol, "fecha": fecha, "eventos": eventos}
+        )
+
+
+def componer_resumen(mensaje: MensajeSaliente) -> Tuple[str, str, str]:
+    """Correo de un resumen acumulado: (destinatario, asunto, texto)."""
+    datos = mensaje.datos
+    eventos = sorted(datos["eventos"].values(), key=lambda e: (e["hora"] or "", e["asignatura"]))
+    lineas = [f"Hola, {datos['nombre']}:", ""]
+
+    if datos["rol"] == "docente":
+        asunto = f"AulaTap: ausencias y llegadas tarde en sus clases del {datos['fecha']}"
+        lineas.append(f"Resumen de asistencia de sus clases del {datos['fecha']}:")
+        for e in eventos:
+            lineas += ["", f"- {e['asignatura']} (grupo {e['grupo']}), {e['hora']}: "
+                           f"{len(e['ausentes'])} ausentes y {len(e['tarde'])} llegadas tarde "
+                           f"de {e['inscritos']} inscritos"]
+            if e["ausentes"]:
+                lineas.append(f"  Ausentes: {', '.join(e['ausentes'])}")
+            if e["tarde"]:
+                lineas.append(f"  Tarde: {', '.join(e['tarde'])}")
+    else:
+        asunto = f"AulaTap: tu asistencia del {datos['fecha']}"
+        lineas += [f"Estas son tus ausencias y llegadas tarde del {datos['fecha']}:", ""]
+        for e in eventos:
+            detalle = f"llegada tarde ({e['hora_entrada']})" if e["estado"] == EstadoAsistencia.TARDE.value else "ausente"
+            lineas.append(f"- {e['asignatura']} (grupo {e['grupo']}), {e['hora']}: {detalle}")
+
+    lineas += ["", "Este es un mensaje automático de AulaTap."]
+    return datos["destinatario"], asunto, "\n".join(lineas)
@@ -0,0 +1,195 @@
+"""
+Servicio: entrega por lotes de los mensajes de la bandeja de salida (transactional outbox).
+
+Los casos de uso escriben los mensajes para sistemas externos en su propia
+transacción, así que la petición que los origina nunca espera al destino y no
+se pierden si este está caído. Cada worker ejecuta un `ProcesadorBandejaSalida`
+por destino que:
+- reserva un lote de hasta `tam_lote` mensajes (SKIP LOCKED + reserva con
+  caducidad: los workers se reparten los mensajes sin bloquearse),
+- lo entrega con el emisor del destino sin tener una conexión de la BD ocupada,
+- marca los entregados y reprograma los fallidos con espera exponencial
+  (base × factor^(intento-1)) hasta `max_intentos`; después quedan "Fallido".
+
+La entrega es "al menos una vez": si el worker muere después de entregar y antes
+de registrarlo, el lote se reenvía al caducar la reserva. Los mensajes llevan
+una clave de idempotencia para que el destino descarte los repetidos.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ExternalServiceException
+from app.core.health import registrar_componente, quitar_componente
+from app.core.logger import logger
+from app.core.metrics import metricas
+from app.domain.entities.mensaje_saliente import MensajeSaliente
+from app.domain.repositories.bandeja_salida_repository import IBandejaSalidaRepository, FalloEnvio
+from app.domain.repositories.emisor_mensajes import IEmisorMensajes, RechazoEnvio
+
+
+class ProcesadorBandejaSalida:
+    """Tarea de fondo que entrega los mensajes pendientes de un destino."""
+
+    def __init__(self,
+                 session_factory: Callable[[], AsyncSession],
+                 crear_repositorio: Callable[[AsyncSession], IBandejaSalidaRepository],
+                 emisor: IEmisorMensajes,
+                 tam_lote: int = 100,
+                 intervalo_segundos: float = 5.0,
+                 reserva_segundos: float = 120.0,
+                 max_intentos: int = 3,
+                 backoff_base_segundos: float = 30.0,
+                 backoff_factor: float = 2.0):
+        self.session_factory = session_factory
+        self.crear_repositorio = crear_repositorio
+        self.emisor = emisor
+        self.destino = emisor.destino
+        self.tam_lote = tam_lote
+        self.intervalo_segundos = intervalo_segundos
+        self.reserva_segundos = reserva_segundos
+        self.max_intentos = max_intentos
+        self.backoff_base_segundos = backoff_base_segundos
+        self.backoff_factor = backoff_factor
+        self._aviso = asyncio.Event()
+        self._tarea: Optional[asyncio.Task] = None
+
+        self._enviados = metricas.contador(
+            f"aulatap_bandeja_{self.destino}_enviados_total", f"Mensajes entregados a {self.destino}"
+        )
+        self._reintentos = metricas.contador(
+            f"aulatap_bandeja_{self.destino}_reintentos_total", f"Mensajes a {self.destino} reprogramados tras un fallo"
+        )
+        self._fallidos = metricas.contador(
+            f"aulatap_bandeja_{self.destino}_fallidos_total",
+            f"Mensajes a {self.destino} rechazados o sin más reintentos"
+        )
+
+    def iniciar(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle(), name=f"bandeja-salida-{self.destino}")
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+        await self.emisor.cerrar()
+
+    @property
+    def vivo(self) -> bool:
+        return self._tarea is not None and not self._tarea.done()
+
+    def avisar(self) -> None:
+        """Adelanta la siguiente pasada (hay mensajes nuevos confirmados en este proceso)."""
+        self._aviso.set()
+
+    async def _bucle(self) -> None:
+        while True:
+            self._aviso.clear()
+            try:
+                await self.procesar()
+            except Exception as e:
+                logger.error(f"Error procesando la bandeja de salida ({self.destino}): {e}")
+            try:
+                async with asyncio.timeout(self.intervalo_segundos):
+                    await self._aviso.wait()
+            except TimeoutError:
+                pass
+
+    async def procesar(self) -> int:
+        """Entrega lotes mientras haya mensajes disponibles. Retorna los mensajes procesados."""
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                lote = await self.crear_repositorio(session).reservar_lote(
+                    self.destino, self.tam_lote, self.reserva_segundos
+                )
+                await session.commit()
+            if not lote:
+                return total
+            total += len(lote)
+            if not await self._entregar(lote):
+                return total  # El destino falla: los siguientes lotes esperan a la próxima pasada
+
+    async def _entregar(self, lote: List[MensajeSaliente]) -> bool:
+        inicio = time.perf_counter()
+        rechazados: Dict[int, RechazoEnvio] = {}
+        error: Optional[str] = None
+        reintentable = True
+        try:
+            rechazados = await self.emisor.enviar_lote(lote)
+        except ExternalServiceException as e:
+            error, reintentable = e.message, e.reintentable
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        if error is None:
+            enviados = [m for m in lote if m.id not in rechazados]
+            fallos = [
+                FalloEnvio(m.id, m.intentos, rechazados[m.id].motivo,
+                           reintentar_en=self._reintentar_en(m) if rechazados[m.id].reintentable else None)
+                for m in lote if m.id in rechazados
+            ]
+        else:
+            enviados = []
+            fallos = [
+                FalloEnvio(m.id, m.intentos, error, reintentar_en=self._reintentar_en(m) if reintentable else None)
+                for m in lote
+            ]
+
+        async with self.session_factory() as session:
+            repositorio = self.crear_repositorio(session)
+            await repositorio.marcar_enviados(enviados)
+            await repositorio.registrar_fallos(fallos)
+            await session.commit()
+
+        definitivos = sum(1 for f in fallos if f.reintentar_en is None)
+        self._enviados.inc(len(enviados))
+        self._fallidos.inc(definitivos)
+        self._reintentos.inc(len(fallos) - definitivos)
+        if error is None:
+            logger.info(f"Bandeja de salida ({self.destino}): {len(enviados)} entregados, "
+                        f"{len(rechazados)} rechazados en {time.perf_counter() - inicio:.2f} s")
+        else:
+            logger.warning(f"Bandeja de salida ({self.destino}): lote de {len(lote)} no entregado "
+                           f"({definitivos} sin más reintentos): {error}")
+        return error is None
+
+    def _reintentar_en(self, mensaje: MensajeSaliente) -> Optional[datetime]:
+        """Próximo intento con espera exponencial, o None si ya agotó los intentos."""
+        if mensaje.intentos >= self.max_intentos:
+            return None
+        espera = self.backoff_base_segundos * self.backoff_factor ** (mensaje.intentos - 1)
+        return datetime.utcnow() + timedelta(seconds=espera)
+
+
+_procesadores: Dict[str, ProcesadorBandejaSalida] = {}
+
+
+def iniciar_procesador_bandeja(procesador: ProcesadorBandejaSalida) -> None:
+    """Arranca el procesador de un destino (startup); uno por destino y proceso."""
+    if procesador.destino in _procesadores:
+        return
+    _procesadores[procesador.destino] = procesador
+    procesador.iniciar()
+    registrar_componente(f"bandeja_{procesador.destino}", lambda: procesador.vivo)
+
+
+def avisar_bandeja(destino: str) -> None:
+    """Tras confirmar mensajes para `destino`, los entrega sin esperar al siguiente intervalo."""
+    procesador = _procesadores.get(destino)
+    if procesador is not None:
+        procesador.avisar()
+
+
+async def detener_procesador_bandeja(destino: str) -> None:
+    """Detiene el procesador del destino, si se llegó a iniciar (shutdown)."""
+    procesador = _procesadores.pop(destino, None)
+    if procesador is not None:
+        quitar_componente(f"bandeja_{destino}")
+        await procesador.detener()
@@ -0,0 +1,83 @@
+"""
+Servicio: contador en memoria del resumen de asistencia de las sesiones en curso.
+
+El resumen se siembra con la consulta agregada del repositorio y, a partir de ahí,
+los casos de uso de 'tap' lo ajustan en O(1). Es un contador por proceso: con varios
+workers cada uno ve solo sus propios taps, por eso cada entrada caduca a los
+ASISTENCIA_CONTADOR_TTL_SEGUNDOS y se vuelve a sembrar desde la base de datos.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.domain.entities.registro_asistencia import EstadoAsistencia, ResumenAsistenciaSesion
+
+_CAMPO_POR_ESTADO = {
+    EstadoAsistencia.PRESENTE: "presentes",
+    EstadoAsistencia.TARDE: "tardes",
+    EstadoAsistencia.AUSENTE: "ausentes",
+}
+
+
+class ContadorAsistencia:
+    """Resúmenes por sesión con caducidad; no es seguro entre hilos (un solo event loop)."""
+
+    def __init__(self, ttl_segundos: float):
+        self.ttl_segundos = ttl_segundos
+        self._resumenes: Dict[int, Tuple[float, ResumenAsistenciaSesion]] = {}
+
+    def obtener(self, sesion_id: int) -> Optional[ResumenAsistenciaSesion]:
+        """Retorna una copia del resumen, o None si no existe o ha caducado."""
+        entrada = self._resumenes.get(sesion_id)
+        if entrada is None:
+            return None
+        sembrado_en, resumen = entrada
+        if time.monotonic() - sembrado_en > self.ttl_segundos:
+            del self._resumenes[sesion_id]
+            return None
+        return resumen.model_copy()
+
+    def sembrar(self, resumen: ResumenAsistenciaSesion) -> None:
+        self._resumenes[resumen.id_sesion] = (time.monotonic(), resumen.model_copy())
+
+    def registrar(self, sesion_id: int,
+                  estado_anterior: Optional[EstadoAsistencia],
+                  estado_nuevo: EstadoAsistencia) -> None:
+        """
+        Aplica un tap de un estudiante inscrito. `estado_anterior` es None si el
+        estudiante aún no tenía registro. Sin entrada sembrada no hace nada.
+        """
+        entrada = self._resumenes.get(sesion_id)
+        if entrada is None:
+            return
+        resumen = entrada[1]
+
+        if estado_anterior is None:
+            resumen.sin_registrar -= 1
+        else:
+            campo = _CAMPO_POR_ESTADO[estado_anterior]
+            setattr(resumen, campo, getattr(resumen, campo) - 1)
+        campo = _CAMPO_POR_ESTADO[estado_nuevo]
+        setattr(resumen, campo, getattr(resumen, campo) + 1)
+
+        # Un tap concurrente con la siembra puede descuadrar el conteo: se descarta
+        if resumen.sin_registrar < 0 or min(resumen.presentes, resumen.tardes, resumen.ausentes) < 0:
+            self.descartar(sesion_id)
+
+    def descartar(self, sesion_id: int) -> None:
+        """Invalida el resumen (cambios masivos, o taps que no se pueden contar)."""
+        self._resumenes.pop(sesion_id, None)
+
+
+_contador: Optional[ContadorAsistencia] = None
+
+
+def get_contador_asistencia() -> Optional[ContadorAsistencia]:
+    """Retorna el contador del proceso, o None si ASISTENCIA_CONTADOR_EN_MEMORIA está desactivado."""
+    global _contador
+    if not settings.ASISTENCIA_CONTADOR_EN_MEMORIA:
+        return None
+    if _contador is None:
+        _contador = ContadorAsistencia(settings.ASISTENCIA_CONTADOR_TTL_SEGUNDOS)
+    return _contador
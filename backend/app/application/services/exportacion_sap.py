@@ -0,0 +1,46 @@
+"""
+Servicio: mensajes de asistencia para el sistema académico (SAP).
+
+Al cerrar una sesión se encola en la bandeja de salida, en la misma transacción,
+un documento con la asistencia definitiva de la sesión. El procesador de la
+bandeja (destino "sap") lo entrega después con EmisorSAP.
+"""
+
+from typing import List
+
+from app.domain.entities.mensaje_saliente import MensajeSalienteCreate
+from app.domain.entities.registro_asistencia import RegistroAsistenciaDetalle
+from app.domain.entities.sesion_de_clase import SesionDeClase
+
+DESTINO_SAP = "sap"
+TIPO_ASISTENCIA_SESION = "asistencia_sesion"
+
+
+def mensaje_asistencia_sesion(sesion: SesionDeClase, registros: List[RegistroAsistenciaDetalle]) -> MensajeSalienteCreate:
+    """Documento de asistencia de una sesión cerrada; la clave permite a SAP descartar reenvíos."""
+    asignatura = sesion.clase_programada.asignatura
+    return MensajeSalienteCreate(
+        destino=DESTINO_SAP,
+        tipo=TIPO_ASISTENCIA_SESION,
+        clave=f"sesion:{sesion.id}",
+        datos={
+            "id_sesion": sesion.id,
+            "id_asignatura": asignatura.id,
+            "asignatura": asignatura.nombre_materia,
+            "grupo": asignatura.grupo,
+            "id_docente": asignatura.id_docente,
+            "hora_inicio": sesion.hora_inicio.isoformat(),
+            "hora_fin": sesion.hora_fin.isoformat() if sesion.hora_fin else None,
+            "tema": sesion.tema,
+            "asistencias": [
+                {
+                    "email_estudiante": r.email_estudiante,
+                    "nombre_estudiante": r.nombre_estudiante,
+                    "estado": r.estado_asistencia.value,
+                    "hora_entrada": r.hora_entrada.isoformat() if r.hora_entrada else None,
+                    "hora_salida": r.hora_salida.isoformat() if r.hora_salida else None,
+                }
+                for r in registros
+            ],
+        }
+    )
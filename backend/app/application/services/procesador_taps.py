@@ -0,0 +1,197 @@
+"""
+Servicio: procesamiento por lotes de los taps de los lectores NFC.
+
+Los taps de todas las conexiones de lectores entran en una sola cola. Cada
+trabajador toma hasta `tam_lote` taps (esperando como mucho `espera_lote_ms` a que
+se llene el lote) y los procesa con una sola sesión y un solo COMMIT; cada tap va
+en su propio SAVEPOINT, de modo que el error de uno no deshace los demás.
+
+Al detenerse no se aceptan taps nuevos y los lotes en proceso se terminan; los
+taps que no llegan a procesarse reciben un error en lugar de quedar sin respuesta.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, Set, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.RegistrarAsistenciaUseCase import RegistrarAsistenciaUseCase
+from app.core.database import es_fallo_de_bd
+from app.core.exceptions import AulaTapException, ExternalServiceException
+from app.core.health import registrar_componente, quitar_componente
+from app.core.logger import logger
+from app.domain.entities.registro_asistencia import RegistroAsistencia
+
+
+@dataclass
+class _Tap:
+    codigo_rfid: str
+    id_dispositivo: str
+    hora_registro: Optional[datetime] = None
+    resultado: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class ProcesadorTaps:
+    """Cola de taps con trabajadores que los procesan por lotes."""
+
+    def __init__(self,
+                 session_factory: Callable[[], AsyncSession],
+                 crear_caso_de_uso: Callable[[AsyncSession], RegistrarAsistenciaUseCase],
+                 tam_lote: int = 50,
+                 espera_lote_ms: float = 10.0,
+                 trabajadores: int = 2,
+                 tam_cola: int = 1000,
+                 espera_detener_segundos: float = 5.0):
+        self.session_factory = session_factory
+        self.crear_caso_de_uso = crear_caso_de_uso
+        self.tam_lote = tam_lote
+        self.espera_lote = espera_lote_ms / 1000
+        self.num_trabajadores = trabajadores
+        self.espera_detener = espera_detener_segundos
+        self._cola: asyncio.Queue[_Tap] = asyncio.Queue(maxsize=tam_cola)
+        self._trabajadores: List[asyncio.Task] = []
+        self._procesando: Set[asyncio.Task] = set()  # Trabajadores con un lote a medias
+        self._deteniendo = False
+
+    def iniciar(self) -> None:
+        """Arranca los trabajadores (requiere un event loop en marcha)."""
+        if self._trabajadores:
+            return
+        self._trabajadores = [
+            asyncio.create_task(self._trabajador(), name=f"procesador-taps-{i}")
+            for i in range(self.num_trabajadores)
+        ]
+
+    async def detener(self) -> None:
+        """
+        Detiene los trabajadores. Deja de aceptar taps, termina los lotes en proceso
+        (como mucho `espera_detener_segundos`) y responde con un error a los taps
+        que no llegan a procesarse: los aún en cola y los de un lote interrumpido.
+        """
+        self._deteniendo = True
+        for tarea in self._trabajadores:
+            if tarea not in self._procesando:
+                tarea.cancel()  # Esperando taps: no tiene nada a medias
+        if self._trabajadores:
+            await asyncio.wait(self._trabajadores, timeout=self.espera_detener)
+        for tarea in self._trabajadores:
+            tarea.cancel()
+        await asyncio.gather(*self._trabajadores, return_exceptions=True)
+        self._trabajadores = []
+        pendientes = []
+        while not self._cola.empty():
+            pendientes.append(self._cola.get_nowait())
+        self._rechazar(pendientes)
+
+    @staticmethod
+    def _rechazar(taps: List[_Tap]) -> None:
+        for tap in taps:
+            if not tap.resultado.done():
+                tap.resultado.set_exception(ExternalServiceException("Ingesta", "El servidor se está deteniendo"))
+
+    @property
+    def vivo(self) -> bool:
+        """True si todos los trabajadores siguen en marcha."""
+        return bool(self._trabajadores) and not any(t.done() for t in self._trabajadores)
+
+    async def registrar(self, codigo_rfid: str, id_dispositivo: str,
+                        hora_registro: Optional[datetime] = None) -> RegistroAsistencia:
+        """
+        Encola un tap y espera su resultado. Propaga las excepciones del caso de uso
+        (NotFoundException, ValidationException...) y lanza ExternalServiceException
+        si la cola está llena.
+        """
+        if self._deteniendo:
+            raise ExternalServiceException("Ingesta", "El servidor se está deteniendo")
+        tap = _Tap(codigo_rfid, id_dispositivo, hora_registro)
+        try:
+            self._cola.put_nowait(tap)
+        except asyncio.QueueFull:
+            raise ExternalServiceException("Ingesta", "Cola de taps llena, reintente")
+        return await tap.resultado
+
+    # ==================== TRABAJADORES ====================
+
+    async def _siguiente_lote(self, lote: List[_Tap]) -> None:
+        """Llena `lote` (del trabajador: si se le cancela a medias, sabe qué taps tenía)."""
+        lote.append(await self._cola.get())
+        limite = asyncio.get_running_loop().time() + self.espera_lote
+        while len(lote) < self.tam_lote:
+            restante = limite - asyncio.get_running_loop().time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+
+    async def _trabajador(self) -> None:
+        tarea = asyncio.current_task()
+        lote: List[_Tap] = []
+        try:
+            while not self._deteniendo:
+                lote = []
+                await self._siguiente_lote(lote)
+                self._procesando.add(tarea)
+                try:
+                    await self._procesar_lote(lote)
+                except Exception as e:  # Fallo del lote completo (p. ej. el COMMIT)
+                    logger.error(f"Error procesando lote de {len(lote)} taps: {e}")
+                    for tap in lote:
+                        if not tap.resultado.done():
+                            tap.resultado.set_exception(e)
+                finally:
+                    self._procesando.discard(tarea)
+        finally:
+            # Cancelado por `detener` con taps ya sacados de la cola: no quedan sin respuesta
+            self._rechazar(lote)
+
+    async def _procesar_lote(self, lote: List[_Tap]) -> None:
+        resultados: List[Union[RegistroAsistencia, Exception]] = []
+        async with self.session_factory() as session:
+            caso_de_uso = self.crear_caso_de_uso(session)
+            for tap in lote:
+                try:
+                    async with session.begin_nested():
+                        resultados.append(await caso_de_uso.execute(tap.codigo_rfid, tap.hora_registro))
+                except AulaTapException as e:
+                    resultados.append(e)
+                except Exception as e:
+                    if es_fallo_de_bd(e):
+                        raise  # Sin BD el resto del lote fallaría igual: se responde a todos
+                    logger.error(f"Error procesando tap del dispositivo {tap.id_dispositivo}: {e}")
+                    resultados.append(e)
+            await session.commit()
+
+        # Solo se confirma a los lectores después del COMMIT
+        for tap, resultado in zip(lote, resultados):
+            if tap.resultado.done():  # El lector se desconectó
+                continue
+            if isinstance(resultado, Exception):
+                tap.resultado.set_exception(resultado)
+            else:
+                tap.resultado.set_result(resultado)
+
+
+_procesador: Optional[ProcesadorTaps] = None
+
+
+def get_procesador_taps(fabrica: Callable[[], ProcesadorTaps]) -> ProcesadorTaps:
+    """Retorna el procesador del proceso; en la primera llamada lo crea con `fabrica` y lo arranca."""
+    global _procesador
+    if _procesador is None:
+        _procesador = fabrica()
+        _procesador.iniciar()
+        registrar_componente("procesador_taps", lambda: _procesador is not None and _procesador.vivo)
+    return _procesador
+
+
+async def detener_procesador_taps() -> None:
+    """Detiene el procesador del proceso, si se llegó a crear (shutdown)."""
+    global _procesador
+    if _procesador is not None:
+        quitar_componente("procesador_taps")
+        await _procesador.detener()
+        _procesador = None
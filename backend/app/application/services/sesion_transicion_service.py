@@ -0,0 +1,35 @@
+"""
+Servicio: diagnóstico de transiciones de estado rechazadas.
+
+`ISesionDeClaseRepository.transition_estado` solo dice si la transición se aplicó.
+Cuando no, este servicio determina el motivo (para devolver 404 / 403 / 400)
+con lecturas que solo ocurren en el camino de error.
+"""
+
+from app.domain.entities.sesion_de_clase import SesionDeClase
+from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
+from app.domain.repositories.asignatura_repository import IAsignaturaRepository
+from app.core.exceptions import NotFoundException, ForbiddenException
+
+
+async def diagnosticar_transicion_rechazada(
+        sesion_repo: ISesionDeClaseRepository,
+        asignatura_repo: IAsignaturaRepository,
+        sesion_id: int,
+        docente_id: int,
+        forbidden_detail: str,
+) -> SesionDeClase:
+    """
+    Lanza NotFoundException si la sesión no existe y ForbiddenException si el docente
+    no es dueño de la asignatura. En otro caso el rechazo se debe al estado actual:
+    retorna la sesión para que el caso de uso construya su ValidationException.
+    """
+    sesion = await sesion_repo.get_by_id(sesion_id)
+    if not sesion:
+        raise NotFoundException(resource="SesionDeClase", identifier=sesion_id)
+
+    owns_asignatura = await asignatura_repo.docente_owns_asignatura(docente_id, sesion.id_clase)
+    if not owns_asignatura:
+        raise ForbiddenException(detail=forbidden_detail)
+
+    return sesion
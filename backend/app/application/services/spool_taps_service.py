@@ -0,0 +1,138 @@
+"""
+Servicio: desvío de taps al spool local y su reenvío cuando vuelve la BD.
+
+Los endpoints de taps consultan el circuito de la BD (`get_circuito_bd()`). Si está
+abierto, o si el tap falla por no poder conectar con la BD, el tap se guarda en el
+spool con su hora original y al lector se le responde "encolado". El
+`ReproductorSpool` vacía el spool a través del `ProcesadorTaps` (el mismo camino
+por lotes de la ingesta WebSocket) en cuanto el circuito deja de estar abierto.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from app.application.services.procesador_taps import ProcesadorTaps
+from app.core.circuit_breaker import CircuitBreaker, EstadoCircuito
+from app.core.database import es_fallo_de_bd
+from app.core.exceptions import AulaTapException
+from app.core.logger import logger
+from app.core.metrics import metricas
+from app.domain.repositories.spool_taps import ISpoolTaps, TapEnSpool
+
+taps_encolados = metricas.contador(
+    "aulatap_spool_taps_encolados_total", "Taps guardados en el spool por no estar disponible la BD"
+)
+taps_reproducidos = metricas.contador(
+    "aulatap_spool_taps_reproducidos_total", "Taps del spool registrados en la BD"
+)
+taps_rechazados = metricas.contador(
+    "aulatap_spool_taps_rechazados_total", "Taps del spool rechazados por reglas de negocio al reenviarlos"
+)
+tasa_reproduccion = metricas.medidor(
+    "aulatap_spool_taps_reproducidos_por_segundo", "Ritmo del último lote reenviado desde el spool"
+)
+
+
+def registrar_metricas_spool(spool: ISpoolTaps, circuito: CircuitBreaker) -> None:
+    """Publica la profundidad del spool y el estado del circuito como medidores."""
+    metricas.medidor("aulatap_spool_taps_pendientes", "Taps en el spool pendientes de reenviar",
+                     funcion=lambda: spool.profundidad)
+    metricas.medidor("aulatap_circuito_bd_abierto", "1 si el circuito de la BD está abierto",
+                     funcion=lambda: float(circuito.estado == EstadoCircuito.ABIERTO))
+
+
+async def encolar_tap(spool: ISpoolTaps, codigo_rfid: str, id_dispositivo: str, hora_registro: datetime) -> None:
+    """Guarda un tap en el spool (la BD no está disponible)."""
+    await spool.agregar(codigo_rfid, id_dispositivo, hora_registro)
+    taps_encolados.inc()
+    logger.warning(f"BD no disponible: tap del dispositivo {id_dispositivo} guardado en el spool "
+                   f"({spool.profundidad} pendientes)")
+
+
+class ReproductorSpool:
+    """Tarea de fondo que reenvía los taps del spool cuando la BD está disponible."""
+
+    def __init__(self,
+                 spool: ISpoolTaps,
+                 circuito: CircuitBreaker,
+                 obtener_procesador: Callable[[], ProcesadorTaps],
+                 tam_lote: int = 200,
+                 intervalo_segundos: float = 2.0):
+        self.spool = spool
+        self.circuito = circuito
+        self.obtener_procesador = obtener_procesador
+        self.tam_lote = tam_lote
+        self.intervalo_segundos = intervalo_segundos
+        self._tarea: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle(), name="reproductor-spool-taps")
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+
+    @property
+    def vivo(self) -> bool:
+        return self._tarea is not None and not self._tarea.done()
+
+    async def _bucle(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo_segundos)
+            try:
+                await self.reproducir()
+            except Exception as e:
+                logger.error(f"Error reenviando taps del spool: {e}")
+
+    async def reproducir(self) -> int:
+        """Reenvía lotes mientras haya taps y el circuito lo permita. Retorna los registrados."""
+        total = 0
+        while self.spool.profundidad > 0 and self.circuito.permite():
+            lote = await self.spool.reservar_lote(self.tam_lote)
+            if not lote:
+                break
+            registrados, fallo_bd = await self._reproducir_lote(lote)
+            total += registrados
+            if fallo_bd:
+                break
+        return total
+
+    async def _reproducir_lote(self, lote: List[TapEnSpool]) -> Tuple[int, bool]:
+        procesador = self.obtener_procesador()
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(
+            *(procesador.registrar(t.codigo_rfid, t.id_dispositivo, hora_registro=t.hora_registro) for t in lote),
+            return_exceptions=True
+        )
+
+        ids_registrados: List[int] = []
+        rechazados: List[Tuple[TapEnSpool, str]] = []
+        fallo_bd = False
+        for tap, resultado in zip(lote, resultados):
+            if not isinstance(resultado, BaseException):
+                ids_registrados.append(tap.id)
+            elif isinstance(resultado, AulaTapException) and resultado.status_code < 500:
+                # Regla de negocio (estudiante desconocido, sin sesión en curso, duplicado...)
+                rechazados.append((tap, resultado.message))
+            elif es_fallo_de_bd(resultado):
+                fallo_bd = True  # Se queda en el spool; se reintenta al caducar la reserva
+            # Otros errores (cola llena...) también se reintentan más tarde
+
+        await self.spool.completar(ids_registrados, rechazados)
+        taps_reproducidos.inc(len(ids_registrados))
+        taps_rechazados.inc(len(rechazados))
+        tasa_reproduccion.set(len(ids_registrados) / max(time.perf_counter() - inicio, 1e-6))
+
+        if fallo_bd:
+            self.circuito.registrar_fallo()
+        elif ids_registrados:
+            self.circuito.registrar_exito()
+        if ids_registrados or rechazados:
+            logger.info(f"Spool de taps: {len(ids_registrados)} registrados, {len(rechazados)} rechazados, "
+                        f"{self.spool.profundidad} pendientes")
+        return len(ids_registrados), fallo_bd
@@ -0,0 +1,252 @@
+"""
+Servicio: ejecución en segundo plano de los trabajos encolados (tabla "Trabajo").
+
+Las peticiones encolan las operaciones pesadas (p. ej. completar el cierre de una
+sesión) en su propia transacción y responden al momento. Cada proceso ejecuta un
+`EjecutorTrabajos` con `concurrencia` workers que:
+- reservan un trabajo cada vez (SKIP LOCKED + reserva con caducidad: los workers
+  de todos los procesos se reparten la cola sin bloquearse),
+- ejecutan su manejador en una transacción que también lo marca como completado:
+  el efecto del trabajo y su estado se confirman juntos,
+- mientras tanto renuevan la reserva y guardan el progreso en transacciones
+  cortas aparte, para que se vea desde fuera (GET /trabajos/{id}),
+- si el manejador falla, deshacen su transacción y lo reprograman con espera
+  exponencial (base × factor^(intento-1)) hasta `max_intentos`; después queda "Fallido".
+
+Si el proceso muere a mitad de un trabajo, la reserva caduca y otro worker lo
+retoma; como nada se confirmó, lo ejecuta entero otra vez. Si solo se detiene
+(reinicio, despliegue), el trabajo vuelve a la cola sin gastar un intento.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ExternalServiceException, ForbiddenException, NotFoundException, ValidationException
+from app.core.health import registrar_componente, quitar_componente
+from app.core.logger import logger
+from app.core.metrics import metricas
+from app.domain.entities.trabajo import Trabajo
+from app.domain.repositories.trabajo_repository import ITrabajoRepository
+
+# Errores que no se arreglan reintentando
+_DEFINITIVOS = (NotFoundException, ValidationException, ForbiddenException)
+
+
+class ProgresoTrabajo:
+    """Progreso de un trabajo en curso; el manejador lo actualiza y el worker lo guarda."""
+
+    def __init__(self):
+        self.actual = 0
+        self.total: Optional[int] = None
+        self._cambio = asyncio.Event()
+
+    def reportar(self, actual: int, total: Optional[int] = None) -> None:
+        self.actual = actual
+        if total is not None:
+            self.total = total
+        self._cambio.set()
+
+    async def esperar_cambio(self, timeout: float) -> None:
+        """Espera a que el manejador reporte progreso, como mucho `timeout` segundos."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._cambio.wait()
+        except TimeoutError:
+            pass
+        self._cambio.clear()
+
+
+# Ejecuta el trabajo con la sesión de su transacción (sin confirmarla); retorna el resultado
+ManejadorTrabajo = Callable[[AsyncSession, Trabajo, ProgresoTrabajo], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class EjecutorTrabajos:
+    """Workers de fondo que ejecutan los trabajos de la cola."""
+
+    # Entre dos escrituras del progreso (las de la reserva no esperan a esto)
+    INTERVALO_PROGRESO = 1.0
+
+    def __init__(self,
+                 session_factory: Callable[[], AsyncSession],
+                 crear_repositorio: Callable[[AsyncSession], ITrabajoRepository],
+                 manejadores: Dict[str, ManejadorTrabajo],
+                 concurrencia: int = 2,
+                 intervalo_segundos: float = 5.0,
+                 reserva_segundos: float = 60.0,
+                 max_intentos: int = 3,
+                 backoff_base_segundos: float = 10.0,
+                 backoff_factor: float = 2.0):
+        self.session_factory = session_factory
+        self.crear_repositorio = crear_repositorio
+        self.manejadores = manejadores
+        self.concurrencia = concurrencia
+        self.intervalo_segundos = intervalo_segundos
+        self.reserva_segundos = reserva_segundos
+        self.max_intentos = max_intentos
+        self.backoff_base_segundos = backoff_base_segundos
+        self.backoff_factor = backoff_factor
+        self._aviso = asyncio.Event()
+        self._tareas: List[asyncio.Task] = []
+
+        self._completados = metricas.contador("aulatap_trabajos_completados_total", "Trabajos completados")
+        self._reintentos = metricas.contador(
+            "aulatap_trabajos_reintentos_total", "Trabajos reprogramados tras un fallo"
+        )
+        self._fallidos = metricas.contador("aulatap_trabajos_fallidos_total", "Trabajos que agotaron los reintentos")
+
+    def iniciar(self) -> None:
+        if not self._tareas:
+            self._tareas = [
+                asyncio.create_task(self._worker(), name=f"trabajos-{n}") for n in range(self.concurrencia)
+            ]
+
+    async def detener(self) -> None:
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+
+    @property
+    def vivo(self) -> bool:
+        return bool(self._tareas) and not any(t.done() for t in self._tareas)
+
+    def avisar(self) -> None:
+        """Despierta a los workers (hay trabajos nuevos confirmados en este proceso)."""
+        self._aviso.set()
+
+    async def _worker(self) -> None:
+        while True:
+            self._aviso.clear()
+            try:
+                if await self.procesar_uno():
+                    continue
+            except Exception as e:
+                logger.error(f"Error reservando un trabajo: {e}")
+            try:
+                async with asyncio.timeout(self.intervalo_segundos):
+                    await self._aviso.wait()
+            except TimeoutError:
+                pass
+
+    async def _reservar(self) -> Optional[Trabajo]:
+        async with self.session_factory() as session:
+            trabajo = await self.crear_repositorio(session).reservar(list(self.manejadores), self.reserva_segundos)
+            await session.commit()
+        return trabajo
+
+    async def procesar_uno(self) -> bool:
+        """Reserva y ejecuta un trabajo, si hay alguno disponible. Retorna si ejecutó uno."""
+        trabajo = await self._reservar()
+        if trabajo is None:
+            return False
+        await self._ejecutar(trabajo)
+        return True
+
+    async def _ejecutar(self, trabajo: Trabajo) -> None:
+        progreso = ProgresoTrabajo()
+        latido = asyncio.create_task(self._latir(trabajo, progreso), name=f"trabajo-{trabajo.id}-latido")
+        try:
+            async with self.session_factory() as session:
+                resultado = await self.manejadores[trabajo.tipo](session, trabajo, progreso)
+                completado = await self.crear_repositorio(session).completar(
+                    trabajo.id, trabajo.intentos, resultado, progreso.actual, progreso.total
+                )
+                if not completado:
+                    # Su reserva caducó y otro worker lo retomó: que confirme ese
+                    logger.warning(f"Trabajo {trabajo.id} ({trabajo.tipo}) retomado por otro worker; se descarta")
+                    return
+                await session.commit()
+            self._completados.inc()
+            logger.info(f"Trabajo {trabajo.id} ({trabajo.tipo}) completado en el intento {trabajo.intentos}")
+        except asyncio.CancelledError:
+            # Parada del proceso: se libera ya, sin esperar a que caduque la reserva
+            # ni contarlo como un intento fallido
+            await self._liberar(trabajo)
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            definitivo = isinstance(e, _DEFINITIVOS) or (isinstance(e, ExternalServiceException) and not e.reintentable)
+            reintentar_en = None if definitivo else self._reintentar_en(trabajo)
+            await self._registrar_fallo(trabajo, error, reintentar_en)
+            if reintentar_en is None:
+                self._fallidos.inc()
+                logger.error(f"Trabajo {trabajo.id} ({trabajo.tipo}) fallido en el intento {trabajo.intentos}: {error}")
+            else:
+                self._reintentos.inc()
+                logger.warning(f"Trabajo {trabajo.id} ({trabajo.tipo}) falló en el intento {trabajo.intentos}, "
+                               f"se reintenta a las {reintentar_en:%H:%M:%S}: {error}")
+        finally:
+            latido.cancel()
+            await asyncio.gather(latido, return_exceptions=True)
+
+    async def _latir(self, trabajo: Trabajo, progreso: ProgresoTrabajo) -> None:
+        """Renueva la reserva cada tercio de su duración y guarda el progreso cuando cambia."""
+        while True:
+            await progreso.esperar_cambio(self.reserva_segundos / 3)
+            try:
+                async with self.session_factory() as session:
+                    vigente = await self.crear_repositorio(session).renovar(
+                        trabajo.id, trabajo.intentos, self.reserva_segundos, progreso.actual, progreso.total
+                    )
+                    await session.commit()
+                if not vigente:
+                    return
+            except Exception as e:
+                logger.warning(f"No se pudo renovar la reserva del trabajo {trabajo.id}: {e}")
+            await asyncio.sleep(self.INTERVALO_PROGRESO)
+
+    async def _registrar_fallo(self, trabajo: Trabajo, error: str, reintentar_en: Optional[datetime]) -> None:
+        try:
+            async with self.session_factory() as session:
+                await self.crear_repositorio(session).registrar_fallo(trabajo.id, trabajo.intentos, error, reintentar_en)
+                await session.commit()
+        except Exception as e:
+            # La reserva caducará y otro worker lo retomará
+            logger.error(f"No se pudo registrar el fallo del trabajo {trabajo.id}: {e}")
+
+    async def _liberar(self, trabajo: Trabajo) -> None:
+        try:
+            async with self.session_factory() as session:
+                await self.crear_repositorio(session).liberar(trabajo.id, trabajo.intentos)
+                await session.commit()
+            logger.info(f"Trabajo {trabajo.id} ({trabajo.tipo}) devuelto a la cola al detener el worker")
+        except Exception as e:
+            logger.error(f"No se pudo liberar el trabajo {trabajo.id}: {e}")
+
+    def _reintentar_en(self, trabajo: Trabajo) -> Optional[datetime]:
+        """Próximo intento con espera exponencial, o None si ya agotó los intentos."""
+        if trabajo.intentos >= self.max_intentos:
+            return None
+        espera = self.backoff_base_segundos * self.backoff_factor ** (trabajo.intentos - 1)
+        return datetime.utcnow() + timedelta(seconds=espera)
+
+
+_ejecutor: Optional[EjecutorTrabajos] = None
+
+
+def iniciar_ejecutor_trabajos(ejecutor: EjecutorTrabajos) -> None:
+    """Arranca los workers de trabajos del proceso (startup); uno por proceso."""
+    global _ejecutor
+    if _ejecutor is not None:
+        return
+    _ejecutor = ejecutor
+    ejecutor.iniciar()
+    registrar_componente("trabajos", lambda: ejecutor.vivo)
+
+
+def avisar_trabajos() -> None:
+    """Tras confirmar trabajos nuevos, los empieza sin esperar al siguiente intervalo."""
+    if _ejecutor is not None:
+        _ejecutor.avisar()
+
+
+async def detener_ejecutor_trabajos() -> None:
+    """Detiene los workers, si se llegaron a iniciar (shutdown); los trabajos en curso vuelven a la cola."""
+    global _ejecutor
+    if _ejecutor is not None:
+        quitar_componente("trabajos")
+        await _ejecutor.detener()
+        _ejecutor = None
@@ -1,13 +1,16 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
 from app.domain.repositories.inscripcion_repository import IInscripcionRepository
 from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
 from app.domain.repositories.asignatura_repository import IAsignaturaRepository
 from app.domain.repositories.clase_programada_repository import IClaseProgramadaRepository
-from app.domain.entities.sesion_de_clase import SesionDeClase, EstadoSesion, SesionDeClaseUpdate
+from app.domain.entities.sesion_de_clase import SesionDeClase, EstadoSesion
 from app.domain.entities.registro_asistencia import RegistroAsistencia, EstadoAsistencia, RegistroAsistenciaCreate
 from app.domain.entities.clase_programada import ClaseProgramada
-from app.core.exceptions import NotFoundException, ForbiddenException, ValidationException
+from app.application.services.sesion_transicion_service import diagnosticar_transicion_rechazada
+from app.application.services.contador_asistencia import ContadorAsistencia
+from app.application.services.avisos_asistencia import AvisosAsistencia
+from app.core.exceptions import NotFoundException, ValidationException
 
 class CerrarValidacionUseCase:
     def __init__(self,
@@ -15,36 +18,39 @@ class CerrarValidacionUseCase:
                  inscripcion_repository: IInscripcionRepository,
                  registro_asistencia_repository: IRegistroAsistenciaRepository,
                  asignatura_repo: IAsignaturaRepository,
-                 clase_programada_repo: IClaseProgramadaRepository):
+                 clase_programada_repo: IClaseProgramadaRepository,
+                 contador: Optional[ContadorAsistencia] = None,
+                 avisos: Optional[AvisosAsistencia] = None):
         self.sesion_de_clase_repository = sesion_de_clase_repository
         self.inscripcion_repository = inscripcion_repository
         self.registro_asistencia_repository = registro_asistencia_repository
         self.asignatura_repo = asignatura_repo
         self.clase_programada_repo = clase_programada_repo
+        self.contador = contador
+        self.avisos = avisos  # None: correo no configurado
 
     async def execute(self, id_sesion: int, id_docente: int) -> Tuple[SesionDeClase, ClaseProgramada]:
-        sesion = await self.sesion_de_clase_repository.get_by_id(id_sesion)
-        if not sesion:
-            raise NotFoundException("SesionDeClase", id_sesion)
+        # 1. Cambiar estado de la sesión (comprobación de estado + propiedad en la misma sentencia)
+        transicion = await self.sesion_de_clase_repository.transition_estado(
+            id_sesion,
+            estados_permitidos=[EstadoSesion.VALIDACION_ABIERTA],
+            nuevo_estado=EstadoSesion.VALIDACION_CERRADA,
+            id_docente=id_docente
+        )
+        if not transicion:
+            sesion = await diagnosticar_transicion_rechazada(
+                self.sesion_de_clase_repository, self.asignatura_repo, id_sesion, id_docente,
+                forbidden_detail="El docente no tiene permiso para modificar esta sesión."
+            )
+            raise ValidationException(f"La validación no está abierta. Estado actual: '{sesion.estado}'.")
 
         clase_programada = await self.clase_programada_repo.get_by_asignatura_and_horario(
-            sesion.id_clase, sesion.id_horario
+            transicion.id_clase, transicion.id_horario
         )
         if not clase_programada:
-            raise NotFoundException(resource="ClaseProgramada", identifier=f"Asignatura ID: {sesion.id_clase}, Horario ID: {sesion.id_horario}")
-
-        owns_asignatura = await self.asignatura_repo.docente_owns_asignatura(id_docente, clase_programada.id_clase)
-        if not owns_asignatura:
-            raise ForbiddenException(detail="El docente no tiene permiso para modificar esta sesión.")
-
-        if sesion.estado != EstadoSesion.VALIDACION_ABIERTA:
-            raise ValidationException(f"La validación no está abierta. Estado actual: '{sesion.estado}'.")
+            raise NotFoundException(resource="ClaseProgramada", identifier=f"Asignatura ID: {transicion.id_clase}, Horario ID: {transicion.id_horario}")
 
-        # 1. Cambiar estado de la sesión
-        update_payload = SesionDeClaseUpdate(estado=EstadoSesion.VALIDACION_CERRADA)
-        updated_sesion = await self.sesion_de_clase_repository.update(id_sesion, update_payload)
-        if not updated_sesion:
-            raise NotFoundException("SesionDeClase", id_sesion)
+        updated_sesion = SesionDeClase(**transicion.model_dump(), clase_programada=clase_programada)
 
         # 2. Obtener todos los estudiantes inscritos en la asignatura de la sesión
         # id_clase de SesionDeClase es en realidad id_asignatura de ClaseProgramada
@@ -61,7 +67,8 @@ class CerrarValidacionUseCase:
                 create_payload = RegistroAsistenciaCreate(
                     id_sesion_clase=id_sesion,
                     id_estudiante=estudiante_id,
-                    estado_asistencia=EstadoAsistencia.AUSENTE
+                    estado_asistencia=EstadoAsistencia.AUSENTE,
+                    fecha_sesion=transicion.hora_inicio
                 )
                 await self.registro_asistencia_repository.create(create_payload)
             elif registro_asistencia.estado_asistencia not in [EstadoAsistencia.PRESENTE, EstadoAsistencia.TARDE]:
@@ -71,6 +78,15 @@ class CerrarValidacionUseCase:
                     id_estudiante=estudiante_id,
                     estado_asistencia=EstadoAsistencia.AUSENTE
                 )
-                await self.registro_asistencia_repository.update(registro_asistencia.id, update_registro_payload)
+                await self.registro_asistencia_repository.update(registro_asistencia.id, update_registro_payload, reciente=True)
+
+        # 4. Encolar los avisos por correo de ausencias y llegadas tarde (salen en el resumen del día)
+        if self.avisos:
+            registros = await self.registro_asistencia_repository.list_detalle_por_sesion(id_sesion)
+            await self.avisos.encolar_sesion(updated_sesion, registros)
+
+        # Los ausentes se crearon en bloque: el resumen en memoria se vuelve a sembrar
+        if self.contador:
+            self.contador.descartar(id_sesion)
 
         return updated_sesion, clase_programada
@@ -0,0 +1,67 @@
+"""
+Caso de Uso: Completar el cierre de una Sesión de Clase (en segundo plano).
+"""
+
+from typing import Any, Dict, Optional
+from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
+from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
+from app.domain.repositories.bandeja_salida_repository import IBandejaSalidaRepository
+from app.application.services.exportacion_sap import mensaje_asistencia_sesion
+from app.application.services.avisos_asistencia import AvisosAsistencia
+from app.application.services.trabajos_service import ProgresoTrabajo
+from app.core.exceptions import NotFoundException
+
+# Tipo del trabajo que encola CerrarSesionUseCase
+TIPO_CIERRE_SESION = "cierre_sesion"
+
+
+class CompletarCierreSesionUseCase:
+    """
+    Clase que encapsula la parte pesada del cierre de una sesión, que CerrarSesionUseCase
+    deja encolada como trabajo para que el docente no espere.
+    """
+
+    def __init__(self,
+                 sesion_repo: ISesionDeClaseRepository,
+                 registro_asistencia_repository: IRegistroAsistenciaRepository,
+                 bandeja_sap: Optional[IBandejaSalidaRepository] = None,
+                 avisos: Optional[AvisosAsistencia] = None):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.sesion_repo = sesion_repo
+        self.registro_asistencia_repository = registro_asistencia_repository
+        self.bandeja_sap = bandeja_sap  # None: integración con SAP no configurada
+        self.avisos = avisos  # None: correo no configurado
+
+    async def execute(self, sesion_id: int, progreso: Optional[ProgresoTrabajo] = None) -> Dict[str, Any]:
+        """
+        Completa el cierre de la sesión (ya en estado "Cerrada"), en la transacción del trabajo:
+
+        1. Marca como ausentes a los estudiantes inscritos sin registro (una sola sentencia).
+        2. Encola la asistencia definitiva para SAP y los avisos por correo de ausencias y
+           llegadas tarde en la bandeja de salida.
+
+        Es idempotente: si el trabajo se reintenta, no duplica ausentes.
+        """
+        sesion = await self.sesion_repo.get_by_id(sesion_id)
+        if not sesion:
+            raise NotFoundException(resource="SesionDeClase", identifier=sesion_id)
+        pasos = 1 + bool(self.bandeja_sap or self.avisos)
+
+        # 1. Ausentes
+        ausentes = await self.registro_asistencia_repository.marcar_ausentes_sin_registro(sesion_id)
+        if progreso:
+            progreso.reportar(1, pasos)
+
+        # 2. Bandeja de salida
+        if self.bandeja_sap or self.avisos:
+            registros = await self.registro_asistencia_repository.list_detalle_por_sesion(sesion_id)
+            if self.bandeja_sap:
+                await self.bandeja_sap.agregar(mensaje_asistencia_sesion(sesion, registros))
+            if self.avisos:
+                await self.avisos.encolar_sesion(sesion, registros)
+            if progreso:
+                progreso.reportar(2, pasos)
+
+        return {"id_sesion": sesion_id, "ausentes_marcados": ausentes}
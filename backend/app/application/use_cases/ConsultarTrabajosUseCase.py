@@ -0,0 +1,39 @@
+"""
+Caso de Uso: Consultar el estado y el progreso de los trabajos en segundo plano.
+"""
+
+from typing import Optional
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.trabajo import Trabajo, EstadoTrabajo
+from app.domain.repositories.trabajo_repository import ITrabajoRepository
+
+
+class ConsultarTrabajosUseCase:
+    """
+    Clase que encapsula la consulta de los trabajos que solicitó un usuario
+    (p. ej. el que encola un docente al cerrar una sesión).
+    """
+
+    def __init__(self, trabajo_repo: ITrabajoRepository):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.trabajo_repo = trabajo_repo
+
+    async def get(self, trabajo_id: int, usuario_id: int) -> Trabajo:
+        """Un trabajo del usuario (404 si no existe, 403 si lo solicitó otro usuario)."""
+        trabajo = await self.trabajo_repo.get_by_id(trabajo_id)
+        if not trabajo:
+            raise NotFoundException(resource="Trabajo", identifier=trabajo_id)
+        if trabajo.id_usuario != usuario_id:
+            raise ForbiddenException(detail="El usuario no tiene permiso para ver este trabajo.")
+        return trabajo
+
+    async def listar(self, usuario_id: int, limite: int, cursor: Optional[str] = None,
+                     estado: Optional[EstadoTrabajo] = None) -> Pagina[Trabajo]:
+        """
+        Trabajos del usuario, los más recientes primero, paginados por cursor
+        (ValidationException si el cursor no es válido).
+        """
+        return await self.trabajo_repo.list_by_usuario(usuario_id, limite, cursor, estado)
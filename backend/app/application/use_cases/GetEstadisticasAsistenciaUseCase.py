@@ -0,0 +1,117 @@
+"""
+Caso de Uso: Estadísticas de asistencia (por asignatura, por docente y por estudiante).
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ForbiddenException
+from app.domain.repositories.analitica_asistencia_repository import IAnaliticaAsistenciaRepository
+from app.domain.repositories.asignatura_repository import IAsignaturaRepository
+from app.application.dtos.analitica_dtos import (
+    ReporteAnaliticaAsignatura, ReporteAnaliticaDocente, ReporteAnaliticaEstudiante,
+    EstadisticasAsignatura, DistribucionLlegada
+)
+from app.application.services.analitica_asistencia_service import (
+    ColumnasAsistencia, cargar_columnas, estadisticas_asignaturas, estadisticas_estudiantes
+)
+
+
+class GetEstadisticasAsistenciaUseCase:
+    """
+    Clase que encapsula el cálculo de estadísticas de asistencia de un periodo.
+    Los datos se leen en una sola pasada por lotes y se agregan en memoria (NumPy).
+    """
+
+    def __init__(self,
+                 analitica_repository: IAnaliticaAsistenciaRepository,
+                 asignatura_repository: IAsignaturaRepository):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.analitica_repository = analitica_repository
+        self.asignatura_repository = asignatura_repository
+
+    @staticmethod
+    def _periodo(desde: Optional[datetime], hasta: Optional[datetime]) -> Tuple[datetime, datetime]:
+        hasta = hasta or datetime.utcnow()
+        desde = desde or hasta - timedelta(days=settings.ANALITICA_PERIODO_DIAS)
+        return desde, hasta
+
+    async def _cargar(self, id_asignaturas: List[int], desde: datetime, hasta: datetime,
+                      id_estudiante: Optional[int] = None) -> ColumnasAsistencia:
+        lotes = self.analitica_repository.iter_lotes(
+            id_asignaturas, desde, hasta,
+            id_estudiante=id_estudiante,
+            tam_lote=settings.ANALITICA_TAM_LOTE
+        )
+        return await cargar_columnas(lotes)
+
+    async def por_asignatura(self, id_asignatura: int, docente_id: int,
+                             desde: Optional[datetime] = None,
+                             hasta: Optional[datetime] = None) -> ReporteAnaliticaAsignatura:
+        """Estadísticas de una asignatura del docente, con detalle por estudiante."""
+        if not await self.asignatura_repository.docente_owns_asignatura(docente_id, id_asignatura):
+            raise ForbiddenException(detail="El docente no tiene permiso para ver esta asignatura.")
+
+        desde, hasta = self._periodo(desde, hasta)
+        cols = await self._cargar([id_asignatura], desde, hasta)
+
+        asignaturas = estadisticas_asignaturas(cols, settings.ANALITICA_UMBRAL_RIESGO, settings.ANALITICA_MIN_REGISTROS)
+        nombres = await self.analitica_repository.nombres_estudiantes(list(set(cols.id_estudiante.tolist())))
+        estudiantes = estadisticas_estudiantes(
+            cols, settings.ANALITICA_UMBRAL_RIESGO, settings.ANALITICA_MIN_REGISTROS, nombres=nombres
+        )
+
+        return ReporteAnaliticaAsignatura(
+            desde=desde,
+            hasta=hasta,
+            asignatura=asignaturas[0] if asignaturas else EstadisticasAsignatura(
+                id_asignatura=id_asignatura, sesiones=0, registros=0, presentes=0, tardes=0, ausentes=0,
+                tasa_asistencia=0.0, tasa_tardanza=0.0, distribucion_llegada=DistribucionLlegada()
+            ),
+            estudiantes=estudiantes
+        )
+
+    async def por_docente(self, docente_id: int,
+                          desde: Optional[datetime] = None,
+                          hasta: Optional[datetime] = None) -> ReporteAnaliticaDocente:
+        """Resumen de todas las asignaturas del docente y sus estudiantes en riesgo."""
+        desde, hasta = self._periodo(desde, hasta)
+        asignaturas = await self.asignatura_repository.list_by_docente(docente_id)
+        cols = await self._cargar([a.id for a in asignaturas], desde, hasta)
+
+        en_riesgo = [
+            e for e in estadisticas_estudiantes(cols, settings.ANALITICA_UMBRAL_RIESGO, settings.ANALITICA_MIN_REGISTROS)
+            if e.en_riesgo
+        ]
+        nombres = await self.analitica_repository.nombres_estudiantes(list({e.id_estudiante for e in en_riesgo}))
+        for e in en_riesgo:
+            e.nombre_completo = nombres.get(e.id_estudiante)
+
+        return ReporteAnaliticaDocente(
+            desde=desde,
+            hasta=hasta,
+            asignaturas=estadisticas_asignaturas(cols, settings.ANALITICA_UMBRAL_RIESGO, settings.ANALITICA_MIN_REGISTROS),
+            estudiantes_en_riesgo=sorted(en_riesgo, key=lambda e: e.tasa_asistencia)
+        )
+
+    async def por_estudiante(self, id_estudiante: int, docente_id: int,
+                             desde: Optional[datetime] = None,
+                             hasta: Optional[datetime] = None) -> ReporteAnaliticaEstudiante:
+        """Estadísticas de un estudiante en las asignaturas del docente."""
+        desde, hasta = self._periodo(desde, hasta)
+        asignaturas = await self.asignatura_repository.list_by_docente(docente_id)
+        cols = await self._cargar([a.id for a in asignaturas], desde, hasta, id_estudiante=id_estudiante)
+
+        nombres = await self.analitica_repository.nombres_estudiantes([id_estudiante])
+        return ReporteAnaliticaEstudiante(
+            desde=desde,
+            hasta=hasta,
+            id_estudiante=id_estudiante,
+            nombre_completo=nombres.get(id_estudiante),
+            asignaturas=estadisticas_estudiantes(
+                cols, settings.ANALITICA_UMBRAL_RIESGO, settings.ANALITICA_MIN_REGISTROS, nombres=nombres
+            )
+        )
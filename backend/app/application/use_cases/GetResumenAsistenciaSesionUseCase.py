@@ -0,0 +1,44 @@
+"""
+Caso de Uso: Resumen en vivo de la asistencia de una sesión.
+"""
+
+from typing import Optional
+
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.domain.entities.registro_asistencia import ResumenAsistenciaSesion
+from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
+from app.domain.repositories.asignatura_repository import IAsignaturaRepository
+from app.application.services.contador_asistencia import ContadorAsistencia
+
+
+class GetResumenAsistenciaSesionUseCase:
+    """
+    Clase que encapsula la obtención del conteo presentes / tardes / ausentes / sin registrar
+    de una sesión. Usa el contador en memoria si está habilitado y vigente; si no, una
+    única consulta agregada (que además vuelve a sembrar el contador).
+    """
+
+    def __init__(self,
+                 registro_asistencia_repository: IRegistroAsistenciaRepository,
+                 asignatura_repository: IAsignaturaRepository,
+                 contador: Optional[ContadorAsistencia] = None):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.registro_asistencia_repository = registro_asistencia_repository
+        self.asignatura_repository = asignatura_repository
+        self.contador = contador
+
+    async def execute(self, sesion_id: int, docente_id: int) -> ResumenAsistenciaSesion:
+        resumen = self.contador.obtener(sesion_id) if self.contador else None
+        if resumen is None:
+            resumen = await self.registro_asistencia_repository.resumen_por_sesion(sesion_id)
+            if resumen is None:
+                raise NotFoundException(resource="SesionDeClase", identifier=sesion_id)
+            if self.contador:
+                self.contador.sembrar(resumen)
+
+        if not await self.asignatura_repository.docente_owns_asignatura(docente_id, resumen.id_asignatura):
+            raise ForbiddenException(detail="El docente no tiene permiso para ver esta sesión.")
+
+        return resumen
@@ -29,7 +29,11 @@ class GetSesionesActivasPorDocenteUseCase:
         1. Obtiene todas las asignaturas del docente.
         2. Extrae los IDs de esas asignaturas.
         3. Busca todas las sesiones activas asociadas a esos IDs de asignatura.
-        4. Para cada sesión, obtiene la clase programada asociada.
+        4. Asocia a cada sesión su clase programada: la que ya trae cargada la
+           sesión o, si faltara, la de una única consulta por lotes.
+
+        El número de consultas es fijo, sin importar cuántas sesiones estén abiertas
+        (el panel del docente se consulta de forma continua).
         """
 
         # 1. Obtener todas las asignaturas del docente
@@ -41,15 +45,23 @@ class GetSesionesActivasPorDocenteUseCase:
         id_asignaturas = [asignatura.id for asignatura in asignaturas_docente]
 
         # 3. Buscar todas las sesiones activas asociadas a esos IDs de asignatura
+        #    (la consulta ya carga clase_programada con su asignatura y horario)
         sesiones_activas = await self.sesion_repo.find_active_by_asignaturas(id_asignaturas)
 
-        # 4. Para cada sesión, obtener la clase programada asociada
+        # 4. Reutilizar la relación ya cargada; las que falten se piden en un solo lote
+        faltantes = [
+            (sesion.id_clase, sesion.id_horario)
+            for sesion in sesiones_activas
+            if getattr(sesion, "clase_programada", None) is None
+        ]
+        por_clave = await self.clase_programada_repo.get_many_by_keys(faltantes) if faltantes else {}
+
         result = []
         for sesion in sesiones_activas:
-            clase_programada = await self.clase_programada_repo.get_by_asignatura_and_horario(
-                sesion.id_clase, sesion.id_horario
+            clase_programada = getattr(sesion, "clase_programada", None) or por_clave.get(
+                (sesion.id_clase, sesion.id_horario)
             )
             if clase_programada: # Ensure clase_programada is found
                 result.append((sesion, clase_programada))
-        
+
         return result
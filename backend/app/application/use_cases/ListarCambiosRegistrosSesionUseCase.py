@@ -0,0 +1,68 @@
+"""
+Caso de Uso: Listar los registros de asistencia de una sesión que cambiaron desde un cursor.
+"""
+
+import time
+from contextlib import nullcontext
+from typing import Optional
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.domain.entities.registro_asistencia import CambiosRegistrosSesion
+from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
+from app.domain.repositories.asignatura_repository import IAsignaturaRepository
+from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
+from app.domain.repositories.unit_of_work import IUnitOfWork
+from app.domain.repositories.avisos_cambios import IAvisosCambiosAsistencia, ObservacionCambios
+
+
+class ListarCambiosRegistrosSesionUseCase:
+    """
+    Clase que encapsula la lógica del feed de cambios de los registros de una sesión:
+    el cliente del docente guarda el cursor de cada respuesta y solo recibe lo nuevo.
+    """
+
+    def __init__(self,
+                 sesion_repo: ISesionDeClaseRepository,
+                 asignatura_repo: IAsignaturaRepository,
+                 registro_asistencia_repository: IRegistroAsistenciaRepository,
+                 uow: IUnitOfWork,
+                 avisos: Optional[IAvisosCambiosAsistencia] = None,
+                 intervalo_sondeo: float = 5.0):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.sesion_repo = sesion_repo
+        self.asignatura_repo = asignatura_repo
+        self.registro_asistencia_repository = registro_asistencia_repository
+        self.uow = uow
+        self.avisos = avisos
+        self.intervalo_sondeo = intervalo_sondeo
+
+    async def execute(self, sesion_id: int, docente_id: int, cursor: Optional[str] = None,
+                      espera: float = 0.0) -> CambiosRegistrosSesion:
+        """
+        Retorna los registros creados o modificados desde `cursor` (sin cursor, todos).
+
+        Con `espera` > 0 y sin cambios, retiene la petición hasta que llegue un
+        cambio o pasen `espera` segundos (long-polling). Mientras espera no ocupa
+        una conexión del pool: la transacción de lectura se cierra entre consultas.
+        """
+        sesion = await self.sesion_repo.get_by_id(sesion_id)
+        if not sesion:
+            raise NotFoundException(resource="SesionDeClase", identifier=sesion_id)
+        if not await self.asignatura_repo.docente_owns_asignatura(docente_id, sesion.id_clase):
+            raise ForbiddenException(detail="El docente no tiene permiso para ver esta sesión.")
+
+        limite = time.monotonic() + espera
+        observar = self.avisos.observar(sesion_id) if self.avisos else nullcontext(ObservacionCambios())
+        with observar as observacion:
+            while True:
+                # Armada antes de consultar: un cambio confirmado durante la consulta también despierta
+                observacion.reiniciar()
+                cambios = await self.registro_asistencia_repository.list_cambios_desde(sesion_id, cursor)
+                restante = limite - time.monotonic()
+                if cambios.items or restante <= 0:
+                    return cambios
+
+                cursor = cambios.cursor
+                await self.uow.rollback()
+                await observacion.esperar(min(restante, self.intervalo_sondeo))
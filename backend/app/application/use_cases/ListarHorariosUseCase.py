@@ -1,15 +1,16 @@
 """
-Caso de Uso: Listar todos los Horarios.
+Caso de Uso: Listar los Horarios (paginados por cursor).
 """
 
-from typing import List
+from typing import Optional
 from app.domain.entities.horario import Horario
+from app.domain.entities.pagina import Pagina
 from app.domain.repositories.horario_repository import IHorarioRepository
 
 
 class ListarHorariosUseCase:
     """
-    Clase que encapsula la lógica para listar todos los horarios.
+    Clase que encapsula la lógica para listar los horarios.
     """
 
     def __init__(self, horario_repository: IHorarioRepository):
@@ -18,8 +19,8 @@ class ListarHorariosUseCase:
         """
         self.horario_repository = horario_repository
 
-    async def execute(self) -> List[Horario]:
+    async def execute(self, limite: int, cursor: Optional[str] = None) -> Pagina[Horario]:
         """
-        Ejecuta la lógica del caso de uso para listar horarios.
+        Ejecuta la lógica del caso de uso para listar una página de horarios.
         """
-        return await self.horario_repository.list_all()
+        return await self.horario_repository.list_all(limite, cursor)
@@ -0,0 +1,39 @@
+"""
+Caso de Uso: Listar los registros de asistencia de una sesión (paginados por cursor).
+"""
+
+from typing import Optional
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.registro_asistencia import RegistroAsistencia
+from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
+from app.domain.repositories.asignatura_repository import IAsignaturaRepository
+from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
+
+
+class ListarRegistrosSesionUseCase:
+    """
+    Clase que encapsula la lógica para listar los registros de asistencia de una sesión
+    del docente.
+    """
+
+    def __init__(self,
+                 sesion_repo: ISesionDeClaseRepository,
+                 asignatura_repo: IAsignaturaRepository,
+                 registro_asistencia_repository: IRegistroAsistenciaRepository):
+        """
+        Inicializa el caso de uso con sus dependencias (inyectadas).
+        """
+        self.sesion_repo = sesion_repo
+        self.asignatura_repo = asignatura_repo
+        self.registro_asistencia_repository = registro_asistencia_repository
+
+    async def execute(self, sesion_id: int, docente_id: int, limite: int,
+                      cursor: Optional[str] = None) -> Pagina[RegistroAsistencia]:
+        sesion = await self.sesion_repo.get_by_id(sesion_id)
+        if not sesion:
+            raise NotFoundException(resource="SesionDeClase", identifier=sesion_id)
+        if not await self.asignatura_repo.docente_owns_asignatura(docente_id, sesion.id_clase):
+            raise ForbiddenException(detail="El docente no tiene permiso para ver esta sesión.")
+
+        return await self.registro_asistencia_repository.list_by_sesion(sesion_id, limite, cursor)
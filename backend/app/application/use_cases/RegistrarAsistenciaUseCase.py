@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
+from typing import Optional
 from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
 from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
 from app.domain.repositories.estudiante_repository import IEstudianteRepository
 from app.domain.repositories.inscripcion_repository import IInscripcionRepository
 from app.domain.entities.registro_asistencia import RegistroAsistencia, EstadoAsistencia, RegistroAsistenciaCreate
 from app.domain.entities.sesion_de_clase import EstadoSesion
+from app.application.services.contador_asistencia import ContadorAsistencia
 from app.core.exceptions import NotFoundException, ValidationException
 
 class RegistrarAsistenciaUseCase:
@@ -12,13 +14,16 @@ class RegistrarAsistenciaUseCase:
                  registro_asistencia_repository: IRegistroAsistenciaRepository,
                  sesion_de_clase_repository: ISesionDeClaseRepository,
                  estudiante_repository: IEstudianteRepository,
-                 inscripcion_repository: IInscripcionRepository):
+                 inscripcion_repository: IInscripcionRepository,
+                 contador: Optional[ContadorAsistencia] = None):
         self.registro_asistencia_repository = registro_asistencia_repository
         self.sesion_de_clase_repository = sesion_de_clase_repository
         self.estudiante_repository = estudiante_repository
         self.inscripcion_repository = inscripcion_repository
+        self.contador = contador
 
-    async def execute(self, codigo_rfid: str) -> RegistroAsistencia:
+    async def execute(self, codigo_rfid: str, hora_registro: Optional[datetime] = None) -> RegistroAsistencia:
+        # hora_registro: hora original del tap (p. ej. al reenviarlo desde el spool); por defecto, ahora
         # 1. Buscar estudiante por RFID
         estudiante = await self.estudiante_repository.get_by_rfc_uid(codigo_rfid)
         if not estudiante:
@@ -31,9 +36,15 @@ class RegistrarAsistenciaUseCase:
 
         # 3. Encontrar la sesión única en progreso para las asignaturas del estudiante
         ids_asignaturas = [inscripcion.id_clase for inscripcion in inscripciones]
-        sesiones_activas = await self.sesion_de_clase_repository.find_active_by_asignaturas(ids_asignaturas)
-
-        sesiones_en_progreso = [s for s in sesiones_activas if s.estado == EstadoSesion.EN_PROGRESO]
+        if hora_registro is not None:
+            # Con la hora del tap, la sesión es la que estaba en curso entonces: un tap reenviado
+            # desde el spool no debe caer en la clase siguiente ni rechazarse porque la suya ya cerró
+            sesiones_en_progreso = await self.sesion_de_clase_repository.find_en_curso_by_asignaturas(
+                ids_asignaturas, hora_registro
+            )
+        else:
+            sesiones_activas = await self.sesion_de_clase_repository.find_active_by_asignaturas(ids_asignaturas)
+            sesiones_en_progreso = [s for s in sesiones_activas if s.estado == EstadoSesion.EN_PROGRESO]
 
         if not sesiones_en_progreso:
             raise ValidationException("No hay ninguna sesión de clase en progreso para este estudiante.")
@@ -50,7 +61,7 @@ class RegistrarAsistenciaUseCase:
             raise ValidationException("El estudiante ya tiene un registro de asistencia para esta sesión.")
 
         # 5. Determinar estado de asistencia (Presente o Tarde)
-        hora_actual = datetime.utcnow()
+        hora_actual = hora_registro or datetime.utcnow()
         limite_tardanza = sesion.hora_inicio + timedelta(minutes=15)
         estado = EstadoAsistencia.PRESENTE if hora_actual <= limite_tardanza else EstadoAsistencia.TARDE
 
@@ -59,7 +70,13 @@ class RegistrarAsistenciaUseCase:
             id_sesion_clase=id_sesion,
             id_estudiante=estudiante.id,
             hora_registro=hora_actual,
-            estado_asistencia=estado
+            estado_asistencia=estado,
+            fecha_sesion=sesion.hora_inicio
         )
-        
-        return await self.registro_asistencia_repository.create(create_payload)
\ No newline at end of file
+        registro = await self.registro_asistencia_repository.create(create_payload)
+
+        # 7. Actualizar el resumen en memoria de la sesión (si está habilitado)
+        if self.contador:
+            self.contador.registrar(id_sesion, None, estado)
+
+        return registro
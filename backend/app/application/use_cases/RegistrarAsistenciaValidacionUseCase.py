@@ -1,13 +1,14 @@
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Optional, Tuple
 from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
 from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
 from app.domain.repositories.estudiante_repository import IEstudianteRepository
-from app.domain.repositories.clase_programada_repository import IClaseProgramadaRepository
+from app.domain.repositories.precarga import IPrecargador
 from app.domain.entities.registro_asistencia import RegistroAsistencia, EstadoAsistencia, RegistroAsistenciaUpdate, RegistroAsistenciaCreate
 from app.domain.entities.sesion_de_clase import EstadoSesion, SesionDeClase
 from app.domain.entities.clase_programada import ClaseProgramada
 from app.domain.entities.estudiante import Estudiante
+from app.application.services.contador_asistencia import ContadorAsistencia
 from app.core.exceptions import NotFoundException, ValidationException
 
 class RegistrarAsistenciaValidacionUseCase:
@@ -15,15 +16,24 @@ class RegistrarAsistenciaValidacionUseCase:
                  registro_asistencia_repository: IRegistroAsistenciaRepository,
                  sesion_de_clase_repository: ISesionDeClaseRepository,
                  estudiante_repository: IEstudianteRepository,
-                 clase_programada_repository: IClaseProgramadaRepository):
+                 precargador: IPrecargador,
+                 contador: Optional[ContadorAsistencia] = None):
         self.registro_asistencia_repository = registro_asistencia_repository
         self.sesion_de_clase_repository = sesion_de_clase_repository
         self.estudiante_repository = estudiante_repository
-        self.clase_programada_repository = clase_programada_repository
+        self.precargador = precargador
+        self.contador = contador
 
     async def execute(self, id_sesion: int, codigo_rfid: str) -> Tuple[RegistroAsistencia, Estudiante, ClaseProgramada, SesionDeClase]:
+        # Las tres lecturas son independientes entre sí (el registro se busca por el UID):
+        # se envían juntas y la latencia con la BD se paga una vez
+        sesion, estudiante, registro_asistencia = await self.precargador.precargar(
+            self.sesion_de_clase_repository.consulta_por_id(id_sesion),
+            self.estudiante_repository.consulta_por_rfc_uid(codigo_rfid),
+            self.registro_asistencia_repository.consulta_por_sesion_y_rfc_uid(id_sesion, codigo_rfid),
+        )
+
         # 1. Verificar que la sesión esté en estado VALIDACION_ABIERTA
-        sesion = await self.sesion_de_clase_repository.get_by_id(id_sesion)
         if not sesion:
             raise NotFoundException("Sesión de Clase", f"ID {id_sesion}")
         if sesion.estado != EstadoSesion.VALIDACION_ABIERTA:
@@ -31,21 +41,14 @@ class RegistrarAsistenciaValidacionUseCase:
                 f"La sesión {id_sesion} no está en estado de validación abierta. Estado actual: {sesion.estado}"
             )
 
-        # 2. Buscar estudiante por RFID
-        estudiante = await self.estudiante_repository.get_by_rfc_uid(codigo_rfid)
+        # 2. El estudiante debe existir
         if not estudiante:
             raise NotFoundException("Estudiante", f"RFID {codigo_rfid}")
 
-        # 3. Obtener la ClaseProgramada para obtener la Asignatura
-        clase_programada = await self.clase_programada_repository.get_by_asignatura_and_horario(
-            sesion.id_clase, sesion.id_horario
-        )
-        if not clase_programada:
-            raise NotFoundException("Clase Programada", f"Asignatura ID {sesion.id_clase}, Horario ID {sesion.id_horario} para Sesión {id_sesion}")
+        # 3. La ClaseProgramada (con su Asignatura) llega con la sesión
+        clase_programada = sesion.clase_programada
 
         # 4. Obtener o crear el registro de asistencia del estudiante para esta sesión
-        registro_asistencia = await self.registro_asistencia_repository.get_by_sesion_and_estudiante(id_sesion, estudiante.id)
-        
         # New check: Prevent re-validation if hora_salida already exists
         if registro_asistencia and registro_asistencia.hora_salida:
             raise ValidationException("El estudiante ya ha validado su salida para esta sesión.")
@@ -69,15 +72,21 @@ class RegistrarAsistenciaValidacionUseCase:
                 hora_salida=hora_actual,
                 estado_asistencia=target_estado
             )
-            updated_registro = await self.registro_asistencia_repository.update(registro_asistencia.id, update_payload)
+            updated_registro = await self.registro_asistencia_repository.update(registro_asistencia.id, update_payload, reciente=True)
+            if self.contador:
+                self.contador.registrar(id_sesion, registro_asistencia.estado_asistencia, target_estado)
         else:
             # Si no existe, crear uno. Asumimos que es un "tap" de entrada tardía o validación inicial
             create_payload = RegistroAsistenciaCreate(
                 id_sesion_clase=id_sesion,
                 id_estudiante=estudiante.id,
                 hora_registro=hora_actual, # Set hora_registro to current time
-                estado_asistencia=target_estado # Set initial state based on rules
+                estado_asistencia=target_estado, # Set initial state based on rules
+                fecha_sesion=sesion.hora_inicio
             )
             updated_registro = await self.registro_asistencia_repository.create(create_payload)
+            # Este camino no comprueba la inscripción: el resumen se vuelve a sembrar
+            if self.contador:
+                self.contador.descartar(id_sesion)
         
         return updated_registro, estudiante, clase_programada, sesion
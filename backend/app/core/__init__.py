@@ -1,40 +1,41 @@
 """
 Core Module - AulaTap Backend
 Contiene configuración central, seguridad, base de datos y utilidades compartidas.
+
+Las exportaciones se resuelven de forma perezosa: importar `app.core.config`
+no arrastra la carga de security, database ni FastAPI.
 """
 
-from app.core.config import settings
-from app.core.database import get_db, engine, async_session_factory
-from app.core.security import (
-    create_access_token,
-    create_refresh_token,
-    verify_password,
-    get_password_hash,
-)
-from app.core.exceptions import (
-    AulaTapException,
-    NotFoundException,
-    UnauthorizedException,
-    ForbiddenException,
-    ValidationException,
-)
+from importlib import import_module
+from typing import Any
 
-__all__ = [
+_EXPORTS = {
     # Config
-    "settings",
+    "settings": "app.core.config",
     # Database
-    "get_db",
-    "engine",
-    "async_session_factory",
+    "get_db": "app.core.database",
+    "get_engine": "app.core.database",
+    "get_session_factory": "app.core.database",
+    "get_read_db": "app.core.database",
+    "read_only_session": "app.core.database",
     # Security
-    "create_access_token",
-    "create_refresh_token",
-    "verify_password",
-    "get_password_hash",
+    "create_access_token": "app.core.security",
+    "create_refresh_token": "app.core.security",
+    "verify_password": "app.core.security",
+    "get_password_hash": "app.core.security",
     # Exceptions
-    "AulaTapException",
-    "NotFoundException",
-    "UnauthorizedException",
-    "ForbiddenException",
-    "ValidationException",
-]
\ No newline at end of file
+    "AulaTapException": "app.core.exceptions",
+    "NotFoundException": "app.core.exceptions",
+    "UnauthorizedException": "app.core.exceptions",
+    "ForbiddenException": "app.core.exceptions",
+    "ValidationException": "app.core.exceptions",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module_name), name)
@@ -0,0 +1,56 @@
+"""
+Circuit Breaker Module
+Corta el acceso a una dependencia (la base de datos) tras varios fallos seguidos.
+
+- Cerrado: las llamadas pasan; `umbral_fallos` fallos consecutivos lo abren.
+- Abierto: `permite()` es False durante `segundos_abierto`; el llamador usa su
+  alternativa (p. ej. el spool de taps) sin esperar timeouts.
+- Semiabierto: pasado ese tiempo se vuelve a intentar; un éxito lo cierra y un
+  fallo lo abre de nuevo.
+"""
+
+import enum
+import time
+
+from app.core.logger import logger
+
+
+class EstadoCircuito(str, enum.Enum):
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+
+class CircuitBreaker:
+    def __init__(self, nombre: str, umbral_fallos: int, segundos_abierto: float):
+        self.nombre = nombre
+        self.umbral_fallos = umbral_fallos
+        self.segundos_abierto = segundos_abierto
+        self.fallos_consecutivos = 0
+        self._abierto_desde: float = 0.0
+        self._abierto = False
+
+    @property
+    def estado(self) -> EstadoCircuito:
+        if not self._abierto:
+            return EstadoCircuito.CERRADO
+        if time.monotonic() - self._abierto_desde >= self.segundos_abierto:
+            return EstadoCircuito.SEMIABIERTO
+        return EstadoCircuito.ABIERTO
+
+    def permite(self) -> bool:
+        return self.estado != EstadoCircuito.ABIERTO
+
+    def registrar_exito(self) -> None:
+        if self._abierto:
+            logger.info(f"Circuito '{self.nombre}' cerrado: la dependencia responde de nuevo")
+        self.fallos_consecutivos = 0
+        self._abierto = False
+
+    def registrar_fallo(self) -> None:
+        self.fallos_consecutivos += 1
+        if self._abierto or self.fallos_consecutivos >= self.umbral_fallos:
+            if not self._abierto:
+                logger.warning(f"Circuito '{self.nombre}' abierto tras {self.fallos_consecutivos} fallos")
+            self._abierto = True
+            self._abierto_desde = time.monotonic()
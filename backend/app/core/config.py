@@ -4,7 +4,7 @@ Gestiona todas las variables de configuración del sistema usando Pydantic Setti
 """
 
 import os
-from typing import List, Optional, ClassVar
+from typing import Dict, List, Optional, ClassVar, Tuple
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
@@ -31,7 +31,11 @@ class Settings(BaseSettings):
     # ==================== SERVER SETTINGS ====================
     HOST: str = Field(default="0.0.0.0", description="Host del servidor")
     PORT: int = Field(default=8000, description="Puerto del servidor")
-    WORKERS: int = Field(default=4, description="Número de workers (producción)")
+    WORKERS: int = Field(default=4, ge=1, description="Número de workers (producción, ver servidor.py)")
+    SERVER_TIMEOUT_GRACEFUL_SEGUNDOS: int = Field(
+        default=30,
+        description="Tiempo que un worker espera a que terminen sus peticiones al detenerse o reiniciarse"
+    )
 
     # ==================== DATABASE SETTINGS ====================
     DATABASE_URL: str = Field(
@@ -42,7 +46,66 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = Field(default=10, description="Tamaño del pool de conexiones")
     DATABASE_MAX_OVERFLOW: int = Field(default=20, description="Conexiones adicionales permitidas")
     DATABASE_POOL_TIMEOUT: int = Field(default=30, description="Timeout del pool en segundos")
+    DATABASE_MAX_CONEXIONES: Optional[int] = Field(
+        default=None,
+        description="Presupuesto global de conexiones de todos los workers a cada servidor (primario y "
+                    "réplica); se reparte entre WORKERS. None = cada worker usa POOL_SIZE + MAX_OVERFLOW"
+    )
+    DATABASE_CONEXIONES_RESERVADAS: int = Field(
+        default=3,
+        description="Conexiones del presupuesto que no se reparten (migraciones, scripts, psql)"
+    )
     DATABASE_ECHO: bool = Field(default=False, description="Mostrar queries SQL en logs")
+    DATABASE_PREPARE_THRESHOLD: Optional[int] = Field(
+        default=1,
+        description="Ejecuciones de una sentencia en una conexión antes de prepararla en el servidor "
+                    "(0 = siempre; vacío = nunca, p. ej. tras un PgBouncer antiguo en modo transacción)"
+    )
+    DATABASE_PREPARED_MAX: int = Field(default=200, description="Sentencias preparadas por conexión (LRU de psycopg)")
+
+    # --- Réplica de lectura (opcional) ---
+    DATABASE_REPLICA_URL: Optional[str] = Field(
+        default=None,
+        description="URL de la réplica de lectura (None = todas las lecturas van al primario)"
+    )
+    DATABASE_REPLICA_LAG_WINDOW_SECONDS: float = Field(
+        default=2.0,
+        description="Tras una escritura, segundos durante los que las lecturas siguen yendo al primario"
+    )
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = Field(
+        default=5.0,
+        description="Retraso máximo tolerado de la réplica; por encima se lee del primario"
+    )
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="Cada cuánto se mide el retraso de la réplica"
+    )
+
+    # --- Consultas lentas ---
+    SLOW_QUERY_HABILITADO: bool = Field(default=True, description="Registrar las sentencias SQL que superan el umbral")
+    SLOW_QUERY_UMBRAL_MS: float = Field(default=200.0, description="Milisegundos a partir de los que una sentencia es lenta")
+    SLOW_QUERY_MAX_CARACTERES: int = Field(default=2000, description="Longitud máxima de la sentencia en el log")
+    SLOW_QUERY_EXPLAIN: bool = Field(
+        default=False,
+        description="Capturar EXPLAIN (ANALYZE, BUFFERS) de las SELECT lentas (vuelve a ejecutarlas)"
+    )
+    SLOW_QUERY_EXPLAIN_INTERVALO_SEGUNDOS: float = Field(
+        default=3600.0,
+        description="Cada sentencia distinta se explica como mucho una vez por intervalo"
+    )
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = Field(default=5000, description="statement_timeout del EXPLAIN")
+
+    @field_validator("DATABASE_MAX_CONEXIONES", mode="before")
+    @classmethod
+    def validate_max_conexiones(cls, v):
+        """Una cadena vacía desactiva el presupuesto global."""
+        return None if v == "" else v
+
+    @field_validator("DATABASE_PREPARE_THRESHOLD", mode="before")
+    @classmethod
+    def validate_prepare_threshold(cls, v):
+        """Una cadena vacía desactiva las sentencias preparadas."""
+        return None if v == "" else v
 
     # --- ¡CAMBIO 1: Validador actualizado a 'psycopg'! ---
     @field_validator("DATABASE_URL")
@@ -53,6 +116,16 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL debe usar el driver psycopg (postgresql+psycopg://...)")
         return v
 
+    @field_validator("DATABASE_REPLICA_URL")
+    @classmethod
+    def validate_database_replica_url(cls, v: Optional[str]) -> Optional[str]:
+        """Misma regla que DATABASE_URL; una cadena vacía desactiva la réplica."""
+        if not v:
+            return None
+        if not v.startswith("postgresql+psycopg://"):
+            raise ValueError("DATABASE_REPLICA_URL debe usar el driver psycopg (postgresql+psycopg://...)")
+        return v
+
     # ==================== SECURITY SETTINGS ====================
     API_KEY: str = Field(
         default="aulatap-super-secret-key-for-dev",
@@ -73,6 +146,19 @@ class Settings(BaseSettings):
     PASSWORD_REQUIRE_DIGIT: bool = Field(default=True)
     PASSWORD_REQUIRE_SPECIAL: bool = Field(default=True)
 
+    # --- Control de admisión del login (Argon2 es caro a propósito) ---
+    # Los intentos fallidos por cuenta se limitan con RATE_LIMIT_LOGIN_ATTEMPTS (más abajo);
+    # con REDIS_URL los contadores se comparten entre workers, si no son del proceso
+    LOGIN_VERIFICACIONES_CONCURRENTES: int = Field(
+        default=2, ge=1, description="Verificaciones Argon2 simultáneas por worker (en hilos aparte)"
+    )
+    LOGIN_ESPERA_MAX_SEGUNDOS: float = Field(
+        default=2.0, description="Espera máxima por un turno de verificación antes de responder 429"
+    )
+    LOGIN_INTENTOS_POR_IP: int = Field(default=20, description="Intentos fallidos por IP dentro de la ventana")
+    LOGIN_VENTANA_SEGUNDOS: int = Field(default=900, description="Ventana en la que se cuentan los intentos fallidos")
+    LOGIN_BLOQUEO_SEGUNDOS: int = Field(default=900, description="Duración del bloqueo al superar el límite")
+
     # ==================== CORS SETTINGS ====================
     ALLOWED_ORIGINS_STR: str = Field(
         default="*",
@@ -92,6 +178,174 @@ class Settings(BaseSettings):
     LOG_FILE: Optional[str] = Field(default=None, description="Archivo de logs (None = solo consola)")
     LOG_MAX_BYTES: int = Field(default=10485760, description="Tamaño máximo del log file (10MB)")
     LOG_BACKUP_COUNT: int = Field(default=5, description="Número de archivos de backup")
+    LOG_QUEUE_MAX_SIZE: int = Field(
+        default=10000,
+        description="Capacidad de la cola de logs (si se llena, los records se descartan en vez de bloquear)"
+    )
+    LOG_INFO_SAMPLE_RATE: float = Field(
+        default=1.0, ge=0.0, le=1.0,
+        description="Fracción de eventos INFO/DEBUG que se conservan (1.0 = sin muestreo)"
+    )
+    LOG_SAMPLED_LOGGERS_STR: str = Field(
+        default="",
+        alias="LOG_SAMPLED_LOGGERS",
+        description="Prefijos de loggers a muestrear, separados por coma (vacío = todos)"
+    )
+
+    # ==================== ASISTENCIA (PARTICIONADO / ARCHIVO) ====================
+    ASISTENCIA_VENTANA_RECIENTE_DIAS: int = Field(
+        default=180,
+        description="Lecturas de RegistroAsistencia por ID solo miran particiones de los últimos N días"
+    )
+    ASISTENCIA_RETENCION_MESES: int = Field(
+        default=12,
+        description="Meses de particiones que se mantienen en caliente antes de archivarlas"
+    )
+    ASISTENCIA_PARTICIONES_ADELANTE: int = Field(
+        default=3,
+        description="Meses futuros para los que se pre-crean particiones"
+    )
+    ASISTENCIA_CONTADOR_EN_MEMORIA: bool = Field(
+        default=False,
+        description="Mantener en memoria el resumen de las sesiones en curso (actualizado por los taps)"
+    )
+    ASISTENCIA_CONTADOR_TTL_SEGUNDOS: float = Field(
+        default=5.0,
+        description="Segundos tras los que el resumen en memoria se vuelve a sembrar desde la base de datos"
+    )
+    ASISTENCIA_CAMBIOS_ESPERA_MAX_SEGUNDOS: float = Field(
+        default=25.0,
+        description="Máximo que el feed de cambios de una sesión retiene la petición esperando un cambio (long-polling)"
+    )
+    ASISTENCIA_CAMBIOS_INTERVALO_SONDEO_SEGUNDOS: float = Field(
+        default=5.0,
+        description="Durante la espera, el feed vuelve a consultar al menos con este intervalo aunque no llegue aviso"
+    )
+    ASISTENCIA_CAMBIOS_AVISOS: bool = Field(
+        default=True,
+        description="Escuchar (LISTEN) los avisos de cambios de PostgreSQL: una conexión más por worker, fuera del pool"
+    )
+
+    # ==================== ANALÍTICA ====================
+    ANALITICA_PERIODO_DIAS: int = Field(default=180, description="Periodo por defecto de los reportes (≈ un semestre)")
+    ANALITICA_UMBRAL_RIESGO: float = Field(
+        default=0.8, ge=0.0, le=1.0,
+        description="Tasa de asistencia por debajo de la cual un estudiante se considera en riesgo"
+    )
+    ANALITICA_MIN_REGISTROS: int = Field(
+        default=3,
+        description="Registros mínimos para evaluar el riesgo de un estudiante"
+    )
+    ANALITICA_TAM_LOTE: int = Field(default=5000, description="Filas por lote al leer registros para analítica")
+
+    # ==================== INGESTA DE LECTORES (WEBSOCKET) ====================
+    INGESTA_TAM_LOTE: int = Field(default=50, description="Máximo de taps procesados en una misma transacción")
+    INGESTA_ESPERA_LOTE_MS: float = Field(
+        default=10.0,
+        description="Milisegundos que se espera a que se llene un lote antes de procesarlo"
+    )
+    INGESTA_TRABAJADORES: int = Field(default=2, description="Lotes de taps procesados en paralelo (conexiones a la BD)")
+    INGESTA_TAM_COLA: int = Field(default=1000, description="Taps en espera antes de rechazar nuevos (503)")
+    INGESTA_ESPERA_DETENER_SEGUNDOS: float = Field(
+        default=5.0,
+        description="Al detenerse (shutdown), tiempo máximo para terminar los lotes de taps en proceso"
+    )
+    INGESTA_MAX_PENDIENTES_POR_CONEXION: int = Field(
+        default=32,
+        description="Taps sin confirmar por lector; al alcanzarlo se deja de leer del socket"
+    )
+
+    # ==================== SPOOL DE TAPS (CAÍDAS DE LA BD) ====================
+    SPOOL_TAPS_HABILITADO: bool = Field(
+        default=True,
+        description="Guardar en un spool local los taps que llegan mientras la BD no está disponible"
+    )
+    SPOOL_TAPS_RUTA: str = Field(default="spool/taps.sqlite3", description="Archivo SQLite (WAL) del spool de taps")
+    SPOOL_TAPS_LOTE_REPLAY: int = Field(default=200, description="Taps del spool reenviados por lote al recuperarse la BD")
+    SPOOL_TAPS_INTERVALO_REPLAY_SEGUNDOS: float = Field(
+        default=2.0,
+        description="Cada cuánto se comprueba si hay taps en el spool para reenviar"
+    )
+    CIRCUITO_BD_UMBRAL_FALLOS: int = Field(
+        default=3,
+        description="Fallos de conexión seguidos que abren el circuito de la BD"
+    )
+    CIRCUITO_BD_SEGUNDOS_ABIERTO: float = Field(
+        default=10.0,
+        description="Segundos con el circuito abierto antes de volver a intentar la BD"
+    )
+
+    # ==================== PAGINACIÓN ====================
+    PAGINACION_LIMITE_DEFECTO: int = Field(default=50, description="Elementos por página si el cliente no indica 'limite'")
+    PAGINACION_LIMITE_MAXIMO: int = Field(default=200, description="Máximo de elementos por página")
+
+    # ==================== EVENT LOOP ====================
+    EVENT_LOOP_MONITOR_HABILITADO: bool = Field(default=True, description="Medir el retraso del event loop")
+    EVENT_LOOP_INTERVALO_MS: float = Field(default=500.0, description="Cada cuánto se mide el retraso del event loop")
+    EVENT_LOOP_UMBRAL_BLOQUEO_MS: float = Field(
+        default=100.0,
+        description="Retraso a partir del cual el event loop se considera bloqueado"
+    )
+    EVENT_LOOP_CAPTURAR_PILA: bool = Field(
+        default=False,
+        description="Registrar la pila de lo que bloquea el loop también fuera de DEBUG (un hilo vigilante)"
+    )
+
+    # ==================== SALUD (/health/live, /health/ready) ====================
+    HEALTH_INTERVALO_SONDA_SEGUNDOS: float = Field(
+        default=5.0, description="Cada cuánto la tarea de fondo mide la latencia de la BD (y de Redis)"
+    )
+    HEALTH_TIMEOUT_SONDA_SEGUNDOS: float = Field(default=2.0, description="Timeout de cada sonda")
+    HEALTH_LATENCIA_MAX_MS: float = Field(
+        default=500.0, description="Latencia de la sonda por encima de la que el worker deja de estar listo"
+    )
+    HEALTH_SATURACION_POOL_MAX: float = Field(
+        default=0.9, description="Fracción del pool en uso a partir de la que el worker deja de estar listo"
+    )
+    HEALTH_LAG_EVENT_LOOP_MAX_MS: float = Field(
+        default=500.0, description="Lag del event loop a partir del que el worker deja de estar listo"
+    )
+
+    # ==================== PROFILING (PYINSTRUMENT, OPCIONAL) ====================
+    PROFILING_HABILITADO: bool = Field(default=False, description="Instalar el middleware de perfilado (extra 'profiling')")
+    PROFILING_FRACCION_MUESTREO: float = Field(
+        default=0.0, ge=0.0, le=1.0,
+        description="Fracción de peticiones HTTP perfiladas (0 = solo las que traen X-Profile-Token)"
+    )
+    PROFILING_FRACCION_POR_RUTA: Dict[str, float] = Field(
+        default={},
+        description='Fracción por plantilla de ruta, ej. {"/api/v1/sesiones/{id_sesion}/cerrar": 0.2} (JSON)'
+    )
+    PROFILING_TOKEN: Optional[str] = Field(
+        default=None,
+        description="Valor del header X-Profile-Token que fuerza el perfilado de una petición"
+    )
+    PROFILING_INTERVALO_MS: float = Field(default=1.0, description="Intervalo de muestreo de la pila en milisegundos")
+    PROFILING_FORMATO: str = Field(default="speedscope", pattern="^(speedscope|html)$", description="speedscope|html")
+    PROFILING_DIRECTORIO: str = Field(default="profiles", description="Directorio donde se guardan los perfiles")
+    PROFILING_MAX_ARCHIVOS_POR_RUTA: int = Field(default=20, description="Perfiles conservados por ruta (los más recientes)")
+    PROFILING_MAX_CONCURRENTES: int = Field(default=1, description="Peticiones perfiladas a la vez")
+
+    # ==================== TRABAJOS EN SEGUNDO PLANO ====================
+    TRABAJOS_CONCURRENCIA: int = Field(
+        default=2,
+        ge=0,
+        description="Workers de trabajos de cada proceso (0: este proceso solo encola, no ejecuta)"
+    )
+    TRABAJOS_INTERVALO_SEGUNDOS: float = Field(
+        default=5.0,
+        description="Cada cuánto un worker desocupado busca trabajos (los encolados en el mismo proceso empiezan ya)"
+    )
+    TRABAJOS_RESERVA_SEGUNDOS: float = Field(
+        default=60.0,
+        description="Caducidad de la reserva de un trabajo; el worker la renueva mientras lo ejecuta"
+    )
+    TRABAJOS_MAX_INTENTOS: int = Field(default=3, description="Intentos de un trabajo antes de quedar 'Fallido'")
+    TRABAJOS_REINTENTO_BASE_SEGUNDOS: float = Field(
+        default=10.0,
+        description="Espera antes del primer reintento; se multiplica por TRABAJOS_REINTENTO_FACTOR en cada siguiente"
+    )
+    TRABAJOS_REINTENTO_FACTOR: float = Field(default=2.0)
 
     # ... (El resto de tus settings que estaban bien) ...
     REDIS_URL: Optional[str] = Field(default=None)
@@ -107,14 +361,42 @@ class Settings(BaseSettings):
     SYNC_BATCH_MAX_SIZE: int = Field(default=100)
     SYNC_RETRY_MAX_ATTEMPTS: int = Field(default=3)
     SYNC_RETRY_BACKOFF_FACTOR: int = Field(default=2)
+    SYNC_RETRY_BASE_SEGUNDOS: float = Field(
+        default=30.0,
+        description="Espera antes del primer reintento de un mensaje; se multiplica por "
+                    "SYNC_RETRY_BACKOFF_FACTOR en cada reintento siguiente"
+    )
+    SYNC_INTERVALO_SEGUNDOS: float = Field(
+        default=5.0,
+        description="Cada cuánto el procesador de la bandeja de salida busca mensajes pendientes"
+    )
+    SYNC_RESERVA_SEGUNDOS: float = Field(
+        default=120.0,
+        description="Tiempo que un lote queda reservado para un worker; debe superar el timeout del envío"
+    )
     SMTP_HOST: Optional[str] = Field(default=None)
     SMTP_PORT: int = Field(default=587)
     SMTP_USER: Optional[str] = Field(default=None)
     SMTP_PASSWORD: Optional[str] = Field(default=None)
     SMTP_FROM_EMAIL: str = Field(default="noreply@aulatap.edu.co")
+    SMTP_TIMEOUT_SEGUNDOS: float = Field(default=30.0, description="Timeout de cada operación SMTP")
+    SMTP_MAX_CONEXIONES: int = Field(
+        default=4,
+        description="Conexiones SMTP que mantiene cada worker (máximo de correos enviándose a la vez)"
+    )
+    AVISOS_CORREO_HORA_RESUMEN: int = Field(
+        default=18, ge=0, le=23,
+        description="Hora local a la que sale el resumen diario de ausencias y llegadas tarde"
+    )
+    AVISOS_CORREO_ZONA_HORARIA: str = Field(
+        default="America/Bogota",
+        description="Zona horaria del resumen diario (define el día y la hora de envío)"
+    )
     SAP_API_URL: Optional[str] = Field(default=None)
     SAP_CLIENT_ID: Optional[str] = Field(default=None)
     SAP_CLIENT_SECRET: Optional[str] = Field(default=None)
+    SAP_TIMEOUT_SEGUNDOS: float = Field(default=30.0, description="Timeout de cada petición a SAP")
+    SAP_MAX_CONEXIONES: int = Field(default=4, description="Conexiones HTTP a SAP que mantiene cada worker")
     SENTRY_DSN: Optional[str] = Field(default=None)
     PROMETHEUS_ENABLED: bool = Field(default=False)
 
@@ -136,6 +418,13 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.ALLOWED_ORIGINS_STR.split(",")]
 
+    @property
+    def LOG_SAMPLED_LOGGERS(self) -> List[str]:
+        """Parsea LOG_SAMPLED_LOGGERS_STR en una lista."""
+        if not self.LOG_SAMPLED_LOGGERS_STR:
+            return []
+        return [name.strip() for name in self.LOG_SAMPLED_LOGGERS_STR.split(",") if name.strip()]
+
     @property
     def is_development(self) -> bool:
         return self.ENVIRONMENT == "development"
@@ -144,6 +433,29 @@ class Settings(BaseSettings):
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
 
+    @property
+    def database_pool_por_worker(self) -> Tuple[int, int]:
+        """
+        (pool_size, max_overflow) de cada worker.
+
+        Con DATABASE_MAX_CONEXIONES, el presupuesto (menos las reservadas) se reparte
+        entre WORKERS: pool_size + max_overflow de un worker nunca supera su parte,
+        así que WORKERS procesos juntos no pasan de max_connections. La conexión de
+        los avisos de cambios (ASISTENCIA_CAMBIOS_AVISOS) sale de la parte del worker.
+        """
+        if self.DATABASE_MAX_CONEXIONES is None:
+            return self.DATABASE_POOL_SIZE, self.DATABASE_MAX_OVERFLOW
+        por_worker = (self.DATABASE_MAX_CONEXIONES - self.DATABASE_CONEXIONES_RESERVADAS) // self.WORKERS
+        if self.ASISTENCIA_CAMBIOS_AVISOS:
+            por_worker -= 1
+        if por_worker < 1:
+            raise ValueError(
+                f"DATABASE_MAX_CONEXIONES={self.DATABASE_MAX_CONEXIONES} (con "
+                f"{self.DATABASE_CONEXIONES_RESERVADAS} reservadas) no alcanza para {self.WORKERS} workers"
+            )
+        pool_size = min(self.DATABASE_POOL_SIZE, por_worker)
+        return pool_size, min(self.DATABASE_MAX_OVERFLOW, por_worker - pool_size)
+
     # --- ¡CAMBIO 2: Propiedad sync actualizada a 'psycopg'! ---
     @property
     def database_url_sync(self) -> str:
@@ -159,6 +471,19 @@ def get_settings() -> Settings:
     return Settings()
 
 
-# Exportar singleton
-settings = get_settings()
+class _LazySettings:
+    """
+    Proxy de Settings que difiere la lectura del entorno/.env hasta el
+    primer acceso a un atributo (no al importar el módulo).
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+# Exportar singleton (perezoso)
+settings: Settings = _LazySettings()  # type: ignore[assignment]
 
@@ -1,35 +1,45 @@
 """
 Database Module
 Configuración de SQLAlchemy con soporte asíncrono (psycopg).
+
+El engine y la session factory se crean de forma perezosa (en el `lifespan`
+de la aplicación o en el primer uso), no al importar este módulo.
+
+Si `DATABASE_REPLICA_URL` está configurada, las lecturas declaradas como
+read-only (`get_read_db` / `read_only_session`) se envían a la réplica,
+con fallback al primario justo después de una escritura del mismo cliente
+o si la réplica va retrasada.
 """
 
-from typing import AsyncGenerator, Optional, Dict, Any
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, AsyncIterator, Optional, Dict, Any
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
     AsyncEngine,
 )
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
 from app.core.logger import logger
-
-# ==================== BASE DECLARATIVE ====================
-
-# Importar la Base de la capa de persistencia (la misma que usa Alembic)
-try:
-    from app.infrastructure.persistence.models.base import Base
-except ImportError:
-    logger.warning("No se pudo importar 'Base' desde 'infrastructure'. Creando una Base declarativa genérica.")
-    logger.warning("Esto es normal si solo se prueba el 'core', pero fallará con 'autogenerate' de Alembic.")
-    Base = declarative_base()
+from app.core.slow_query import instalar_detector_consultas_lentas
 
 
-# ==================== ENGINE CONFIGURATION (CORREGIDO) ====================
+# ==================== ENGINE CONFIGURATION ====================
 
-def get_engine() -> AsyncEngine:
+def _create_engine(url: str, label: str = "primary") -> AsyncEngine:
     """
     Crea y configura el async engine de SQLAlchemy.
     Pasa los argumentos del pool solo si se usa QueuePool (producción).
@@ -39,45 +49,343 @@ def get_engine() -> AsyncEngine:
     engine_args: Dict[str, Any] = {
         "echo": settings.DATABASE_ECHO,
         "pool_pre_ping": True,
+        # psycopg prepara en el servidor las sentencias que se repiten en una conexión:
+        # las consultas preconstruidas de los repositorios se planifican una sola vez
+        "connect_args": {"prepare_threshold": settings.DATABASE_PREPARE_THRESHOLD},
     }
 
     # Configuración del pool basada en el entorno
     if settings.is_development:
         engine_args["poolclass"] = NullPool
     else:
-        # Solo en producción (QueuePool) pasamos los argumentos de tamaño
-        engine_args["poolclass"] = QueuePool
-        engine_args["pool_size"] = settings.DATABASE_POOL_SIZE
-        engine_args["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
+        # Solo en producción (QueuePool) pasamos los argumentos de tamaño, ya
+        # repartidos entre los workers (ver Settings.database_pool_por_worker)
+        pool_size, max_overflow = settings.database_pool_por_worker
+        engine_args["poolclass"] = AsyncAdaptedQueuePool  # QueuePool no admite engines asyncio
+        engine_args["pool_size"] = pool_size
+        engine_args["max_overflow"] = max_overflow
         engine_args["pool_timeout"] = settings.DATABASE_POOL_TIMEOUT
 
     # Crear el engine
     engine = create_async_engine(
-        settings.DATABASE_URL,
+        url,
         **engine_args
     )
+    event.listen(engine.sync_engine, "connect", _configurar_conexion)
+    instalar_detector_consultas_lentas(engine)
 
     try:
-        db_url_safe = settings.DATABASE_URL.split('@')[1]
-        logger.info(f"Database engine created: {db_url_safe}")
+        db_url_safe = url.split('@')[1]
+        logger.info(f"Database engine created ({label}): {db_url_safe}")
     except Exception:
-        logger.info("Database engine created.")
+        logger.info(f"Database engine created ({label}).")
+    if not settings.is_development:
+        presupuesto = (
+            f"presupuesto {settings.DATABASE_MAX_CONEXIONES} conexiones "
+            f"({settings.DATABASE_CONEXIONES_RESERVADAS} reservadas) / {settings.WORKERS} workers"
+            if settings.DATABASE_MAX_CONEXIONES is not None else "sin presupuesto global"
+        )
+        logger.info(
+            f"Pool del worker {os.getpid()} ({label}): pool_size={engine_args['pool_size']} "
+            f"max_overflow={engine_args['max_overflow']} timeout={engine_args['pool_timeout']}s; {presupuesto}"
+        )
 
     return engine
 
 
-# Singleton del engine
-engine = get_engine()
+def _configurar_conexion(dbapi_connection, connection_record) -> None:
+    """Listener `connect`: ajusta cada conexión nueva de psycopg."""
+    dbapi_connection.driver_connection.prepared_max = settings.DATABASE_PREPARED_MAX
+
+
+# Singletons perezosos (se crean en el primer uso o en el lifespan)
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_replica_engine: Optional[AsyncEngine] = None
+_read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Retorna el engine singleton, creándolo en la primera llamada.
+    """
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(settings.DATABASE_URL)
+        event.listen(_engine.sync_engine, "after_cursor_execute", _track_primary_write)
+    return _engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """
+    Retorna el engine de la réplica de lectura, o None si no está configurada.
+    """
+    global _replica_engine
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        _replica_engine = _create_engine(settings.DATABASE_REPLICA_URL, label="replica")
+    return _replica_engine
+
 
 # ==================== SESSION FACTORY ====================
 
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+def _make_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Retorna la session factory singleton, creándola en la primera llamada.
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = _make_session_factory(get_engine())
+    return _session_factory
+
+
+def get_read_session_factory() -> Optional[async_sessionmaker[AsyncSession]]:
+    """
+    Retorna la session factory de la réplica, o None si no está configurada.
+    """
+    global _read_session_factory
+    replica_engine = get_replica_engine()
+    if _read_session_factory is None and replica_engine is not None:
+        _read_session_factory = _make_session_factory(replica_engine)
+    return _read_session_factory
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Compatibilidad con `from app.core.database import engine, async_session_factory`.
+    El acceso a estos nombres crea el recurso bajo demanda.
+    """
+    if name == "engine":
+        return get_engine()
+    if name == "async_session_factory":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ==================== READ-REPLICA ROUTING ====================
+
+# Instante (epoch) de la última escritura del cliente, que devuelve en cada petición
+# para leer sus propias escrituras aunque la atienda otro worker
+COOKIE_ULTIMA_ESCRITURA = "aulatap_ultima_escritura"
+HEADER_ULTIMA_ESCRITURA = "X-Ultima-Escritura"
+
+
+class EscriturasCliente:
+    """Escrituras del cliente de la petición en curso (ver LecturaTrasEscrituraMiddleware)."""
+
+    __slots__ = ("ultima", "escribio")
+
+    def __init__(self, ultima: float = 0.0):
+        self.ultima = ultima
+        self.escribio = False
+
+
+escrituras_cliente: ContextVar[Optional[EscriturasCliente]] = ContextVar("escrituras_cliente", default=None)
+
+
+class ReplicaRouter:
+    """
+    Decide si una lectura read-only puede ir a la réplica.
+
+    - Tras una escritura del cliente en el primario, sus lecturas van al primario
+      durante una ventana (máx. entre DATABASE_REPLICA_LAG_WINDOW_SECONDS y el
+      retraso medido de la réplica), para leer las propias escrituras. Las
+      escrituras se siguen por petición (cookie/header), no por proceso.
+    - Una tarea de fondo mide el retraso de la réplica cada
+      DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS; si supera
+      DATABASE_REPLICA_MAX_LAG_SECONDS, la medición falla o es vieja, se usa el primario.
+    """
+
+    _LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self):
+        self.replica_lag: float = 0.0
+        # Hasta la primera medición las lecturas van al primario
+        self.replica_healthy: bool = False
+        self._medido_en: float = float("-inf")
+        self._tarea: Optional[asyncio.Task] = None
+
+    @property
+    def ventana(self) -> float:
+        return max(settings.DATABASE_REPLICA_LAG_WINDOW_SECONDS, self.replica_lag)
+
+    def mark_write(self) -> None:
+        estado = escrituras_cliente.get()
+        if estado is not None:
+            estado.ultima = time.time()
+            estado.escribio = True
+
+    def iniciar(self) -> None:
+        replica_engine = get_replica_engine()
+        if replica_engine is not None and self._tarea is None:
+            self._tarea = asyncio.get_running_loop().create_task(
+                self._bucle(replica_engine), name="sonda-replica"
+            )
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+        self.replica_healthy = False
+
+    async def _bucle(self, replica_engine: AsyncEngine) -> None:
+        while True:
+            await self._refresh_lag(replica_engine)
+            await asyncio.sleep(settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+
+    async def _refresh_lag(self, replica_engine: AsyncEngine) -> None:
+        try:
+            async with asyncio.timeout(settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS):
+                async with replica_engine.connect() as conn:
+                    self.replica_lag = float((await conn.execute(self._LAG_QUERY)).scalar() or 0.0)
+            self.replica_healthy = True
+        except Exception as e:
+            self.replica_healthy = False
+            logger.warning(f"Replica lag check failed, routing reads to primary: {e}")
+        self._medido_en = time.monotonic()
+
+    def use_replica(self) -> bool:
+        if get_replica_engine() is None or not self.replica_healthy:
+            return False
+        # Una medición vieja (sonda colgada o muerta) no vale como prueba de que la réplica va al día
+        if time.monotonic() - self._medido_en > 3 * settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS:
+            return False
+        if self.replica_lag > settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+            return False
+
+        estado = escrituras_cliente.get()
+        return estado is None or time.time() - estado.ultima >= self.ventana
+
+
+replica_router = ReplicaRouter()
+
+
+def _track_primary_write(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Listener del engine primario: registra el instante de cada escritura de la petición en curso."""
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        replica_router.mark_write()
+
+
+def iniciar_sonda_replica() -> None:
+    """Arranca la medición periódica del retraso de la réplica (startup). No hace nada sin réplica."""
+    replica_router.iniciar()
+
+
+async def detener_sonda_replica() -> None:
+    """Detiene la medición del retraso de la réplica (shutdown)."""
+    await replica_router.detener()
+
+
+class LecturaTrasEscrituraMiddleware:
+    """
+    Middleware ASGI que sigue las escrituras de cada cliente para `read_only_session`.
+
+    Lee el instante de su última escritura (cookie o header) al empezar la petición
+    y, si la petición escribe en el primario, devuelve el nuevo instante en la
+    respuesta. Así un cliente lee sus propias escrituras en cualquier worker, y las
+    escrituras de los demás no le quitan la réplica.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _ultima_escritura(scope: Scope) -> float:
+        cabeceras = Headers(scope=scope)
+        valor = cabeceras.get(HEADER_ULTIMA_ESCRITURA) or cookie_parser(cabeceras.get("cookie", "")).get(
+            COOKIE_ULTIMA_ESCRITURA
+        )
+        try:
+            # Un valor futuro solo alargaría la ventana del propio cliente; se acota a ahora
+            return min(float(valor), time.time()) if valor else 0.0
+        except ValueError:
+            return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = EscriturasCliente(self._ultima_escritura(scope))
+        token = escrituras_cliente.set(estado)
+
+        async def send_con_escritura(message: Message) -> None:
+            if message["type"] == "http.response.start" and estado.escribio:
+                valor = f"{estado.ultima:.3f}"
+                cookie = (
+                    f"{COOKIE_ULTIMA_ESCRITURA}={valor}; Max-Age={math.ceil(replica_router.ventana)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                    (HEADER_ULTIMA_ESCRITURA.lower().encode(), valor.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_con_escritura)
+        finally:
+            escrituras_cliente.reset(token)
+
+
+@asynccontextmanager
+async def read_only_session() -> AsyncIterator[AsyncSession]:
+    """
+    Context manager para lecturas read-only (use cases, exportaciones, reportes).
+    Usa la réplica cuando está disponible y al día; si no, el primario.
+    """
+    factory = get_read_session_factory() if replica_router.use_replica() else get_session_factory()
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+# ==================== DISPONIBILIDAD DEL PRIMARIO ====================
+
+_circuito_bd: Optional[CircuitBreaker] = None
+
+
+def get_circuito_bd() -> CircuitBreaker:
+    """
+    Circuito de la BD para los endpoints de taps (abierto, los taps van al spool
+    local). Singleton creado en la primera llamada, como el engine.
+    """
+    global _circuito_bd
+    if _circuito_bd is None:
+        _circuito_bd = CircuitBreaker(
+            "base de datos",
+            umbral_fallos=settings.CIRCUITO_BD_UMBRAL_FALLOS,
+            segundos_abierto=settings.CIRCUITO_BD_SEGUNDOS_ABIERTO
+        )
+    return _circuito_bd
+
+
+def es_fallo_de_bd(exc: BaseException) -> bool:
+    """
+    True si la excepción indica que la BD no está disponible (conexión rechazada
+    o perdida, failover, pool agotado), y no un error de la propia sentencia.
+    """
+    if isinstance(exc, (OperationalError, InterfaceError, PoolTimeoutError)):
+        return True
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, (ConnectionError, TimeoutError))
 
 
 # ==================== DEPENDENCY FOR FASTAPI ====================
@@ -87,7 +395,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     Dependency que provee una sesión de base de datos para FastAPI endpoints.
     Maneja el rollback en excepciones, pero NO hace auto-commit.
     """
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
         except Exception:
@@ -97,23 +405,55 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para endpoints de solo lectura (listados, exportaciones, dashboards).
+    Enruta a la réplica cuando es seguro hacerlo (ver ReplicaRouter).
+    """
+    async with read_only_session() as session:
+        yield session
+
+
 # ==================== DATABASE LIFECYCLE ====================
 
+def init_engine() -> AsyncEngine:
+    """
+    Crea el engine y la session factory por adelantado (llamado desde el lifespan),
+    para que la primera request no pague ese coste.
+    """
+    get_session_factory()
+    get_read_session_factory()
+    return get_engine()
+
+
 async def init_db() -> None:
     """
     Inicializa la base de datos (crear tablas si no existen).
     NOTA: En producción usar Alembic migrations en lugar de esto.
     """
-    async with engine.begin() as conn:
+    # Importar el paquete de modelos registra todas las tablas en la metadata
+    from app.infrastructure.persistence.models import Base
+
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created (if they didn't exist)")
 
 
 async def close_db() -> None:
     """
-    Cierra el engine y libera conexiones.
+    Cierra los engines y libera conexiones (si llegaron a crearse).
     """
-    await engine.dispose()
+    global _engine, _session_factory, _replica_engine, _read_session_factory
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+        _replica_engine = None
+        _read_session_factory = None
+        logger.info("Replica engine disposed")
+    if _engine is None:
+        return
+    await _engine.dispose()
+    _engine = None
+    _session_factory = None
     logger.info("Database engine disposed")
 
 
@@ -128,7 +468,7 @@ class DatabaseTransaction:
         self.session: Optional[AsyncSession] = None
 
     async def __aenter__(self) -> AsyncSession:
-        self.session = async_session_factory()
+        self.session = get_session_factory()()
         return self.session
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -142,4 +482,3 @@ class DatabaseTransaction:
                 await self.session.commit()
         finally:
             await self.session.close()
-
@@ -3,17 +3,37 @@ Dependencies Module
 FastAPI dependencies para autenticación, autorización e inyección de servicios.
 """
 
-from typing import Dict, Any, Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Dict, Any, Optional
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_token_payload, extract_user_id_from_token, oauth2_scheme
 from app.core.exceptions import UnauthorizedException, ForbiddenException
 
 from app.domain.entities.usuario import Usuario
 from app.domain.repositories.usuario_repository import IUsuarioRepository
+from app.domain.repositories.unit_of_work import IUnitOfWork
+from app.application.services.avisos_asistencia import AvisosAsistencia
 from app.infrastructure.persistence.repositories.usuario_repository_impl import UsuarioRepositoryImpl
+from app.infrastructure.persistence.repositories.bandeja_salida_repository_impl import BandejaSalidaRepositoryImpl
+from app.infrastructure.persistence.unit_of_work import SQLAlchemyUnitOfWork
+
+
+# ==================== UNIT OF WORK ====================
+
+async def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[IUnitOfWork, None]:
+    """
+    Unidad de Trabajo por request.
+
+    Comparte la sesión de `get_db` (FastAPI la cachea por request), así que los
+    repositorios de los casos de uso escriben en la misma transacción. El endpoint
+    llama a `uow.commit()` una sola vez; si no lo hace o hay una excepción, se
+    hace rollback al terminar la request.
+    """
+    async with SQLAlchemyUnitOfWork(db) as uow:
+        yield uow
 
 
 # ==================== USER AUTHENTICATION ====================
@@ -95,6 +115,35 @@ def require_role(allowed_roles: list[str]):
 
     return role_checker
 
+
+# ==================== AVISOS POR CORREO ====================
+
+async def get_avisos_asistencia(db: AsyncSession = Depends(get_db)) -> Optional[AvisosAsistencia]:
+    """Inyecta los avisos de asistencia por correo, o None si no hay SMTP_HOST configurado."""
+    if not settings.SMTP_HOST:
+        return None
+    return AvisosAsistencia(
+        BandejaSalidaRepositoryImpl(db),
+        UsuarioRepositoryImpl(db),
+        hora_resumen=settings.AVISOS_CORREO_HORA_RESUMEN,
+        zona_horaria=settings.AVISOS_CORREO_ZONA_HORARIA
+    )
+
+# ==================== PAGINACIÓN ====================
+
+def get_limite_pagina(
+    limite: Optional[int] = Query(None, ge=1, description="Tamaño de página (por defecto PAGINACION_LIMITE_DEFECTO)")
+) -> int:
+    """Tamaño de página de la request; los límites se leen de settings por request, no al importar."""
+    if limite is None:
+        return settings.PAGINACION_LIMITE_DEFECTO
+    if limite > settings.PAGINACION_LIMITE_MAXIMO:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"'limite' no puede ser mayor que {settings.PAGINACION_LIMITE_MAXIMO}."
+        )
+    return limite
+
 # ==================== REPOSITORY INJECTION ====================
 # (Comentados temporalmente para evitar ModuleNotFoundError)
 
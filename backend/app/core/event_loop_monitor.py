@@ -0,0 +1,142 @@
+"""
+Event Loop Monitor Module
+Mide el retraso (lag) del event loop y detecta qué lo bloquea.
+
+- Una tarea duerme EVENT_LOOP_INTERVALO_MS y mide cuánto tarda de más en
+  despertar: ese exceso es el tiempo que el loop estuvo ocupado con otra cosa
+  (Argon2 síncrono, validación de grafos grandes, I/O bloqueante...). Se
+  exporta como métrica.
+- Con captura de pila (DEBUG o EVENT_LOOP_CAPTURAR_PILA), un hilo vigilante
+  comprueba el latido de esa tarea; si el loop lleva más de
+  EVENT_LOOP_UMBRAL_BLOQUEO_MS sin latir, registra la pila del hilo del loop en
+  ese momento, es decir, el código que lo está bloqueando. En DEBUG además se
+  activa el modo debug de asyncio, que avisa de cada callback lento.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.health import registrar_componente, quitar_componente
+from app.core.logger import logger
+from app.core.metrics import metricas
+
+lag_actual = metricas.medidor(
+    "aulatap_event_loop_lag_segundos", "Retraso del event loop en la última medición"
+)
+lag_maximo = metricas.medidor(
+    "aulatap_event_loop_lag_maximo_segundos", "Mayor retraso del event loop desde el arranque del proceso"
+)
+bloqueos = metricas.contador(
+    "aulatap_event_loop_bloqueos_total", "Veces que el event loop superó EVENT_LOOP_UMBRAL_BLOQUEO_MS sin responder"
+)
+
+
+class MonitorEventLoop:
+    """Tarea de medición del lag más, opcionalmente, el hilo vigilante que captura la pila."""
+
+    def __init__(self, intervalo_ms: float, umbral_bloqueo_ms: float, capturar_pila: bool = False):
+        self.intervalo = intervalo_ms / 1000
+        self.umbral_bloqueo = umbral_bloqueo_ms / 1000
+        self.capturar_pila = capturar_pila
+        self._tarea: Optional[asyncio.Task] = None
+        self._vigilante: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+        self._latido = time.monotonic()
+        self._id_hilo_loop: Optional[int] = None
+
+    def iniciar(self) -> None:
+        if self._tarea is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._id_hilo_loop = threading.get_ident()
+        self._latido = time.monotonic()
+        self._tarea = loop.create_task(self._medir(), name="monitor-event-loop")
+        if self.capturar_pila:
+            self._detener.clear()
+            self._vigilante = threading.Thread(target=self._vigilar, name="vigilante-event-loop", daemon=True)
+            self._vigilante.start()
+
+    async def detener(self) -> None:
+        self._detener.set()
+        if self._vigilante is not None:
+            await asyncio.to_thread(self._vigilante.join)
+            self._vigilante = None
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+
+    @property
+    def vivo(self) -> bool:
+        return self._tarea is not None and not self._tarea.done()
+
+    async def _medir(self) -> None:
+        while True:
+            inicio = time.monotonic()
+            await asyncio.sleep(self.intervalo)
+            ahora = time.monotonic()
+            self._latido = ahora
+            lag = max(0.0, ahora - inicio - self.intervalo)
+            lag_actual.set(lag)
+            if lag > lag_maximo.valor:
+                lag_maximo.set(lag)
+            if lag >= self.umbral_bloqueo:
+                bloqueos.inc()
+                if not self.capturar_pila:
+                    logger.warning(f"Event loop bloqueado {lag * 1000:.0f} ms")
+
+    def _vigilar(self) -> None:
+        # Margen del propio intervalo: la tarea de medición duerme entre latidos
+        limite = self.intervalo + self.umbral_bloqueo
+        reportado = 0.0
+        while not self._detener.wait(self.umbral_bloqueo / 2):
+            latido = self._latido
+            sin_latir = time.monotonic() - latido
+            if sin_latir < limite or latido == reportado:
+                continue
+            reportado = latido  # Una pila por bloqueo
+            frame = sys._current_frames().get(self._id_hilo_loop)
+            if frame is None:
+                continue
+            pila = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop bloqueado más de {(sin_latir - self.intervalo) * 1000:.0f} ms; "
+                f"pila del hilo del loop:\n{pila}"
+            )
+
+
+_monitor: Optional[MonitorEventLoop] = None
+
+
+def iniciar_monitor_event_loop() -> None:
+    """Arranca el monitor (startup) si EVENT_LOOP_MONITOR_HABILITADO está activo."""
+    global _monitor
+    if not settings.EVENT_LOOP_MONITOR_HABILITADO or _monitor is not None:
+        return
+    capturar_pila = settings.DEBUG or settings.EVENT_LOOP_CAPTURAR_PILA
+    if settings.DEBUG:
+        # asyncio avisa (logger "asyncio") de cada callback que supere el umbral
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = settings.EVENT_LOOP_UMBRAL_BLOQUEO_MS / 1000
+    _monitor = MonitorEventLoop(
+        intervalo_ms=settings.EVENT_LOOP_INTERVALO_MS,
+        umbral_bloqueo_ms=settings.EVENT_LOOP_UMBRAL_BLOQUEO_MS,
+        capturar_pila=capturar_pila
+    )
+    _monitor.iniciar()
+    registrar_componente("monitor_event_loop", lambda: _monitor is not None and _monitor.vivo)
+
+
+async def detener_monitor_event_loop() -> None:
+    """Detiene el monitor (shutdown)."""
+    global _monitor
+    if _monitor is not None:
+        quitar_componente("monitor_event_loop")
+        await _monitor.detener()
+        _monitor = None
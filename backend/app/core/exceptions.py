@@ -12,6 +12,7 @@ import traceback
 from datetime import datetime
 
 from app.core.logger import logger
+from app.core.request_context import HEADER_REQUEST_ID, request_id_de
 
 
 # ==================== BASE EXCEPTION ====================
@@ -193,12 +194,14 @@ class ExternalServiceException(AulaTapException):
     Excepción para errores en servicios externos (SAP, email, etc.)
     """
 
-    def __init__(self, service_name: str, detail: str):
+    def __init__(self, service_name: str, detail: str, reintentable: bool = True):
         super().__init__(
             message=f"External service error ({service_name}): {detail}",
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             details={"service": service_name}
         )
+        # False si repetir la misma petición no puede funcionar (p. ej. el servicio la rechazó con 4xx)
+        self.reintentable = reintentable
 
 
 class DatabaseConnectionException(AulaTapException):
@@ -271,7 +274,7 @@ async def aulatap_exception_handler(request: Request, exc: AulaTapException) ->
     """
     Handler para excepciones personalizadas de AulaTap.
     """
-    request_id = request.headers.get("X-Request-ID")
+    request_id = request_id_de(request)
 
     logger.warning(
         f"AulaTap Exception: {exc.message}",
@@ -298,7 +301,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     """
     Handler para errores de validación de Pydantic (422).
     """
-    request_id = request.headers.get("X-Request-ID")
+    request_id = request_id_de(request)
 
     # Formatear errores de validación
     errors = []
@@ -333,7 +336,7 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
     """
     Handler para excepciones no capturadas (500).
     """
-    request_id = request.headers.get("X-Request-ID")
+    request_id = request_id_de(request)
 
     # Log completo del error con traceback
     logger.error(
@@ -366,7 +369,9 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
             message="Internal server error",
             details=error_detail,
             request_id=request_id
-        )
+        ),
+        # La respuesta sale por ServerErrorMiddleware, fuera de RequestIdMiddleware: el header se pone aquí
+        headers={HEADER_REQUEST_ID: request_id} if request_id else None
     )
 
 
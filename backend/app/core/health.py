@@ -0,0 +1,207 @@
+"""
+Health Module
+Estado de salud del worker para `/health/live` y `/health/ready`.
+
+Las comprobaciones de readiness no generan carga: una tarea de fondo sondea la BD
+(`SELECT 1`) y Redis (`PING`) cada HEALTH_INTERVALO_SONDA_SEGUNDOS y guarda la
+latencia; el endpoint solo lee ese resultado, lo que cuesta lo mismo con uno o
+con cien balanceadores preguntando. El resto sale de la memoria del proceso:
+- ocupación del pool de conexiones (checked out / capacidad),
+- lag del event loop (MonitorEventLoop),
+- vivacidad de los componentes de fondo registrados (reproductor del spool,
+  procesador de taps, planificadores...),
+- records de log descartados con la cola del logging llena (solo informativo).
+
+El worker deja de estar listo cuando la BD no responde o va lenta, el pool está
+casi agotado o el event loop va retrasado: el balanceador le quita tráfico antes
+de que las peticiones empiecen a agotar sus timeouts.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger, logs_descartados
+from app.core.metrics import metricas
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - dependencia opcional (extra "redis")
+    aioredis = None
+
+listo = metricas.medidor("aulatap_listo", "1 si el worker está listo para recibir tráfico (/health/ready)")
+# El registro devuelve la misma métrica que actualiza MonitorEventLoop
+lag_event_loop = metricas.medidor("aulatap_event_loop_lag_segundos", "Retraso del event loop en la última medición")
+
+
+# ==================== COMPONENTES DE FONDO ====================
+
+_componentes: Dict[str, Callable[[], bool]] = {}
+
+
+def registrar_componente(nombre: str, vivo: Callable[[], bool]) -> None:
+    """Registra una tarea de fondo; `vivo()` debe ser barato (se llama en cada readiness)."""
+    _componentes[nombre] = vivo
+
+
+def quitar_componente(nombre: str) -> None:
+    _componentes.pop(nombre, None)
+
+
+# ==================== SONDAS ====================
+
+@dataclass
+class ResultadoSonda:
+    ok: bool = False
+    latencia_ms: Optional[float] = None
+    error: Optional[str] = None
+    instante: float = field(default=0.0)  # time.monotonic() de la última medición (0 = nunca)
+
+
+class SondaDependencias:
+    """Tarea de fondo que mide la latencia de la BD (y de Redis) y guarda el último resultado."""
+
+    def __init__(self, engine: AsyncEngine, redis_url: Optional[str], intervalo: float, timeout: float):
+        self.engine = engine
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self.bd = ResultadoSonda()
+        self.redis: Optional[ResultadoSonda] = ResultadoSonda() if redis_url else None
+        self._cliente_redis = aioredis.from_url(redis_url) if redis_url and aioredis is not None else None
+        self._tarea: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.get_running_loop().create_task(self._bucle(), name="sonda-dependencias")
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+        if self._cliente_redis is not None:
+            await self._cliente_redis.aclose()
+
+    @property
+    def vivo(self) -> bool:
+        return self._tarea is not None and not self._tarea.done()
+
+    async def _bucle(self) -> None:
+        while True:
+            self.bd = await self._medir(self._sondear_bd)
+            if self.redis is not None:
+                if self._cliente_redis is None:
+                    self.redis = ResultadoSonda(error="REDIS_URL requiere el paquete 'redis'", instante=time.monotonic())
+                else:
+                    self.redis = await self._medir(self._cliente_redis.ping)
+            await asyncio.sleep(self.intervalo)
+
+    async def _sondear_bd(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _medir(self, sondear: Callable[[], Any]) -> ResultadoSonda:
+        inicio = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                await sondear()
+        except Exception as e:
+            return ResultadoSonda(ok=False, error=str(e) or type(e).__name__, instante=time.monotonic())
+        return ResultadoSonda(ok=True, latencia_ms=(time.perf_counter() - inicio) * 1000, instante=time.monotonic())
+
+
+_sonda: Optional[SondaDependencias] = None
+
+
+def iniciar_sonda_salud(engine: AsyncEngine) -> None:
+    """Arranca la sonda de dependencias (startup)."""
+    global _sonda
+    if _sonda is None:
+        _sonda = SondaDependencias(
+            engine, settings.REDIS_URL,
+            intervalo=settings.HEALTH_INTERVALO_SONDA_SEGUNDOS,
+            timeout=settings.HEALTH_TIMEOUT_SONDA_SEGUNDOS
+        )
+        _sonda.iniciar()
+
+
+async def detener_sonda_salud() -> None:
+    """Detiene la sonda (shutdown)."""
+    global _sonda
+    if _sonda is not None:
+        await _sonda.detener()
+        _sonda = None
+
+
+# ==================== READINESS ====================
+
+def _comprobar_sonda(resultado: ResultadoSonda, latencia_max_ms: float) -> Dict[str, Any]:
+    edad = time.monotonic() - resultado.instante if resultado.instante else None
+    # Un resultado viejo (sonda colgada o muerta) no vale como prueba de salud
+    reciente = edad is not None and edad <= settings.HEALTH_INTERVALO_SONDA_SEGUNDOS * 3 + settings.HEALTH_TIMEOUT_SONDA_SEGUNDOS
+    ok = resultado.ok and reciente and resultado.latencia_ms <= latencia_max_ms
+    estado: Dict[str, Any] = {
+        "ok": ok,
+        "latencia_ms": round(resultado.latencia_ms, 2) if resultado.latencia_ms is not None else None,
+        "edad_segundos": round(edad, 1) if edad is not None else None,
+    }
+    if resultado.error:
+        estado["error"] = resultado.error
+    return estado
+
+
+def _comprobar_pool(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return {"ok": True, "pool": type(pool).__name__}  # NullPool (desarrollo): sin límite
+    capacidad = pool.size() + max(pool._max_overflow, 0)
+    en_uso = pool.checkedout()
+    saturacion = en_uso / capacidad if capacidad else 1.0
+    return {
+        "ok": saturacion < settings.HEALTH_SATURACION_POOL_MAX,
+        "en_uso": en_uso,
+        "capacidad": capacidad,
+        "saturacion": round(saturacion, 3),
+    }
+
+
+def _comprobar_event_loop() -> Dict[str, Any]:
+    lag_ms = lag_event_loop.valor * 1000  # 0 si EVENT_LOOP_MONITOR_HABILITADO está desactivado
+    return {"ok": lag_ms <= settings.HEALTH_LAG_EVENT_LOOP_MAX_MS, "lag_ms": round(lag_ms, 1)}
+
+
+def estado_readiness(engine: AsyncEngine) -> Dict[str, Any]:
+    """Compone el estado de readiness a partir de resultados ya medidos (no hace I/O)."""
+    comprobaciones: Dict[str, Any] = {}
+    if _sonda is None:
+        comprobaciones["base_de_datos"] = {"ok": False, "error": "Sonda no iniciada"}
+    else:
+        comprobaciones["base_de_datos"] = _comprobar_sonda(_sonda.bd, settings.HEALTH_LATENCIA_MAX_MS)
+        if _sonda.redis is not None:
+            comprobaciones["redis"] = _comprobar_sonda(_sonda.redis, settings.HEALTH_LATENCIA_MAX_MS)
+    comprobaciones["pool"] = _comprobar_pool(engine)
+    comprobaciones["event_loop"] = _comprobar_event_loop()
+
+    componentes = {}
+    for nombre, vivo in list(_componentes.items()):
+        try:
+            componentes[nombre] = bool(vivo())
+        except Exception:
+            componentes[nombre] = False
+    comprobaciones["componentes"] = {"ok": all(componentes.values()), **componentes}
+    # Informativo: perder logs no es motivo para quitarle tráfico al worker
+    comprobaciones["logging"] = {"ok": True, "descartados": int(logs_descartados.valor)}
+
+    ok = all(c["ok"] for c in comprobaciones.values())
+    if ok != bool(listo.valor):
+        (logger.info if ok else logger.warning)(
+            "Worker listo" if ok else
+            f"Worker no listo: {', '.join(n for n, c in comprobaciones.items() if not c['ok'])}"
+        )
+    listo.set(1.0 if ok else 0.0)
+    return {"listo": ok, "comprobaciones": comprobaciones}
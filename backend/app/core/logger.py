@@ -1,17 +1,41 @@
 """
 Logging Module
 Configuración centralizada del sistema de logging.
+
+Los handlers reales (consola / archivo) corren en un hilo de fondo detrás de un
+QueueHandler: el hilo que emite el log (el event loop) solo encola el record,
+sin serializar JSON ni escribir a disco.
 """
 
+import atexit
+import copy
 import logging
+import queue
+import random
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Optional, List
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback si orjson no está instalado
+    orjson = None
 
 from app.core.config import settings
+from app.core.metrics import metricas
+from app.core.request_context import get_request_id
+
+
+# ==================== JSON ENCODING ====================
+
+def _dumps(data: dict) -> str:
+    """Serializa a JSON usando orjson si está disponible (fallback: json estándar)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return json.dumps(data, default=str)
 
 
 # ==================== CUSTOM FORMATTER ====================
@@ -24,7 +48,8 @@ class JSONFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Hora del evento (no de la serialización, que ocurre en el hilo del listener)
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -34,17 +59,19 @@ class JSONFormatter(logging.Formatter):
         }
 
         # Agregar contexto extra si existe
-        if hasattr(record, "request_id"):
+        if getattr(record, "request_id", None):
             log_data["request_id"] = record.request_id
 
         if hasattr(record, "user_id"):
             log_data["user_id"] = record.user_id
 
-        # Agregar excepción si existe
+        # Agregar excepción si existe (ya formateada por el QueueHandler, o en crudo)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
 
-        return json.dumps(log_data)
+        return _dumps(log_data)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -63,6 +90,8 @@ class ColoredFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         if record.levelname in self.COLORS:
+            # Copia: el mismo record lo reciben otros handlers (ej. archivo JSON)
+            record = copy.copy(record)
             record.levelname = (
                 f"{self.COLORS[record.levelname]}"
                 f"{record.levelname}{self.RESET}"
@@ -70,21 +99,119 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+# ==================== NON-BLOCKING PIPELINE ====================
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar solo una fracción de los eventos INFO/DEBUG de alto volumen.
+    WARNING o superior nunca se muestrea.
+
+    Args:
+        rate: Fracción de eventos a conservar (0.0 - 1.0)
+        logger_prefixes: Loggers a muestrear (vacío = todos)
+    """
+
+    def __init__(self, rate: float, logger_prefixes: Optional[List[str]] = None):
+        super().__init__()
+        self.rate = rate
+        self.logger_prefixes = tuple(logger_prefixes or ())
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1.0:
+            return True
+        if self.logger_prefixes and not record.name.startswith(self.logger_prefixes):
+            return True
+        return random.random() < self.rate
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Añade el X-Request-ID de la petición en curso a cada record.
+    Corre en el hilo emisor, donde el ContextVar de la petición es visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = get_request_id()
+        return True
+
+
+# Acumulado del proceso (sobrevive a reconfigurar el logging); se publica en /metrics
+logs_descartados = metricas.contador(
+    "aulatap_logs_descartados_total", "Records de log descartados porque la cola del logging estaba llena"
+)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloquea al emisor: si la cola está llena,
+    descarta el record y lo contabiliza en `dropped` (y en la métrica
+    aulatap_logs_descartados_total, ya que el aviso también se perdería).
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Solo se resuelve el mensaje y el traceback (barato); el formateo
+        # completo (JSON, colores) lo hacen los handlers en el hilo del listener.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            logs_descartados.inc()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """
+    Detiene el QueueListener vaciando los records pendientes.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 # ==================== LOGGER CONFIGURATION ====================
 
 def setup_logging() -> logging.Logger:
     """
     Configura el sistema de logging global.
 
+    El logger raíz solo tiene un QueueHandler; los handlers de consola/archivo
+    se ejecutan en el hilo de un QueueListener.
+
     Returns:
         Logger raíz configurado
     """
+    global _listener
+
     # Crear logger raíz
     root_logger = logging.getLogger()
     root_logger.setLevel(settings.LOG_LEVEL)
 
-    # Limpiar handlers existentes (evitar duplicados)
+    # Limpiar handlers existentes (evitar duplicados) y detener un listener previo
     root_logger.handlers.clear()
+    stop_logging()
+
+    handlers: List[logging.Handler] = []
 
     # ==================== CONSOLE HANDLER ====================
     console_handler = logging.StreamHandler(sys.stdout)
@@ -101,7 +228,7 @@ def setup_logging() -> logging.Logger:
         console_formatter = JSONFormatter()
 
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # ==================== FILE HANDLER (Opcional) ====================
     if settings.LOG_FILE:
@@ -122,7 +249,19 @@ def setup_logging() -> logging.Logger:
         file_formatter = JSONFormatter()
         file_handler.setFormatter(file_formatter)
 
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # ==================== QUEUE HANDLER + LISTENER ====================
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_MAX_SIZE)
+
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    if settings.LOG_INFO_SAMPLE_RATE < 1.0:
+        queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE, settings.LOG_SAMPLED_LOGGERS))
+    root_logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # ==================== SILENCE NOISY LOGGERS ====================
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -134,8 +273,8 @@ def setup_logging() -> logging.Logger:
 
 # ==================== APPLICATION LOGGER ====================
 
-# Configurar logging al importar el módulo
-setup_logging()
+# NOTA: setup_logging() lo invoca el punto de entrada (app.main), no la importación
+# de este módulo, para que importar el core no tenga efectos secundarios.
 
 # Logger específico de la aplicación
 logger = logging.getLogger("aulatap")
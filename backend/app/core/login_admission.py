@@ -0,0 +1,278 @@
+"""
+Login Admission Module
+Control de admisión de `/auth/login`: el coste de CPU de Argon2 no puede dejar sin
+servicio al resto de endpoints (los taps).
+
+- Un semáforo global limita las verificaciones Argon2 simultáneas del worker
+  (LOGIN_VERIFICACIONES_CONCURRENTES) y las ejecuta en hilos aparte, fuera del
+  event loop. Si no hay turno en LOGIN_ESPERA_MAX_SEGUNDOS se responde 429.
+- Contadores de intentos fallidos por cuenta (RATE_LIMIT_LOGIN_ATTEMPTS) y por IP
+  (LOGIN_INTENTOS_POR_IP) dentro de LOGIN_VENTANA_SEGUNDOS; al superarlos la
+  cuenta o la IP quedan bloqueadas LOGIN_BLOQUEO_SEGUNDOS.
+- Las cuentas e IPs bloqueadas se rechazan antes de consultar la BD y de calcular
+  ningún hash.
+
+Con REDIS_URL los contadores se guardan en Redis y los comparten todos los
+workers; si no, cada proceso tiene los suyos en memoria.
+"""
+
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitException
+from app.core.logger import logger
+from app.core.metrics import metricas
+from app.core.security import verify_password
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - dependencia opcional (extra "redis")
+    aioredis = None
+
+rechazos_bloqueo = metricas.contador(
+    "aulatap_login_rechazos_bloqueo_total", "Logins rechazados por cuenta o IP bloqueada, sin verificar el hash"
+)
+rechazos_saturacion = metricas.contador(
+    "aulatap_login_rechazos_saturacion_total", "Logins rechazados por no obtener turno de verificación a tiempo"
+)
+bloqueos_login = metricas.contador(
+    "aulatap_login_bloqueos_total", "Cuentas o IPs bloqueadas por superar los intentos fallidos"
+)
+
+
+# ==================== CONTADORES DE INTENTOS ====================
+
+class ContadorIntentos(ABC):
+    """Intentos fallidos por clave dentro de una ventana, con bloqueo al superar el límite."""
+
+    @abstractmethod
+    async def bloqueada(self, clave: str) -> Optional[float]:
+        """Segundos de bloqueo restantes de la clave, o None si no está bloqueada."""
+        pass
+
+    @abstractmethod
+    async def registrar_fallo(self, clave: str, limite: int, ventana: int, bloqueo: int) -> bool:
+        """Suma un fallo; retorna True si con él la clave queda bloqueada."""
+        pass
+
+    @abstractmethod
+    async def reiniciar(self, clave: str) -> None:
+        pass
+
+    async def cerrar(self) -> None:
+        pass
+
+
+@dataclass
+class _Intentos:
+    fallos: int
+    inicio_ventana: float
+    bloqueada_hasta: float = 0.0
+
+
+class ContadorIntentosMemoria(ContadorIntentos):
+    """Contadores del proceso (sin Redis): cada worker cuenta por separado."""
+
+    MAX_CLAVES = 100_000
+
+    def __init__(self):
+        self._claves: Dict[str, _Intentos] = {}
+
+    async def bloqueada(self, clave: str) -> Optional[float]:
+        intentos = self._claves.get(clave)
+        restante = intentos.bloqueada_hasta - time.monotonic() if intentos else 0.0
+        return restante if restante > 0 else None
+
+    async def registrar_fallo(self, clave: str, limite: int, ventana: int, bloqueo: int) -> bool:
+        ahora = time.monotonic()
+        intentos = self._claves.get(clave)
+        if intentos is None or ahora - intentos.inicio_ventana >= ventana:
+            if len(self._claves) >= self.MAX_CLAVES:
+                self._purgar(ahora, ventana)
+            intentos = self._claves[clave] = _Intentos(fallos=0, inicio_ventana=ahora)
+        intentos.fallos += 1
+        if intentos.fallos >= limite:
+            intentos.bloqueada_hasta = ahora + bloqueo
+            intentos.fallos = 0
+            intentos.inicio_ventana = ahora
+            return True
+        return False
+
+    async def reiniciar(self, clave: str) -> None:
+        intentos = self._claves.get(clave)
+        if intentos is not None and intentos.bloqueada_hasta <= time.monotonic():
+            del self._claves[clave]
+
+    def _purgar(self, ahora: float, ventana: int) -> None:
+        self._claves = {
+            clave: i for clave, i in self._claves.items()
+            if i.bloqueada_hasta > ahora or ahora - i.inicio_ventana < ventana
+        }
+
+
+class ContadorIntentosRedis(ContadorIntentos):
+    """Contadores en Redis, compartidos por todos los workers e instancias."""
+
+    # Suma el fallo, fija la ventana en el primero y, al llegar al límite, bloquea
+    _SCRIPT_FALLO = """
+    local fallos = redis.call('INCR', KEYS[1])
+    if fallos == 1 then redis.call('EXPIRE', KEYS[1], ARGV[2]) end
+    if fallos >= tonumber(ARGV[1]) then
+        redis.call('SET', KEYS[2], '1', 'EX', ARGV[3])
+        redis.call('DEL', KEYS[1])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, prefijo: str = "aulatap:login:"):
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL requiere el paquete 'redis' (pip install aulatap[redis])")
+        self._redis = aioredis.from_url(url)
+        self._prefijo = prefijo
+        self._fallo = self._redis.register_script(self._SCRIPT_FALLO)
+
+    async def bloqueada(self, clave: str) -> Optional[float]:
+        restante = await self._redis.pttl(f"{self._prefijo}bloqueo:{clave}")
+        return restante / 1000 if restante > 0 else None
+
+    async def registrar_fallo(self, clave: str, limite: int, ventana: int, bloqueo: int) -> bool:
+        bloqueada = await self._fallo(
+            keys=[f"{self._prefijo}fallos:{clave}", f"{self._prefijo}bloqueo:{clave}"],
+            args=[limite, ventana, bloqueo]
+        )
+        return bool(bloqueada)
+
+    async def reiniciar(self, clave: str) -> None:
+        await self._redis.delete(f"{self._prefijo}fallos:{clave}")
+
+    async def cerrar(self) -> None:
+        await self._redis.aclose()
+
+
+# ==================== CONTROL DE ADMISIÓN ====================
+
+class ControlAdmisionLogin:
+    """Semáforo de verificaciones más contadores de intentos por cuenta y por IP."""
+
+    def __init__(self,
+                 contador: Optional[ContadorIntentos],
+                 verificaciones_concurrentes: int,
+                 espera_max_segundos: float,
+                 intentos_por_cuenta: int,
+                 intentos_por_ip: int,
+                 ventana_segundos: int,
+                 bloqueo_segundos: int):
+        self.contador = contador  # None: sin límite de intentos (RATE_LIMIT_ENABLED=False)
+        self.espera_max_segundos = espera_max_segundos
+        self.intentos_por_cuenta = intentos_por_cuenta
+        self.intentos_por_ip = intentos_por_ip
+        self.ventana_segundos = ventana_segundos
+        self.bloqueo_segundos = bloqueo_segundos
+        self._semaforo = asyncio.Semaphore(verificaciones_concurrentes)
+
+    @staticmethod
+    def _claves(email: str, ip: Optional[str]) -> Dict[str, str]:
+        # El correo no se guarda tal cual (los contadores pueden vivir en Redis)
+        cuenta = hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+        claves = {"cuenta": f"cuenta:{cuenta}"}
+        if ip:
+            claves["ip"] = f"ip:{ip}"
+        return claves
+
+    async def comprobar(self, email: str, ip: Optional[str]) -> None:
+        """Rechaza (429) la cuenta o la IP bloqueadas, antes de cualquier trabajo."""
+        if self.contador is None:
+            return
+        for clave in self._claves(email, ip).values():
+            try:
+                restante = await self.contador.bloqueada(clave)
+            except Exception as e:  # Sin Redis el login sigue funcionando (el semáforo protege la CPU)
+                logger.warning(f"No se pudo consultar el bloqueo de login: {e}")
+                return
+            if restante is not None:
+                rechazos_bloqueo.inc()
+                raise RateLimitException(
+                    detail="Demasiados intentos de inicio de sesión fallidos. Intente más tarde.",
+                    retry_after=max(1, int(restante + 0.999))
+                )
+
+    async def verificar(self, password: str, password_hash: str) -> bool:
+        """Verifica el hash en un hilo aparte, con un turno del semáforo global."""
+        try:
+            async with asyncio.timeout(self.espera_max_segundos):
+                await self._semaforo.acquire()
+        except TimeoutError:
+            rechazos_saturacion.inc()
+            raise RateLimitException(
+                detail="Demasiados inicios de sesión en curso. Intente de nuevo en unos segundos.",
+                retry_after=1
+            )
+        # El turno se libera cuando termina el hilo, no la petición: si esta se cancela
+        # (cliente desconectado), Argon2 sigue ocupando la CPU hasta acabar
+        verificacion = asyncio.ensure_future(asyncio.to_thread(verify_password, password, password_hash))
+        verificacion.add_done_callback(self._liberar_turno)
+        return await asyncio.shield(verificacion)
+
+    def _liberar_turno(self, verificacion: asyncio.Future) -> None:
+        self._semaforo.release()
+        if not verificacion.cancelled():
+            verificacion.exception()  # Ya nadie la espera si la petición se canceló: se da por recogida
+
+    async def registrar_fallo(self, email: str, ip: Optional[str]) -> None:
+        if self.contador is None:
+            return
+        limites = {"cuenta": self.intentos_por_cuenta, "ip": self.intentos_por_ip}
+        try:
+            for tipo, clave in self._claves(email, ip).items():
+                if await self.contador.registrar_fallo(
+                    clave, limites[tipo], self.ventana_segundos, self.bloqueo_segundos
+                ):
+                    bloqueos_login.inc()
+                    logger.warning(f"Login bloqueado {self.bloqueo_segundos} s para {tipo} {clave}")
+        except Exception as e:
+            logger.warning(f"No se pudo registrar el intento de login fallido: {e}")
+
+    async def registrar_exito(self, email: str) -> None:
+        # Solo se reinicia la cuenta: una IP compartida sigue acumulando los fallos de otras cuentas
+        if self.contador is None:
+            return
+        try:
+            await self.contador.reiniciar(self._claves(email, None)["cuenta"])
+        except Exception as e:
+            logger.warning(f"No se pudo reiniciar el contador de login: {e}")
+
+
+_control: Optional[ControlAdmisionLogin] = None
+
+
+def get_control_admision_login() -> ControlAdmisionLogin:
+    """Retorna el control de admisión del proceso, creándolo en la primera llamada."""
+    global _control
+    if _control is None:
+        contador: Optional[ContadorIntentos] = None
+        if settings.RATE_LIMIT_ENABLED:
+            contador = ContadorIntentosRedis(settings.REDIS_URL) if settings.REDIS_URL else ContadorIntentosMemoria()
+        _control = ControlAdmisionLogin(
+            contador,
+            verificaciones_concurrentes=settings.LOGIN_VERIFICACIONES_CONCURRENTES,
+            espera_max_segundos=settings.LOGIN_ESPERA_MAX_SEGUNDOS,
+            intentos_por_cuenta=settings.RATE_LIMIT_LOGIN_ATTEMPTS,
+            intentos_por_ip=settings.LOGIN_INTENTOS_POR_IP,
+            ventana_segundos=settings.LOGIN_VENTANA_SEGUNDOS,
+            bloqueo_segundos=settings.LOGIN_BLOQUEO_SEGUNDOS
+        )
+    return _control
+
+
+async def cerrar_control_admision_login() -> None:
+    """Cierra la conexión a Redis de los contadores, si se llegó a crear (shutdown)."""
+    global _control
+    if _control is not None and _control.contador is not None:
+        await _control.contador.cerrar()
+    _control = None
@@ -0,0 +1,77 @@
+"""
+Metrics Module
+Registro mínimo de métricas en memoria (contadores y medidores) del proceso.
+
+Se exponen en formato de texto de Prometheus en `/metrics` cuando
+PROMETHEUS_ENABLED está activo. Sin dependencias externas: cada worker
+publica sus propios valores.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+
+class Contador:
+    """Valor monótono creciente (ej. taps reproducidos)."""
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self._valor = 0.0
+
+    def inc(self, cantidad: float = 1.0) -> None:
+        self._valor += cantidad
+
+    @property
+    def valor(self) -> float:
+        return self._valor
+
+
+class Medidor:
+    """Valor que sube y baja (ej. profundidad del spool). Puede leerse de una función."""
+
+    tipo = "gauge"
+
+    def __init__(self, nombre: str, ayuda: str, funcion: Optional[Callable[[], float]] = None):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.funcion = funcion
+        self._valor = 0.0
+
+    def set(self, valor: float) -> None:
+        self._valor = valor
+
+    @property
+    def valor(self) -> float:
+        return float(self.funcion()) if self.funcion else self._valor
+
+
+class RegistroMetricas:
+    """Colección de métricas con nombre único; registrar dos veces devuelve la misma."""
+
+    def __init__(self):
+        self._metricas: Dict[str, object] = {}
+
+    def contador(self, nombre: str, ayuda: str) -> Contador:
+        return self._metricas.setdefault(nombre, Contador(nombre, ayuda))
+
+    def medidor(self, nombre: str, ayuda: str, funcion: Optional[Callable[[], float]] = None) -> Medidor:
+        medidor = self._metricas.setdefault(nombre, Medidor(nombre, ayuda))
+        if funcion is not None:
+            medidor.funcion = funcion
+        return medidor
+
+    def valores(self) -> Dict[str, float]:
+        return {nombre: metrica.valor for nombre, metrica in self._metricas.items()}
+
+    def exportar_prometheus(self) -> str:
+        lineas: List[str] = []
+        for metrica in self._metricas.values():
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.append(f"{metrica.nombre} {metrica.valor}")
+        return "\n".join(lineas) + "\n"
+
+
+metricas = RegistroMetricas()
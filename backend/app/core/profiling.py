@@ -0,0 +1,153 @@
+"""
+Profiling Module
+Middleware ASGI de perfilado bajo demanda con pyinstrument (dependencia opcional).
+
+Perfila una fracción de las peticiones HTTP (PROFILING_FRACCION_MUESTREO, con
+fracciones por plantilla de ruta en PROFILING_FRACCION_POR_RUTA) y toda petición
+que traiga el header `X-Profile-Token` con el valor de PROFILING_TOKEN. El
+perfilador muestrea la pila (no instrumenta cada llamada) y en modo async atribuye
+el tiempo de pared de cada `await` a la línea que espera, así que también se ve el
+tiempo pasado en la BD.
+
+Cada perfil se guarda como `<PROFILING_DIRECTORIO>/<ruta>/<timestamp>_<ms>ms.<ext>`
+(speedscope o HTML) y por ruta solo se conservan los PROFILING_MAX_ARCHIVOS_POR_RUTA
+más recientes. Las peticiones no muestreadas solo pagan un `random()`, y nunca hay
+más de PROFILING_MAX_CONCURRENTES perfiles a la vez: es seguro dejarlo activo con
+fracciones bajas.
+
+Instalación: `pip install "aulatap[profiling]"` (o `pip install pyinstrument`).
+"""
+
+import asyncio
+import random
+import re
+import secrets
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logger import logger
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:  # pragma: no cover - dependencia opcional
+    Profiler = None
+
+HEADER_TOKEN = b"x-profile-token"
+_EXTENSIONES = {"speedscope": "speedscope.json", "html": "html"}
+
+
+def _nombre_de_ruta(metodo: str, plantilla: str) -> str:
+    """`GET /api/v1/sesiones/{id_sesion}/resumen` -> `GET_api_v1_sesiones_id_sesion_resumen`."""
+    return f"{metodo}_" + (re.sub(r"[^A-Za-z0-9]+", "_", plantilla).strip("_") or "raiz")
+
+
+class ProfilingMiddleware:
+    """Perfila peticiones muestreadas y escribe un archivo por petición, agrupado por ruta."""
+
+    def __init__(self,
+                 app: ASGIApp,
+                 directorio: str,
+                 fraccion: float,
+                 fraccion_por_ruta: Optional[Dict[str, float]] = None,
+                 token: Optional[str] = None,
+                 intervalo_ms: float = 1.0,
+                 formato: str = "speedscope",
+                 max_archivos_por_ruta: int = 20,
+                 max_concurrentes: int = 1):
+        self.app = app
+        self.directorio = Path(directorio)
+        self.fraccion = fraccion
+        self.fraccion_por_ruta = fraccion_por_ruta or {}
+        self.token = token.encode() if token else None
+        self.intervalo = intervalo_ms / 1000
+        self.formato = formato
+        self.max_archivos_por_ruta = max_archivos_por_ruta
+        self.max_concurrentes = max_concurrentes
+        self._activos = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._debe_perfilar(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._activos += 1
+        profiler = Profiler(interval=self.intervalo, async_mode="enabled")
+        inicio = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            self._activos -= 1
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            # La plantilla la deja en el scope el router de FastAPI al resolver la ruta
+            ruta = scope.get("route")
+            plantilla = getattr(ruta, "path", None) or "sin_ruta"
+            try:
+                await asyncio.to_thread(self._guardar, profiler, scope["method"], plantilla, duracion_ms)
+            except Exception as e:
+                logger.error(f"No se pudo guardar el perfil de {scope['method']} {plantilla}: {e}")
+
+    def _debe_perfilar(self, scope: Scope) -> bool:
+        if self._activos >= self.max_concurrentes:
+            return False
+        if self.token is not None:
+            valor = dict(scope["headers"]).get(HEADER_TOKEN)
+            if valor is not None and secrets.compare_digest(valor, self.token):
+                return True
+        fraccion = self.fraccion
+        if self.fraccion_por_ruta:
+            fraccion = self.fraccion_por_ruta.get(self._plantilla(scope), fraccion)
+        return fraccion > 0 and random.random() < fraccion
+
+    def _plantilla(self, scope: Scope) -> Optional[str]:
+        # Solo se resuelve si hay fracciones por ruta: recorre las rutas como lo hará el router
+        for ruta in scope["app"].router.routes:
+            coincidencia, _ = ruta.matches(scope)
+            if coincidencia == Match.FULL:
+                return getattr(ruta, "path", None)
+        return None
+
+    def _guardar(self, profiler, metodo: str, plantilla: str, duracion_ms: float) -> None:
+        carpeta = self.directorio / _nombre_de_ruta(metodo, plantilla)
+        carpeta.mkdir(parents=True, exist_ok=True)
+        renderer = SpeedscopeRenderer() if self.formato == "speedscope" else HTMLRenderer()
+        marca = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        archivo = carpeta / f"{marca}_{duracion_ms:.0f}ms.{_EXTENSIONES[self.formato]}"
+        archivo.write_text(profiler.output(renderer), encoding="utf-8")
+        logger.info(f"Perfil de {metodo} {plantilla} ({duracion_ms:.0f} ms) guardado en {archivo}")
+
+        # Directorio acotado: se descartan los perfiles más antiguos de la ruta
+        archivos = sorted(carpeta.iterdir(), key=lambda p: p.name)
+        for viejo in archivos[:-self.max_archivos_por_ruta]:
+            viejo.unlink(missing_ok=True)
+
+
+def configurar_profiling(app) -> None:
+    """Instala el middleware si PROFILING_HABILITADO está activo y pyinstrument disponible."""
+    if not settings.PROFILING_HABILITADO:
+        return
+    if Profiler is None:
+        logger.warning("PROFILING_HABILITADO está activo pero pyinstrument no está instalado; "
+                       "instale el extra 'profiling'")
+        return
+    app.add_middleware(
+        ProfilingMiddleware,
+        directorio=settings.PROFILING_DIRECTORIO,
+        fraccion=settings.PROFILING_FRACCION_MUESTREO,
+        fraccion_por_ruta=settings.PROFILING_FRACCION_POR_RUTA,
+        token=settings.PROFILING_TOKEN,
+        intervalo_ms=settings.PROFILING_INTERVALO_MS,
+        formato=settings.PROFILING_FORMATO,
+        max_archivos_por_ruta=settings.PROFILING_MAX_ARCHIVOS_POR_RUTA,
+        max_concurrentes=settings.PROFILING_MAX_CONCURRENTES
+    )
+    logger.info(f"Profiling activo: fracción {settings.PROFILING_FRACCION_MUESTREO}, "
+                f"perfiles en {settings.PROFILING_DIRECTORIO}")
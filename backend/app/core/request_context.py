@@ -0,0 +1,65 @@
+"""
+Request Context Module
+Id de la petición en curso, disponible fuera de los endpoints (logs, consultas lentas).
+
+`RequestIdMiddleware` toma el header `X-Request-ID` del cliente (o genera uno),
+lo guarda en un ContextVar durante la petición y lo devuelve en la respuesta.
+También queda en `request.state.request_id`: el handler de los 500 se ejecuta
+fuera del middleware, cuando el ContextVar ya se ha restablecido.
+"""
+
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HEADER_REQUEST_ID = "X-Request-ID"
+
+request_id_actual: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Id de la petición en curso, o None fuera de una petición (tareas de fondo, scripts)."""
+    return request_id_actual.get()
+
+
+def request_id_de(conexion: HTTPConnection) -> Optional[str]:
+    """
+    Id de la petición `conexion`. Para los handlers de excepciones: también vale
+    para el de los 500, que se ejecuta después de que el middleware termine.
+    """
+    return getattr(conexion.state, "request_id", None) or get_request_id()
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI que propaga X-Request-ID (HTTP y WebSocket)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        cabecera = dict(scope["headers"]).get(HEADER_REQUEST_ID.lower().encode())
+        # Se acota el valor del cliente: termina en los logs
+        request_id = cabecera.decode("latin-1")[:64] if cabecera else uuid.uuid4().hex
+        token = request_id_actual.set(request_id)
+        # El estado de la petición es compartido con los middlewares externos (ServerErrorMiddleware)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_con_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (HEADER_REQUEST_ID.lower().encode(), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_con_request_id)
+        finally:
+            request_id_actual.reset(token)
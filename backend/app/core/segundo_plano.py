@@ -0,0 +1,117 @@
+"""
+Segundo Plano Module
+Composición de los procesos de fondo del worker que arranca y detiene el lifespan:
+
+- los procesadores de la bandeja de salida (asistencia a SAP y resúmenes por correo),
+- los workers de trabajos en segundo plano y sus manejadores por tipo.
+
+Igual que `app.core.dependencies` para las requests, aquí se eligen las
+implementaciones (repositorios, emisores) de los servicios de aplicación; los
+endpoints solo encolan y avisan (`avisar_bandeja`, `avisar_trabajos`).
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_session_factory
+from app.core.dependencies import get_avisos_asistencia
+from app.domain.entities.trabajo import Trabajo
+from app.application.use_cases.CompletarCierreSesionUseCase import CompletarCierreSesionUseCase, TIPO_CIERRE_SESION
+from app.application.services.bandeja_salida_service import (
+    ProcesadorBandejaSalida, iniciar_procesador_bandeja, detener_procesador_bandeja, avisar_bandeja
+)
+from app.application.services.exportacion_sap import DESTINO_SAP
+from app.application.services.avisos_asistencia import DESTINO_CORREO, componer_resumen
+from app.application.services.trabajos_service import (
+    EjecutorTrabajos, ProgresoTrabajo, iniciar_ejecutor_trabajos, detener_ejecutor_trabajos
+)
+from app.infrastructure.integraciones.sap import crear_emisor_sap
+from app.infrastructure.integraciones.correo import crear_emisor_correo
+from app.infrastructure.persistence.repositories.sesion_de_clase_repository_impl import SesionDeClaseRepositoryImpl
+from app.infrastructure.persistence.repositories.registro_asistencia_repository_impl import RegistroAsistenciaRepositoryImpl
+from app.infrastructure.persistence.repositories.bandeja_salida_repository_impl import BandejaSalidaRepositoryImpl
+from app.infrastructure.persistence.repositories.trabajo_repository_impl import TrabajoRepositoryImpl
+
+
+# ==================== EXPORTACIÓN A SAP Y AVISOS POR CORREO ====================
+
+def _procesador_bandeja(emisor) -> ProcesadorBandejaSalida:
+    return ProcesadorBandejaSalida(
+        session_factory=get_session_factory(),
+        crear_repositorio=BandejaSalidaRepositoryImpl,
+        emisor=emisor,
+        tam_lote=settings.SYNC_BATCH_MAX_SIZE,
+        intervalo_segundos=settings.SYNC_INTERVALO_SEGUNDOS,
+        reserva_segundos=settings.SYNC_RESERVA_SEGUNDOS,
+        max_intentos=settings.SYNC_RETRY_MAX_ATTEMPTS,
+        backoff_base_segundos=settings.SYNC_RETRY_BASE_SEGUNDOS,
+        backoff_factor=settings.SYNC_RETRY_BACKOFF_FACTOR
+    )
+
+
+def iniciar_exportador_sap() -> None:
+    """Arranca el procesador de la bandeja de salida hacia SAP (startup). No hace nada sin SAP_API_URL."""
+    emisor = crear_emisor_sap()
+    if emisor is not None:
+        iniciar_procesador_bandeja(_procesador_bandeja(emisor))
+
+
+async def detener_exportador_sap() -> None:
+    """Detiene el procesador hacia SAP y cierra su cliente HTTP (shutdown)."""
+    await detener_procesador_bandeja(DESTINO_SAP)
+
+
+def iniciar_avisos_correo() -> None:
+    """Arranca el procesador de los resúmenes de asistencia por correo (startup). No hace nada sin SMTP_HOST."""
+    emisor = crear_emisor_correo(componer_resumen)
+    if emisor is not None:
+        iniciar_procesador_bandeja(_procesador_bandeja(emisor))
+
+
+async def detener_avisos_correo() -> None:
+    """Detiene el procesador de correo y cierra sus conexiones SMTP (shutdown)."""
+    await detener_procesador_bandeja(DESTINO_CORREO)
+
+
+# ==================== TRABAJOS EN SEGUNDO PLANO ====================
+
+async def completar_cierre_sesion(session: AsyncSession, trabajo: Trabajo,
+                                  progreso: ProgresoTrabajo) -> Optional[Dict[str, Any]]:
+    """
+    Manejador de los trabajos TIPO_CIERRE_SESION que encola cerrar_sesion. Se ejecuta
+    en la transacción del trabajo (la confirma el worker junto con su estado).
+    """
+    use_case = CompletarCierreSesionUseCase(
+        SesionDeClaseRepositoryImpl(session),
+        RegistroAsistenciaRepositoryImpl(session),
+        bandeja_sap=BandejaSalidaRepositoryImpl(session) if settings.SAP_API_URL else None,
+        avisos=await get_avisos_asistencia(session)
+    )
+    # La asistencia encolada sale hacia SAP en cuanto se confirme, sin esperar al intervalo
+    event.listen(session.sync_session, "after_commit", lambda _: avisar_bandeja(DESTINO_SAP), once=True)
+    return await use_case.execute(trabajo.parametros["id_sesion"], progreso)
+
+
+def iniciar_trabajos() -> None:
+    """Arranca los workers de trabajos del proceso (startup). No hace nada con TRABAJOS_CONCURRENCIA=0."""
+    if settings.TRABAJOS_CONCURRENCIA == 0:
+        return
+    iniciar_ejecutor_trabajos(EjecutorTrabajos(
+        session_factory=get_session_factory(),
+        crear_repositorio=TrabajoRepositoryImpl,
+        manejadores={TIPO_CIERRE_SESION: completar_cierre_sesion},
+        concurrencia=settings.TRABAJOS_CONCURRENCIA,
+        intervalo_segundos=settings.TRABAJOS_INTERVALO_SEGUNDOS,
+        reserva_segundos=settings.TRABAJOS_RESERVA_SEGUNDOS,
+        max_intentos=settings.TRABAJOS_MAX_INTENTOS,
+        backoff_base_segundos=settings.TRABAJOS_REINTENTO_BASE_SEGUNDOS,
+        backoff_factor=settings.TRABAJOS_REINTENTO_FACTOR
+    ))
+
+
+async def detener_trabajos() -> None:
+    """Detiene los workers de trabajos (shutdown); los trabajos en curso vuelven a la cola."""
+    await detener_ejecutor_trabajos()
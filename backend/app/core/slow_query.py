@@ -0,0 +1,206 @@
+"""
+Slow Query Module
+Detector de consultas lentas sobre los eventos `before/after_cursor_execute` del engine.
+
+A diferencia de DATABASE_ECHO (todo o nada), solo registra las sentencias que
+superan SLOW_QUERY_UMBRAL_MS, con:
+- los parámetros redactados (solo su tipo: pueden ser UIDs, correos, hashes),
+- el método de la aplicación que originó la consulta (normalmente un repositorio),
+- el id de la petición en curso (X-Request-ID).
+
+Con SLOW_QUERY_EXPLAIN activo, además captura un `EXPLAIN (ANALYZE, BUFFERS)` de
+las SELECT lentas en una tarea aparte, con otra conexión del pool y en una
+transacción de solo lectura que se descarta. Cada sentencia distinta se explica
+como mucho una vez cada SLOW_QUERY_EXPLAIN_INTERVALO_SEGUNDOS, y nunca hay más
+de un EXPLAIN en curso: el coste es acotado aunque haya muchas consultas lentas.
+"""
+
+import asyncio
+import re
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metricas
+from app.core.request_context import get_request_id
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover - siempre presente con el extra asyncio de SQLAlchemy
+    greenlet = None
+
+consultas_lentas = metricas.contador(
+    "aulatap_consultas_lentas_total", "Sentencias SQL que superaron SLOW_QUERY_UMBRAL_MS"
+)
+
+# Marca de las conexiones del propio detector (sus EXPLAIN no se vuelven a medir)
+_OPCION_IGNORAR = "aulatap_sin_deteccion_lenta"
+_PAQUETE_APP = "app."
+_PAQUETES_PROPIOS = ("app.core.",)
+
+
+# ==================== UTILIDADES ====================
+
+def _compactar(sentencia: str) -> str:
+    sentencia = re.sub(r"\s+", " ", sentencia).strip()
+    limite = settings.SLOW_QUERY_MAX_CARACTERES
+    return sentencia if len(sentencia) <= limite else sentencia[:limite] + "..."
+
+
+def _redactar(parametros: Any) -> Any:
+    """Reemplaza cada valor por su tipo: `{'codigo_rfid_1': 'str'}`."""
+    if isinstance(parametros, dict):
+        return {clave: type(valor).__name__ for clave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        if parametros and isinstance(parametros[0], (dict, list, tuple)):
+            return f"<{len(parametros)} filas>"  # executemany
+        return [type(valor).__name__ for valor in parametros]
+    return None
+
+
+def _origen() -> Optional[str]:
+    """
+    Método de la aplicación que lanzó la consulta, ej.
+    `app.infrastructure.persistence.repositories.estudiante_repository_impl.EstudianteRepositoryImpl.list_all`.
+
+    Con AsyncSession la sentencia se ejecuta en un greenlet hijo: la pila del
+    código async (repositorio, caso de uso) está en el greenlet padre.
+    """
+    frames = [sys._getframe(2)]
+    if greenlet is not None and greenlet.getcurrent().parent is not None:
+        frames.append(greenlet.getcurrent().parent.gr_frame)
+
+    primero: Optional[str] = None
+    for frame in frames:
+        while frame is not None:
+            modulo = frame.f_globals.get("__name__", "")
+            if modulo.startswith(_PAQUETE_APP) and not modulo.startswith(_PAQUETES_PROPIOS):
+                nombre = f"{modulo}.{frame.f_code.co_qualname}"
+                if ".repositories." in modulo:
+                    return nombre
+                primero = primero or nombre
+            frame = frame.f_back
+    return primero
+
+
+# ==================== DETECTOR ====================
+
+class DetectorConsultasLentas:
+    """Se engancha a un engine y registra las sentencias que superan el umbral."""
+
+    def __init__(self,
+                 engine: AsyncEngine,
+                 umbral_ms: float,
+                 explain: bool = False,
+                 explain_intervalo_segundos: float = 3600.0,
+                 explain_timeout_ms: int = 5000):
+        self.engine = engine
+        self.umbral = umbral_ms / 1000
+        self.explain = explain
+        self.explain_intervalo_segundos = explain_intervalo_segundos
+        self.explain_timeout_ms = explain_timeout_ms
+        self._explicadas: Dict[str, float] = {}
+        self._explain_en_curso = False
+        self._tareas: set[asyncio.Task] = set()
+
+    def instalar(self) -> None:
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._antes)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._despues)
+        event.listen(self.engine.sync_engine, "handle_error", self._error)
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("aulatap_inicio_consultas", []).append(time.perf_counter())
+
+    def _error(self, contexto) -> None:
+        # Si la sentencia falla no hay after_cursor_execute: se descarta su inicio para
+        # que la pila de la conexión (que vuelve al pool) no crezca. Si falló antes de
+        # before_cursor_execute la pila ya está vacía (en una conexión no se anidan)
+        conn = contexto.connection
+        inicios = conn.info.get("aulatap_inicio_consultas") if conn is not None else None
+        if inicios:
+            inicios.pop()
+
+    def _despues(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        inicios = conn.info.get("aulatap_inicio_consultas")
+        if not inicios:
+            return
+        duracion = time.perf_counter() - inicios.pop()
+        if duracion < self.umbral or conn.get_execution_options().get(_OPCION_IGNORAR):
+            return
+
+        consultas_lentas.inc()
+        request_id = get_request_id()
+        logger.warning(
+            f"Consulta lenta ({duracion * 1000:.0f} ms) [request {request_id or '-'}] "
+            f"desde {_origen() or 'desconocido'}: {_compactar(statement)} "
+            f"| parámetros: {_redactar(parameters)}",
+            extra={"request_id": request_id}
+        )
+        if self.explain and not executemany:
+            self._programar_explain(statement, parameters, request_id)
+
+    # ==================== EXPLAIN ASÍNCRONO ====================
+
+    def _programar_explain(self, statement: str, parameters: Any, request_id: Optional[str]) -> None:
+        # EXPLAIN ANALYZE ejecuta la sentencia: solo lecturas
+        if not statement.lstrip().upper().startswith("SELECT") or self._explain_en_curso:
+            return
+        ahora = time.monotonic()
+        if ahora - self._explicadas.get(statement, float("-inf")) < self.explain_intervalo_segundos:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Engine usado fuera del event loop (scripts)
+
+        if len(self._explicadas) >= 1000:
+            # Sentencias distintas acotadas: se olvidan las ya fuera del intervalo
+            self._explicadas = {
+                sentencia: instante for sentencia, instante in self._explicadas.items()
+                if ahora - instante < self.explain_intervalo_segundos
+            }
+        self._explicadas[statement] = ahora
+        self._explain_en_curso = True
+        tarea = loop.create_task(self._explicar(statement, parameters, request_id))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _explicar(self, statement: str, parameters: Any, request_id: Optional[str]) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execution_options(**{_OPCION_IGNORAR: True})
+                await conn.execute(text("SET TRANSACTION READ ONLY"))
+                await conn.execute(text(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"))
+                resultado = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or ()
+                )
+                plan = "\n".join(fila[0] for fila in resultado)
+                await conn.rollback()
+            logger.warning(
+                f"Plan de consulta lenta [request {request_id or '-'}]: {_compactar(statement)}\n{plan}",
+                extra={"request_id": request_id}
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo capturar el EXPLAIN de una consulta lenta: {e}")
+        finally:
+            self._explain_en_curso = False
+
+
+def instalar_detector_consultas_lentas(engine: AsyncEngine) -> Optional[DetectorConsultasLentas]:
+    """Engancha el detector al engine si SLOW_QUERY_HABILITADO está activo."""
+    if not settings.SLOW_QUERY_HABILITADO:
+        return None
+    detector = DetectorConsultasLentas(
+        engine,
+        umbral_ms=settings.SLOW_QUERY_UMBRAL_MS,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_intervalo_segundos=settings.SLOW_QUERY_EXPLAIN_INTERVALO_SEGUNDOS,
+        explain_timeout_ms=settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS
+    )
+    detector.instalar()
+    return detector
@@ -16,10 +16,11 @@ from .sesion_de_clase import (
 )
 from .registro_asistencia import (
     RegistroAsistencia, RegistroAsistenciaCreate, RegistroAsistenciaUpdate,
-    EstadoAsistencia
+    EstadoAsistencia, ResumenAsistenciaSesion
 )
 from .inscripcion import Inscripcion, InscripcionCreate
 from .clase_programada import ClaseProgramada, ClaseProgramadaCreate
+from .pagina import Pagina
 
 __all__ = [
     "Usuario", "UsuarioCreate", "UsuarioPublic", "UsuarioUpdate",
@@ -29,7 +30,8 @@ __all__ = [
     "SesionDeClase", "SesionDeClaseCreate", "SesionDeClaseUpdate",
     "EstadoSesion",
     "RegistroAsistencia", "RegistroAsistenciaCreate", "RegistroAsistenciaUpdate",
-    "EstadoAsistencia",
+    "EstadoAsistencia", "ResumenAsistenciaSesion",
     "Inscripcion", "InscripcionCreate",
     "ClaseProgramada", "ClaseProgramadaCreate",
+    "Pagina",
 ]
@@ -0,0 +1,38 @@
+"""
+Define la entidad de negocio 'MensajeSaliente' (bandeja de salida hacia sistemas externos).
+"""
+
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class EstadoMensaje(str, enum.Enum):
+    """Define los estados posibles de un mensaje de la bandeja de salida."""
+    PENDIENTE = "Pendiente"
+    ENVIANDO = "Enviando"  # Reservado por un procesador; vuelve a estar disponible si caduca la reserva
+    ENVIADO = "Enviado"
+    FALLIDO = "Fallido"  # Agotó los reintentos o el destino lo rechazó
+
+
+class MensajeSalienteCreate(BaseModel):
+    """Modelo para encolar un mensaje en la bandeja de salida."""
+    destino: str = Field(..., max_length=30, description="Sistema externo (p. ej. 'sap')")
+    tipo: str = Field(..., max_length=50, description="Tipo de mensaje dentro del destino")
+    clave: str = Field(..., max_length=100, description="Clave de idempotencia para el destino")
+    datos: Dict[str, Any]
+
+
+class MensajeSaliente(MensajeSalienteCreate):
+    """Modelo completo de la entidad MensajeSaliente."""
+    id: int
+    estado: EstadoMensaje = EstadoMensaje.PENDIENTE
+    intentos: int = 0
+    creado_en: datetime
+    disponible_en: datetime
+    enviado_en: Optional[datetime] = None
+    ultimo_error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
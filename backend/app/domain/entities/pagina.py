@@ -0,0 +1,14 @@
+"""
+Define la entidad genérica 'Pagina' (resultado de una consulta paginada por cursor).
+"""
+
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Pagina(BaseModel, Generic[T]):
+    """Una página de resultados y el cursor opaco para pedir la siguiente."""
+    items: List[T]
+    siguiente_cursor: Optional[str] = Field(None, description="None si es la última página")
@@ -4,7 +4,7 @@ Define la entidad de negocio 'RegistroAsistencia'.
 
 import enum
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -27,20 +27,45 @@ class RegistroAsistenciaBase(BaseModel):
 class RegistroAsistencia(RegistroAsistenciaBase):
     """Modelo completo de la entidad RegistroAsistencia."""
     id: int
+    fecha_sesion: Optional[datetime] = None  # Clave de partición (hora de inicio de la sesión)
 
     class Config:
         from_attributes = True
 
 
+class RegistroAsistenciaDetalle(RegistroAsistencia):
+    """Registro de asistencia con los datos del estudiante (exportaciones a sistemas externos)."""
+    email_estudiante: str
+    nombre_estudiante: str
+
+
 class RegistroAsistenciaCreate(BaseModel):
     """Modelo para el 'tap' de asistencia."""
     id_sesion_clase: int
     id_estudiante: int
     hora_registro: datetime = Field(default_factory=datetime.utcnow)
     estado_asistencia: EstadoAsistencia
+    fecha_sesion: Optional[datetime] = None  # Si se omite, se toma de la sesión en el mismo INSERT
 
 
 class RegistroAsistenciaUpdate(BaseModel):
     """Modelo para actualizar un registro de asistencia."""
     hora_salida: Optional[datetime] = None
     estado_asistencia: Optional[EstadoAsistencia] = None
+
+
+class ResumenAsistenciaSesion(BaseModel):
+    """Conteo de asistencia de una sesión frente a los estudiantes inscritos."""
+    id_sesion: int
+    id_asignatura: int
+    inscritos: int = 0
+    presentes: int = 0
+    tardes: int = 0
+    ausentes: int = 0
+    sin_registrar: int = Field(0, description="Inscritos que aún no tienen registro (no han hecho tap)")
+
+
+class CambiosRegistrosSesion(BaseModel):
+    """Registros de una sesión creados o modificados desde un cursor, con el cursor siguiente."""
+    items: List[RegistroAsistencia] = Field(default_factory=list)
+    cursor: str = Field(..., description="Cursor para pedir los cambios posteriores a esta respuesta")
@@ -37,6 +37,17 @@ class SesionDeClase(SesionDeClaseBase):
         from_attributes = True
 
 
+class SesionDeClaseTransicion(SesionDeClaseBase):
+    """
+    Columnas de la sesión devueltas por una transición de estado atómica
+    (UPDATE ... RETURNING), sin el grafo de relaciones.
+    """
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
 class SesionDeClaseCreate(BaseModel):
     """Modelo para crear una nueva SesionDeClase."""
     id_clase: int
@@ -0,0 +1,41 @@
+"""
+Define la entidad de negocio 'Trabajo' (operación pesada que se ejecuta en segundo plano).
+"""
+
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class EstadoTrabajo(str, enum.Enum):
+    """Define los estados posibles de un trabajo en segundo plano."""
+    PENDIENTE = "Pendiente"  # En cola, o esperando su siguiente reintento
+    EN_CURSO = "EnCurso"
+    COMPLETADO = "Completado"
+    FALLIDO = "Fallido"  # Agotó los reintentos
+
+
+class TrabajoCreate(BaseModel):
+    """Modelo para encolar un trabajo."""
+    tipo: str = Field(..., max_length=50, description="Tipo de trabajo (p. ej. 'cierre_sesion')")
+    parametros: Dict[str, Any] = Field(default_factory=dict)
+    id_usuario: Optional[int] = Field(None, description="Usuario que lo solicitó (puede consultar su estado)")
+
+
+class Trabajo(TrabajoCreate):
+    """Modelo completo de la entidad Trabajo."""
+    id: int
+    estado: EstadoTrabajo = EstadoTrabajo.PENDIENTE
+    progreso_actual: int = 0
+    progreso_total: Optional[int] = None
+    intentos: int = 0
+    creado_en: datetime
+    disponible_en: datetime
+    iniciado_en: Optional[datetime] = None
+    terminado_en: Optional[datetime] = None
+    ultimo_error: Optional[str] = None
+    resultado: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
@@ -13,6 +13,14 @@ from .sesion_de_clase_repository import ISesionDeClaseRepository
 from .registro_asistencia_repository import IRegistroAsistenciaRepository
 from .inscripcion_repository import IInscripcionRepository
 from .clase_programada_repository import IClaseProgramadaRepository
+from .unit_of_work import IUnitOfWork
+from .analitica_asistencia_repository import IAnaliticaAsistenciaRepository
+from .spool_taps import ISpoolTaps
+from .precarga import IPrecargador, ConsultaPrecargable
+from .avisos_cambios import IAvisosCambiosAsistencia, ObservacionCambios
+from .bandeja_salida_repository import IBandejaSalidaRepository, FalloEnvio
+from .emisor_mensajes import IEmisorMensajes, RechazoEnvio
+from .trabajo_repository import ITrabajoRepository
 
 __all__ = [
     "IUsuarioRepository",
@@ -23,4 +31,16 @@ __all__ = [
     "IRegistroAsistenciaRepository",
     "IInscripcionRepository",
     "IClaseProgramadaRepository",
+    "IUnitOfWork",
+    "IAnaliticaAsistenciaRepository",
+    "ISpoolTaps",
+    "IPrecargador",
+    "ConsultaPrecargable",
+    "IAvisosCambiosAsistencia",
+    "ObservacionCambios",
+    "IBandejaSalidaRepository",
+    "FalloEnvio",
+    "IEmisorMensajes",
+    "RechazoEnvio",
+    "ITrabajoRepository",
 ]
@@ -0,0 +1,36 @@
+"""
+Define la Interfaz (un contrato abstracto) para el Repositorio de Analítica de Asistencia.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# Fila columnar: (id_estudiante, id_asignatura, id_sesion, codigo_estado, minutos_llegada)
+#   codigo_estado: 0 = Presente, 1 = Tarde, 2 = Ausente
+#   minutos_llegada: minutos entre el inicio de la sesión y el tap (None si no hubo tap)
+FilaAsistencia = Tuple[int, int, int, int, Optional[float]]
+
+
+class IAnaliticaAsistenciaRepository(ABC):
+    """Interfaz abstracta para la lectura masiva de asistencia (solo lectura)."""
+
+    @abstractmethod
+    def iter_lotes(
+        self,
+        id_asignaturas: List[int],
+        desde: datetime,
+        hasta: datetime,
+        id_estudiante: Optional[int] = None,
+        tam_lote: int = 5000,
+    ) -> AsyncIterator[List[FilaAsistencia]]:
+        """
+        Recorre los registros de asistencia de las asignaturas en el rango [desde, hasta)
+        en lotes de tuplas planas (sin construir entidades por fila).
+        """
+        pass
+
+    @abstractmethod
+    async def nombres_estudiantes(self, ids_estudiantes: List[int]) -> Dict[int, str]:
+        """Retorna {id_estudiante: nombre_completo} para los IDs indicados."""
+        pass
@@ -0,0 +1,44 @@
+"""
+Define la Interfaz (un contrato abstracto) para los Avisos de Cambios de Asistencia.
+
+Los avisos despiertan a quien espera cambios en los registros de una sesión
+(long-polling del feed de cambios). Son solo una pista: tras un aviso hay que
+volver a consultar el repositorio, y se pueden perder (p. ej. mientras se
+reconecta), así que quien espera debe consultar también periódicamente.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import ContextManager
+
+
+class ObservacionCambios:
+    """Espera de los avisos de una sesión; se arma antes de consultar para no perder ninguno."""
+
+    def __init__(self):
+        self._evento = asyncio.Event()
+
+    def avisar(self) -> None:
+        self._evento.set()
+
+    def reiniciar(self) -> None:
+        """Descarta los avisos recibidos hasta ahora (llamar antes de cada consulta)."""
+        self._evento.clear()
+
+    async def esperar(self, timeout: float) -> bool:
+        """Retorna True si llega un aviso antes de `timeout` segundos."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._evento.wait()
+        except TimeoutError:
+            return False
+        return True
+
+
+class IAvisosCambiosAsistencia(ABC):
+    """Interfaz abstracta de los avisos de cambios en los registros de las sesiones."""
+
+    @abstractmethod
+    def observar(self, sesion_id: int) -> ContextManager[ObservacionCambios]:
+        """Recibe los avisos de la sesión mientras dura el bloque `with`."""
+        pass
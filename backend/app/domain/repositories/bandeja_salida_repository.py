@@ -0,0 +1,70 @@
+"""
+Define la Interfaz (un contrato abstracto) para el Repositorio de la Bandeja de Salida.
+
+Los casos de uso agregan mensajes dentro de su transacción (si se deshace, el
+mensaje tampoco existe); un procesador de fondo los reserva por lotes, los
+entrega al destino y registra el resultado.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from app.domain.entities.mensaje_saliente import MensajeSaliente, MensajeSalienteCreate
+
+
+@dataclass
+class FalloEnvio:
+    """Resultado de un mensaje que no se pudo entregar."""
+    id: int
+    intento: int  # `intentos` del mensaje al reservarlo: identifica la reserva
+    error: str
+    reintentar_en: Optional[datetime]  # None: fallo definitivo
+
+
+class IBandejaSalidaRepository(ABC):
+    """Interfaz abstracta para el repositorio de la bandeja de salida."""
+
+    @abstractmethod
+    async def agregar(self, mensaje: MensajeSalienteCreate) -> None:
+        """Encola un mensaje en la transacción en curso."""
+        pass
+
+    @abstractmethod
+    async def acumular(self, mensajes: List[MensajeSalienteCreate], disponible_en: datetime) -> None:
+        """
+        Encola mensajes acumulables (resúmenes) que no salen hasta `disponible_en`.
+        Si ya hay uno pendiente con el mismo destino y clave, se le fusionan las
+        entradas del objeto `datos["eventos"]` (las repetidas se reemplazan) en
+        lugar de crear otro.
+        """
+        pass
+
+    @abstractmethod
+    async def reservar_lote(self, destino: str, limite: int, reserva_segundos: float) -> List[MensajeSaliente]:
+        """
+        Reserva hasta `limite` mensajes pendientes y disponibles del destino, los más
+        antiguos primero: pasan a "Enviando" con un intento más. Otros procesadores
+        (otros workers) no los reciben hasta que termine la reserva; si este no llega
+        a registrar el resultado, vuelven a estar disponibles entonces. Mientras se
+        envían, `acumular` deja los eventos nuevos en otro mensaje pendiente.
+        """
+        pass
+
+    @abstractmethod
+    async def marcar_enviados(self, mensajes: List[MensajeSaliente]) -> None:
+        """
+        Marca los mensajes reservados como entregados. Se ignoran los que ya no siguen
+        reservados por este procesador (la reserva caducó y otro los retomó).
+        """
+        pass
+
+    @abstractmethod
+    async def registrar_fallos(self, fallos: List[FalloEnvio]) -> None:
+        """
+        Guarda el error de cada mensaje y lo reprograma, o lo marca como fallido. Uno
+        que se reprograma cuando ya hay otro pendiente con su clave se funde en ese.
+        Como en `marcar_enviados`, se ignoran los que ya no siguen reservados por este
+        procesador.
+        """
+        pass
@@ -3,7 +3,7 @@ Define la Interfaz (un contrato abstracto) para el Repositorio de Clases Program
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 from app.domain.entities.clase_programada import ClaseProgramada, ClaseProgramadaCreate
 
 class IClaseProgramadaRepository(ABC):
@@ -18,3 +18,12 @@ class IClaseProgramadaRepository(ABC):
     async def get_by_asignatura_and_horario(self, id_asignatura: int, id_horario: int) -> Optional[ClaseProgramada]:
         """Obtiene una clase programada por ID de asignatura y horario."""
         pass
+
+    @abstractmethod
+    async def get_many_by_keys(self, claves: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], ClaseProgramada]:
+        """
+        Obtiene varias clases programadas en una sola consulta.
+        Retorna un diccionario `(id_asignatura, id_horario) -> ClaseProgramada`;
+        las claves que no existen no aparecen.
+        """
+        pass
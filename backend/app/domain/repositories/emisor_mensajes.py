@@ -0,0 +1,37 @@
+"""
+Define la Interfaz (un contrato abstracto) para los Emisores de Mensajes.
+
+Un emisor entrega a un sistema externo los mensajes de la bandeja de salida de
+su destino. No toca la base de datos: el procesador de la bandeja registra el
+resultado.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List
+from app.domain.entities.mensaje_saliente import MensajeSaliente
+
+
+@dataclass
+class RechazoEnvio:
+    """Mensaje de un lote que el destino no aceptó."""
+    motivo: str
+    reintentable: bool = False  # False: el destino no lo aceptará nunca
+
+
+class IEmisorMensajes(ABC):
+    """Interfaz abstracta de la entrega de un lote de mensajes a un destino."""
+
+    destino: str  # Destino de la bandeja que atiende (p. ej. 'sap')
+
+    @abstractmethod
+    async def enviar_lote(self, mensajes: List[MensajeSaliente]) -> Dict[int, RechazoEnvio]:
+        """
+        Entrega el lote. Retorna los mensajes que el destino no aceptó (ID -> rechazo);
+        el resto se da por entregado. Si falla el lote entero lanza
+        ExternalServiceException (con `reintentable`).
+        """
+        pass
+
+    async def cerrar(self) -> None:
+        pass
@@ -3,8 +3,10 @@ Define la Interfaz (un contrato abstracto) para el Repositorio de Estudiantes.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 from app.domain.entities.estudiante import Estudiante, EstudianteCreate
+from app.domain.entities.pagina import Pagina
+from app.domain.repositories.precarga import ConsultaPrecargable
 
 
 class IEstudianteRepository(ABC):
@@ -20,6 +22,11 @@ class IEstudianteRepository(ABC):
         """Obtiene un estudiante por su RFC/UID."""
         pass
 
+    @abstractmethod
+    def consulta_por_rfc_uid(self, rfc_uid: str) -> ConsultaPrecargable[Optional[Estudiante]]:
+        """Como get_by_rfc_uid, pero sin ejecutar: para precargarla junto a otras (IPrecargador)."""
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[Estudiante]:
         """Obtiene un estudiante por su email."""
@@ -31,6 +38,6 @@ class IEstudianteRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_all(self) -> List[Estudiante]:
-        """Lista todos los estudiantes."""
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Estudiante]:
+        """Lista los estudiantes (por nombre) paginados por cursor."""
         pass
@@ -3,8 +3,9 @@ Define la Interfaz (un contrato abstracto) para el Repositorio de Horarios.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 from app.domain.entities.horario import Horario, HorarioCreate
+from app.domain.entities.pagina import Pagina
 
 
 class IHorarioRepository(ABC):
@@ -21,6 +22,6 @@ class IHorarioRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_all(self) -> List[Horario]:
-        """Lista todos los horarios."""
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Horario]:
+        """Lista los horarios (por día y hora de inicio) paginados por cursor."""
         pass
@@ -0,0 +1,26 @@
+"""
+Define la Interfaz (un contrato abstracto) para la precarga de consultas.
+
+Un caso de uso que necesita varias lecturas independientes entre sí (ninguna usa
+el resultado de otra) puede pedirlas todas a la vez: los repositorios devuelven
+consultas sin ejecutar (`consulta_por_...`) y el precargador las envía juntas, de
+modo que la latencia de red con la BD se paga una vez y no una por lectura.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Generic, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ConsultaPrecargable(Generic[T]):
+    """Consulta de un repositorio aún sin ejecutar; al precargarla produce un `T`."""
+
+
+class IPrecargador(ABC):
+    """Interfaz abstracta del ejecutor de consultas precargables."""
+
+    @abstractmethod
+    async def precargar(self, *consultas: ConsultaPrecargable[Any]) -> Tuple[Any, ...]:
+        """Ejecuta las consultas en un único viaje a la BD y retorna sus resultados en el mismo orden."""
+        pass
@@ -4,15 +4,23 @@ Define la Interfaz (un contrato abstracto) para el Repositorio de Asistencia.
 
 from abc import ABC, abstractmethod
 from typing import Optional, List
-from app.domain.entities.registro_asistencia import RegistroAsistencia, RegistroAsistenciaCreate, RegistroAsistenciaUpdate
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.registro_asistencia import (
+    CambiosRegistrosSesion, RegistroAsistencia, RegistroAsistenciaCreate, RegistroAsistenciaDetalle,
+    RegistroAsistenciaUpdate, ResumenAsistenciaSesion
+)
+from app.domain.repositories.precarga import ConsultaPrecargable
 
 
 class IRegistroAsistenciaRepository(ABC):
     """Interfaz abstracta para el repositorio de asistencia."""
 
     @abstractmethod
-    async def get_by_id(self, registro_id: int) -> Optional[RegistroAsistencia]:
-        """Obtiene un registro de asistencia por su ID."""
+    async def get_by_id(self, registro_id: int, reciente: bool = False) -> Optional[RegistroAsistencia]:
+        """
+        Obtiene un registro de asistencia por su ID. Con `reciente`, solo se busca en
+        las particiones de los últimos ASISTENCIA_VENTANA_RECIENTE_DIAS días.
+        """
         pass
 
     @abstractmethod
@@ -20,17 +28,57 @@ class IRegistroAsistenciaRepository(ABC):
         """Busca si ya existe un registro de asistencia para este estudiante en esta sesión."""
         pass
 
+    @abstractmethod
+    def consulta_por_sesion_y_rfc_uid(self, sesion_id: int, rfc_uid: str) -> ConsultaPrecargable[Optional[RegistroAsistencia]]:
+        """
+        Registro del estudiante con ese RFC/UID en la sesión, sin ejecutar: no necesita
+        el ID del estudiante, así que se puede precargar junto a su búsqueda (IPrecargador).
+        """
+        pass
+
     @abstractmethod
     async def create(self, registro_create: RegistroAsistenciaCreate) -> RegistroAsistencia:
         """Crea un nuevo registro de asistencia."""
         pass
 
     @abstractmethod
-    async def update(self, registro_id: int, registro_update: RegistroAsistenciaUpdate) -> Optional[RegistroAsistencia]:
-        """Actualiza un registro de asistencia (ej. para marcar salida)."""
+    async def update(self, registro_id: int, registro_update: RegistroAsistenciaUpdate,
+                     reciente: bool = False) -> Optional[RegistroAsistencia]:
+        """Actualiza un registro de asistencia (ej. para marcar salida). `reciente` como en get_by_id."""
+        pass
+
+    @abstractmethod
+    async def list_by_sesion(self, sesion_id: int, limite: int,
+                             cursor: Optional[str] = None) -> Pagina[RegistroAsistencia]:
+        """Lista los registros de asistencia de una sesión (por estudiante) paginados por cursor."""
+        pass
+
+    @abstractmethod
+    async def list_cambios_desde(self, sesion_id: int, cursor: Optional[str] = None) -> CambiosRegistrosSesion:
+        """
+        Registros de la sesión creados o modificados después del `cursor` de una
+        respuesta anterior (sin cursor, todos). Cada registro aparece una sola vez,
+        con su estado actual; como hay uno por estudiante, no se pagina.
+        """
+        pass
+
+    @abstractmethod
+    async def list_detalle_por_sesion(self, sesion_id: int) -> List[RegistroAsistenciaDetalle]:
+        """Todos los registros de la sesión con el email y nombre del estudiante, en una consulta."""
+        pass
+
+    @abstractmethod
+    async def marcar_ausentes_sin_registro(self, sesion_id: int) -> int:
+        """
+        Crea un registro "Ausente" para cada inscrito en la asignatura de la sesión
+        que no tiene registro, en una sola sentencia. Retorna los creados.
+        """
         pass
 
     @abstractmethod
-    async def list_by_sesion(self, sesion_id: int) -> List[RegistroAsistencia]:
-        """Lista todos los registros de asistencia de una sesión."""
+    async def resumen_por_sesion(self, sesion_id: int) -> Optional[ResumenAsistenciaSesion]:
+        """
+        Cuenta, en una sola consulta agregada, los registros de la sesión por estado
+        y los inscritos sin registro. Retorna None si la sesión no existe.
+        """
         pass
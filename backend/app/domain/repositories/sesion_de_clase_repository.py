@@ -3,8 +3,12 @@ Define la Interfaz (un contrato abstracto) para el Repositorio de Sesiones.
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, List
-from app.domain.entities.sesion_de_clase import SesionDeClase, SesionDeClaseCreate, SesionDeClaseUpdate
+from app.domain.entities.sesion_de_clase import (
+    SesionDeClase, SesionDeClaseCreate, SesionDeClaseUpdate, SesionDeClaseTransicion, EstadoSesion
+)
+from app.domain.repositories.precarga import ConsultaPrecargable
 
 
 class ISesionDeClaseRepository(ABC):
@@ -15,6 +19,11 @@ class ISesionDeClaseRepository(ABC):
         """Obtiene una sesión por su ID."""
         pass
 
+    @abstractmethod
+    def consulta_por_id(self, sesion_id: int) -> ConsultaPrecargable[Optional[SesionDeClase]]:
+        """Como get_by_id, pero sin ejecutar: para precargarla junto a otras (IPrecargador)."""
+        pass
+
     @abstractmethod
     async def find_activa(self, id_clase: int, id_horario: int) -> Optional[SesionDeClase]:
         """Busca una sesión activa para una clase/horario."""
@@ -25,6 +34,16 @@ class ISesionDeClaseRepository(ABC):
         """Busca sesiones activas para una lista de asignaturas."""
         pass
 
+    @abstractmethod
+    async def find_en_curso_by_asignaturas(self, id_asignaturas: List[int], instante: datetime) -> List[SesionDeClase]:
+        """
+        Busca las sesiones de las asignaturas que estaban en curso en `instante`: empezadas
+        antes (hora_inicio <= instante) y que dejaron de estar "EnProgreso" después o aún lo
+        están, sea cual sea su estado ahora (p. ej. para un tap reenviado desde el spool
+        tras una caída de la BD).
+        """
+        pass
+
     @abstractmethod
     async def find_validation_open_by_asignaturas(self, id_asignaturas: List[int]) -> List[SesionDeClase]:
         """Busca sesiones con validación abierta para una lista de asignaturas."""
@@ -39,3 +58,21 @@ class ISesionDeClaseRepository(ABC):
     async def update(self, sesion_id: int, sesion_update: SesionDeClaseUpdate) -> Optional[SesionDeClase]:
         """Actualiza una sesión (ej. para cerrarla)."""
         pass
+
+    @abstractmethod
+    async def transition_estado(
+        self,
+        sesion_id: int,
+        estados_permitidos: List[EstadoSesion],
+        nuevo_estado: EstadoSesion,
+        id_docente: Optional[int] = None,
+        hora_fin: Optional[datetime] = None,
+    ) -> Optional[SesionDeClaseTransicion]:
+        """
+        Cambia el estado de la sesión en una sola sentencia, solo si su estado actual
+        está en `estados_permitidos` (y, si se indica, la asignatura es de `id_docente`).
+
+        Returns:
+            La sesión ya actualizada, o None si la transición no se aplicó.
+        """
+        pass
@@ -0,0 +1,49 @@
+"""
+Define la Interfaz (un contrato abstracto) para el Spool de Taps.
+
+El spool guarda, fuera de PostgreSQL, los taps que llegan mientras la base de
+datos no está disponible, para registrarlos cuando se recupere.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Tuple
+
+
+@dataclass
+class TapEnSpool:
+    """Un tap pendiente, con la hora en que ocurrió (no la de su registro en la BD)."""
+    id: int
+    codigo_rfid: str
+    id_dispositivo: str
+    hora_registro: datetime
+    encolado_en: datetime
+
+
+class ISpoolTaps(ABC):
+    """Interfaz abstracta de una cola FIFO durable de taps."""
+
+    profundidad: int  # Taps pendientes
+
+    @abstractmethod
+    async def agregar(self, codigo_rfid: str, id_dispositivo: str, hora_registro: datetime) -> None:
+        """Guarda un tap de forma durable (al retornar, sobrevive a un reinicio)."""
+        pass
+
+    @abstractmethod
+    async def reservar_lote(self, limite: int) -> List[TapEnSpool]:
+        """
+        Reserva y retorna hasta `limite` taps, los más antiguos primero, sin eliminarlos.
+        Otro proceso que comparta el spool no recibe los reservados hasta que caduque
+        la reserva (si este no llega a completarlos).
+        """
+        pass
+
+    @abstractmethod
+    async def completar(self, ids_registrados: List[int], rechazados: List[Tuple[TapEnSpool, str]]) -> None:
+        """
+        Elimina los taps ya registrados en la BD y aparta los rechazados por reglas
+        de negocio (con su motivo), de forma atómica.
+        """
+        pass
@@ -0,0 +1,69 @@
+"""
+Define la Interfaz (un contrato abstracto) para el Repositorio de Trabajos.
+
+Las peticiones encolan trabajos dentro de su transacción (si se deshace, el
+trabajo tampoco existe). Los workers reservan uno cada vez y lo identifican por
+(id, intento): si su reserva caduca y otro worker lo retoma, las escrituras del
+primero dejan de aplicarse.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.trabajo import Trabajo, TrabajoCreate, EstadoTrabajo
+
+
+class ITrabajoRepository(ABC):
+    """Interfaz abstracta para el repositorio de trabajos en segundo plano."""
+
+    @abstractmethod
+    async def encolar(self, trabajo: TrabajoCreate) -> Trabajo:
+        """Encola un trabajo en la transacción en curso."""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, trabajo_id: int) -> Optional[Trabajo]:
+        """Obtiene un trabajo por su ID."""
+        pass
+
+    @abstractmethod
+    async def list_by_usuario(self, usuario_id: int, limite: int, cursor: Optional[str] = None,
+                              estado: Optional[EstadoTrabajo] = None) -> Pagina[Trabajo]:
+        """Trabajos solicitados por el usuario, los más recientes primero, paginados por cursor."""
+        pass
+
+    @abstractmethod
+    async def reservar(self, tipos: List[str], reserva_segundos: float) -> Optional[Trabajo]:
+        """
+        Reserva el trabajo disponible más antiguo de uno de los tipos: uno pendiente
+        cuya espera terminó o uno en curso cuya reserva caducó. Lo pasa a "EnCurso"
+        con un intento más; otros workers no lo reciben mientras dure la reserva.
+        """
+        pass
+
+    @abstractmethod
+    async def renovar(self, trabajo_id: int, intento: int, reserva_segundos: float,
+                      progreso_actual: Optional[int] = None, progreso_total: Optional[int] = None) -> bool:
+        """Extiende la reserva y guarda el progreso. False si el worker ya no tiene el trabajo."""
+        pass
+
+    @abstractmethod
+    async def completar(self, trabajo_id: int, intento: int, resultado: Optional[Dict[str, Any]],
+                        progreso_actual: Optional[int] = None, progreso_total: Optional[int] = None) -> bool:
+        """Marca el trabajo como completado, con su progreso final. False si el worker ya no tiene el trabajo."""
+        pass
+
+    @abstractmethod
+    async def registrar_fallo(self, trabajo_id: int, intento: int, error: str,
+                              reintentar_en: Optional[datetime]) -> None:
+        """Guarda el error y lo reprograma (pendiente hasta `reintentar_en`), o lo marca como fallido."""
+        pass
+
+    @abstractmethod
+    async def liberar(self, trabajo_id: int, intento: int) -> None:
+        """
+        Devuelve a la cola, disponible ya, un trabajo que el worker no llegó a terminar
+        porque se detuvo: el intento no cuenta para `max_intentos`.
+        """
+        pass
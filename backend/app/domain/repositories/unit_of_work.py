@@ -0,0 +1,34 @@
+"""
+Define la Interfaz (un contrato abstracto) para la Unidad de Trabajo (Unit of Work).
+
+Los repositorios solo hacen `flush`; la Unidad de Trabajo es la única que
+confirma (`commit`) o descarta (`rollback`) los cambios de una operación.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class IUnitOfWork(ABC):
+    """Interfaz abstracta para la frontera transaccional de una request."""
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Confirma todos los cambios pendientes en una sola transacción."""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Descarta todos los cambios pendientes."""
+        pass
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Envía los cambios pendientes a la base de datos sin confirmarlos."""
+        pass
+
+    async def __aenter__(self) -> "IUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Lo que no se haya confirmado explícitamente se descarta
+        await self.rollback()
@@ -5,8 +5,9 @@ implementación concreta (SQLAlchemy).
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 from app.domain.entities.usuario import Usuario, UsuarioCreate, UsuarioUpdate
+from app.domain.entities.pagina import Pagina
 
 class IUsuarioRepository(ABC):
     """Interfaz abstracta para el repositorio de usuarios."""
@@ -32,6 +33,6 @@ class IUsuarioRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_all(self) -> List[Usuario]:
-        """Lista todos los usuarios."""
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Usuario]:
+        """Lista los usuarios (por nombre) paginados por cursor."""
         pass
@@ -0,0 +1,3 @@
+"""
+Paquete de Integraciones: clientes de sistemas externos (SAP, correo SMTP...).
+"""
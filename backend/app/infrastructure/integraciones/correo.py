@@ -0,0 +1,137 @@
+"""
+Emisor de la bandeja de salida por correo electrónico (SMTP).
+
+Cada mensaje del lote es un correo; `componer` (del servicio que encola los
+mensajes) lo convierte en destinatario, asunto y texto. Los correos de un lote se
+envían en paralelo sobre un pool de hasta SMTP_MAX_CONEXIONES conexiones que se
+reutilizan entre lotes (una conexión que falla se descarta y se abre otra).
+
+Un destinatario rechazado con un código 5xx no se reintenta; los 4xx y los
+errores de conexión sí. Si no se puede entregar ningún correo del lote por un
+error reintentable (servidor caído), falla el lote entero.
+
+Requiere el paquete aiosmtplib (extra "correo").
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceException
+from app.domain.entities.mensaje_saliente import MensajeSaliente
+from app.domain.repositories.emisor_mensajes import IEmisorMensajes, RechazoEnvio
+
+try:
+    import aiosmtplib
+except ImportError:  # pragma: no cover - dependencia opcional (extra "correo")
+    aiosmtplib = None
+
+
+class EmisorCorreo(IEmisorMensajes):
+    """Implementación de IEmisorMensajes sobre SMTP con un pool de conexiones."""
+
+    destino = "correo"
+
+    def __init__(self,
+                 componer: Callable[[MensajeSaliente], Tuple[str, str, str]],
+                 host: str,
+                 port: int,
+                 usuario: Optional[str],
+                 password: Optional[str],
+                 remitente: str,
+                 max_conexiones: int = 4,
+                 timeout_segundos: float = 30.0):
+        if aiosmtplib is None:
+            raise RuntimeError("SMTP_HOST requiere el paquete 'aiosmtplib' (pip install aulatap[correo])")
+        self.componer = componer
+        self.host = host
+        self.port = port
+        self.usuario = usuario
+        self.password = password
+        self.remitente = remitente
+        self.timeout_segundos = timeout_segundos
+        self._cupos = asyncio.Semaphore(max_conexiones)
+        self._libres: List["aiosmtplib.SMTP"] = []
+
+    async def enviar_lote(self, mensajes: List[MensajeSaliente]) -> Dict[int, RechazoEnvio]:
+        resultados = await asyncio.gather(*(self._enviar(m) for m in mensajes))
+        rechazados = {m.id: r for m, r in zip(mensajes, resultados) if r is not None}
+        if rechazados and len(rechazados) == len(mensajes) and all(r.reintentable for r in rechazados.values()):
+            raise ExternalServiceException("SMTP", next(iter(rechazados.values())).motivo)
+        return rechazados
+
+    async def _enviar(self, mensaje: MensajeSaliente) -> Optional[RechazoEnvio]:
+        destinatario, asunto, texto = self.componer(mensaje)
+        correo = EmailMessage()
+        correo["From"] = self.remitente
+        correo["To"] = destinatario
+        correo["Subject"] = asunto
+        correo.set_content(texto)
+        for ultimo_intento in (False, True):
+            try:
+                async with self._conexion() as smtp:
+                    await smtp.send_message(correo)
+                return None
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                codigo = min((r.code for r in e.recipients), default=550)
+                return RechazoEnvio(f"Destinatario rechazado: {e}", reintentable=codigo < 500)
+            except aiosmtplib.SMTPAuthenticationError as e:
+                # Credenciales mal configuradas: no es culpa del correo, se reintenta
+                return RechazoEnvio(f"Autenticación SMTP fallida: {e.message}", reintentable=True)
+            except aiosmtplib.SMTPResponseException as e:
+                return RechazoEnvio(f"SMTP {e.code}: {e.message}", reintentable=e.code < 500)
+            except aiosmtplib.SMTPServerDisconnected as e:
+                # Una conexión del pool pudo caducar en el servidor: se prueba una vez con otra
+                if ultimo_intento:
+                    return RechazoEnvio(f"{type(e).__name__}: {e}", reintentable=True)
+            except (aiosmtplib.SMTPException, OSError) as e:
+                return RechazoEnvio(f"{type(e).__name__}: {e}", reintentable=True)
+
+    @asynccontextmanager
+    async def _conexion(self) -> AsyncIterator["aiosmtplib.SMTP"]:
+        """Toma una conexión del pool (o abre una) y la devuelve al terminar si sigue abierta."""
+        async with self._cupos:
+            smtp = self._libres.pop() if self._libres else None
+            if smtp is None or not smtp.is_connected:
+                smtp = aiosmtplib.SMTP(
+                    hostname=self.host, port=self.port, use_tls=self.port == 465,
+                    username=self.usuario, password=self.password, timeout=self.timeout_segundos
+                )
+                await smtp.connect()
+            try:
+                yield smtp
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException):
+                # El servidor rechazó solo este correo (aiosmtplib ya reinició el sobre)
+                if smtp.is_connected:
+                    self._libres.append(smtp)
+                raise
+            except BaseException:
+                smtp.close()
+                raise
+            self._libres.append(smtp)
+
+    async def cerrar(self) -> None:
+        while self._libres:
+            smtp = self._libres.pop()
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+
+
+def crear_emisor_correo(componer: Callable[[MensajeSaliente], Tuple[str, str, str]]) -> Optional[EmisorCorreo]:
+    """Emisor configurado con SMTP_*, o None si el correo no está configurado (sin SMTP_HOST)."""
+    if not settings.SMTP_HOST:
+        return None
+    return EmisorCorreo(
+        componer,
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        settings.SMTP_USER,
+        settings.SMTP_PASSWORD,
+        settings.SMTP_FROM_EMAIL,
+        max_conexiones=settings.SMTP_MAX_CONEXIONES,
+        timeout_segundos=settings.SMTP_TIMEOUT_SEGUNDOS
+    )
@@ -0,0 +1,97 @@
+"""
+Emisor de la bandeja de salida hacia el sistema académico (SAP).
+
+Cada lote se envía en una sola petición:
+
+    POST {SAP_API_URL}/asistencia/lote
+    {"mensajes": [{"id_mensaje": 17, "tipo": "asistencia_sesion", "clave": "sesion:42", "datos": {...}}]}
+
+con autenticación básica SAP_CLIENT_ID / SAP_CLIENT_SECRET. Una respuesta 2xx
+entrega el lote; puede incluir {"rechazados": [{"id_mensaje": 17, "motivo": "..."}]}
+con los mensajes que SAP no aceptará nunca. 408, 429 y 5xx (y los errores de red)
+se reintentan; el resto de 4xx rechazan el lote entero sin reintento.
+
+El cliente httpx (extra "sap") se crea una vez por worker y reutiliza hasta
+SAP_MAX_CONEXIONES conexiones keep-alive.
+"""
+
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceException
+from app.domain.entities.mensaje_saliente import MensajeSaliente
+from app.domain.repositories.emisor_mensajes import IEmisorMensajes, RechazoEnvio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - dependencia opcional (extra "sap")
+    httpx = None
+
+_REINTENTABLES = {408, 425, 429}
+
+
+class EmisorSAP(IEmisorMensajes):
+    """Implementación de IEmisorMensajes sobre la API REST de SAP."""
+
+    destino = "sap"
+
+    def __init__(self,
+                 url: str,
+                 client_id: Optional[str],
+                 client_secret: Optional[str],
+                 timeout_segundos: float = 30.0,
+                 max_conexiones: int = 4):
+        if httpx is None:
+            raise RuntimeError("SAP_API_URL requiere el paquete 'httpx' (pip install aulatap[sap])")
+        self._cliente = httpx.AsyncClient(
+            base_url=url.rstrip("/"),
+            auth=(client_id, client_secret or "") if client_id else None,
+            timeout=timeout_segundos,
+            limits=httpx.Limits(max_connections=max_conexiones, max_keepalive_connections=max_conexiones)
+        )
+
+    async def enviar_lote(self, mensajes: List[MensajeSaliente]) -> Dict[int, RechazoEnvio]:
+        cuerpo = {
+            "mensajes": [
+                {"id_mensaje": m.id, "tipo": m.tipo, "clave": m.clave, "datos": m.datos}
+                for m in mensajes
+            ]
+        }
+        try:
+            respuesta = await self._cliente.post("/asistencia/lote", json=cuerpo)
+        except httpx.HTTPError as e:
+            raise ExternalServiceException("SAP", f"{type(e).__name__}: {e}")
+
+        if respuesta.status_code >= 500 or respuesta.status_code in _REINTENTABLES:
+            raise ExternalServiceException("SAP", f"HTTP {respuesta.status_code}")
+        if respuesta.status_code >= 400:
+            raise ExternalServiceException(
+                "SAP", f"HTTP {respuesta.status_code}: {respuesta.text[:500]}", reintentable=False
+            )
+
+        try:
+            rechazados = respuesta.json().get("rechazados") or []
+        except (ValueError, AttributeError):
+            rechazados = []  # 2xx sin cuerpo JSON: todo entregado
+        ids = {m.id for m in mensajes}
+        return {
+            r["id_mensaje"]: RechazoEnvio(str(r.get("motivo") or "Rechazado por SAP"))
+            for r in rechazados
+            if isinstance(r, dict) and r.get("id_mensaje") in ids
+        }
+
+    async def cerrar(self) -> None:
+        await self._cliente.aclose()
+
+
+def crear_emisor_sap() -> Optional[EmisorSAP]:
+    """Emisor configurado con SAP_*, o None si la integración no está configurada (sin SAP_API_URL)."""
+    if not settings.SAP_API_URL:
+        return None
+    return EmisorSAP(
+        settings.SAP_API_URL,
+        settings.SAP_CLIENT_ID,
+        settings.SAP_CLIENT_SECRET,
+        timeout_segundos=settings.SAP_TIMEOUT_SEGUNDOS,
+        max_conexiones=settings.SAP_MAX_CONEXIONES
+    )
@@ -0,0 +1,117 @@
+"""
+Avisos de cambios de asistencia con LISTEN/NOTIFY de PostgreSQL.
+
+El trigger de "RegistroAsistencia" hace NOTIFY con el ID de la sesión en cada
+INSERT o UPDATE (PostgreSQL lo entrega al confirmar la transacción). Cada worker
+mantiene una conexión dedicada, fuera del pool, que escucha el canal y despierta
+a las peticiones del feed de cambios que esperan esa sesión. Así un cambio
+hecho desde cualquier worker (o desde un script) llega a todas las esperas.
+
+Si la conexión se pierde, se reintenta con espera creciente; al reconectar se
+despierta a todas las esperas porque algún aviso pudo perderse. Mientras tanto
+el feed sigue funcionando con su consulta periódica.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+import psycopg
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.domain.repositories.avisos_cambios import IAvisosCambiosAsistencia, ObservacionCambios
+from app.infrastructure.persistence.models.registro_asistencia import CANAL_CAMBIOS
+
+
+class AvisosCambiosPostgres(IAvisosCambiosAsistencia):
+    """Implementación de IAvisosCambiosAsistencia con una conexión LISTEN por proceso."""
+
+    ESPERA_RECONEXION_MAX = 30.0
+
+    def __init__(self, url: str):
+        self.url = url  # URL de libpq (sin "+psycopg")
+        self.conectado = False
+        self._observaciones: Dict[int, Set[ObservacionCambios]] = {}
+        self._tarea: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def observar(self, sesion_id: int) -> Iterator[ObservacionCambios]:
+        observacion = ObservacionCambios()
+        self._observaciones.setdefault(sesion_id, set()).add(observacion)
+        try:
+            yield observacion
+        finally:
+            observaciones = self._observaciones.get(sesion_id)
+            if observaciones is not None:
+                observaciones.discard(observacion)
+                if not observaciones:
+                    del self._observaciones[sesion_id]
+
+    def iniciar(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.get_running_loop().create_task(self._escuchar(), name="avisos-cambios")
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+        self.conectado = False
+
+    def _avisar(self, sesion_id: int) -> None:
+        for observacion in self._observaciones.get(sesion_id, ()):
+            observacion.avisar()
+
+    def _avisar_a_todas(self) -> None:
+        for observaciones in self._observaciones.values():
+            for observacion in observaciones:
+                observacion.avisar()
+
+    async def _escuchar(self) -> None:
+        espera = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.url, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {CANAL_CAMBIOS}")
+                    self.conectado = True
+                    espera = 1.0
+                    logger.info(f"Escuchando avisos de cambios de asistencia (canal {CANAL_CAMBIOS})")
+                    self._avisar_a_todas()
+                    async for aviso in conn.notifies():
+                        try:
+                            self._avisar(int(aviso.payload))
+                        except ValueError:
+                            logger.warning(f"Aviso de cambios con ID de sesión inválido: {aviso.payload!r}")
+                logger.warning("La conexión de avisos de cambios se cerró")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Conexión de avisos de cambios perdida (reintento en {espera:.0f} s): {e}")
+            self.conectado = False
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, self.ESPERA_RECONEXION_MAX)
+
+
+_avisos: Optional[AvisosCambiosPostgres] = None
+
+
+def get_avisos_cambios() -> Optional[AvisosCambiosPostgres]:
+    """Retorna los avisos del proceso, o None si ASISTENCIA_CAMBIOS_AVISOS está desactivado o no se iniciaron."""
+    return _avisos
+
+
+def iniciar_avisos_cambios() -> None:
+    """Abre la escucha de avisos de cambios (startup). No hace nada si está deshabilitada."""
+    global _avisos
+    if settings.ASISTENCIA_CAMBIOS_AVISOS and _avisos is None:
+        _avisos = AvisosCambiosPostgres(settings.database_url_sync)
+        _avisos.iniciar()
+
+
+async def detener_avisos_cambios() -> None:
+    """Cierra la escucha de avisos, si se llegó a iniciar (shutdown)."""
+    global _avisos
+    if _avisos is not None:
+        await _avisos.detener()
+        _avisos = None
@@ -0,0 +1,131 @@
+"""
+Cargadores (DataLoader) por petición: memoización de entidades y carga por lotes.
+
+Dentro de una misma petición las mismas entidades se piden varias veces (el caso de
+uso busca la sesión y el estudiante, y el endpoint los vuelve a pedir para armar la
+respuesta). Un `Cargador`:
+- memoiza cada entidad por clave: la segunda petición no va a la BD,
+- agrupa las claves pedidas en el mismo ciclo del event loop (p. ej. desde un
+  `asyncio.gather`) en una sola consulta `IN (...)`.
+
+Los cargadores viven en `session.info`: todos los repositorios creados sobre la
+misma AsyncSession (las factories de un endpoint reciben la misma sesión de
+`get_db`, que FastAPI cachea por petición) comparten la misma memoria, y esta
+desaparece con la sesión. Los repositorios actualizan la memoria al escribir
+(`primar` / `olvidar`) y un rollback (también de un savepoint) la vacía entera.
+
+AsyncSession no admite operaciones concurrentes: se pueden agrupar claves de un
+mismo cargador con `cargar_muchos`, pero no esperar en paralelo a cargadores
+distintos de la misma sesión.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Recibe la sesión y claves sin repetir; retorna las encontradas (las ausentes se memoizan como None)
+CargarLote = Callable[[AsyncSession, List[K]], Awaitable[Dict[K, V]]]
+
+_CLAVE_INFO = "aulatap_cargadores"
+
+
+class Cargador(Generic[K, V]):
+    """Memoria por clave más agrupación de cargas concurrentes en un lote."""
+
+    def __init__(self, session: AsyncSession, cargar_lote: CargarLote):
+        self.session = session
+        self._cargar_lote = cargar_lote
+        self._memoria: Dict[K, asyncio.Future] = {}
+        self._pendientes: List[K] = []
+        self._despacho: Optional[asyncio.Task] = None
+
+    async def cargar(self, clave: K) -> Optional[V]:
+        futuro = self._memoria.get(clave)
+        if futuro is None:
+            loop = asyncio.get_running_loop()
+            futuro = self._memoria[clave] = loop.create_future()
+            self._pendientes.append(clave)
+            if self._despacho is None:
+                # La tarea corre después de las corrutinas ya listas en este ciclo:
+                # las claves que pidan se suman al mismo lote
+                self._despacho = loop.create_task(self._despachar())
+        # shield: cancelar a quien espera no debe cancelar la carga de los demás
+        return await asyncio.shield(futuro)
+
+    async def cargar_muchos(self, claves: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.cargar(clave) for clave in claves)))
+
+    def primar(self, clave: K, valor: Optional[V]) -> None:
+        """Guarda (o reemplaza) el valor de una clave ya conocido por el repositorio."""
+        futuro = self._memoria.get(clave)
+        if futuro is not None and not futuro.done():
+            return  # Hay una carga en curso: su resultado llegará igual
+        futuro = asyncio.get_running_loop().create_future()
+        futuro.set_result(valor)
+        self._memoria[clave] = futuro
+
+    def olvidar(self, clave: K) -> None:
+        futuro = self._memoria.get(clave)
+        if futuro is not None and futuro.done():
+            del self._memoria[clave]
+
+    def limpiar(self) -> None:
+        self._memoria = {clave: f for clave, f in self._memoria.items() if not f.done()}
+
+    async def _despachar(self) -> None:
+        claves, self._pendientes = self._pendientes, []
+        futuros = [self._memoria[clave] for clave in claves]
+        self._despacho = None
+        try:
+            encontrados = await self._cargar_lote(self.session, claves)
+        except BaseException as e:
+            for clave, futuro in zip(claves, futuros):
+                if self._memoria.get(clave) is futuro:
+                    del self._memoria[clave]  # No se memoizan los errores
+                if not futuro.done():
+                    futuro.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for clave, futuro in zip(claves, futuros):
+            if not futuro.done():
+                futuro.set_result(encontrados.get(clave))
+
+
+def en_mapa_de_identidad(session: AsyncSession, modelo: type, ids: List[Any]) -> Tuple[Dict[Any, Any], List[Any]]:
+    """
+    Separa las instancias ya presentes en el mapa de identidad de la sesión (las
+    que `session.get` retornaría sin consultar) de los ids que hay que cargar.
+    """
+    encontrados, faltantes = {}, []
+    for id_ in ids:
+        instancia = session.identity_map.get(identity_key(modelo, id_))
+        if instancia is not None and not inspect(instancia).expired_attributes:
+            encontrados[id_] = instancia
+        else:
+            faltantes.append(id_)
+    return encontrados, faltantes
+
+
+def _limpiar_cargadores(session, *args) -> None:
+    for existente in session.info.get(_CLAVE_INFO, {}).values():
+        existente.limpiar()
+
+
+def cargador(session: AsyncSession, nombre: str, cargar_lote: CargarLote) -> Cargador:
+    """Retorna el cargador `nombre` de la sesión, creándolo la primera vez."""
+    cargadores: Dict[str, Cargador] = session.info.get(_CLAVE_INFO)
+    if cargadores is None:
+        cargadores = session.info[_CLAVE_INFO] = {}
+        # Tras un rollback lo memoizado puede no existir ya en la BD (incluye savepoints)
+        event.listen(session.sync_session, "after_rollback", _limpiar_cargadores)
+    existente = cargadores.get(nombre)
+    if existente is None:
+        existente = cargadores[nombre] = Cargador(session, cargar_lote)
+    return existente
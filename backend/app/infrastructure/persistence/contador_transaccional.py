@@ -0,0 +1,78 @@
+"""
+Contador de asistencia ligado a la transacción de una sesión de SQLAlchemy.
+
+Los casos de uso de 'tap' ajustan el ContadorAsistencia del proceso antes de que
+el endpoint (o el lote de taps) confirme. Si el COMMIT falla o se hace rollback,
+el contador quedaría contando registros que no existen hasta volver a sembrarse.
+Con este envoltorio los ajustes se guardan en la sesión y se aplican tras el
+COMMIT; un rollback (incluidos los savepoints) descarta el resumen de las
+sesiones afectadas, que se vuelve a sembrar desde la base de datos.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.contador_asistencia import ContadorAsistencia, get_contador_asistencia
+from app.domain.entities.registro_asistencia import EstadoAsistencia, ResumenAsistenciaSesion
+
+_CLAVE_INFO = "aulatap_contador_pendientes"
+
+# (al confirmar, al deshacer)
+_Pendiente = Tuple[Callable[[], None], Callable[[], None]]
+
+
+def _aplicar(session, *args) -> None:
+    for al_confirmar, _ in session.info.pop(_CLAVE_INFO, []):
+        al_confirmar()
+
+
+def _deshacer(session, *args) -> None:
+    for _, al_deshacer in session.info.pop(_CLAVE_INFO, []):
+        al_deshacer()
+
+
+def _pendientes(session: AsyncSession) -> List[_Pendiente]:
+    pendientes = session.info.get(_CLAVE_INFO)
+    if pendientes is None:
+        pendientes = session.info[_CLAVE_INFO] = []
+        if not event.contains(session.sync_session, "after_commit", _aplicar):
+            event.listen(session.sync_session, "after_commit", _aplicar)
+            event.listen(session.sync_session, "after_rollback", _deshacer)
+    return pendientes
+
+
+class ContadorTransaccional(ContadorAsistencia):
+    """ContadorAsistencia cuyos ajustes esperan al COMMIT de la sesión."""
+
+    def __init__(self, session: AsyncSession, contador: ContadorAsistencia):
+        # Sin estado propio: lecturas y siembras van al contador del proceso
+        self.session = session
+        self.contador = contador
+
+    def obtener(self, sesion_id: int) -> Optional[ResumenAsistenciaSesion]:
+        return self.contador.obtener(sesion_id)
+
+    def sembrar(self, resumen: ResumenAsistenciaSesion) -> None:
+        self.contador.sembrar(resumen)
+
+    def registrar(self, sesion_id: int,
+                  estado_anterior: Optional[EstadoAsistencia],
+                  estado_nuevo: EstadoAsistencia) -> None:
+        _pendientes(self.session).append((
+            lambda: self.contador.registrar(sesion_id, estado_anterior, estado_nuevo),
+            lambda: self.contador.descartar(sesion_id)
+        ))
+
+    def descartar(self, sesion_id: int) -> None:
+        # Ya (nadie siembra con el cambio a medias) y otra vez tras el COMMIT
+        self.contador.descartar(sesion_id)
+        descartar = lambda: self.contador.descartar(sesion_id)
+        _pendientes(self.session).append((descartar, descartar))
+
+
+def get_contador_de_sesion(session: AsyncSession) -> Optional[ContadorAsistencia]:
+    """Contador para los casos de uso que escriben con `session`, o None si está desactivado."""
+    contador = get_contador_asistencia()
+    return ContadorTransaccional(session, contador) if contador is not None else None
@@ -12,8 +12,12 @@ from .clase_programada import ClaseProgramada
 from .inscripcion import Inscripcion
 from .sesion_de_clase import SesionDeClase
 from .registro_asistencia import RegistroAsistencia
+from .mensaje_saliente import MensajeSaliente
+from .trabajo import Trabajo
 
 # Importa los Enums si deseas que sean accesibles
 # directamente desde 'models'
 from .sesion_de_clase import EstadoSesion
-from .registro_asistencia import EstadoAsistencia
\ No newline at end of file
+from .registro_asistencia import EstadoAsistencia
+from .mensaje_saliente import EstadoMensaje
+from .trabajo import EstadoTrabajo
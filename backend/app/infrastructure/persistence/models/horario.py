@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import VARCHAR, TIME
+from sqlalchemy import VARCHAR, TIME, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 from typing import List
@@ -7,6 +7,10 @@ from typing import List
 
 class Horario(Base):
     __tablename__ = "Horario"
+    __table_args__ = (
+        # Orden de list_all (paginación por cursor)
+        Index("ix_Horario_dia_semana_hora_inicio_id", "dia_semana", "hora_inicio", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     dia_semana: Mapped[str] = mapped_column(VARCHAR(10))
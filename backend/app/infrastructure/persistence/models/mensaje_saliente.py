@@ -0,0 +1,52 @@
+"""
+Modelo SQLAlchemy para MensajeSaliente (bandeja de salida / transactional outbox).
+
+Cada fila es un mensaje para un sistema externo (SAP, correo...) escrito en la misma
+transacción que el cambio que lo origina; un procesador de fondo lo entrega.
+"""
+import enum
+import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import TIMESTAMP, VARCHAR, BigInteger, Enum, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+class EstadoMensaje(enum.Enum):
+    Pendiente = "Pendiente"
+    Enviando = "Enviando"
+    Enviado = "Enviado"
+    Fallido = "Fallido"
+
+
+class MensajeSaliente(Base):
+    __tablename__ = "MensajeSaliente"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    destino: Mapped[str] = mapped_column(VARCHAR(30))
+    tipo: Mapped[str] = mapped_column(VARCHAR(50))
+    # Clave de idempotencia para el destino (p. ej. "sesion:42")
+    clave: Mapped[str] = mapped_column(VARCHAR(100))
+    datos: Mapped[Dict[str, Any]] = mapped_column(JSONB)
+    estado: Mapped[EstadoMensaje] = mapped_column(Enum(EstadoMensaje), default=EstadoMensaje.Pendiente)
+    intentos: Mapped[int] = mapped_column(Integer, default=0)
+    creado_en: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, default=datetime.datetime.utcnow)
+    # Próximo intento; mientras un procesador tiene el mensaje reservado ("Enviando"), fin de la reserva
+    disponible_en: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, default=datetime.datetime.utcnow)
+    enviado_en: Mapped[Optional[datetime.datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    ultimo_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        # Solo los activos: el índice no crece con el histórico de enviados
+        Index(
+            "ix_MensajeSaliente_pendientes", "destino", "disponible_en", "id",
+            postgresql_where=text("estado IN ('Pendiente', 'Enviando')")
+        ),
+        # Un solo pendiente por clave: los mensajes acumulables (resúmenes) se fusionan en él.
+        # Los que se están enviando no cuentan: lo que llegue entonces va a un mensaje nuevo
+        Index(
+            "ux_MensajeSaliente_clave_pendiente", "destino", "clave",
+            unique=True, postgresql_where=text("estado = 'Pendiente'")
+        ),
+    )
@@ -1,7 +1,8 @@
 import enum
 import datetime
-from sqlalchemy import TIMESTAMP, VARCHAR, Enum, ForeignKey
+from sqlalchemy import TIMESTAMP, VARCHAR, Enum, ForeignKey, Index, DDL, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import UserDefinedType
 from .base import Base
 from typing import Optional
 
@@ -12,10 +13,38 @@ class EstadoAsistencia(enum.Enum):
     Tarde = "Tarde"
 
 
+# Canal de LISTEN/NOTIFY por el que se avisa (con el ID de la sesión) de cada cambio
+CANAL_CAMBIOS = "registro_asistencia_cambios"
+
+
+class Xid8(UserDefinedType):
+    """Tipo `xid8` de PostgreSQL (ID de transacción de 64 bits, PostgreSQL 13+)."""
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
+
+
+class PgSnapshot(UserDefinedType):
+    """Tipo `pg_snapshot` (instantánea de transacciones en curso); su texto es 'xmin:xmax:xip,...'."""
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "pg_snapshot"
+
+
 class RegistroAsistencia(Base):
+    """
+    Tabla particionada por rango mensual de `fecha_sesion` (hora de inicio de la
+    sesión). Las particiones las gestiona Alembic y el script archivar_asistencia.py;
+    ver app/infrastructure/persistence/particiones.py.
+    """
     __tablename__ = "RegistroAsistencia"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # En una PK compuesta SQLAlchemy no asume SERIAL: se declara explícitamente
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Clave de partición: la PK debe incluirla
+    fecha_sesion: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, primary_key=True)
     hora_entrada: Mapped[Optional[datetime.datetime]] = mapped_column(
         TIMESTAMP, nullable=True
     )
@@ -29,10 +58,55 @@ class RegistroAsistencia(Base):
     id_sesion_clase: Mapped[int] = mapped_column(ForeignKey("SesionDeClase.id"))
     id_estudiante: Mapped[int] = mapped_column(ForeignKey("Estudiante.id"))
 
+    # Transacción que escribió la fila por última vez (DEFAULT en el INSERT, trigger en
+    # el UPDATE): la base del feed de cambios de una sesión. NULL en las filas
+    # anteriores a la columna, que cualquier cliente ya ha visto. Solo se usa en SQL.
+    xid_cambio: Mapped[Optional[str]] = mapped_column(
+        Xid8, nullable=True, server_default=text("pg_current_xact_id()"), deferred=True
+    )
+
+    __table_args__ = (
+        Index("ix_RegistroAsistencia_sesion_estudiante", "id_sesion_clase", "id_estudiante"),
+        Index("ix_RegistroAsistencia_sesion_xid_cambio", "id_sesion_clase", "xid_cambio"),
+        {"postgresql_partition_by": "RANGE (fecha_sesion)"},
+    )
+
     # Relaciones N-1
     sesion_de_clase: Mapped["SesionDeClase"] = relationship(
         "SesionDeClase", back_populates="asistencias"
     )
     estudiante: Mapped["Estudiante"] = relationship(
         "Estudiante", back_populates="asistencias"
-    )
\ No newline at end of file
+    )
+
+
+# Con `init_db()` (create_all, solo desarrollo) no se crean particiones mensuales:
+# la partición DEFAULT recibe todas las filas para que los inserts no fallen.
+event.listen(
+    RegistroAsistencia.__table__,
+    "after_create",
+    DDL(
+        'CREATE TABLE IF NOT EXISTS "RegistroAsistencia_default" '
+        'PARTITION OF "RegistroAsistencia" DEFAULT'
+    ).execute_if(dialect="postgresql"),
+)
+
+# Misma función y trigger que crea la migración del feed de cambios
+FUNCION_CAMBIO = f"""
+CREATE OR REPLACE FUNCTION registro_asistencia_cambio() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        NEW.xid_cambio := pg_current_xact_id();
+    END IF;
+    -- PostgreSQL entrega el aviso al confirmar y une los repetidos de una transacción
+    PERFORM pg_notify('{CANAL_CAMBIOS}', NEW.id_sesion_clase::text);
+    RETURN NEW;
+END $$
+"""
+TRIGGER_CAMBIO = (
+    'CREATE TRIGGER "RegistroAsistencia_cambio" BEFORE INSERT OR UPDATE ON "RegistroAsistencia" '
+    "FOR EACH ROW EXECUTE FUNCTION registro_asistencia_cambio()"
+)
+event.listen(RegistroAsistencia.__table__, "after_create", DDL(FUNCION_CAMBIO).execute_if(dialect="postgresql"))
+event.listen(RegistroAsistencia.__table__, "after_create", DDL(TRIGGER_CAMBIO).execute_if(dialect="postgresql"))
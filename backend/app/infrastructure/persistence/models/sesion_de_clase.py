@@ -30,6 +30,8 @@ class SesionDeClase(Base):
     # --- CAMPOS ORIGINALES ---
     hora_inicio: Mapped[datetime.datetime] = mapped_column(TIMESTAMP)
     hora_fin: Mapped[Optional[datetime.datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    # Cuándo dejó de estar EnProgreso (de aceptar taps): acota la sesión en curso a una hora dada
+    hora_fin_progreso: Mapped[Optional[datetime.datetime]] = mapped_column(TIMESTAMP, nullable=True)
     estado: Mapped[EstadoSesion] = mapped_column(
         Enum(EstadoSesion, name="estadosesion", create_type=False), default=EstadoSesion.EnProgreso
     )
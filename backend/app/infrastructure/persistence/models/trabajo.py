@@ -0,0 +1,54 @@
+"""
+Modelo SQLAlchemy para Trabajo (cola de trabajos en segundo plano).
+
+Cada fila es una operación pesada (p. ej. completar el cierre de una sesión) que
+una petición encola en su transacción y ejecutan los workers de los procesos de
+la API (SELECT ... FOR UPDATE SKIP LOCKED).
+"""
+import enum
+import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import TIMESTAMP, VARCHAR, BigInteger, Enum, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+class EstadoTrabajo(enum.Enum):
+    Pendiente = "Pendiente"
+    EnCurso = "EnCurso"
+    Completado = "Completado"
+    Fallido = "Fallido"
+
+
+class Trabajo(Base):
+    __tablename__ = "Trabajo"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    tipo: Mapped[str] = mapped_column(VARCHAR(50))
+    parametros: Mapped[Dict[str, Any]] = mapped_column(JSONB)
+    estado: Mapped[EstadoTrabajo] = mapped_column(Enum(EstadoTrabajo), default=EstadoTrabajo.Pendiente)
+    progreso_actual: Mapped[int] = mapped_column(Integer, default=0)
+    progreso_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    intentos: Mapped[int] = mapped_column(Integer, default=0)
+    creado_en: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, default=datetime.datetime.utcnow)
+    # Pendiente: cuándo puede empezar (reintentos). EnCurso: fin de la reserva del worker,
+    # que la renueva mientras trabaja; si caduca (el worker murió) otro lo retoma
+    disponible_en: Mapped[datetime.datetime] = mapped_column(TIMESTAMP, default=datetime.datetime.utcnow)
+    iniciado_en: Mapped[Optional[datetime.datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    terminado_en: Mapped[Optional[datetime.datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    ultimo_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    resultado: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+
+    id_usuario: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("Usuario.id", ondelete="SET NULL"), nullable=True
+    )
+
+    __table_args__ = (
+        # Solo los activos: el índice no crece con el histórico de terminados
+        Index(
+            "ix_Trabajo_activos", "disponible_en", "id",
+            postgresql_where=text("estado IN ('Pendiente', 'EnCurso')")
+        ),
+        Index("ix_Trabajo_usuario", "id_usuario", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import VARCHAR
+from sqlalchemy import VARCHAR, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 from typing import List
@@ -6,6 +6,10 @@ from typing import List
 
 class Usuario(Base):
     __tablename__ = "Usuario"
+    __table_args__ = (
+        # Orden de list_all (paginación por cursor)
+        Index("ix_Usuario_nombre_completo_id", "nombre_completo", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     nombre_completo: Mapped[str] = mapped_column(VARCHAR(50))
@@ -0,0 +1,79 @@
+"""
+Paginación por cursor (keyset) para los repositorios SQLAlchemy.
+
+En lugar de OFFSET, cada página continúa "después" de la clave de ordenación de la
+última fila de la anterior: WHERE (a, b, id) > (:a, :b, :id) ORDER BY a, b, id LIMIT n.
+Con un índice sobre (a, b, id) el coste de cada página es constante.
+"""
+
+import datetime
+import enum
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.exceptions import ValidationException
+from app.utils.cursor import codificar_cursor, decodificar_cursor
+
+
+def _a_json(valor: Any) -> Any:
+    if isinstance(valor, (datetime.date, datetime.time)):
+        return valor.isoformat()
+    return getattr(valor, "value", valor)  # Enums
+
+
+def _de_json(columna: InstrumentedAttribute, valor: Any) -> Any:
+    """Inverso de `_a_json` según el tipo de la columna; ValueError/TypeError si no encaja."""
+    tipo = columna.type.python_type
+    if issubclass(tipo, (datetime.date, datetime.time)):
+        # datetime hereda de date: fromisoformat del propio tipo
+        if not isinstance(valor, str):
+            raise TypeError(valor)
+        return tipo.fromisoformat(valor)
+    if issubclass(tipo, enum.Enum):
+        return tipo(valor)
+    if tipo is float and isinstance(valor, int) and not isinstance(valor, bool):
+        return float(valor)
+    # bool es subclase de int: un cursor con true no es un ID
+    if not isinstance(valor, tipo) or (tipo is int and isinstance(valor, bool)):
+        raise TypeError(valor)
+    return valor
+
+
+async def paginar(
+    session: AsyncSession,
+    stmt: Select,
+    orden: Sequence[InstrumentedAttribute],
+    limite: int,
+    cursor: Optional[str] = None,
+    descendente: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Ejecuta `stmt` (un SELECT de un modelo) paginado por las columnas `orden`,
+    cuya última debe ser única (normalmente el ID). Con `descendente`, todas las
+    columnas se recorren de mayor a menor (p. ej. los más recientes primero).
+
+    Los valores del cursor se validan contra el tipo de cada columna de `orden`: un
+    cursor bien formado pero manipulado da ValidationException, no un error de la BD.
+    Retorna (modelos de la página, cursor de la siguiente o None).
+    """
+    if cursor:
+        try:
+            valores = [_de_json(col, v) for col, v in zip(orden, decodificar_cursor(cursor, len(orden)))]
+        except (TypeError, ValueError):
+            raise ValidationException("Cursor de paginación inválido.")
+        clave = tuple_(*orden)
+        stmt = stmt.where(clave < tuple(valores) if descendente else clave > tuple(valores))
+
+    # Una fila de más indica si hay página siguiente, sin un COUNT aparte
+    stmt = stmt.order_by(*(col.desc() if descendente else col for col in orden)).limit(limite + 1)
+    filas = list((await session.execute(stmt)).scalars().all())
+
+    siguiente_cursor = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        ultima = filas[-1]
+        siguiente_cursor = codificar_cursor([_a_json(getattr(ultima, col.key)) for col in orden])
+    return filas, siguiente_cursor
@@ -0,0 +1,182 @@
+"""
+Gestión de particiones de "RegistroAsistencia".
+
+La tabla está particionada por RANGE mensual sobre `fecha_sesion`:
+
+    "RegistroAsistencia_p2025_11"  FOR VALUES FROM ('2025-11-01') TO ('2025-12-01')
+    "RegistroAsistencia_default"   DEFAULT
+
+Así el índice (id_sesion_clase, id_estudiante) de las particiones recientes
+mantiene un tamaño estable: el histórico se desengancha (DETACH) y se archiva.
+
+Si el mantenimiento no se ejecuta a tiempo, las filas de un mes sin partición
+caen en la DEFAULT, y PostgreSQL ya no permite crear esa partición mientras la
+DEFAULT tenga filas de su rango. `crear_particion` las mueve a la partición nueva
+(desenganchando y volviendo a enganchar la DEFAULT en la misma transacción), y
+`crear_particiones_futuras` crea también las de los meses atrasados.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.logger import logger
+
+TABLA = "RegistroAsistencia"
+TABLA_DEFAULT = f"{TABLA}_default"
+ESQUEMA_ARCHIVO = "archivo"
+TABLA_FRIA = "RegistroAsistenciaHistorico"
+
+_NOMBRE_RE = re.compile(rf"^{TABLA}_p(\d{{4}})_(\d{{2}})$")
+
+ModoArchivo = Literal["detach", "frio"]
+
+
+@dataclass(frozen=True)
+class ParticionMensual:
+    """Partición mensual de RegistroAsistencia: [desde, hasta)."""
+    nombre: str
+    desde: date
+    hasta: date
+
+
+def sumar_meses(fecha: date, meses: int) -> date:
+    """Primer día del mes que está `meses` meses después (o antes) de `fecha`."""
+    total = fecha.year * 12 + (fecha.month - 1) + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def particion_para(fecha: date) -> ParticionMensual:
+    """Partición mensual que contiene `fecha`."""
+    desde = date(fecha.year, fecha.month, 1)
+    return ParticionMensual(
+        nombre=f"{TABLA}_p{desde.year:04d}_{desde.month:02d}",
+        desde=desde,
+        hasta=sumar_meses(desde, 1),
+    )
+
+
+async def listar_particiones(conn: AsyncConnection) -> List[ParticionMensual]:
+    """Particiones mensuales enganchadas actualmente (sin la DEFAULT), ordenadas."""
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabla"
+    ), {"tabla": TABLA})
+
+    particiones = []
+    for (nombre,) in result.all():
+        match = _NOMBRE_RE.match(nombre)
+        if match:
+            particiones.append(particion_para(date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(particiones, key=lambda p: p.desde)
+
+
+async def _tiene_default(conn: AsyncConnection) -> bool:
+    result = await conn.execute(text(
+        "SELECT 1 FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabla AND c.relname = :default"
+    ), {"tabla": TABLA, "default": TABLA_DEFAULT})
+    return result.first() is not None
+
+
+async def meses_en_default(conn: AsyncConnection) -> List[ParticionMensual]:
+    """Particiones mensuales que faltan para las filas que han caído en la DEFAULT."""
+    if not await _tiene_default(conn):
+        return []
+    result = await conn.execute(text(
+        f'SELECT DISTINCT date_trunc(\'month\', fecha_sesion)::date FROM "{TABLA_DEFAULT}"'
+    ))
+    return sorted((particion_para(mes) for (mes,) in result.all()), key=lambda p: p.desde)
+
+
+async def crear_particion(conn: AsyncConnection, particion: ParticionMensual) -> None:
+    """
+    Crea la partición mensual si no existe (hereda índices y FKs del padre). Si la
+    DEFAULT tiene filas de su rango, las mueve a la partición nueva.
+    """
+    crear = (
+        f'CREATE TABLE IF NOT EXISTS "{particion.nombre}" PARTITION OF "{TABLA}" '
+        f"FOR VALUES FROM ('{particion.desde.isoformat()}') TO ('{particion.hasta.isoformat()}')"
+    )
+    rango = {"desde": particion.desde, "hasta": particion.hasta}
+    en_default = await _tiene_default(conn) and (await conn.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM "{TABLA_DEFAULT}" WHERE fecha_sesion >= :desde AND fecha_sesion < :hasta)'
+    ), rango)).scalar()
+    if not en_default:
+        await conn.execute(text(crear))
+        return
+
+    # Con la DEFAULT desenganchada la partición se puede crear; las filas se copian
+    # con sus columnas por nombre y la DEFAULT se vuelve a enganchar sin ellas
+    columnas = ", ".join(
+        f'"{nombre}"' for (nombre,) in (await conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :tabla ORDER BY ordinal_position"
+        ), {"tabla": TABLA})).all()
+    )
+    await conn.execute(text(f'ALTER TABLE "{TABLA}" DETACH PARTITION "{TABLA_DEFAULT}"'))
+    await conn.execute(text(crear))
+    movidas = await conn.execute(text(
+        f'INSERT INTO "{particion.nombre}" ({columnas}) '
+        f'SELECT {columnas} FROM "{TABLA_DEFAULT}" WHERE fecha_sesion >= :desde AND fecha_sesion < :hasta'
+    ), rango)
+    await conn.execute(text(
+        f'DELETE FROM "{TABLA_DEFAULT}" WHERE fecha_sesion >= :desde AND fecha_sesion < :hasta'
+    ), rango)
+    await conn.execute(text(f'ALTER TABLE "{TABLA}" ATTACH PARTITION "{TABLA_DEFAULT}" DEFAULT'))
+    logger.warning(f"Partición {particion.nombre}: {movidas.rowcount} filas movidas desde {TABLA_DEFAULT}")
+
+
+async def crear_particiones_futuras(conn: AsyncConnection, hoy: date, meses_adelante: int) -> List[ParticionMensual]:
+    """
+    Asegura que existan las particiones del mes actual y de los `meses_adelante` siguientes,
+    para que las nuevas filas no caigan en la partición DEFAULT, y las de los meses
+    cuyas filas ya cayeron en ella (mantenimiento atrasado).
+    """
+    existentes = {p.nombre for p in await listar_particiones(conn)}
+    atrasadas = await meses_en_default(conn)
+    if atrasadas:
+        logger.warning(f"{TABLA_DEFAULT} tiene filas de {', '.join(p.nombre for p in atrasadas)}")
+    creadas = []
+    pendientes = atrasadas + [particion_para(sumar_meses(hoy, offset)) for offset in range(meses_adelante + 1)]
+    for particion in pendientes:
+        if particion.nombre not in existentes:
+            existentes.add(particion.nombre)
+            await crear_particion(conn, particion)
+            creadas.append(particion)
+            logger.info(f"Partición creada: {particion.nombre}")
+    return creadas
+
+
+async def archivar_particion(conn: AsyncConnection, particion: ParticionMensual, modo: ModoArchivo) -> None:
+    """
+    Desengancha una partición antigua de RegistroAsistencia.
+
+    - "detach": la partición se mueve tal cual al esquema `archivo` (consultable, fuera del hot path).
+    - "frio":   sus filas se copian a `archivo."RegistroAsistenciaHistorico"` (tabla única,
+                compacta y sin los índices del hot path) y la partición se elimina.
+    """
+    await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ESQUEMA_ARCHIVO}"))
+    await conn.execute(text(f'ALTER TABLE "{TABLA}" DETACH PARTITION "{particion.nombre}"'))
+
+    if modo == "detach":
+        await conn.execute(text(f'ALTER TABLE "{particion.nombre}" SET SCHEMA {ESQUEMA_ARCHIVO}'))
+    else:
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {ESQUEMA_ARCHIVO}."{TABLA_FRIA}" '
+            f'(LIKE "{particion.nombre}") WITH (fillfactor = 100)'
+        ))
+        await conn.execute(text(
+            f'INSERT INTO {ESQUEMA_ARCHIVO}."{TABLA_FRIA}" SELECT * FROM "{particion.nombre}"'
+        ))
+        await conn.execute(text(f'DROP TABLE "{particion.nombre}"'))
+
+    logger.info(f"Partición archivada ({modo}): {particion.nombre}")
@@ -0,0 +1,97 @@
+"""
+Precarga de consultas independientes en un único viaje de red (modo pipeline de psycopg).
+
+Con AsyncSession cada `execute` espera su resultado antes de enviar la siguiente
+sentencia: N lecturas cuestan N viajes de ida y vuelta a PostgreSQL. En modo
+pipeline psycopg envía todas las sentencias seguidas y lee los resultados al
+final, así que N lecturas independientes cuestan un solo viaje.
+
+Las consultas (`ConsultaSQL`) son SELECT de columnas planas, preconstruidas a nivel
+de módulo con `bindparam`: se compilan una vez por dialecto y las filas se
+convierten a entidades de dominio con la función de cada consulta. Si el driver
+no soporta el modo pipeline (p. ej. libpq < 14), se ejecutan una tras otra por la
+sesión, con el mismo resultado.
+"""
+
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Compiled, Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper
+
+from app.domain.repositories.precarga import ConsultaPrecargable, IPrecargador
+
+try:
+    from psycopg import AsyncConnection as PsycopgAsyncConnection, Pipeline
+    from psycopg.rows import dict_row
+except ImportError:  # pragma: no cover - psycopg es el driver de la aplicación
+    PsycopgAsyncConnection = None
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ConsultaSQL(ConsultaPrecargable[T]):
+    """Sentencia preconstruida, sus parámetros y la conversión de sus filas al resultado."""
+    sentencia: Select
+    parametros: Mapping[str, Any]
+    convertir: Callable[[List[Mapping[str, Any]]], T]
+
+
+def columnas_con_prefijo(mapper: Mapper, prefijo: str) -> list:
+    """Columnas de un modelo etiquetadas `<prefijo><atributo>`, para SELECT con varios modelos."""
+    return [atributo.expression.label(f"{prefijo}{atributo.key}") for atributo in mapper.column_attrs]
+
+
+def sin_prefijo(fila: Mapping[str, Any], prefijo: str) -> Dict[str, Any]:
+    """Los valores de `fila` cuyas claves empiezan por `prefijo`, sin él."""
+    return {clave[len(prefijo):]: valor for clave, valor in fila.items() if clave.startswith(prefijo)}
+
+
+class SQLAlchemyPrecargador(IPrecargador):
+    """Implementación de IPrecargador sobre la conexión de la sesión (misma transacción)."""
+
+    # Compilación por (sentencia, dialecto): las sentencias son constantes de módulo
+    _compiladas: Dict[Tuple[int, str], Compiled] = {}
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @classmethod
+    def _compilar(cls, sentencia: Select, dialecto: Dialect) -> Compiled:
+        clave = (id(sentencia), dialecto.name)
+        compilada = cls._compiladas.get(clave)
+        if compilada is None:
+            compilada = cls._compiladas[clave] = sentencia.compile(dialect=dialecto)
+        return compilada
+
+    async def precargar(self, *consultas: ConsultaPrecargable[Any]) -> Tuple[Any, ...]:
+        conexion = await self.session.connection()
+        driver = (await conexion.get_raw_connection()).driver_connection
+
+        if PsycopgAsyncConnection is not None and isinstance(driver, PsycopgAsyncConnection) and Pipeline.is_supported():
+            filas = await self._en_pipeline(driver, conexion.dialect, consultas)
+        else:
+            filas = [
+                (await self.session.execute(c.sentencia, dict(c.parametros))).mappings().all()
+                for c in consultas
+            ]
+        return tuple(consulta.convertir(resultado) for consulta, resultado in zip(consultas, filas))
+
+    async def _en_pipeline(self, driver, dialecto: Dialect, consultas: Sequence[ConsultaSQL]) -> List[List[dict]]:
+        # Las sentencias se compilan a SQL del driver (psycopg, parámetros %(nombre)s);
+        # los valores van tal cual (enteros y cadenas): no hay tipos que adaptar
+        # Los cursores se cierran al terminar, también si una sentencia falla
+        async with AsyncExitStack() as abiertos:
+            cursores = []
+            async with driver.pipeline():
+                for consulta in consultas:
+                    compilada = self._compilar(consulta.sentencia, dialecto)
+                    cursor = await abiertos.enter_async_context(driver.cursor(row_factory=dict_row))
+                    await cursor.execute(compilada.string, compilada.construct_params(dict(consulta.parametros)))
+                    cursores.append(cursor)
+            # Al salir del bloque el pipeline se sincroniza: todos los resultados están en memoria
+            return [await cursor.fetchall() for cursor in cursores]
@@ -12,6 +12,9 @@ from .sesion_de_clase_repository_impl import SesionDeClaseRepositoryImpl
 from .registro_asistencia_repository_impl import RegistroAsistenciaRepositoryImpl
 from .inscripcion_repository_impl import InscripcionRepositoryImpl
 from .clase_programada_repository_impl import ClaseProgramadaRepositoryImpl
+from .analitica_asistencia_repository_impl import AnaliticaAsistenciaRepositoryImpl
+from .bandeja_salida_repository_impl import BandejaSalidaRepositoryImpl
+from .trabajo_repository_impl import TrabajoRepositoryImpl
 
 __all__ = [
     "UsuarioRepositoryImpl",
@@ -22,4 +25,7 @@ __all__ = [
     "RegistroAsistenciaRepositoryImpl",
     "InscripcionRepositoryImpl",
     "ClaseProgramadaRepositoryImpl",
+    "AnaliticaAsistenciaRepositoryImpl",
+    "BandejaSalidaRepositoryImpl",
+    "TrabajoRepositoryImpl",
 ]
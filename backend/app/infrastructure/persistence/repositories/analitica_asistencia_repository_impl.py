@@ -0,0 +1,74 @@
+"""
+Implementación Concreta del Repositorio de Analítica de Asistencia usando SQLAlchemy.
+"""
+
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import select, case, extract, cast, Float, SmallInteger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories.analitica_asistencia_repository import IAnaliticaAsistenciaRepository, FilaAsistencia
+from app.infrastructure.persistence.models.registro_asistencia import RegistroAsistencia as AsistenciaModel, EstadoAsistencia
+from app.infrastructure.persistence.models.sesion_de_clase import SesionDeClase as SesionModel
+from app.infrastructure.persistence.models.estudiante import Estudiante as EstudianteModel
+
+
+class AnaliticaAsistenciaRepositoryImpl(IAnaliticaAsistenciaRepository):
+    """Implementación de IAnaliticaAsistenciaRepository con SQLAlchemy."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def iter_lotes(
+        self,
+        id_asignaturas: List[int],
+        desde: datetime,
+        hasta: datetime,
+        id_estudiante: Optional[int] = None,
+        tam_lote: int = 5000,
+    ) -> AsyncIterator[List[FilaAsistencia]]:
+        if not id_asignaturas:
+            return
+
+        # El estado y los minutos de llegada se calculan en SQL: en Python solo
+        # llegan tuplas de números, listas para convertirse en columnas NumPy.
+        codigo_estado = case(
+            (AsistenciaModel.estado_asistencia == EstadoAsistencia.Presente, 0),
+            (AsistenciaModel.estado_asistencia == EstadoAsistencia.Tarde, 1),
+            else_=2,
+        )
+        minutos_llegada = extract("epoch", AsistenciaModel.hora_entrada - AsistenciaModel.fecha_sesion) / 60
+
+        stmt = (
+            select(
+                AsistenciaModel.id_estudiante,
+                SesionModel.id_clase,
+                AsistenciaModel.id_sesion_clase,
+                cast(codigo_estado, SmallInteger),
+                cast(minutos_llegada, Float),
+            )
+            .join(SesionModel, SesionModel.id == AsistenciaModel.id_sesion_clase)
+            .where(
+                SesionModel.id_clase.in_(id_asignaturas),
+                # Filtrar por la clave de partición poda los meses fuera del periodo
+                AsistenciaModel.fecha_sesion >= desde,
+                AsistenciaModel.fecha_sesion < hasta,
+            )
+        )
+        if id_estudiante is not None:
+            stmt = stmt.where(AsistenciaModel.id_estudiante == id_estudiante)
+
+        # Cursor del lado del servidor: memoria acotada a un lote
+        result = await self.session.stream(stmt.execution_options(yield_per=tam_lote))
+        async for lote in result.partitions(tam_lote):
+            yield [tuple(fila) for fila in lote]
+
+    async def nombres_estudiantes(self, ids_estudiantes: List[int]) -> Dict[int, str]:
+        if not ids_estudiantes:
+            return {}
+        stmt = select(EstudianteModel.id, EstudianteModel.nombre_completo).where(
+            EstudianteModel.id.in_(ids_estudiantes)
+        )
+        result = await self.session.execute(stmt)
+        return {id_estudiante: nombre for id_estudiante, nombre in result.all()}
@@ -2,8 +2,8 @@
 Implementación Concreta del Repositorio de Asignaturas usando SQLAlchemy.
 """
 
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Dict, Optional, List
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import exists
 
@@ -12,22 +12,39 @@ from app.domain.repositories.asignatura_repository import IAsignaturaRepository
 from app.infrastructure.persistence.models.asignatura import Asignatura as AsignaturaModel
 from app.infrastructure.persistence.models.inscripcion import Inscripcion as InscripcionModel
 from app.infrastructure.persistence.models.clase_programada import ClaseProgramada as ClaseProgramadaModel
+from app.infrastructure.persistence.cargadores import Cargador, cargador, en_mapa_de_identidad
+
+_ASIGNATURAS_POR_IDS = select(AsignaturaModel).where(AsignaturaModel.id.in_(bindparam("ids", expanding=True)))
+
+
+# Carga por lotes del cargador de la petición (ver app/infrastructure/persistence/cargadores.py)
+async def _cargar_por_ids(session: AsyncSession, ids: List[int]) -> Dict[int, Asignatura]:
+    # Como session.get: lo ya cargado en la sesión no se vuelve a consultar
+    cargados, faltantes = en_mapa_de_identidad(session, AsignaturaModel, ids)
+    if faltantes:
+        result = await session.execute(_ASIGNATURAS_POR_IDS, {"ids": faltantes})
+        cargados.update((a.id, a) for a in result.scalars())
+    return {id_: Asignatura.model_validate(a) for id_, a in cargados.items()}
+
 
 class AsignaturaRepositoryImpl(IAsignaturaRepository):
     """Implementación de IAsignaturaRepository con SQLAlchemy."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._por_id: Cargador[int, Asignatura] = cargador(session, "asignatura", _cargar_por_ids)
 
     async def get_by_id(self, asignatura_id: int) -> Optional[Asignatura]:
-        result = await self.session.get(AsignaturaModel, asignatura_id)
-        return Asignatura.model_validate(result) if result else None
+        return await self._por_id.cargar(asignatura_id)
 
     async def list_by_docente(self, docente_id: int) -> List[Asignatura]:
         stmt = select(AsignaturaModel).where(AsignaturaModel.id_docente == docente_id).order_by(AsignaturaModel.nombre_materia)
         result = await self.session.execute(stmt)
         db_asignaturas = result.scalars().all()
-        return [Asignatura.model_validate(a) for a in db_asignaturas]
+        asignaturas = [Asignatura.model_validate(a) for a in db_asignaturas]
+        for asignatura in asignaturas:
+            self._por_id.primar(asignatura.id, asignatura)
+        return asignaturas
 
     async def create(self, asignatura_create: AsignaturaCreate) -> Asignatura:
         db_asignatura = AsignaturaModel(
@@ -38,7 +55,9 @@ class AsignaturaRepositoryImpl(IAsignaturaRepository):
         self.session.add(db_asignatura)
         await self.session.flush()
         await self.session.refresh(db_asignatura)
-        return Asignatura.model_validate(db_asignatura)
+        asignatura = Asignatura.model_validate(db_asignatura)
+        self._por_id.primar(asignatura.id, asignatura)
+        return asignatura
 
     async def esta_estudiante_inscrito(self, id_asignatura: int, id_estudiante: int) -> bool:
         """Verifica si un estudiante está inscrito en una asignatura."""
@@ -0,0 +1,183 @@
+"""
+Implementación Concreta del Repositorio de la Bandeja de Salida usando SQLAlchemy.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import select, update, delete, bindparam, case, func, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.mensaje_saliente import MensajeSaliente, MensajeSalienteCreate
+from app.domain.repositories.bandeja_salida_repository import IBandejaSalidaRepository, FalloEnvio
+from app.infrastructure.persistence.models.mensaje_saliente import (
+    MensajeSaliente as MensajeModel, EstadoMensaje as EstadoMensajeModel
+)
+
+# Candidatos del lote: recorre el índice parcial de activos. SKIP LOCKED: los
+# procesadores de otros workers toman filas distintas en lugar de esperarse. Uno
+# "Enviando" con la reserva caducada es de un procesador que murió: se retoma
+_CANDIDATOS = (
+    select(MensajeModel.id)
+    .where(
+        MensajeModel.destino == bindparam("b_destino"),
+        MensajeModel.estado.in_([EstadoMensajeModel.Pendiente, EstadoMensajeModel.Enviando]),
+        MensajeModel.disponible_en <= bindparam("ahora")
+    )
+    .order_by(MensajeModel.disponible_en, MensajeModel.id)
+    .limit(bindparam("limite"))
+    .with_for_update(skip_locked=True)
+)
+
+_RESERVAR_LOTE = (
+    update(MensajeModel)
+    .where(MensajeModel.id.in_(_CANDIDATOS.scalar_subquery()))
+    .values(
+        estado=EstadoMensajeModel.Enviando,  # Sale del índice único: `acumular` ya no lo modifica
+        intentos=MensajeModel.intentos + 1,
+        disponible_en=bindparam("reservado_hasta")
+    )
+    .returning(MensajeModel)
+)
+
+# Reserva de un mensaje: su id y el intento con el que se reservó (cada reserva suma uno)
+_RESERVA = tuple_(MensajeModel.id, MensajeModel.intentos)
+
+# Mensajes cuya reserva sigue siendo de este procesador. Si caducó y otro procesador lo
+# retomó, el intento ya es otro: su resultado no se toca. Quedan bloqueados hasta el commit
+_RESERVAS_VIGENTES = (
+    select(MensajeModel.id)
+    .where(
+        _RESERVA.in_(bindparam("reservas", expanding=True)),
+        MensajeModel.estado == EstadoMensajeModel.Enviando
+    )
+    .with_for_update()
+)
+
+# Resúmenes: un solo pendiente por (destino, clave); si ya existe se fusionan sus
+# "eventos" con los nuevos (el resto de `datos` se toma del nuevo)
+_insertar = pg_insert(MensajeModel)
+_ACUMULAR = _insertar.on_conflict_do_update(
+    index_elements=[MensajeModel.destino, MensajeModel.clave],
+    index_where=text("estado = 'Pendiente'"),  # Literal: debe coincidir con el predicado del índice
+    set_={
+        "datos": _insertar.excluded.datos.op("||", return_type=JSONB)(
+            func.jsonb_build_object(
+                "eventos",
+                MensajeModel.datos["eventos"].op("||", return_type=JSONB)(_insertar.excluded.datos["eventos"])
+            )
+        )
+    }
+)
+
+# Un mensaje que vuelve a "Pendiente" tras un fallo no puede convivir con el pendiente
+# de su clave creado mientras se enviaba: se funde en él (sus eventos primero, los del
+# pendiente, más recientes, prevalecen) y se borra
+_pendiente = MensajeModel.__table__.alias("pendiente")
+_fallido = MensajeModel.__table__.alias("fallido")
+_FUNDIR_EN_PENDIENTES = (
+    update(_pendiente)
+    .where(
+        _pendiente.c.estado == EstadoMensajeModel.Pendiente,
+        _pendiente.c.destino == _fallido.c.destino,
+        _pendiente.c.clave == _fallido.c.clave,
+        _fallido.c.estado == EstadoMensajeModel.Enviando,
+        _fallido.c.id.in_(bindparam("ids", expanding=True))
+    )
+    .values(datos=_pendiente.c.datos.op("||", return_type=JSONB)(
+        case(
+            (_fallido.c.datos.has_key("eventos"), func.jsonb_build_object(
+                "eventos",
+                _fallido.c.datos["eventos"].op("||", return_type=JSONB)(_pendiente.c.datos["eventos"])
+            )),
+            else_=text("'{}'::jsonb")
+        )
+    ))
+    .returning(_fallido.c.id)
+)
+
+
+class BandejaSalidaRepositoryImpl(IBandejaSalidaRepository):
+    """Implementación de IBandejaSalidaRepository con SQLAlchemy."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def agregar(self, mensaje: MensajeSalienteCreate) -> None:
+        self.session.add(MensajeModel(**mensaje.model_dump()))
+        await self.session.flush()
+
+    async def acumular(self, mensajes: List[MensajeSalienteCreate], disponible_en: datetime) -> None:
+        # Una sentencia no puede fusionar dos veces la misma fila: se agrupan aquí las claves repetidas
+        filas: Dict[Tuple[str, str], dict] = {}
+        for mensaje in mensajes:
+            clave = (mensaje.destino, mensaje.clave)
+            fila = {**mensaje.model_dump(), "disponible_en": disponible_en}
+            if clave in filas:
+                fila["datos"]["eventos"] = {**filas[clave]["datos"]["eventos"], **fila["datos"]["eventos"]}
+            filas[clave] = fila
+        if filas:
+            await self.session.execute(_ACUMULAR, list(filas.values()))
+
+    async def reservar_lote(self, destino: str, limite: int, reserva_segundos: float) -> List[MensajeSaliente]:
+        ahora = datetime.utcnow()
+        result = await self.session.execute(
+            _RESERVAR_LOTE,
+            {"b_destino": destino, "ahora": ahora, "limite": limite,
+             "reservado_hasta": ahora + timedelta(seconds=reserva_segundos)},
+            execution_options={"synchronize_session": False}
+        )
+        mensajes = sorted(result.scalars().all(), key=lambda m: m.id)
+        return [MensajeSaliente.model_validate(m) for m in mensajes]
+
+    async def _vigentes(self, reservas: List[Tuple[int, int]]) -> Set[int]:
+        result = await self.session.execute(_RESERVAS_VIGENTES, {"reservas": reservas})
+        return set(result.scalars().all())
+
+    async def marcar_enviados(self, mensajes: List[MensajeSaliente]) -> None:
+        if not mensajes:
+            return
+        await self.session.execute(
+            update(MensajeModel)
+            .where(
+                _RESERVA.in_([(m.id, m.intentos) for m in mensajes]),
+                MensajeModel.estado == EstadoMensajeModel.Enviando
+            )
+            .values(estado=EstadoMensajeModel.Enviado, enviado_en=datetime.utcnow(), ultimo_error=None),
+            execution_options={"synchronize_session": False}
+        )
+
+    async def registrar_fallos(self, fallos: List[FalloEnvio]) -> None:
+        if not fallos:
+            return
+        # Solo los que siguen reservados por este procesador, bloqueados para el resto del registro
+        vigentes = await self._vigentes([(f.id, f.intento) for f in fallos])
+        fallos = [f for f in fallos if f.id in vigentes]
+        reintentos = [f.id for f in fallos if f.reintentar_en]
+        if reintentos:
+            result = await self.session.execute(_FUNDIR_EN_PENDIENTES, {"ids": reintentos})
+            fundidos = set(result.scalars().all())
+            if fundidos:
+                await self.session.execute(
+                    delete(MensajeModel).where(
+                        MensajeModel.id.in_(fundidos), MensajeModel.estado == EstadoMensajeModel.Enviando
+                    ),
+                    execution_options={"synchronize_session": False}
+                )
+                fallos = [f for f in fallos if f.id not in fundidos]
+        if not fallos:
+            return
+        # UPDATE por clave primaria en bloque (executemany): una ida y vuelta por lote
+        await self.session.execute(
+            update(MensajeModel).where(MensajeModel.estado == EstadoMensajeModel.Enviando),
+            [
+                {
+                    "id": f.id,
+                    "ultimo_error": f.error[:2000],
+                    "estado": EstadoMensajeModel.Pendiente if f.reintentar_en else EstadoMensajeModel.Fallido,
+                    "disponible_en": f.reintentar_en or datetime.utcnow(),
+                }
+                for f in fallos
+            ],
+            execution_options={"synchronize_session": None}
+        )
@@ -2,8 +2,8 @@
 Implementación Concreta del Repositorio de Clases Programadas usando SQLAlchemy.
 """
 
-from typing import Optional
-from sqlalchemy import select
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import select, tuple_, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload # New import
 
@@ -11,6 +11,18 @@ from app.domain.entities.clase_programada import ClaseProgramada, ClaseProgramad
 from app.domain.repositories.clase_programada_repository import IClaseProgramadaRepository
 from app.infrastructure.persistence.models.clase_programada import ClaseProgramada as ClaseProgramadaModel
 
+
+# ==================== SENTENCIAS PRECONSTRUIDAS ====================
+
+# IN sobre la clave compuesta: (id_clase, id_horario) IN ((1, 2), (3, 4), ...)
+_CLASES_PROGRAMADAS_POR_CLAVES = select(ClaseProgramadaModel).options(
+    joinedload(ClaseProgramadaModel.asignatura),
+    joinedload(ClaseProgramadaModel.horario)
+).where(
+    tuple_(ClaseProgramadaModel.id_clase, ClaseProgramadaModel.id_horario).in_(bindparam("claves", expanding=True))
+)
+
+
 class ClaseProgramadaRepositoryImpl(IClaseProgramadaRepository):
     """Implementación de IClaseProgramadaRepository con SQLAlchemy."""
 
@@ -44,3 +56,14 @@ class ClaseProgramadaRepositoryImpl(IClaseProgramadaRepository):
         result = await self.session.execute(stmt)
         db_clase_programada = result.scalars().first()
         return ClaseProgramada.model_validate(db_clase_programada) if db_clase_programada else None
+
+    async def get_many_by_keys(self, claves: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], ClaseProgramada]:
+        """Obtiene varias clases programadas por (asignatura, horario) en una sola consulta."""
+        claves = list(dict.fromkeys(claves))
+        if not claves:
+            return {}
+        result = await self.session.execute(_CLASES_PROGRAMADAS_POR_CLAVES, {"claves": claves})
+        return {
+            (db_clase_programada.id_clase, db_clase_programada.id_horario): ClaseProgramada.model_validate(db_clase_programada)
+            for db_clase_programada in result.scalars().unique()
+        }
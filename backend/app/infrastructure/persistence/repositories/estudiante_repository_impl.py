@@ -2,35 +2,82 @@
 Implementación Concreta del Repositorio de Estudiantes usando SQLAlchemy.
 """
 
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Dict, Optional, List
+from sqlalchemy import select, bindparam, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.estudiante import Estudiante, EstudianteCreate
+from app.domain.entities.pagina import Pagina
 from app.domain.repositories.estudiante_repository import IEstudianteRepository
 from app.infrastructure.persistence.models.estudiante import Estudiante as EstudianteModel
+from app.infrastructure.persistence.paginacion import paginar
+from app.infrastructure.persistence.cargadores import Cargador, cargador, en_mapa_de_identidad
+from app.infrastructure.persistence.precarga import ConsultaSQL, columnas_con_prefijo
+
+# Sentencias preconstruidas (ver sesion_de_clase_repository_impl): get_by_rfc_uid está en el camino de cada tap
+_ESTUDIANTE_POR_RFC_UID = select(EstudianteModel).where(EstudianteModel.rfc_uid == bindparam("rfc_uid"))
+_ESTUDIANTE_POR_EMAIL = select(EstudianteModel).where(EstudianteModel.email == bindparam("email"))
+_ESTUDIANTES_POR_IDS = select(EstudianteModel).where(EstudianteModel.id.in_(bindparam("ids", expanding=True)))
+_ESTUDIANTES_POR_RFC_UIDS = select(EstudianteModel).where(
+    EstudianteModel.rfc_uid.in_(bindparam("rfc_uids", expanding=True))
+)
+
+# Columnas planas para precargar (ver app/infrastructure/persistence/precarga.py)
+_COLUMNAS_ESTUDIANTE_POR_RFC_UID = select(*columnas_con_prefijo(inspect(EstudianteModel), "")).where(
+    EstudianteModel.rfc_uid == bindparam("rfc_uid")
+)
+
+
+def _estudiante_desde_filas(filas) -> Optional[Estudiante]:
+    return Estudiante.model_validate(dict(filas[0])) if filas else None
+
+
+# Cargas por lotes de los cargadores de la petición (ver app/infrastructure/persistence/cargadores.py)
+async def _cargar_por_ids(session: AsyncSession, ids: List[int]) -> Dict[int, Estudiante]:
+    # Como session.get: lo ya cargado en la sesión no se vuelve a consultar
+    cargados, faltantes = en_mapa_de_identidad(session, EstudianteModel, ids)
+    if faltantes:
+        result = await session.execute(_ESTUDIANTES_POR_IDS, {"ids": faltantes})
+        cargados.update((e.id, e) for e in result.scalars())
+    return {id_: Estudiante.model_validate(e) for id_, e in cargados.items()}
+
+
+async def _cargar_por_rfc_uids(session: AsyncSession, rfc_uids: List[str]) -> Dict[str, Estudiante]:
+    if len(rfc_uids) == 1:  # El caso de cada tap: la sentencia preparada de una sola clave
+        result = await session.execute(_ESTUDIANTE_POR_RFC_UID, {"rfc_uid": rfc_uids[0]})
+    else:
+        result = await session.execute(_ESTUDIANTES_POR_RFC_UIDS, {"rfc_uids": rfc_uids})
+    return {e.rfc_uid: Estudiante.model_validate(e) for e in result.scalars()}
+
 
 class EstudianteRepositoryImpl(IEstudianteRepository):
     """Implementación de IEstudianteRepository con SQLAlchemy."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._por_id: Cargador[int, Estudiante] = cargador(session, "estudiante", _cargar_por_ids)
+        self._por_rfc_uid: Cargador[str, Estudiante] = cargador(session, "estudiante_por_rfc_uid", _cargar_por_rfc_uids)
+
+    def _memorizar(self, estudiante: Estudiante) -> Estudiante:
+        self._por_id.primar(estudiante.id, estudiante)
+        self._por_rfc_uid.primar(estudiante.rfc_uid, estudiante)
+        return estudiante
 
     async def get_by_id(self, estudiante_id: int) -> Optional[Estudiante]:
-        result = await self.session.get(EstudianteModel, estudiante_id)
-        return Estudiante.model_validate(result) if result else None
+        estudiante = await self._por_id.cargar(estudiante_id)
+        return self._memorizar(estudiante) if estudiante else None
 
     async def get_by_rfc_uid(self, rfc_uid: str) -> Optional[Estudiante]:
-        stmt = select(EstudianteModel).where(EstudianteModel.rfc_uid == rfc_uid)
-        result = await self.session.execute(stmt)
-        db_estudiante = result.scalars().first()
-        return Estudiante.model_validate(db_estudiante) if db_estudiante else None
+        estudiante = await self._por_rfc_uid.cargar(rfc_uid)
+        return self._memorizar(estudiante) if estudiante else None
+
+    def consulta_por_rfc_uid(self, rfc_uid: str) -> ConsultaSQL[Optional[Estudiante]]:
+        return ConsultaSQL(_COLUMNAS_ESTUDIANTE_POR_RFC_UID, {"rfc_uid": rfc_uid}, _estudiante_desde_filas)
 
     async def get_by_email(self, email: str) -> Optional[Estudiante]:
-        stmt = select(EstudianteModel).where(EstudianteModel.email == email)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_ESTUDIANTE_POR_EMAIL, {"email": email})
         db_estudiante = result.scalars().first()
-        return Estudiante.model_validate(db_estudiante) if db_estudiante else None
+        return self._memorizar(Estudiante.model_validate(db_estudiante)) if db_estudiante else None
 
     async def create(self, estudiante_create: EstudianteCreate) -> Estudiante:
         db_estudiante = EstudianteModel(
@@ -41,10 +88,15 @@ class EstudianteRepositoryImpl(IEstudianteRepository):
         self.session.add(db_estudiante)
         await self.session.flush()
         await self.session.refresh(db_estudiante)
-        return Estudiante.model_validate(db_estudiante)
+        return self._memorizar(Estudiante.model_validate(db_estudiante))
 
-    async def list_all(self) -> List[Estudiante]:
-        stmt = select(EstudianteModel).order_by(EstudianteModel.nombre_completo)
-        result = await self.session.execute(stmt)
-        db_estudiantes = result.scalars().all()
-        return [Estudiante.model_validate(e) for e in db_estudiantes]
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Estudiante]:
+        db_estudiantes, siguiente_cursor = await paginar(
+            self.session, select(EstudianteModel),
+            orden=[EstudianteModel.nombre_completo, EstudianteModel.id],
+            limite=limite, cursor=cursor
+        )
+        return Pagina(
+            items=[Estudiante.model_validate(e) for e in db_estudiantes],
+            siguiente_cursor=siguiente_cursor
+        )
@@ -2,13 +2,15 @@
 Implementación Concreta del Repositorio de Horarios usando SQLAlchemy.
 """
 
-from typing import Optional, List
+from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.horario import Horario, HorarioCreate
+from app.domain.entities.pagina import Pagina
 from app.domain.repositories.horario_repository import IHorarioRepository
 from app.infrastructure.persistence.models.horario import Horario as HorarioModel
+from app.infrastructure.persistence.paginacion import paginar
 
 class HorarioRepositoryImpl(IHorarioRepository):
     """Implementación de IHorarioRepository con SQLAlchemy."""
@@ -31,8 +33,13 @@ class HorarioRepositoryImpl(IHorarioRepository):
         await self.session.refresh(db_horario)
         return Horario.model_validate(db_horario)
 
-    async def list_all(self) -> List[Horario]:
-        stmt = select(HorarioModel).order_by(HorarioModel.dia_semana, HorarioModel.hora_inicio)
-        result = await self.session.execute(stmt)
-        db_horarios = result.scalars().all()
-        return [Horario.model_validate(h) for h in db_horarios]
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Horario]:
+        db_horarios, siguiente_cursor = await paginar(
+            self.session, select(HorarioModel),
+            orden=[HorarioModel.dia_semana, HorarioModel.hora_inicio, HorarioModel.id],
+            limite=limite, cursor=cursor
+        )
+        return Pagina(
+            items=[Horario.model_validate(h) for h in db_horarios],
+            siguiente_cursor=siguiente_cursor
+        )
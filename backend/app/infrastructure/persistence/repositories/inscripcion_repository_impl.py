@@ -4,13 +4,21 @@ Implementación Concreta del Repositorio de Inscripciones usando SQLAlchemy.
 
 from datetime import date
 from typing import Optional, List
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.inscripcion import Inscripcion, InscripcionCreate
 from app.domain.repositories.inscripcion_repository import IInscripcionRepository
 from app.infrastructure.persistence.models.inscripcion import Inscripcion as InscripcionModel
 
+# Sentencias preconstruidas (ver sesion_de_clase_repository_impl): list_by_estudiante está en el camino de cada tap
+_INSCRIPCION_POR_ASIGNATURA_Y_ESTUDIANTE = select(InscripcionModel).where(
+    InscripcionModel.id_clase == bindparam("id_asignatura"),
+    InscripcionModel.id_estudiante == bindparam("id_estudiante")
+)
+_INSCRIPCIONES_POR_ESTUDIANTE = select(InscripcionModel).where(InscripcionModel.id_estudiante == bindparam("id_estudiante"))
+_INSCRIPCIONES_POR_ASIGNATURA = select(InscripcionModel).where(InscripcionModel.id_clase == bindparam("id_asignatura"))
+
 
 class InscripcionRepositoryImpl(IInscripcionRepository):
     """Implementación de IInscripcionRepository con SQLAlchemy."""
@@ -37,24 +45,20 @@ class InscripcionRepositoryImpl(IInscripcionRepository):
 
     async def get_by_asignatura_and_estudiante(self, id_asignatura: int, id_estudiante: int) -> Optional[Inscripcion]:
         """Obtiene una inscripción por ID de asignatura y estudiante."""
-        stmt = select(InscripcionModel).where(
-            InscripcionModel.id_clase == id_asignatura,
-            InscripcionModel.id_estudiante == id_estudiante
+        result = await self.session.execute(
+            _INSCRIPCION_POR_ASIGNATURA_Y_ESTUDIANTE, {"id_asignatura": id_asignatura, "id_estudiante": id_estudiante}
         )
-        result = await self.session.execute(stmt)
         db_inscripcion = result.scalars().first()
         return Inscripcion.model_validate(db_inscripcion) if db_inscripcion else None
 
     async def list_by_estudiante(self, id_estudiante: int) -> List[Inscripcion]:
         """Lista todas las inscripciones de un estudiante."""
-        stmt = select(InscripcionModel).where(InscripcionModel.id_estudiante == id_estudiante)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_INSCRIPCIONES_POR_ESTUDIANTE, {"id_estudiante": id_estudiante})
         db_inscripciones = result.scalars().all()
         return [Inscripcion.model_validate(i) for i in db_inscripciones]
 
     async def find_by_asignatura(self, id_asignatura: int) -> List[Inscripcion]:
         """Busca todas las inscripciones para una asignatura."""
-        stmt = select(InscripcionModel).where(InscripcionModel.id_clase == id_asignatura)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_INSCRIPCIONES_POR_ASIGNATURA, {"id_asignatura": id_asignatura})
         db_inscripciones = result.scalars().all()
         return [Inscripcion.model_validate(i) for i in db_inscripciones]
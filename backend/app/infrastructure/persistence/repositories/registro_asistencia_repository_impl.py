@@ -2,15 +2,135 @@
 Implementación Concreta del Repositorio de Asistencia usando SQLAlchemy.
 """
 
+import re
 from typing import Optional, List
-from datetime import datetime
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, and_, not_, exists, literal, bindparam, cast, inspect, Text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import load_only
 
-from app.domain.entities.registro_asistencia import RegistroAsistencia, RegistroAsistenciaCreate, RegistroAsistenciaUpdate, EstadoAsistencia
+from app.core.config import settings
+from app.core.exceptions import ValidationException
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.registro_asistencia import (
+    CambiosRegistrosSesion, RegistroAsistencia, RegistroAsistenciaCreate, RegistroAsistenciaDetalle,
+    RegistroAsistenciaUpdate, EstadoAsistencia, ResumenAsistenciaSesion
+)
 from app.domain.repositories.registro_asistencia_repository import IRegistroAsistenciaRepository
-from app.infrastructure.persistence.models.registro_asistencia import RegistroAsistencia as AsistenciaModel
+from app.infrastructure.persistence.models.registro_asistencia import (
+    RegistroAsistencia as AsistenciaModel, EstadoAsistencia as EstadoAsistenciaModel, PgSnapshot
+)
+from app.infrastructure.persistence.models.inscripcion import Inscripcion as InscripcionModel
+from app.infrastructure.persistence.paginacion import paginar
+from app.infrastructure.persistence.precarga import ConsultaSQL, columnas_con_prefijo
+from app.infrastructure.persistence.models.estudiante import Estudiante as EstudianteModel
+from app.infrastructure.persistence.models.sesion_de_clase import SesionDeClase as SesionModel
+from app.utils.cursor import codificar_cursor, decodificar_cursor
+
+
+def _fecha_de_sesion(sesion_id: int):
+    """
+    Subconsulta escalar con la hora de inicio de la sesión (clave de partición).
+    Filtrar por `fecha_sesion = (subconsulta)` permite a PostgreSQL podar en
+    ejecución todas las particiones salvo la del mes de la sesión.
+    """
+    return select(SesionModel.hora_inicio).where(SesionModel.id == sesion_id).scalar_subquery()
+
+
+# Sentencia preconstruida (ver sesion_de_clase_repository_impl): la comprobación de duplicados de cada tap
+_REGISTRO_POR_SESION_Y_ESTUDIANTE = select(AsistenciaModel).where(
+    AsistenciaModel.fecha_sesion == _fecha_de_sesion(bindparam("sesion_id")),
+    AsistenciaModel.id_sesion_clase == bindparam("sesion_id"),
+    AsistenciaModel.id_estudiante == bindparam("estudiante_id")
+)
+
+# Columnas planas para precargar: el estudiante se resuelve por su UID en la misma sentencia
+_COLUMNAS_REGISTRO_POR_SESION_Y_RFC_UID = select(*columnas_con_prefijo(inspect(AsistenciaModel), "")).where(
+    AsistenciaModel.fecha_sesion == _fecha_de_sesion(bindparam("sesion_id")),
+    AsistenciaModel.id_sesion_clase == bindparam("sesion_id"),
+    AsistenciaModel.id_estudiante == select(EstudianteModel.id).where(
+        EstudianteModel.rfc_uid == bindparam("rfc_uid")
+    ).scalar_subquery()
+)
+
+
+def _cambios_de_sesion(desde_instantanea: bool):
+    """
+    Registros de la sesión cambiados desde una instantánea (`pg_snapshot`) junto con la
+    instantánea de esta misma sentencia, que será el siguiente cursor.
+
+    Un registro cambió si la transacción que lo escribió no era visible en la
+    instantánea anterior (seguía en curso o empezó después). A diferencia de un `updated_at` o una secuencia, una transacción
+    lenta que confirma después de otra posterior no se pierde. Todas las no
+    visibles tienen xid >= xmin de la instantánea: rango sobre el índice
+    (id_sesion_clase, xid_cambio).
+
+    LEFT JOIN desde la instantánea: sale una fila aunque no haya cambios.
+    """
+    instantanea = select(cast(func.pg_current_snapshot(), Text).label("instantanea")).cte("instantanea")
+    condiciones = [
+        AsistenciaModel.fecha_sesion == _fecha_de_sesion(bindparam("sesion_id")),
+        AsistenciaModel.id_sesion_clase == bindparam("sesion_id"),
+    ]
+    if desde_instantanea:
+        desde = cast(bindparam("desde", type_=Text), PgSnapshot)
+        condiciones += [
+            AsistenciaModel.xid_cambio >= func.pg_snapshot_xmin(desde),
+            not_(func.pg_visible_in_snapshot(AsistenciaModel.xid_cambio, desde)),
+        ]
+    return (
+        select(instantanea.c.instantanea, AsistenciaModel)
+        .select_from(instantanea)
+        .outerjoin(AsistenciaModel, and_(*condiciones))
+        .order_by(AsistenciaModel.id_estudiante)
+    )
+
+
+_REGISTROS_DE_SESION_CON_INSTANTANEA = _cambios_de_sesion(desde_instantanea=False)
+_CAMBIOS_DE_SESION_DESDE_INSTANTANEA = _cambios_de_sesion(desde_instantanea=True)
+
+_DETALLE_POR_SESION = (
+    select(AsistenciaModel, EstudianteModel.email, EstudianteModel.nombre_completo)
+    .join(EstudianteModel, EstudianteModel.id == AsistenciaModel.id_estudiante)
+    .where(
+        AsistenciaModel.fecha_sesion == _fecha_de_sesion(bindparam("sesion_id")),
+        AsistenciaModel.id_sesion_clase == bindparam("sesion_id")
+    )
+    .order_by(AsistenciaModel.id_estudiante)
+)
+
+# Un "Ausente" por inscrito sin registro: INSERT ... SELECT sobre la partición de la sesión.
+# Sobre la tabla (Core): con parámetros, un INSERT del ORM sería una inserción masiva
+_sesion = select(SesionModel.id, SesionModel.id_clase, SesionModel.hora_inicio).where(
+    SesionModel.id == bindparam("sesion_id")
+).subquery()
+_MARCAR_AUSENTES_SIN_REGISTRO = insert(AsistenciaModel.__table__).from_select(
+    ["fecha_sesion", "id_sesion_clase", "id_estudiante", "estado_asistencia"],
+    select(
+        _sesion.c.hora_inicio,
+        _sesion.c.id,
+        InscripcionModel.id_estudiante,
+        literal(EstadoAsistenciaModel.Ausente, AsistenciaModel.estado_asistencia.type)
+    )
+    .select_from(_sesion)
+    .join(InscripcionModel, InscripcionModel.id_clase == _sesion.c.id_clase)
+    .where(~exists().where(
+        AsistenciaModel.fecha_sesion == _sesion.c.hora_inicio,
+        AsistenciaModel.id_sesion_clase == _sesion.c.id,
+        AsistenciaModel.id_estudiante == InscripcionModel.id_estudiante
+    ))
+)
+
+_INSTANTANEA_RE = re.compile(r"^\d+:\d+:(\d+(,\d+)*)?$")
+
+
+def _registro_desde_filas(filas) -> Optional[RegistroAsistencia]:
+    return RegistroAsistencia.model_validate(dict(filas[0])) if filas else None
+
+
+def _ventana_reciente():
+    """Filtro para lecturas por ID que piden `reciente`: solo particiones recientes."""
+    return AsistenciaModel.fecha_sesion >= datetime.utcnow() - timedelta(days=settings.ASISTENCIA_VENTANA_RECIENTE_DIAS)
 
 
 class RegistroAsistenciaRepositoryImpl(IRegistroAsistenciaRepository):
@@ -19,19 +139,31 @@ class RegistroAsistenciaRepositoryImpl(IRegistroAsistenciaRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_by_id(self, registro_id: int) -> Optional[RegistroAsistencia]:
-        result = await self.session.get(AsistenciaModel, registro_id)
+    async def _get_model_by_id(self, registro_id: int, reciente: bool = False) -> Optional[AsistenciaModel]:
+        # La PK es (id, fecha_sesion): sin fecha se miran todas las particiones,
+        # salvo que el llamador sepa que el registro es reciente
+        stmt = select(AsistenciaModel).where(AsistenciaModel.id == registro_id)
+        if reciente:
+            stmt = stmt.where(_ventana_reciente())
+        result = await self.session.execute(stmt)
+        return result.scalars().first()
+
+    async def get_by_id(self, registro_id: int, reciente: bool = False) -> Optional[RegistroAsistencia]:
+        result = await self._get_model_by_id(registro_id, reciente)
         return RegistroAsistencia.model_validate(result) if result else None
 
     async def get_by_sesion_and_estudiante(self, sesion_id: int, estudiante_id: int) -> Optional[RegistroAsistencia]:
-        stmt = select(AsistenciaModel).where(
-            AsistenciaModel.id_sesion_clase == sesion_id,
-            AsistenciaModel.id_estudiante == estudiante_id
+        result = await self.session.execute(
+            _REGISTRO_POR_SESION_Y_ESTUDIANTE, {"sesion_id": sesion_id, "estudiante_id": estudiante_id}
         )
-        result = await self.session.execute(stmt)
         db_registro = result.scalars().first()
         return RegistroAsistencia.model_validate(db_registro) if db_registro else None
 
+    def consulta_por_sesion_y_rfc_uid(self, sesion_id: int, rfc_uid: str) -> ConsultaSQL[Optional[RegistroAsistencia]]:
+        return ConsultaSQL(
+            _COLUMNAS_REGISTRO_POR_SESION_Y_RFC_UID, {"sesion_id": sesion_id, "rfc_uid": rfc_uid}, _registro_desde_filas
+        )
+
     async def create(self, registro_create: RegistroAsistenciaCreate) -> RegistroAsistencia:
         # Determine hora_entrada based on estado_asistencia and provided hora_registro
         if registro_create.estado_asistencia == EstadoAsistencia.AUSENTE:
@@ -46,19 +178,21 @@ class RegistroAsistenciaRepositoryImpl(IRegistroAsistenciaRepository):
 
 
         db_registro = AsistenciaModel(
+            # Si el caso de uso no la conoce, la clave de partición se resuelve en el mismo INSERT
+            fecha_sesion=registro_create.fecha_sesion or _fecha_de_sesion(registro_create.id_sesion_clase),
             id_sesion_clase=registro_create.id_sesion_clase,
             id_estudiante=registro_create.id_estudiante,
             hora_entrada=hora_entrada_to_set, # Use the determined value
             estado_asistencia=registro_create.estado_asistencia
         )
         self.session.add(db_registro)
-        await self.session.commit()
         await self.session.flush()
         await self.session.refresh(db_registro)
         return RegistroAsistencia.model_validate(db_registro)
 
-    async def update(self, registro_id: int, registro_update: RegistroAsistenciaUpdate) -> Optional[RegistroAsistencia]:
-        db_registro = await self.session.get(AsistenciaModel, registro_id)
+    async def update(self, registro_id: int, registro_update: RegistroAsistenciaUpdate,
+                     reciente: bool = False) -> Optional[RegistroAsistencia]:
+        db_registro = await self._get_model_by_id(registro_id, reciente)
         if not db_registro:
             return None
 
@@ -76,8 +210,97 @@ class RegistroAsistenciaRepositoryImpl(IRegistroAsistenciaRepository):
         await self.session.refresh(db_registro)
         return RegistroAsistencia.model_validate(db_registro)
 
-    async def list_by_sesion(self, sesion_id: int) -> List[RegistroAsistencia]:
-        stmt = select(AsistenciaModel).where(AsistenciaModel.id_sesion_clase == sesion_id)
-        result = await self.session.execute(stmt)
-        db_registros = result.scalars().all()
-        return [RegistroAsistencia.model_validate(r) for r in db_registros]
+    async def list_by_sesion(self, sesion_id: int, limite: int,
+                             cursor: Optional[str] = None) -> Pagina[RegistroAsistencia]:
+        stmt = select(AsistenciaModel).where(
+            AsistenciaModel.fecha_sesion == _fecha_de_sesion(sesion_id),
+            AsistenciaModel.id_sesion_clase == sesion_id
+        )
+        # (id_estudiante, id) sigue el índice ix_RegistroAsistencia_sesion_estudiante
+        db_registros, siguiente_cursor = await paginar(
+            self.session, stmt,
+            orden=[AsistenciaModel.id_estudiante, AsistenciaModel.id],
+            limite=limite, cursor=cursor
+        )
+        return Pagina(
+            items=[RegistroAsistencia.model_validate(r) for r in db_registros],
+            siguiente_cursor=siguiente_cursor
+        )
+
+    async def list_cambios_desde(self, sesion_id: int, cursor: Optional[str] = None) -> CambiosRegistrosSesion:
+        if cursor:
+            (desde,) = decodificar_cursor(cursor, 1)
+            if not isinstance(desde, str) or not _INSTANTANEA_RE.match(desde):
+                raise ValidationException("Cursor de cambios inválido.")
+            result = await self.session.execute(
+                _CAMBIOS_DE_SESION_DESDE_INSTANTANEA, {"sesion_id": sesion_id, "desde": desde}
+            )
+        else:
+            result = await self.session.execute(_REGISTROS_DE_SESION_CON_INSTANTANEA, {"sesion_id": sesion_id})
+
+        filas = result.all()
+        return CambiosRegistrosSesion(
+            items=[RegistroAsistencia.model_validate(r) for _, r in filas if r is not None],
+            cursor=codificar_cursor([filas[0].instantanea])
+        )
+
+    async def list_detalle_por_sesion(self, sesion_id: int) -> List[RegistroAsistenciaDetalle]:
+        result = await self.session.execute(_DETALLE_POR_SESION, {"sesion_id": sesion_id})
+        return [
+            RegistroAsistenciaDetalle(
+                **RegistroAsistencia.model_validate(registro).model_dump(),
+                email_estudiante=email,
+                nombre_estudiante=nombre
+            )
+            for registro, email, nombre in result.all()
+        ]
+
+    async def marcar_ausentes_sin_registro(self, sesion_id: int) -> int:
+        # rowcount de un INSERT solo se conserva si se pide
+        result = await self.session.execute(
+            _MARCAR_AUSENTES_SIN_REGISTRO, {"sesion_id": sesion_id},
+            execution_options={"preserve_rowcount": True}
+        )
+        return result.rowcount
+
+    async def resumen_por_sesion(self, sesion_id: int) -> Optional[ResumenAsistenciaSesion]:
+        sesion = (
+            select(SesionModel.id, SesionModel.id_clase, SesionModel.hora_inicio)
+            .where(SesionModel.id == sesion_id)
+            .subquery()
+        )
+        estado = AsistenciaModel.estado_asistencia
+
+        # Inscripcion LEFT JOIN RegistroAsistencia: una fila por inscrito, con o sin registro
+        stmt = (
+            select(
+                sesion.c.id_clase,
+                func.count(InscripcionModel.id_estudiante),
+                func.count().filter(estado == EstadoAsistenciaModel.Presente),
+                func.count().filter(estado == EstadoAsistenciaModel.Tarde),
+                func.count().filter(estado == EstadoAsistenciaModel.Ausente),
+                func.count(InscripcionModel.id_estudiante).filter(AsistenciaModel.id.is_(None)),
+            )
+            .select_from(sesion)
+            .outerjoin(InscripcionModel, InscripcionModel.id_clase == sesion.c.id_clase)
+            .outerjoin(AsistenciaModel, and_(
+                AsistenciaModel.fecha_sesion == sesion.c.hora_inicio,
+                AsistenciaModel.id_sesion_clase == sesion.c.id,
+                AsistenciaModel.id_estudiante == InscripcionModel.id_estudiante
+            ))
+            .group_by(sesion.c.id_clase)
+        )
+        row = (await self.session.execute(stmt)).first()
+        if row is None:
+            return None
+
+        id_asignatura, inscritos, presentes, tardes, ausentes, sin_registrar = row
+        return ResumenAsistenciaSesion(
+            id_sesion=sesion_id,
+            id_asignatura=id_asignatura,
+            inscritos=inscritos,
+            presentes=presentes,
+            tardes=tardes,
+            ausentes=ausentes,
+            sin_registrar=sin_registrar
+        )
@@ -2,19 +2,109 @@
 Implementación Concreta del Repositorio de Sesiones usando SQLAlchemy.
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
-from sqlalchemy import select, update
+from sqlalchemy import select, update, exists, bindparam, inspect, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import or_
+from sqlalchemy import and_, or_
 
-from app.domain.entities.sesion_de_clase import SesionDeClase, SesionDeClaseCreate, SesionDeClaseUpdate, EstadoSesion
+from app.domain.entities.sesion_de_clase import (
+    SesionDeClase, SesionDeClaseCreate, SesionDeClaseUpdate, SesionDeClaseTransicion, EstadoSesion
+)
 from app.domain.repositories.sesion_de_clase_repository import ISesionDeClaseRepository
 from app.infrastructure.persistence.models.sesion_de_clase import SesionDeClase as SesionModel
 from app.infrastructure.persistence.models.clase_programada import ClaseProgramada as ClaseProgramadaModel
 from app.infrastructure.persistence.models.asignatura import Asignatura as AsignaturaModel
 from app.infrastructure.persistence.models.usuario import Usuario as UsuarioModel
+from app.infrastructure.persistence.models.horario import Horario as HorarioModel
+from app.infrastructure.persistence.cargadores import Cargador, cargador
+from app.infrastructure.persistence.precarga import ConsultaSQL, columnas_con_prefijo, sin_prefijo
+
+
+# ==================== SENTENCIAS PRECONSTRUIDAS ====================
+# Se construyen una vez al importar el módulo: cada llamada solo pasa los parámetros,
+# sin rehacer el select() ni el grafo de selectinload, y SQLAlchemy reutiliza la
+# clave de caché memoizada de la sentencia en lugar de recalcularla.
+
+_SELECT_SESION = select(SesionModel).options(
+    selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
+    selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
+)
+
+_SESION_ACTIVA = or_(
+    SesionModel.estado == EstadoSesion.EN_PROGRESO,
+    SesionModel.estado == EstadoSesion.VALIDACION_ABIERTA,
+    SesionModel.estado == EstadoSesion.VALIDACION_CERRADA
+)
+
+_SESION_POR_ID = _SELECT_SESION.where(SesionModel.id == bindparam("sesion_id"))
+
+_SESIONES_POR_IDS = _SELECT_SESION.where(SesionModel.id.in_(bindparam("ids", expanding=True)))
+
+_SESION_ACTIVA_POR_CLASE_Y_HORARIO = _SELECT_SESION.where(
+    SesionModel.id_clase == bindparam("id_clase"),
+    SesionModel.id_horario == bindparam("id_horario"),
+    _SESION_ACTIVA
+)
+
+_SESIONES_ACTIVAS_POR_ASIGNATURAS = _SELECT_SESION.where(
+    SesionModel.id_clase.in_(bindparam("id_asignaturas", expanding=True)),
+    _SESION_ACTIVA
+)
+
+# En curso a una hora dada: empezada antes y que dejó de estar EnProgreso después (o aún lo está)
+_SESIONES_EN_CURSO_POR_ASIGNATURAS = _SELECT_SESION.where(
+    SesionModel.id_clase.in_(bindparam("id_asignaturas", expanding=True)),
+    SesionModel.hora_inicio <= bindparam("instante"),
+    or_(
+        SesionModel.hora_fin_progreso > bindparam("instante"),
+        and_(SesionModel.hora_fin_progreso.is_(None), SesionModel.estado == EstadoSesion.EN_PROGRESO)
+    )
+)
+
+_SESIONES_VALIDACION_ABIERTA_POR_ASIGNATURAS = _SELECT_SESION.where(
+    SesionModel.id_clase.in_(bindparam("id_asignaturas", expanding=True)),
+    SesionModel.estado == EstadoSesion.VALIDACION_ABIERTA
+)
+
+# Para precargar: la sesión y su grafo (clase programada, asignatura, horario) en una
+# sola sentencia de columnas planas, en vez de un SELECT por nivel de selectinload
+_COLUMNAS_SESION_POR_ID = (
+    select(
+        *columnas_con_prefijo(inspect(SesionModel), "s_"),
+        *columnas_con_prefijo(inspect(ClaseProgramadaModel), "c_"),
+        *columnas_con_prefijo(inspect(AsignaturaModel), "a_"),
+        *columnas_con_prefijo(inspect(HorarioModel), "h_"),
+    )
+    .join_from(SesionModel, ClaseProgramadaModel, SesionModel.clase_programada)
+    .join(AsignaturaModel, ClaseProgramadaModel.asignatura)
+    .join(HorarioModel, ClaseProgramadaModel.horario)
+    .where(SesionModel.id == bindparam("sesion_id"))
+)
+
+
+def _sesion_desde_filas(filas) -> Optional[SesionDeClase]:
+    if not filas:
+        return None
+    fila = filas[0]
+    return SesionDeClase.model_validate({
+        **sin_prefijo(fila, "s_"),
+        "clase_programada": {
+            **sin_prefijo(fila, "c_"),
+            "asignatura": sin_prefijo(fila, "a_"),
+            "horario": sin_prefijo(fila, "h_"),
+        },
+    })
+
+
+# Carga por lotes del cargador de la petición (ver app/infrastructure/persistence/cargadores.py)
+async def _cargar_por_ids(session: AsyncSession, ids: List[int]) -> Dict[int, SesionDeClase]:
+    if len(ids) == 1:
+        result = await session.execute(_SESION_POR_ID, {"sesion_id": ids[0]})
+    else:
+        result = await session.execute(_SESIONES_POR_IDS, {"ids": ids})
+    return {s.id: SesionDeClase.model_validate(s) for s in result.scalars()}
 
 
 class SesionDeClaseRepositoryImpl(ISesionDeClaseRepository):
@@ -22,62 +112,47 @@ class SesionDeClaseRepositoryImpl(ISesionDeClaseRepository):
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._por_id: Cargador[int, SesionDeClase] = cargador(session, "sesion", _cargar_por_ids)
+
+    def _memorizar(self, sesiones: List[SesionDeClase]) -> List[SesionDeClase]:
+        for sesion in sesiones:
+            self._por_id.primar(sesion.id, sesion)
+        return sesiones
 
     async def get_by_id(self, sesion_id: int) -> Optional[SesionDeClase]:
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(SesionModel.id == sesion_id)
-        result = await self.session.execute(stmt)
-        db_sesion = result.scalars().first()
-        return SesionDeClase.model_validate(db_sesion) if db_sesion else None
+        return await self._por_id.cargar(sesion_id)
+
+    def consulta_por_id(self, sesion_id: int) -> ConsultaSQL[Optional[SesionDeClase]]:
+        return ConsultaSQL(_COLUMNAS_SESION_POR_ID, {"sesion_id": sesion_id}, _sesion_desde_filas)
 
     async def find_activa(self, id_clase: int, id_horario: int) -> Optional[SesionDeClase]:
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(
-            SesionModel.id_clase == id_clase,
-            SesionModel.id_horario == id_horario,
-            or_(
-                SesionModel.estado == EstadoSesion.EN_PROGRESO,
-                SesionModel.estado == EstadoSesion.VALIDACION_ABIERTA,
-                SesionModel.estado == EstadoSesion.VALIDACION_CERRADA
-            )
+        result = await self.session.execute(
+            _SESION_ACTIVA_POR_CLASE_Y_HORARIO, {"id_clase": id_clase, "id_horario": id_horario}
         )
-        result = await self.session.execute(stmt)
         db_sesion = result.scalars().first()
-        return SesionDeClase.model_validate(db_sesion) if db_sesion else None
+        return self._memorizar([SesionDeClase.model_validate(db_sesion)])[0] if db_sesion else None
 
     async def find_active_by_asignaturas(self, id_asignaturas: List[int]) -> List[SesionDeClase]:
         """Busca sesiones activas para una lista de asignaturas."""
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(
-            SesionModel.id_clase.in_(id_asignaturas),
-            or_(
-                SesionModel.estado == EstadoSesion.EN_PROGRESO,
-                SesionModel.estado == EstadoSesion.VALIDACION_ABIERTA,
-                SesionModel.estado == EstadoSesion.VALIDACION_CERRADA
-            )
+        result = await self.session.execute(_SESIONES_ACTIVAS_POR_ASIGNATURAS, {"id_asignaturas": id_asignaturas})
+        db_sesiones = result.scalars().all()
+        return self._memorizar([SesionDeClase.model_validate(s) for s in db_sesiones])
+
+    async def find_en_curso_by_asignaturas(self, id_asignaturas: List[int], instante: datetime) -> List[SesionDeClase]:
+        """Busca las sesiones de las asignaturas que estaban en curso en `instante`."""
+        result = await self.session.execute(
+            _SESIONES_EN_CURSO_POR_ASIGNATURAS, {"id_asignaturas": id_asignaturas, "instante": instante}
         )
-        result = await self.session.execute(stmt)
         db_sesiones = result.scalars().all()
-        return [SesionDeClase.model_validate(s) for s in db_sesiones]
+        return self._memorizar([SesionDeClase.model_validate(s) for s in db_sesiones])
 
     async def find_validation_open_by_asignaturas(self, id_asignaturas: List[int]) -> List[SesionDeClase]:
         """Busca sesiones con validación abierta para una lista de asignaturas."""
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(
-            SesionModel.id_clase.in_(id_asignaturas),
-            SesionModel.estado == EstadoSesion.VALIDACION_ABIERTA
+        result = await self.session.execute(
+            _SESIONES_VALIDACION_ABIERTA_POR_ASIGNATURAS, {"id_asignaturas": id_asignaturas}
         )
-        result = await self.session.execute(stmt)
         db_sesiones = result.scalars().all()
-        return [SesionDeClase.model_validate(s) for s in db_sesiones]
+        return self._memorizar([SesionDeClase.model_validate(s) for s in db_sesiones])
 
     async def create(self, sesion_create: SesionDeClaseCreate) -> SesionDeClase:
         db_sesion = SesionModel(
@@ -89,23 +164,14 @@ class SesionDeClaseRepositoryImpl(ISesionDeClaseRepository):
         )
         self.session.add(db_sesion)
         await self.session.flush()
-        await self.session.commit()
-        
+
         # Refrescar para cargar las relaciones anidadas
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(SesionModel.id == db_sesion.id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_SESION_POR_ID, {"sesion_id": db_sesion.id})
         db_sesion_refreshed = result.scalars().one()
-        return SesionDeClase.model_validate(db_sesion_refreshed)
+        return self._memorizar([SesionDeClase.model_validate(db_sesion_refreshed)])[0]
 
     async def update(self, sesion_id: int, sesion_update: SesionDeClaseUpdate) -> Optional[SesionDeClase]:
-        stmt = select(SesionModel).options(
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.asignatura).selectinload(AsignaturaModel.docente),
-            selectinload(SesionModel.clase_programada).selectinload(ClaseProgramadaModel.horario)
-        ).where(SesionModel.id == sesion_id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_SESION_POR_ID, {"sesion_id": sesion_id})
         db_sesion = result.scalars().first()
         
         if not db_sesion:
@@ -114,11 +180,69 @@ class SesionDeClaseRepositoryImpl(ISesionDeClaseRepository):
         update_data = sesion_update.model_dump(exclude_unset=True)
         if 'hora_fin' not in update_data and sesion_update.estado == EstadoSesion.CERRADA:
             update_data['hora_fin'] = datetime.utcnow()
+        if sesion_update.estado not in (None, EstadoSesion.EN_PROGRESO) and db_sesion.hora_fin_progreso is None:
+            update_data['hora_fin_progreso'] = update_data.get('hora_fin') or datetime.utcnow()
 
         for key, value in update_data.items():
             setattr(db_sesion, key, value)
 
         await self.session.flush()
-        await self.session.commit()
-        
-        return SesionDeClase.model_validate(db_sesion)
+
+        return self._memorizar([SesionDeClase.model_validate(db_sesion)])[0]
+
+    async def transition_estado(
+        self,
+        sesion_id: int,
+        estados_permitidos: List[EstadoSesion],
+        nuevo_estado: EstadoSesion,
+        id_docente: Optional[int] = None,
+        hora_fin: Optional[datetime] = None,
+    ) -> Optional[SesionDeClaseTransicion]:
+        """
+        UPDATE ... WHERE id = :id AND estado IN (:permitidos) RETURNING ...
+
+        La comprobación de estado (y de propiedad) y la escritura ocurren en la misma
+        sentencia, así que dos peticiones concurrentes no pueden aplicar la misma transición.
+        """
+        values = {"estado": nuevo_estado}
+        if hora_fin is not None:
+            values["hora_fin"] = hora_fin
+        if nuevo_estado != EstadoSesion.EN_PROGRESO:
+            # Solo la primera vez que sale de EnProgreso
+            values["hora_fin_progreso"] = func.coalesce(SesionModel.hora_fin_progreso, hora_fin or datetime.utcnow())
+
+        stmt = (
+            update(SesionModel)
+            .where(
+                SesionModel.id == sesion_id,
+                SesionModel.estado.in_(estados_permitidos)
+            )
+            .values(**values)
+            .returning(
+                SesionModel.id,
+                SesionModel.id_clase,
+                SesionModel.id_horario,
+                SesionModel.hora_inicio,
+                SesionModel.hora_fin,
+                SesionModel.estado,
+                SesionModel.tema,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        if id_docente is not None:
+            stmt = stmt.where(exists().where(
+                AsignaturaModel.id == SesionModel.id_clase,
+                AsignaturaModel.id_docente == id_docente
+            ))
+
+        result = await self.session.execute(stmt)
+        # La sesión memoizada (si la hay) ya no refleja el estado
+        self._por_id.olvidar(sesion_id)
+        row = result.mappings().first()
+        if not row:
+            return None
+
+        data = dict(row)
+        # El enum del modelo y el del dominio comparten valores
+        data["estado"] = EstadoSesion(data["estado"].value)
+        return SesionDeClaseTransicion.model_validate(data)
@@ -0,0 +1,157 @@
+"""
+Implementación Concreta del Repositorio de Trabajos usando SQLAlchemy.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.pagina import Pagina
+from app.domain.entities.trabajo import Trabajo, TrabajoCreate, EstadoTrabajo
+from app.domain.repositories.trabajo_repository import ITrabajoRepository
+from app.infrastructure.persistence.models.trabajo import (
+    Trabajo as TrabajoModel, EstadoTrabajo as EstadoTrabajoModel
+)
+from app.infrastructure.persistence.paginacion import paginar
+
+# Candidato: recorre el índice parcial de activos. SKIP LOCKED: los workers de
+# todos los procesos toman trabajos distintos en lugar de esperarse. Un trabajo
+# "EnCurso" con la reserva caducada es de un worker que murió: se retoma
+_CANDIDATO = (
+    select(TrabajoModel.id)
+    .where(
+        TrabajoModel.estado.in_([EstadoTrabajoModel.Pendiente, EstadoTrabajoModel.EnCurso]),
+        TrabajoModel.disponible_en <= bindparam("ahora"),
+        TrabajoModel.tipo.in_(bindparam("tipos", expanding=True))
+    )
+    .order_by(TrabajoModel.disponible_en, TrabajoModel.id)
+    .limit(1)
+    .with_for_update(skip_locked=True)
+)
+
+_RESERVAR = (
+    update(TrabajoModel)
+    .where(TrabajoModel.id.in_(_CANDIDATO.scalar_subquery()))
+    .values(
+        estado=EstadoTrabajoModel.EnCurso,
+        intentos=TrabajoModel.intentos + 1,
+        progreso_actual=0,  # El progreso es del intento en curso
+        progreso_total=None,
+        iniciado_en=bindparam("ahora"),
+        disponible_en=bindparam("reservado_hasta")
+    )
+    .returning(TrabajoModel)
+)
+
+
+def _del_intento(trabajo_id: int, intento: int):
+    """Filtro de las escrituras del worker: solo si el trabajo sigue en su intento."""
+    return (
+        TrabajoModel.id == trabajo_id,
+        TrabajoModel.intentos == intento,
+        TrabajoModel.estado == EstadoTrabajoModel.EnCurso
+    )
+
+
+class TrabajoRepositoryImpl(ITrabajoRepository):
+    """Implementación de ITrabajoRepository con SQLAlchemy."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def encolar(self, trabajo: TrabajoCreate) -> Trabajo:
+        db_trabajo = TrabajoModel(**trabajo.model_dump())
+        self.session.add(db_trabajo)
+        await self.session.flush()
+        await self.session.refresh(db_trabajo)
+        return Trabajo.model_validate(db_trabajo)
+
+    async def get_by_id(self, trabajo_id: int) -> Optional[Trabajo]:
+        result = await self.session.execute(select(TrabajoModel).where(TrabajoModel.id == trabajo_id))
+        db_trabajo = result.scalars().first()
+        return Trabajo.model_validate(db_trabajo) if db_trabajo else None
+
+    async def list_by_usuario(self, usuario_id: int, limite: int, cursor: Optional[str] = None,
+                              estado: Optional[EstadoTrabajo] = None) -> Pagina[Trabajo]:
+        stmt = select(TrabajoModel).where(TrabajoModel.id_usuario == usuario_id)
+        if estado is not None:
+            stmt = stmt.where(TrabajoModel.estado == EstadoTrabajoModel(estado.value))
+        # Recorre ix_Trabajo_usuario (id_usuario, id) hacia atrás
+        db_trabajos, siguiente_cursor = await paginar(
+            self.session, stmt,
+            orden=[TrabajoModel.id],
+            limite=limite, cursor=cursor, descendente=True
+        )
+        return Pagina(
+            items=[Trabajo.model_validate(t) for t in db_trabajos],
+            siguiente_cursor=siguiente_cursor
+        )
+
+    async def reservar(self, tipos: List[str], reserva_segundos: float) -> Optional[Trabajo]:
+        ahora = datetime.utcnow()
+        result = await self.session.execute(
+            _RESERVAR,
+            {"ahora": ahora, "tipos": tipos, "reservado_hasta": ahora + timedelta(seconds=reserva_segundos)},
+            execution_options={"synchronize_session": False}
+        )
+        db_trabajo = result.scalars().first()
+        return Trabajo.model_validate(db_trabajo) if db_trabajo else None
+
+    async def renovar(self, trabajo_id: int, intento: int, reserva_segundos: float,
+                      progreso_actual: Optional[int] = None, progreso_total: Optional[int] = None) -> bool:
+        valores: Dict[str, Any] = {"disponible_en": datetime.utcnow() + timedelta(seconds=reserva_segundos)}
+        if progreso_actual is not None:
+            valores["progreso_actual"] = progreso_actual
+        if progreso_total is not None:
+            valores["progreso_total"] = progreso_total
+        result = await self.session.execute(
+            update(TrabajoModel).where(*_del_intento(trabajo_id, intento)).values(**valores),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount > 0
+
+    async def completar(self, trabajo_id: int, intento: int, resultado: Optional[Dict[str, Any]],
+                        progreso_actual: Optional[int] = None, progreso_total: Optional[int] = None) -> bool:
+        valores: Dict[str, Any] = {
+            "estado": EstadoTrabajoModel.Completado,
+            "terminado_en": datetime.utcnow(),
+            "resultado": resultado,
+            "ultimo_error": None
+        }
+        if progreso_actual is not None:
+            valores["progreso_actual"] = progreso_actual
+        if progreso_total is not None:
+            valores["progreso_total"] = progreso_total
+        result = await self.session.execute(
+            update(TrabajoModel).where(*_del_intento(trabajo_id, intento)).values(**valores),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount > 0
+
+    async def registrar_fallo(self, trabajo_id: int, intento: int, error: str,
+                              reintentar_en: Optional[datetime]) -> None:
+        ahora = datetime.utcnow()
+        await self.session.execute(
+            update(TrabajoModel)
+            .where(*_del_intento(trabajo_id, intento))
+            .values(
+                estado=EstadoTrabajoModel.Pendiente if reintentar_en else EstadoTrabajoModel.Fallido,
+                disponible_en=reintentar_en or ahora,
+                terminado_en=None if reintentar_en else ahora,
+                ultimo_error=error[:2000]
+            ),
+            execution_options={"synchronize_session": False}
+        )
+
+    async def liberar(self, trabajo_id: int, intento: int) -> None:
+        await self.session.execute(
+            update(TrabajoModel)
+            .where(*_del_intento(trabajo_id, intento))
+            .values(
+                estado=EstadoTrabajoModel.Pendiente,
+                intentos=TrabajoModel.intentos - 1,  # Lo sumó la reserva
+                disponible_en=datetime.utcnow()
+            ),
+            execution_options={"synchronize_session": False}
+        )
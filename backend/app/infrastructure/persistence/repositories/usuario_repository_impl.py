@@ -2,13 +2,15 @@
 Implementación Concreta del Repositorio de Usuarios usando SQLAlchemy.
 """
 
-from typing import Optional, List
+from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.usuario import Usuario, UsuarioCreate, UsuarioUpdate
+from app.domain.entities.pagina import Pagina
 from app.domain.repositories.usuario_repository import IUsuarioRepository
 from app.infrastructure.persistence.models.usuario import Usuario as UsuarioModel
+from app.infrastructure.persistence.paginacion import paginar
 from app.core.security import get_password_hash
 
 
@@ -37,7 +39,6 @@ class UsuarioRepositoryImpl(IUsuarioRepository):
         )
         self.session.add(db_user)
         await self.session.flush()
-        await self.session.commit()
         await self.session.refresh(db_user)
         return Usuario.model_validate(db_user)
 
@@ -54,8 +55,13 @@ class UsuarioRepositoryImpl(IUsuarioRepository):
         await self.session.refresh(db_user)
         return Usuario.model_validate(db_user)
 
-    async def list_all(self) -> List[Usuario]:
-        stmt = select(UsuarioModel).order_by(UsuarioModel.nombre_completo)
-        result = await self.session.execute(stmt)
-        db_users = result.scalars().all()
-        return [Usuario.model_validate(u) for u in db_users]
+    async def list_all(self, limite: int, cursor: Optional[str] = None) -> Pagina[Usuario]:
+        db_users, siguiente_cursor = await paginar(
+            self.session, select(UsuarioModel),
+            orden=[UsuarioModel.nombre_completo, UsuarioModel.id],
+            limite=limite, cursor=cursor
+        )
+        return Pagina(
+            items=[Usuario.model_validate(u) for u in db_users],
+            siguiente_cursor=siguiente_cursor
+        )
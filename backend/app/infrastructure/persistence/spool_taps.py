@@ -0,0 +1,150 @@
+"""
+Spool local y durable de taps (SQLite en modo WAL).
+
+Cuando PostgreSQL no está disponible, los taps ya validados se guardan aquí con
+su hora original y el reproductor los reenvía cuando la BD se recupera. Cada
+escritura se confirma con synchronous=FULL: un tap aceptado sobrevive a un
+reinicio del proceso o de la máquina.
+
+sqlite3 es síncrono: las operaciones se ejecutan en un hilo (asyncio.to_thread)
+y se serializan con un lock, sobre una única conexión. Varios workers pueden
+compartir el archivo: cada lote se reserva (con caducidad) antes de reenviarse.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.domain.repositories.spool_taps import ISpoolTaps, TapEnSpool
+
+
+class SQLiteSpoolTaps(ISpoolTaps):
+    """Implementación de ISpoolTaps sobre un archivo SQLite local."""
+
+    _ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS taps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_rfid TEXT NOT NULL,
+            id_dispositivo TEXT NOT NULL,
+            hora_registro TEXT NOT NULL,
+            encolado_en TEXT NOT NULL,
+            reservado_hasta REAL NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS taps_rechazados (
+            id INTEGER PRIMARY KEY,
+            codigo_rfid TEXT NOT NULL,
+            id_dispositivo TEXT NOT NULL,
+            hora_registro TEXT NOT NULL,
+            encolado_en TEXT NOT NULL,
+            rechazado_en TEXT NOT NULL,
+            motivo TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, ruta: str, segundos_reserva: float = 30.0):
+        self.ruta = ruta
+        self.segundos_reserva = segundos_reserva
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.profundidad = 0
+
+    def _conexion(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            conn = sqlite3.connect(self.ruta, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(self._ESQUEMA)
+            self.profundidad = conn.execute("SELECT COUNT(*) FROM taps").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    # ==================== OPERACIONES SÍNCRONAS ====================
+
+    def _agregar(self, codigo_rfid: str, id_dispositivo: str, hora_registro: datetime) -> None:
+        with self._lock:
+            self._conexion().execute(
+                "INSERT INTO taps (codigo_rfid, id_dispositivo, hora_registro, encolado_en) VALUES (?, ?, ?, ?)",
+                (codigo_rfid, id_dispositivo, hora_registro.isoformat(), datetime.utcnow().isoformat())
+            )
+            self.profundidad += 1
+
+    def _reservar_lote(self, limite: int) -> List[TapEnSpool]:
+        with self._lock:
+            conn = self._conexion()
+            ahora = time.time()
+            filas = conn.execute(
+                "UPDATE taps SET reservado_hasta = ? WHERE id IN ("
+                "  SELECT id FROM taps WHERE reservado_hasta < ? ORDER BY id LIMIT ?"
+                ") RETURNING id, codigo_rfid, id_dispositivo, hora_registro, encolado_en",
+                (ahora + self.segundos_reserva, ahora, limite)
+            ).fetchall()
+            # El contador local no ve lo que añaden o completan otros procesos
+            self.profundidad = conn.execute("SELECT COUNT(*) FROM taps").fetchone()[0]
+        filas.sort()
+        return [
+            TapEnSpool(id, rfid, disp, datetime.fromisoformat(hora), datetime.fromisoformat(encolado))
+            for id, rfid, disp, hora, encolado in filas
+        ]
+
+    def _completar(self, ids_registrados: List[int], rechazados: List[Tuple[TapEnSpool, str]]) -> None:
+        with self._lock:
+            conn = self._conexion()
+            ahora = datetime.utcnow().isoformat()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO taps_rechazados VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(t.id, t.codigo_rfid, t.id_dispositivo, t.hora_registro.isoformat(),
+                      t.encolado_en.isoformat(), ahora, motivo) for t, motivo in rechazados]
+                )
+                ids = ids_registrados + [t.id for t, _ in rechazados]
+                conn.executemany("DELETE FROM taps WHERE id = ?", [(i,) for i in ids])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.profundidad -= len(ids)
+
+    # ==================== API ASÍNCRONA ====================
+
+    async def abrir(self) -> None:
+        """Abre (o crea) el archivo y carga la profundidad actual."""
+        await asyncio.to_thread(self._conexion)
+
+    async def agregar(self, codigo_rfid: str, id_dispositivo: str, hora_registro: datetime) -> None:
+        await asyncio.to_thread(self._agregar, codigo_rfid, id_dispositivo, hora_registro)
+
+    async def reservar_lote(self, limite: int) -> List[TapEnSpool]:
+        return await asyncio.to_thread(self._reservar_lote, limite)
+
+    async def completar(self, ids_registrados: List[int], rechazados: List[Tuple[TapEnSpool, str]]) -> None:
+        # Los rechazados se mueven a `taps_rechazados` para auditoría
+        if ids_registrados or rechazados:
+            await asyncio.to_thread(self._completar, ids_registrados, rechazados)
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_spool: Optional[SQLiteSpoolTaps] = None
+
+
+def get_spool_taps() -> Optional[SQLiteSpoolTaps]:
+    """Retorna el spool del proceso, o None si SPOOL_TAPS_HABILITADO está desactivado."""
+    global _spool
+    if not settings.SPOOL_TAPS_HABILITADO:
+        return None
+    if _spool is None:
+        _spool = SQLiteSpoolTaps(settings.SPOOL_TAPS_RUTA)
+    return _spool
@@ -0,0 +1,35 @@
+"""
+Implementación Concreta de la Unidad de Trabajo usando SQLAlchemy.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories.unit_of_work import IUnitOfWork
+
+
+class SQLAlchemyUnitOfWork(IUnitOfWork):
+    """
+    Implementación de IUnitOfWork sobre la AsyncSession de la request.
+
+    Los repositorios construidos con la misma sesión comparten la transacción;
+    `commit()` se llama una sola vez al final del caso de uso.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.committed = False
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        self.committed = True
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Tras un commit exitoso no queda nada pendiente que descartar
+        if exc_type is not None or not self.committed:
+            await self.rollback()
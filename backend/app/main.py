@@ -4,14 +4,36 @@ Main Application Entry Point
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import (
+    init_engine, init_db, close_db, iniciar_sonda_replica, detener_sonda_replica, LecturaTrasEscrituraMiddleware
+)
+from app.core.event_loop_monitor import iniciar_monitor_event_loop, detener_monitor_event_loop
 from app.core.exceptions import register_exception_handlers
-from app.core.logger import logger
+from app.core.health import iniciar_sonda_salud, detener_sonda_salud
+from app.core.logger import logger, setup_logging
+from app.core.login_admission import cerrar_control_admision_login
+from app.core.metrics import metricas
+from app.core.profiling import configurar_profiling
+from app.core.request_context import RequestIdMiddleware
+from app.core.segundo_plano import (
+    iniciar_exportador_sap, detener_exportador_sap, iniciar_avisos_correo, detener_avisos_correo,
+    iniciar_trabajos, detener_trabajos
+)
+from app.application.services.procesador_taps import detener_procesador_taps
+from app.infrastructure.persistence.avisos_cambios import iniciar_avisos_cambios, detener_avisos_cambios
+from app.presentation.api.v1.endpoints.lectores import iniciar_reproductor_spool, detener_reproductor_spool
+from app.presentation.api.health import router as health_router
 from app.presentation.api.v1.router import api_v1_router
 
+# ==================== LOGGING ====================
+
+# El punto de entrada configura el logging (importar app.core.logger no lo hace)
+setup_logging()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,6 +44,31 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME} v{settings.VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
 
+    # Lag del event loop (y, en DEBUG, la pila de lo que lo bloquea)
+    iniciar_monitor_event_loop()
+
+    # Engine y session factory se crean aquí, no al importar app.core.database
+    engine = init_engine()
+
+    # Latencia de la BD (y Redis) medida en segundo plano para /health/ready
+    iniciar_sonda_salud(engine)
+
+    # Retraso de la réplica de lectura, medido en segundo plano para enrutar las lecturas
+    iniciar_sonda_replica()
+
+    # Taps guardados en el spool local durante caídas de la BD
+    await iniciar_reproductor_spool()
+
+    # LISTEN de los cambios de asistencia para el long-polling del feed de cambios
+    iniciar_avisos_cambios()
+
+    # Entrega de la bandeja de salida: asistencia a SAP y resúmenes por correo
+    iniciar_exportador_sap()
+    iniciar_avisos_correo()
+
+    # Workers de los trabajos en segundo plano (p. ej. completar el cierre de una sesión)
+    iniciar_trabajos()
+
     if settings.is_development:
         await init_db()  # Solo en desarrollo
 
@@ -29,7 +76,17 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down application")
+    await detener_avisos_cambios()
+    await detener_reproductor_spool()
+    await detener_procesador_taps()  # Antes de cerrar el engine que usan sus lotes
+    await detener_trabajos()  # Antes que la bandeja: sus trabajos en curso la alimentan
+    await detener_exportador_sap()
+    await detener_avisos_correo()
+    await detener_sonda_salud()
+    await detener_sonda_replica()
     await close_db()
+    await cerrar_control_admision_login()
+    await detener_monitor_event_loop()
 
 
 # ==================== CREATE APP ====================
@@ -52,6 +109,21 @@ app.add_middleware(
     allow_headers=settings.ALLOWED_HEADERS,
 )
 
+# ==================== PROFILING ====================
+
+configurar_profiling(app)
+
+# ==================== READ-REPLICA ROUTING ====================
+
+# Lecturas de las propias escrituras en la réplica, por cliente (cookie/header)
+if settings.DATABASE_REPLICA_URL:
+    app.add_middleware(LecturaTrasEscrituraMiddleware)
+
+# ==================== REQUEST ID ====================
+
+# Último en añadirse = más externo: el id existe también durante el perfilado
+app.add_middleware(RequestIdMiddleware)
+
 # ==================== EXCEPTION HANDLERS ====================
 
 register_exception_handlers(app)
@@ -59,6 +131,7 @@ register_exception_handlers(app)
 # ==================== ROUTERS ====================
 
 app.include_router(api_v1_router, prefix="/api/v1")
+app.include_router(health_router, prefix="/health", tags=["health"])
 
 
 # ==================== ROOT ENDPOINT ====================
@@ -73,7 +146,17 @@ async def root():
     }
 
 
+# ==================== METRICS ====================
+
+if settings.PROMETHEUS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(metricas.exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
+    # Desarrollo: un solo proceso con recarga automática.
+    # Producción (WORKERS procesos, pool repartido, reinicio gradual): python servidor.py
     import uvicorn
 
     uvicorn.run(
@@ -0,0 +1,36 @@
+"""
+Endpoints de salud para el balanceador / orquestador.
+
+- `/health/live`: el proceso responde (el event loop atiende peticiones).
+- `/health/ready`: el worker puede atender tráfico ahora mismo. Responde 503 si
+  la BD no responde o va lenta, el pool está casi agotado, el event loop va
+  retrasado o una tarea de fondo murió. No hace I/O: lee los resultados que mide
+  la sonda de fondo (ver app/core/health.py).
+"""
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core.database import get_engine
+from app.core.health import estado_readiness
+
+router = APIRouter()
+
+
+@router.get("/live", summary="Liveness: el proceso responde.")
+async def live():
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    summary="Readiness: el worker puede recibir tráfico.",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "El worker no está listo"}}
+)
+async def ready():
+    estado = estado_readiness(get_engine())
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if estado["listo"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if estado["listo"] else "not_ready", **estado},
+        headers={"Cache-Control": "no-store"}
+    )
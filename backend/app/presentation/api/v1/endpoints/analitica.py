@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.core.dependencies import get_current_active_user
+from app.core.exceptions import ForbiddenException
+from app.domain.entities.usuario import Usuario
+from app.application.dtos.analitica_dtos import (
+    ReporteAnaliticaAsignatura, ReporteAnaliticaDocente, ReporteAnaliticaEstudiante
+)
+from app.application.use_cases.GetEstadisticasAsistenciaUseCase import GetEstadisticasAsistenciaUseCase
+from app.infrastructure.persistence.repositories.analitica_asistencia_repository_impl import AnaliticaAsistenciaRepositoryImpl
+from app.infrastructure.persistence.repositories.asignatura_repository_impl import AsignaturaRepositoryImpl
+
+router = APIRouter()
+
+
+def get_estadisticas_asistencia_use_case(db: AsyncSession = Depends(get_read_db)) -> GetEstadisticasAsistenciaUseCase:
+    analitica_repo = AnaliticaAsistenciaRepositoryImpl(db)
+    asignatura_repo = AsignaturaRepositoryImpl(db)
+    return GetEstadisticasAsistenciaUseCase(analitica_repo, asignatura_repo)
+
+
+@router.get(
+    "/asignaturas/{id_asignatura}",
+    response_model=ReporteAnaliticaAsignatura,
+    status_code=status.HTTP_200_OK,
+    summary="Estadísticas de asistencia de una asignatura, con detalle por estudiante."
+)
+async def get_analitica_asignatura(
+    id_asignatura: int,
+    desde: Optional[datetime] = Query(None, description="Inicio del periodo (por defecto: hace ANALITICA_PERIODO_DIAS días)"),
+    hasta: Optional[datetime] = Query(None, description="Fin del periodo (por defecto: ahora)"),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: GetEstadisticasAsistenciaUseCase = Depends(get_estadisticas_asistencia_use_case)
+) -> ReporteAnaliticaAsignatura:
+    try:
+        return await use_case.por_asignatura(id_asignatura, current_user.id, desde, hasta)
+    except ForbiddenException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
+
+
+@router.get(
+    "/docente",
+    response_model=ReporteAnaliticaDocente,
+    status_code=status.HTTP_200_OK,
+    summary="Resumen de asistencia de las asignaturas del docente autenticado."
+)
+async def get_analitica_docente(
+    desde: Optional[datetime] = Query(None),
+    hasta: Optional[datetime] = Query(None),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: GetEstadisticasAsistenciaUseCase = Depends(get_estadisticas_asistencia_use_case)
+) -> ReporteAnaliticaDocente:
+    return await use_case.por_docente(current_user.id, desde, hasta)
+
+
+@router.get(
+    "/estudiantes/{id_estudiante}",
+    response_model=ReporteAnaliticaEstudiante,
+    status_code=status.HTTP_200_OK,
+    summary="Asistencia de un estudiante en las asignaturas del docente autenticado."
+)
+async def get_analitica_estudiante(
+    id_estudiante: int,
+    desde: Optional[datetime] = Query(None),
+    hasta: Optional[datetime] = Query(None),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: GetEstadisticasAsistenciaUseCase = Depends(get_estadisticas_asistencia_use_case)
+) -> ReporteAnaliticaEstudiante:
+    return await use_case.por_estudiante(id_estudiante, current_user.id, desde, hasta)
@@ -3,7 +3,7 @@ from typing import List
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.dependencies import get_current_active_user # Removed require_role
 from app.domain.entities.usuario import Usuario
 from app.application.use_cases.GetAsignaturasPorDocenteUseCase import GetAsignaturasPorDocenteUseCase
@@ -14,7 +14,7 @@ from app.presentation.schemas.usuario_schemas import UsuarioPublic # New import
 router = APIRouter()
 
 
-def get_asignaturas_por_docente_use_case(db: AsyncSession = Depends(get_db)) -> GetAsignaturasPorDocenteUseCase:
+def get_asignaturas_por_docente_use_case(db: AsyncSession = Depends(get_read_db)) -> GetAsignaturasPorDocenteUseCase:
     asignatura_repo = AsignaturaRepositoryImpl(db)
     return GetAsignaturasPorDocenteUseCase(asignatura_repo)
 
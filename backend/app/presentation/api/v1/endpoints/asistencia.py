@@ -1,16 +1,26 @@
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_circuito_bd, es_fallo_de_bd
+from app.core.dependencies import get_unit_of_work
 from app.core.exceptions import NotFoundException, ValidationException
+from app.domain.repositories.unit_of_work import IUnitOfWork
 from app.application.use_cases.RegistrarAsistenciaUseCase import RegistrarAsistenciaUseCase
+from app.application.services.spool_taps_service import encolar_tap
+from app.infrastructure.persistence.spool_taps import get_spool_taps
+from app.infrastructure.persistence.contador_transaccional import get_contador_de_sesion
 from app.infrastructure.persistence.repositories.registro_asistencia_repository_impl import RegistroAsistenciaRepositoryImpl
 from app.infrastructure.persistence.repositories.sesion_de_clase_repository_impl import SesionDeClaseRepositoryImpl
 from app.infrastructure.persistence.repositories.estudiante_repository_impl import EstudianteRepositoryImpl
 from app.infrastructure.persistence.repositories.inscripcion_repository_impl import InscripcionRepositoryImpl
 from app.infrastructure.persistence.repositories.asignatura_repository_impl import AsignaturaRepositoryImpl
-from app.presentation.schemas.registro_asistencia_schemas import RegistrarAsistenciaRequest, RegistroAsistenciaPublic, EstudianteInfo, AsignaturaInfo
+from app.presentation.schemas.registro_asistencia_schemas import (
+    RegistrarAsistenciaRequest, RegistroAsistenciaPublic, EstudianteInfo, AsignaturaInfo, TapEncoladoPublic
+)
 
 router = APIRouter()
 
@@ -20,29 +30,55 @@ def get_registrar_asistencia_use_case(db: AsyncSession = Depends(get_db)) -> Reg
     sesion_repo = SesionDeClaseRepositoryImpl(db)
     estudiante_repo = EstudianteRepositoryImpl(db)
     inscripcion_repo = InscripcionRepositoryImpl(db)
-    return RegistrarAsistenciaUseCase(asistencia_repo, sesion_repo, estudiante_repo, inscripcion_repo)
+    return RegistrarAsistenciaUseCase(
+        asistencia_repo, sesion_repo, estudiante_repo, inscripcion_repo, contador=get_contador_de_sesion(db)
+    )
+
+
+async def _encolar(codigo_rfid: str, hora_tap: datetime) -> JSONResponse:
+    await encolar_tap(get_spool_taps(), codigo_rfid, "http", hora_tap)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(TapEncoladoPublic(hora_registro=hora_tap))
+    )
 
 
 @router.post(
     "/registrar",
     response_model=RegistroAsistenciaPublic,
     status_code=status.HTTP_201_CREATED,
-    summary="Registra la asistencia de un estudiante mediante 'tap' NFC."
+    summary="Registra la asistencia de un estudiante mediante 'tap' NFC.",
+    responses={status.HTTP_202_ACCEPTED: {"model": TapEncoladoPublic}}
 )
 async def registrar_asistencia(
     request: RegistrarAsistenciaRequest,
     use_case: RegistrarAsistenciaUseCase = Depends(get_registrar_asistencia_use_case),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Endpoint para el 'tap' de la tarjeta NFC.
 
     El backend determina automáticamente a qué sesión activa debe registrarse el estudiante.
+    Si la base de datos no está disponible, el tap se guarda en el spool local con su
+    hora original y se responde 202; se registrará cuando la base de datos se recupere.
     """
+    hora_tap = datetime.utcnow()
+    spool_habilitado = get_spool_taps() is not None
+    circuito = get_circuito_bd()
+    if spool_habilitado and not circuito.permite():
+        return await _encolar(request.rfc_uid_estudiante, hora_tap)
+
+    confirmado = False
     try:
-        registro = await use_case.execute(request.rfc_uid_estudiante)
+        registro = await use_case.execute(request.rfc_uid_estudiante, hora_registro=hora_tap)
+        await uow.commit()
+        confirmado = True
+        circuito.registrar_exito()
 
-        # Construir la respuesta pública
+        # Construir la respuesta pública. Los repositorios comparten los cargadores de la
+        # sesión (app/infrastructure/persistence/cargadores.py): el estudiante y la sesión
+        # que ya cargó el caso de uso no se vuelven a consultar
         estudiante_repo = EstudianteRepositoryImpl(db)
         asignatura_repo = AsignaturaRepositoryImpl(db)
         sesion_repo = SesionDeClaseRepositoryImpl(db)
@@ -67,5 +103,11 @@ async def registrar_asistencia(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ValidationException as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except HTTPException:
+        raise
     except Exception as e:
+        if spool_habilitado and es_fallo_de_bd(e):
+            circuito.registrar_fallo()
+            if not confirmado:  # Si ya se confirmó, solo falló la construcción de la respuesta
+                return await _encolar(request.rfc_uid_estudiante, hora_tap)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
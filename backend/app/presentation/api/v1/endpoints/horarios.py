@@ -1,35 +1,45 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_active_user # Importar get_current_active_user
+from app.core.database import get_read_db
+from app.core.dependencies import get_current_active_user, get_limite_pagina # Importar get_current_active_user
+from app.core.exceptions import ValidationException
 from app.application.use_cases.ListarHorariosUseCase import ListarHorariosUseCase
 from app.infrastructure.persistence.repositories.horario_repository_impl import HorarioRepositoryImpl
 from app.presentation.schemas.horario_schemas import HorarioPublic
+from app.presentation.schemas.pagina_schemas import PaginaPublic
 
 router = APIRouter()
 
 
-def get_listar_horarios_use_case(db: AsyncSession = Depends(get_db)) -> ListarHorariosUseCase:
+def get_listar_horarios_use_case(db: AsyncSession = Depends(get_read_db)) -> ListarHorariosUseCase:
     horario_repo = HorarioRepositoryImpl(db)
     return ListarHorariosUseCase(horario_repo)
 
 
 @router.get(
     "/",
-    response_model=List[HorarioPublic],
+    response_model=PaginaPublic[HorarioPublic],
     status_code=status.HTTP_200_OK,
-    summary="Lista todas las franjas horarias.",
+    summary="Lista las franjas horarias (paginadas por cursor).",
     dependencies=[Depends(get_current_active_user)] # Añadir la dependencia de autenticación
 )
 async def listar_horarios(
+    limite: int = Depends(get_limite_pagina),
+    cursor: Optional[str] = Query(None, description="'siguiente_cursor' de la página anterior"),
     use_case: ListarHorariosUseCase = Depends(get_listar_horarios_use_case)
-) -> List[HorarioPublic]:
+) -> PaginaPublic[HorarioPublic]:
     """
-    Devuelve una lista de todas las franjas horarias disponibles en el sistema.
+    Devuelve una página de las franjas horarias disponibles en el sistema.
     Requiere autenticación.
     """
-    horarios = await use_case.execute()
-    return [HorarioPublic.model_validate(h) for h in horarios]
+    try:
+        pagina = await use_case.execute(limite, cursor)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    return PaginaPublic[HorarioPublic](
+        items=[HorarioPublic.model_validate(h) for h in pagina.items],
+        siguiente_cursor=pagina.siguiente_cursor
+    )
@@ -0,0 +1,188 @@
+import asyncio
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_session_factory, get_circuito_bd, es_fallo_de_bd
+from app.core.exceptions import AulaTapException
+from app.core.health import registrar_componente, quitar_componente
+from app.core.logger import logger
+from app.domain.entities.registro_asistencia import RegistroAsistencia
+from app.application.use_cases.RegistrarAsistenciaUseCase import RegistrarAsistenciaUseCase
+from app.application.services.procesador_taps import ProcesadorTaps, get_procesador_taps
+from app.application.services.spool_taps_service import ReproductorSpool, encolar_tap, registrar_metricas_spool
+from app.infrastructure.persistence.spool_taps import get_spool_taps
+from app.infrastructure.persistence.contador_transaccional import get_contador_de_sesion
+from app.infrastructure.persistence.repositories.registro_asistencia_repository_impl import RegistroAsistenciaRepositoryImpl
+from app.infrastructure.persistence.repositories.sesion_de_clase_repository_impl import SesionDeClaseRepositoryImpl
+from app.infrastructure.persistence.repositories.estudiante_repository_impl import EstudianteRepositoryImpl
+from app.infrastructure.persistence.repositories.inscripcion_repository_impl import InscripcionRepositoryImpl
+from app.presentation.schemas.lector_schemas import TapTrama, AckTrama
+
+router = APIRouter()
+
+
+def crear_registrar_asistencia_use_case(db: AsyncSession) -> RegistrarAsistenciaUseCase:
+    return RegistrarAsistenciaUseCase(
+        RegistroAsistenciaRepositoryImpl(db),
+        SesionDeClaseRepositoryImpl(db),
+        EstudianteRepositoryImpl(db),
+        InscripcionRepositoryImpl(db),
+        contador=get_contador_de_sesion(db)
+    )
+
+
+def crear_procesador_taps() -> ProcesadorTaps:
+    return ProcesadorTaps(
+        session_factory=get_session_factory(),
+        crear_caso_de_uso=crear_registrar_asistencia_use_case,
+        tam_lote=settings.INGESTA_TAM_LOTE,
+        espera_lote_ms=settings.INGESTA_ESPERA_LOTE_MS,
+        trabajadores=settings.INGESTA_TRABAJADORES,
+        tam_cola=settings.INGESTA_TAM_COLA,
+        espera_detener_segundos=settings.INGESTA_ESPERA_DETENER_SEGUNDOS
+    )
+
+
+# ==================== SPOOL DE TAPS ====================
+
+_reproductor: Optional[ReproductorSpool] = None
+
+
+async def iniciar_reproductor_spool() -> None:
+    """Abre el spool de taps y arranca su reproductor (startup). No hace nada si está deshabilitado."""
+    global _reproductor
+    spool = get_spool_taps()
+    if spool is None or _reproductor is not None:
+        return
+    await spool.abrir()
+    circuito = get_circuito_bd()
+    registrar_metricas_spool(spool, circuito)
+    _reproductor = ReproductorSpool(
+        spool, circuito,
+        obtener_procesador=lambda: get_procesador_taps(crear_procesador_taps),
+        tam_lote=settings.SPOOL_TAPS_LOTE_REPLAY,
+        intervalo_segundos=settings.SPOOL_TAPS_INTERVALO_REPLAY_SEGUNDOS
+    )
+    _reproductor.iniciar()
+    registrar_componente("reproductor_spool", lambda: _reproductor is not None and _reproductor.vivo)
+    if spool.profundidad:
+        logger.info(f"Spool de taps: {spool.profundidad} taps pendientes de una ejecución anterior")
+
+
+async def detener_reproductor_spool() -> None:
+    """Detiene el reproductor y cierra el spool (shutdown)."""
+    global _reproductor
+    if _reproductor is not None:
+        quitar_componente("reproductor_spool")
+        await _reproductor.detener()
+        _reproductor = None
+    spool = get_spool_taps()
+    if spool is not None:
+        spool.cerrar()
+
+
+async def registrar_tap(procesador: ProcesadorTaps, codigo_rfid: str, id_dispositivo: str) -> Optional[RegistroAsistencia]:
+    """
+    Registra un tap por el camino por lotes. Si el circuito de la BD está abierto, o el
+    tap falla por no poder conectar, lo guarda en el spool y retorna None.
+    """
+    hora_tap = datetime.utcnow()
+    spool = get_spool_taps()
+    circuito = get_circuito_bd()
+    if spool is not None and not circuito.permite():
+        await encolar_tap(spool, codigo_rfid, id_dispositivo, hora_tap)
+        return None
+    try:
+        registro = await procesador.registrar(codigo_rfid, id_dispositivo, hora_registro=hora_tap)
+    except AulaTapException:
+        circuito.registrar_exito()  # La BD respondió: es una regla de negocio
+        raise
+    except Exception as e:
+        if spool is None or not es_fallo_de_bd(e):
+            raise
+        circuito.registrar_fallo()
+        await encolar_tap(spool, codigo_rfid, id_dispositivo, hora_tap)
+        return None
+    circuito.registrar_exito()
+    return registro
+
+
+# ==================== CANAL WEBSOCKET ====================
+
+def _api_key_valida(websocket: WebSocket) -> bool:
+    # Los lectores envían el header X-API-Key; el query param es para clientes que no pueden
+    api_key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+    return bool(api_key) and secrets.compare_digest(api_key, settings.API_KEY)
+
+
+@router.websocket("/{id_dispositivo}/ws")
+async def canal_lector(websocket: WebSocket, id_dispositivo: str):
+    """
+    Canal persistente de un lector NFC.
+
+    El lector envía tramas `{"id": n, "uid": "..."}` y recibe, por cada una, un ack
+    `{"id": n, "ok": true, "estado": "Presente", ...}` o `{"id": n, "ok": false, "codigo": 404, "error": "..."}`.
+    Los acks pueden llegar en distinto orden que los taps: se correlacionan por `id`.
+    """
+    if not _api_key_valida(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    logger.info(f"Lector {id_dispositivo} conectado")
+
+    procesador = get_procesador_taps(crear_procesador_taps)
+    envio = asyncio.Lock()
+    pendientes = asyncio.Semaphore(settings.INGESTA_MAX_PENDIENTES_POR_CONEXION)
+    tareas: set[asyncio.Task] = set()
+
+    async def enviar(ack: AckTrama) -> None:
+        async with envio:
+            await websocket.send_text(ack.model_dump_json(exclude_none=True))
+
+    async def atender(tap: TapTrama) -> None:
+        try:
+            registro = await registrar_tap(procesador, tap.uid, id_dispositivo)
+            if registro is None:
+                ack = AckTrama(id=tap.id, ok=True, encolado=True)
+            else:
+                ack = AckTrama(
+                    id=tap.id, ok=True, id_registro=registro.id,
+                    estado=registro.estado_asistencia, hora_entrada=registro.hora_entrada
+                )
+        except AulaTapException as e:
+            ack = AckTrama(id=tap.id, ok=False, codigo=e.status_code, error=e.message)
+        except Exception as e:
+            ack = AckTrama(id=tap.id, ok=False, codigo=status.HTTP_500_INTERNAL_SERVER_ERROR, error=str(e))
+        finally:
+            pendientes.release()
+        try:
+            await enviar(ack)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # El lector se desconectó antes del ack
+
+    try:
+        while True:
+            texto = await websocket.receive_text()
+            try:
+                tap = TapTrama.model_validate_json(texto)
+            except ValidationError as e:
+                await enviar(AckTrama(ok=False, codigo=status.HTTP_422_UNPROCESSABLE_ENTITY, error=str(e)))
+                continue
+
+            # Contrapresión: con demasiados taps sin confirmar se deja de leer del socket
+            await pendientes.acquire()
+            tarea = asyncio.create_task(atender(tap))
+            tareas.add(tarea)
+            tarea.add_done_callback(tareas.discard)
+    except WebSocketDisconnect:
+        logger.info(f"Lector {id_dispositivo} desconectado")
+    finally:
+        # Los taps ya encolados se procesan igual; solo se dejan de esperar sus acks
+        for tarea in tareas:
+            tarea.cancel()
@@ -5,13 +5,15 @@ Endpoint para la autenticación de usuarios.
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token
 from app.core.dependencies import get_current_active_user
+from app.core.exceptions import RateLimitException
+from app.core.login_admission import ControlAdmisionLogin, get_control_admision_login
 from app.infrastructure.persistence.repositories.usuario_repository_impl import UsuarioRepositoryImpl
 from app.presentation.schemas.usuario_schemas import Token, UsuarioPublic
 from app.domain.entities.usuario import Usuario
@@ -19,28 +21,45 @@ from app.domain.entities.usuario import Usuario
 router = APIRouter()
 
 
-async def authenticate_user(email: str, password: str, db: AsyncSession) -> Usuario | None:
+async def authenticate_user(email: str, password: str, db: AsyncSession,
+                            control: ControlAdmisionLogin, ip: str | None = None) -> Usuario | None:
     """
     Autentica a un usuario.
+
+    Pasa por el control de admisión: una cuenta o IP bloqueada se rechaza antes de
+    consultar la BD, y la verificación Argon2 se hace en un hilo con turno limitado.
     """
+    await control.comprobar(email, ip)
     user_repo = UsuarioRepositoryImpl(db)
     user = await user_repo.get_by_email(email)
-    if not user:
-        return None
-    if not verify_password(password, user.password_hash):
+    if not user or not await control.verificar(password, user.password_hash):
+        await control.registrar_fallo(email, ip)
         return None
+    await control.registrar_exito(email)
     return user
 
 
 @router.post("/auth/login", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    form_data: OAuth2PasswordRequestForm = Depends()
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    control: ControlAdmisionLogin = Depends(get_control_admision_login)
 ) -> Any:
     """
     Proporciona un token de acceso JWT para un usuario autenticado.
     """
-    user = await authenticate_user(email=form_data.username, password=form_data.password, db=db)
+    ip = request.client.host if request.client else None
+    try:
+        user = await authenticate_user(
+            email=form_data.username, password=form_data.password, db=db, control=control, ip=ip
+        )
+    except RateLimitException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+            headers={"Retry-After": str(e.details["retry_after_seconds"])},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,26 +1,40 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_active_user # Removed require_role
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.dependencies import get_current_active_user, get_unit_of_work, get_limite_pagina # Removed require_role
 from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
 from app.domain.entities.usuario import Usuario
 from app.domain.entities.sesion_de_clase import SesionDeClase
+from app.domain.repositories.unit_of_work import IUnitOfWork
 from app.application.use_cases.AbrirSesionUseCase import AbrirSesionUseCase
 from app.application.use_cases.CerrarSesionUseCase import CerrarSesionUseCase
 from app.application.use_cases.GetSesionesActivasPorDocenteUseCase import GetSesionesActivasPorDocenteUseCase # New import
+from app.application.use_cases.GetResumenAsistenciaSesionUseCase import GetResumenAsistenciaSesionUseCase
+from app.application.use_cases.ListarRegistrosSesionUseCase import ListarRegistrosSesionUseCase
+from app.application.use_cases.ListarCambiosRegistrosSesionUseCase import ListarCambiosRegistrosSesionUseCase
+from app.application.services.contador_asistencia import get_contador_asistencia
+from app.application.services.trabajos_service import avisar_trabajos
+from app.infrastructure.persistence.avisos_cambios import get_avisos_cambios
+from app.infrastructure.persistence.contador_transaccional import get_contador_de_sesion
 from app.infrastructure.persistence.repositories.sesion_de_clase_repository_impl import SesionDeClaseRepositoryImpl
 from app.infrastructure.persistence.repositories.asignatura_repository_impl import AsignaturaRepositoryImpl
 from app.infrastructure.persistence.repositories.clase_programada_repository_impl import ClaseProgramadaRepositoryImpl
-from app.infrastructure.persistence.repositories.inscripcion_repository_impl import InscripcionRepositoryImpl # New import
 from app.infrastructure.persistence.repositories.registro_asistencia_repository_impl import RegistroAsistenciaRepositoryImpl # New import
-from app.presentation.schemas.sesion_de_clase_schemas import AbrirSesionRequest, SesionDeClasePublic
+from app.infrastructure.persistence.repositories.trabajo_repository_impl import TrabajoRepositoryImpl
+from app.presentation.schemas.sesion_de_clase_schemas import AbrirSesionRequest, SesionDeClasePublic, SesionCerradaPublic
+from app.presentation.schemas.trabajo_schemas import TrabajoPublic
 from app.presentation.schemas.clase_programada_schemas import ClaseProgramadaPublic
 from app.presentation.schemas.asignatura_schemas import AsignaturaPublic # New import
 from app.presentation.schemas.horario_schemas import HorarioPublic # New import
 from app.presentation.schemas.usuario_schemas import UsuarioPublic # New import
+from app.presentation.schemas.registro_asistencia_schemas import (
+    ResumenAsistenciaSesionPublic, RegistroAsistenciaSesionPublic, CambiosRegistrosSesionPublic
+)
+from app.presentation.schemas.pagina_schemas import PaginaPublic
 
 router = APIRouter()
 
@@ -36,18 +50,49 @@ def get_cerrar_sesion_use_case(db: AsyncSession = Depends(get_db)) -> CerrarSesi
     sesion_repo = SesionDeClaseRepositoryImpl(db)
     asignatura_repo = AsignaturaRepositoryImpl(db)
     clase_programada_repo = ClaseProgramadaRepositoryImpl(db)
-    inscripcion_repo = InscripcionRepositoryImpl(db) # New
-    registro_asistencia_repo = RegistroAsistenciaRepositoryImpl(db) # New
-    return CerrarSesionUseCase(sesion_repo, asignatura_repo, clase_programada_repo, inscripcion_repo, registro_asistencia_repo) # Updated
+    trabajo_repo = TrabajoRepositoryImpl(db)
+    return CerrarSesionUseCase(
+        sesion_repo, asignatura_repo, clase_programada_repo, trabajo_repo,
+        contador=get_contador_de_sesion(db)
+    )
 
 
-def get_sesiones_activas_por_docente_use_case(db: AsyncSession = Depends(get_db)) -> GetSesionesActivasPorDocenteUseCase:
+def get_sesiones_activas_por_docente_use_case(db: AsyncSession = Depends(get_read_db)) -> GetSesionesActivasPorDocenteUseCase:
     sesion_repo = SesionDeClaseRepositoryImpl(db)
     asignatura_repo = AsignaturaRepositoryImpl(db)
     clase_programada_repo = ClaseProgramadaRepositoryImpl(db)
     return GetSesionesActivasPorDocenteUseCase(sesion_repo, asignatura_repo, clase_programada_repo)
 
 
+# Primario (no réplica): el resumen se consulta mientras llegan los taps
+def get_resumen_asistencia_sesion_use_case(db: AsyncSession = Depends(get_db)) -> GetResumenAsistenciaSesionUseCase:
+    registro_asistencia_repo = RegistroAsistenciaRepositoryImpl(db)
+    asignatura_repo = AsignaturaRepositoryImpl(db)
+    return GetResumenAsistenciaSesionUseCase(registro_asistencia_repo, asignatura_repo, contador=get_contador_asistencia())
+
+
+def get_listar_registros_sesion_use_case(db: AsyncSession = Depends(get_read_db)) -> ListarRegistrosSesionUseCase:
+    sesion_repo = SesionDeClaseRepositoryImpl(db)
+    asignatura_repo = AsignaturaRepositoryImpl(db)
+    registro_asistencia_repo = RegistroAsistenciaRepositoryImpl(db)
+    return ListarRegistrosSesionUseCase(sesion_repo, asignatura_repo, registro_asistencia_repo)
+
+
+# Primario (no réplica): el cursor es una instantánea de transacciones del primario
+def get_listar_cambios_registros_sesion_use_case(
+    db: AsyncSession = Depends(get_db),
+    uow: IUnitOfWork = Depends(get_unit_of_work)
+) -> ListarCambiosRegistrosSesionUseCase:
+    return ListarCambiosRegistrosSesionUseCase(
+        SesionDeClaseRepositoryImpl(db),
+        AsignaturaRepositoryImpl(db),
+        RegistroAsistenciaRepositoryImpl(db),
+        uow,
+        avisos=get_avisos_cambios(),
+        intervalo_sondeo=settings.ASISTENCIA_CAMBIOS_INTERVALO_SONDEO_SEGUNDOS
+    )
+
+
 @router.post(
     "/abrir",
     response_model=SesionDeClasePublic,
@@ -59,7 +104,7 @@ async def abrir_sesion(
     request: AbrirSesionRequest,
     current_user: Usuario = Depends(get_current_active_user),
     use_case: AbrirSesionUseCase = Depends(get_abrir_sesion_use_case),
-    db: AsyncSession = Depends(get_db) # Add db dependency
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ) -> SesionDeClasePublic: # Changed return type hint to SesionDeClasePublic
     """
     Permite a un docente iniciar una nueva sesión de clase.
@@ -72,7 +117,7 @@ async def abrir_sesion(
             id_horario=request.id_horario,
             tema=request.tema
         )
-        await db.commit() # Commit the changes
+        await uow.commit()
 
         # Manually construct AsignaturaPublic with current_user as docente
         asignatura_public_with_docente = AsignaturaPublic.model_validate(clase_programada.asignatura)
@@ -93,20 +138,16 @@ async def abrir_sesion(
             clase_programada=clase_programada_public
         )
     except NotFoundException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 @router.post(
     "/{id_sesion}/cerrar",
-    response_model=SesionDeClasePublic,
+    response_model=SesionCerradaPublic,
     status_code=status.HTTP_200_OK,
     summary="Un docente cierra una sesión de clase."
 )
@@ -114,15 +155,18 @@ async def cerrar_sesion(
     id_sesion: int,
     current_user: Usuario = Depends(get_current_active_user),
     use_case: CerrarSesionUseCase = Depends(get_cerrar_sesion_use_case),
-    db: AsyncSession = Depends(get_db) # Add db dependency
-) -> SesionDeClasePublic: # Changed return type hint to SesionDeClasePublic
+    uow: IUnitOfWork = Depends(get_unit_of_work)
+) -> SesionCerradaPublic:
     """
     Permite a un docente cerrar una sesión de clase activa.
     Verifica que la sesión exista, esté en progreso y que el docente sea dueño de la asignatura asociada.
+    Responde en cuanto la sesión queda cerrada: el marcado de ausentes y los envíos se
+    completan en segundo plano, en el trabajo devuelto (GET /trabajos/{id} para seguirlo).
     """
     try:
-        sesion_cerrada, clase_programada = await use_case.execute(sesion_id=id_sesion, docente_id=current_user.id) # Unpack the tuple
-        await db.commit() # Commit the changes
+        sesion_cerrada, clase_programada, trabajo = await use_case.execute(sesion_id=id_sesion, docente_id=current_user.id) # Unpack the tuple
+        await uow.commit()
+        avisar_trabajos()  # El trabajo empieza ya, sin esperar al intervalo
 
         # Manually construct AsignaturaPublic with current_user as docente
         asignatura_public_with_docente = AsignaturaPublic.model_validate(clase_programada.asignatura)
@@ -134,25 +178,22 @@ async def cerrar_sesion(
             horario=HorarioPublic.model_validate(clase_programada.horario) # Assuming HorarioPublic can validate directly
         )
 
-        return SesionDeClasePublic(
+        return SesionCerradaPublic(
             id=sesion_cerrada.id,
             hora_inicio=sesion_cerrada.hora_inicio,
             hora_fin=sesion_cerrada.hora_fin,
             estado=sesion_cerrada.estado,
             tema=sesion_cerrada.tema,
-            clase_programada=clase_programada_public
+            clase_programada=clase_programada_public,
+            trabajo=TrabajoPublic.model_validate(trabajo)
         )
     except NotFoundException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
-        await db.rollback() # Rollback on exception
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get(
@@ -196,3 +237,99 @@ async def get_sesiones_abiertas(
         return response_sesiones
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get(
+    "/{id_sesion}/resumen",
+    response_model=ResumenAsistenciaSesionPublic,
+    status_code=status.HTTP_200_OK,
+    summary="Conteo en vivo de presentes, tardes, ausentes y sin registrar de una sesión."
+)
+async def get_resumen_asistencia_sesion(
+    id_sesion: int,
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: GetResumenAsistenciaSesionUseCase = Depends(get_resumen_asistencia_sesion_use_case)
+) -> ResumenAsistenciaSesionPublic:
+    """
+    Compara los registros de asistencia de la sesión con los estudiantes inscritos
+    en la asignatura. Pensado para consultarse periódicamente mientras la sesión está en curso.
+    """
+    try:
+        resumen = await use_case.execute(sesion_id=id_sesion, docente_id=current_user.id)
+        return ResumenAsistenciaSesionPublic.model_validate(resumen)
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except ForbiddenException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get(
+    "/{id_sesion}/registros",
+    response_model=PaginaPublic[RegistroAsistenciaSesionPublic],
+    status_code=status.HTTP_200_OK,
+    summary="Lista los registros de asistencia de una sesión (paginados por cursor)."
+)
+async def listar_registros_sesion(
+    id_sesion: int,
+    limite: int = Depends(get_limite_pagina),
+    cursor: Optional[str] = Query(None, description="'siguiente_cursor' de la página anterior"),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: ListarRegistrosSesionUseCase = Depends(get_listar_registros_sesion_use_case)
+) -> PaginaPublic[RegistroAsistenciaSesionPublic]:
+    """
+    Devuelve una página de los registros de asistencia de la sesión, ordenados por estudiante.
+    """
+    try:
+        pagina = await use_case.execute(id_sesion, current_user.id, limite, cursor)
+        return PaginaPublic[RegistroAsistenciaSesionPublic](
+            items=[RegistroAsistenciaSesionPublic.model_validate(r) for r in pagina.items],
+            siguiente_cursor=pagina.siguiente_cursor
+        )
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except ForbiddenException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get(
+    "/{id_sesion}/registros/cambios",
+    response_model=CambiosRegistrosSesionPublic,
+    status_code=status.HTTP_200_OK,
+    summary="Registros de asistencia de una sesión creados o modificados desde un cursor."
+)
+async def listar_cambios_registros_sesion(
+    id_sesion: int,
+    cursor: Optional[str] = Query(None, description="'cursor' de la respuesta anterior (sin él, todos los registros)"),
+    espera: float = Query(
+        0.0, ge=0.0, le=settings.ASISTENCIA_CAMBIOS_ESPERA_MAX_SEGUNDOS,
+        description="Segundos que se retiene la petición si no hay cambios (long-polling)"
+    ),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: ListarCambiosRegistrosSesionUseCase = Depends(get_listar_cambios_registros_sesion_use_case)
+) -> CambiosRegistrosSesionPublic:
+    """
+    Devuelve solo los registros que cambiaron desde `cursor`, con su estado actual, y
+    el cursor para la siguiente petición. Un registro modificado varias veces aparece
+    una sola vez. Con `espera`, si aún no hay cambios la respuesta llega en cuanto se
+    produzca uno (o vacía al agotarse la espera).
+    """
+    try:
+        cambios = await use_case.execute(id_sesion, current_user.id, cursor, espera)
+        return CambiosRegistrosSesionPublic(
+            items=[RegistroAsistenciaSesionPublic.model_validate(r) for r in cambios.items],
+            cursor=cambios.cursor
+        )
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except ForbiddenException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
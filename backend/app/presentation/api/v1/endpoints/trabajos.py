@@ -0,0 +1,64 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_active_user, get_limite_pagina
+from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
+from app.domain.entities.trabajo import EstadoTrabajo
+from app.domain.entities.usuario import Usuario
+from app.application.use_cases.ConsultarTrabajosUseCase import ConsultarTrabajosUseCase
+from app.infrastructure.persistence.repositories.trabajo_repository_impl import TrabajoRepositoryImpl
+from app.presentation.schemas.trabajo_schemas import TrabajoPublic
+from app.presentation.schemas.pagina_schemas import PaginaPublic
+
+router = APIRouter()
+
+
+# Primario (no réplica): el progreso se consulta mientras el trabajo avanza
+def get_consultar_trabajos_use_case(db: AsyncSession = Depends(get_db)) -> ConsultarTrabajosUseCase:
+    return ConsultarTrabajosUseCase(TrabajoRepositoryImpl(db))
+
+
+@router.get(
+    "/{id_trabajo}",
+    response_model=TrabajoPublic,
+    status_code=status.HTTP_200_OK,
+    summary="Estado y progreso de un trabajo en segundo plano del usuario."
+)
+async def get_trabajo(
+    id_trabajo: int,
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: ConsultarTrabajosUseCase = Depends(get_consultar_trabajos_use_case)
+) -> TrabajoPublic:
+    try:
+        trabajo = await use_case.get(id_trabajo, current_user.id)
+        return TrabajoPublic.model_validate(trabajo)
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except ForbiddenException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
+
+
+@router.get(
+    "/",
+    response_model=PaginaPublic[TrabajoPublic],
+    status_code=status.HTTP_200_OK,
+    summary="Trabajos en segundo plano del usuario, los más recientes primero (paginados por cursor)."
+)
+async def listar_trabajos(
+    estado: Optional[EstadoTrabajo] = Query(None, description="Solo los trabajos en este estado"),
+    limite: int = Depends(get_limite_pagina),
+    cursor: Optional[str] = Query(None, description="'siguiente_cursor' de la página anterior"),
+    current_user: Usuario = Depends(get_current_active_user),
+    use_case: ConsultarTrabajosUseCase = Depends(get_consultar_trabajos_use_case)
+) -> PaginaPublic[TrabajoPublic]:
+    try:
+        pagina = await use_case.listar(current_user.id, limite, cursor, estado)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    return PaginaPublic[TrabajoPublic](
+        items=[TrabajoPublic.model_validate(t) for t in pagina.items],
+        siguiente_cursor=pagina.siguiente_cursor
+    )
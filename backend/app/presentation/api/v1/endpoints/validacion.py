@@ -1,8 +1,11 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_db, get_current_user, get_unit_of_work, get_avisos_asistencia
 from app.domain.entities.usuario import Usuario
+from app.domain.repositories.unit_of_work import IUnitOfWork
 from app.presentation.schemas.validacion_schemas import RegistrarAsistenciaRequest
 from app.presentation.schemas.sesion_de_clase_schemas import SesionDeClasePublic
 from app.presentation.schemas.registro_asistencia_schemas import RegistroAsistenciaPublic, EstudianteInfo, AsignaturaInfo
@@ -16,6 +19,8 @@ from app.application.use_cases.AbrirValidacionUseCase import AbrirValidacionUseC
 from app.application.use_cases.RegistrarAsistenciaUseCase import RegistrarAsistenciaUseCase
 from app.application.use_cases.RegistrarAsistenciaValidacionUseCase import RegistrarAsistenciaValidacionUseCase
 from app.application.use_cases.CerrarValidacionUseCase import CerrarValidacionUseCase
+from app.application.services.avisos_asistencia import AvisosAsistencia
+from app.infrastructure.persistence.contador_transaccional import get_contador_de_sesion
 from app.infrastructure.persistence.repositories import (
     SesionDeClaseRepositoryImpl,
     RegistroAsistenciaRepositoryImpl,
@@ -24,6 +29,7 @@ from app.infrastructure.persistence.repositories import (
     AsignaturaRepositoryImpl,
     ClaseProgramadaRepositoryImpl
 )
+from app.infrastructure.persistence.precarga import SQLAlchemyPrecargador
 from app.core.exceptions import AulaTapException, NotFoundException, ForbiddenException, ValidationException
 
 router = APIRouter()
@@ -39,23 +45,32 @@ def get_registrar_asistencia_use_case(db: AsyncSession = Depends(get_db)) -> Reg
         sesion_de_clase_repository=SesionDeClaseRepositoryImpl(db),
         registro_asistencia_repository=RegistroAsistenciaRepositoryImpl(db),
         estudiante_repository=EstudianteRepositoryImpl(db),
-        inscripcion_repository=InscripcionRepositoryImpl(db)
+        inscripcion_repository=InscripcionRepositoryImpl(db),
+        contador=get_contador_de_sesion(db)
     )
 
-def get_cerrar_validacion_use_case(db: AsyncSession = Depends(get_db)) -> CerrarValidacionUseCase:
+def get_cerrar_validacion_use_case(
+    db: AsyncSession = Depends(get_db),
+    avisos: Optional[AvisosAsistencia] = Depends(get_avisos_asistencia)
+) -> CerrarValidacionUseCase:
     sesion_repo = SesionDeClaseRepositoryImpl(db)
     inscripcion_repo = InscripcionRepositoryImpl(db)
     registro_asistencia_repo = RegistroAsistenciaRepositoryImpl(db)
     asignatura_repo = AsignaturaRepositoryImpl(db)
     clase_programada_repo = ClaseProgramadaRepositoryImpl(db)
-    return CerrarValidacionUseCase(sesion_repo, inscripcion_repo, registro_asistencia_repo, asignatura_repo, clase_programada_repo)
+    return CerrarValidacionUseCase(
+        sesion_repo, inscripcion_repo, registro_asistencia_repo, asignatura_repo, clase_programada_repo,
+        contador=get_contador_de_sesion(db),
+        avisos=avisos
+    )
 
 def get_registrar_asistencia_validacion_use_case(db: AsyncSession = Depends(get_db)) -> RegistrarAsistenciaValidacionUseCase:
     return RegistrarAsistenciaValidacionUseCase(
         registro_asistencia_repository=RegistroAsistenciaRepositoryImpl(db),
         sesion_de_clase_repository=SesionDeClaseRepositoryImpl(db),
         estudiante_repository=EstudianteRepositoryImpl(db),
-        clase_programada_repository=ClaseProgramadaRepositoryImpl(db) # Added
+        precargador=SQLAlchemyPrecargador(db),
+        contador=get_contador_de_sesion(db)
     )
 
 @router.post("/{id_sesion}/abrir-validacion", response_model=SesionDeClasePublic, summary="Abrir la validación de asistencia para una sesión")
@@ -63,14 +78,14 @@ async def abrir_validacion(
     id_sesion: int,
     use_case: AbrirValidacionUseCase = Depends(get_abrir_validacion_use_case),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Permite a un docente abrir el proceso de validación de asistencia para una sesión de clase que está 'EnProgreso'.
     """
     try:
         sesion, clase_programada = await use_case.execute(id_sesion, current_user.id)
-        await db.commit()
+        await uow.commit()
 
         asignatura_public_with_docente = AsignaturaPublic.model_validate(clase_programada.asignatura)
         asignatura_public_with_docente.docente = UsuarioPublic.model_validate(current_user)
@@ -89,19 +104,14 @@ async def abrir_validacion(
             clase_programada=clase_programada_public
         )
     except NotFoundException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except AulaTapException as e:
-        await db.rollback()
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.post("/{id_sesion}/validar-asistencia", response_model=RegistroAsistenciaPublic, summary="Validar la asistencia de un estudiante")
@@ -109,14 +119,14 @@ async def registrar_asistencia(
     id_sesion: int,
     request: RegistrarAsistenciaRequest,
     use_case: RegistrarAsistenciaValidacionUseCase = Depends(get_registrar_asistencia_validacion_use_case),
-    db: AsyncSession = Depends(get_db)
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Registra el 'tap' de un carnet de estudiante para una sesión con validación abierta.
     """
     try:
         registro, estudiante, clase_programada, sesion = await use_case.execute(id_sesion, request.codigo_rfid)
-        await db.commit()
+        await uow.commit()
 
         estudiante_info = EstudianteInfo(nombre_completo=f"{estudiante.nombre_completo}")
         asignatura_info = AsignaturaInfo(
@@ -133,33 +143,28 @@ async def registrar_asistencia(
             tema_sesion=sesion.tema
         )
     except NotFoundException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except AulaTapException as e:
-        await db.rollback()
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 @router.post("/{id_sesion}/cerrar-validacion", response_model=SesionDeClasePublic, summary="Cerrar la validación de asistencia")
 async def cerrar_validacion(
     id_sesion: int,
     use_case: CerrarValidacionUseCase = Depends(get_cerrar_validacion_use_case),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Cierra el proceso de validación, marca a los estudiantes no registrados como ausentes y cambia el estado de la sesión.
     """
     try:
         sesion, clase_programada = await use_case.execute(id_sesion, current_user.id)
-        await db.commit()
+        await uow.commit()
 
         asignatura_public_with_docente = AsignaturaPublic.model_validate(clase_programada.asignatura)
         asignatura_public_with_docente.docente = UsuarioPublic.model_validate(current_user)
@@ -178,19 +183,14 @@ async def cerrar_validacion(
             clase_programada=clase_programada_public
         )
     except NotFoundException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except AulaTapException as e:
-        await db.rollback()
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.post("/{id_sesion}/cerrar-validacion", response_model=SesionDeClasePublic, summary="Cerrar la validación de asistencia")
@@ -198,14 +198,14 @@ async def cerrar_validacion(
     id_sesion: int,
     use_case: CerrarValidacionUseCase = Depends(get_cerrar_validacion_use_case),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    uow: IUnitOfWork = Depends(get_unit_of_work)
 ):
     """
     Cierra el proceso de validación, marca a los estudiantes no registrados como ausentes y cambia el estado de la sesión.
     """
     try:
         sesion, clase_programada = await use_case.execute(id_sesion, current_user.id)
-        await db.commit()
+        await uow.commit()
 
         asignatura_public_with_docente = AsignaturaPublic.model_validate(clase_programada.asignatura)
         asignatura_public_with_docente.docente = UsuarioPublic.model_validate(current_user)
@@ -224,17 +224,12 @@ async def cerrar_validacion(
             clase_programada=clase_programada_public
         )
     except NotFoundException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ForbiddenException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.message)
     except ValidationException as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except AulaTapException as e:
-        await db.rollback()
         raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
-        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
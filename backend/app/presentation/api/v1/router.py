@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.presentation.api.v1.endpoints import login, asistencia, horarios, asignaturas, sesiones, validacion
+from app.presentation.api.v1.endpoints import login, asistencia, horarios, asignaturas, sesiones, validacion, analitica, lectores, trabajos
 
 api_v1_router = APIRouter()
 api_v1_router.include_router(login.router, tags=["login"])
@@ -8,3 +8,6 @@ api_v1_router.include_router(horarios.router, prefix="/horarios", tags=["horario
 api_v1_router.include_router(asignaturas.router, prefix="/asignaturas", tags=["asignaturas"])
 api_v1_router.include_router(sesiones.router, prefix="/sesiones", tags=["sesiones"])
 api_v1_router.include_router(validacion.router, prefix="/sesiones", tags=["validación"])
+api_v1_router.include_router(analitica.router, prefix="/analitica", tags=["analítica"])
+api_v1_router.include_router(lectores.router, prefix="/lectores", tags=["lectores"])
+api_v1_router.include_router(trabajos.router, prefix="/trabajos", tags=["trabajos"])
@@ -0,0 +1,27 @@
+"""
+Schemas de las tramas del canal WebSocket de los lectores NFC.
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.domain.entities.registro_asistencia import EstadoAsistencia
+
+
+class TapTrama(BaseModel):
+    """Trama lector -> servidor: un tap."""
+    id: int = Field(..., description="Número de secuencia del lector, se devuelve en el ack")
+    uid: str = Field(..., min_length=1, description="RFC o UID leído de la tarjeta NFC")
+
+
+class AckTrama(BaseModel):
+    """Trama servidor -> lector: confirmación (o error) de un tap."""
+    id: Optional[int] = None
+    ok: bool
+    encolado: Optional[bool] = Field(None, description="True si la BD no estaba disponible y el tap quedó en el spool")
+    id_registro: Optional[int] = None
+    estado: Optional[EstadoAsistencia] = None
+    hora_entrada: Optional[datetime] = None
+    codigo: Optional[int] = Field(None, description="Código HTTP equivalente del error")
+    error: Optional[str] = None
@@ -0,0 +1,16 @@
+"""
+Schemas para las respuestas paginadas por cursor, utilizados en la API.
+"""
+
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class PaginaPublic(BaseModel, Generic[T]):
+    """Schema genérico de una página de resultados."""
+    items: List[T]
+    siguiente_cursor: Optional[str] = Field(
+        None, description="Enviar como 'cursor' para obtener la página siguiente. None si es la última."
+    )
@@ -3,6 +3,7 @@ Schemas para la entidad RegistroAsistencia, utilizados en la API.
 """
 
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 from app.domain.entities.registro_asistencia import EstadoAsistencia
@@ -41,3 +42,41 @@ class RegistroAsistenciaPublic(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TapEncoladoPublic(BaseModel):
+    """Schema de la respuesta 202 cuando la BD no está disponible y el tap queda en el spool."""
+    encolado: bool = True
+    hora_registro: datetime
+    detail: str = "Base de datos no disponible: el tap se registrará en cuanto se recupere."
+
+
+class RegistroAsistenciaSesionPublic(BaseModel):
+    """Schema para un registro de asistencia dentro del listado de una sesión."""
+    id: int
+    id_estudiante: int
+    hora_entrada: Optional[datetime] = None
+    hora_salida: Optional[datetime] = None
+    estado_asistencia: EstadoAsistencia
+
+    class Config:
+        from_attributes = True
+
+
+class CambiosRegistrosSesionPublic(BaseModel):
+    """Schema para el feed de cambios de los registros de una sesión."""
+    items: List[RegistroAsistenciaSesionPublic]
+    cursor: str = Field(..., description="Enviar en la siguiente petición para recibir solo los cambios posteriores")
+
+
+class ResumenAsistenciaSesionPublic(BaseModel):
+    """Schema para el resumen en vivo de la asistencia de una sesión."""
+    id_sesion: int
+    inscritos: int
+    presentes: int
+    tardes: int
+    ausentes: int
+    sin_registrar: int
+
+    class Config:
+        from_attributes = True
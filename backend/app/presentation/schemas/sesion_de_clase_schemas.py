@@ -9,6 +9,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from .clase_programada_schemas import ClaseProgramadaPublic
+from .trabajo_schemas import TrabajoPublic
 
 
 # Enum para los estados de la sesión (reutilizado de la entidad)
@@ -55,3 +56,8 @@ class SesionDeClasePublic(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Schema para la respuesta de cerrar una sesión: el resto del cierre queda encolado
+class SesionCerradaPublic(SesionDeClasePublic):
+    trabajo: TrabajoPublic = Field(..., description="Trabajo que completa el cierre (consultar en /trabajos/{id})")
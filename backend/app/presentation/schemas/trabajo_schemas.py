@@ -0,0 +1,34 @@
+"""
+Schemas para la entidad Trabajo (operaciones en segundo plano), utilizados en la API.
+"""
+
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+# Enum para los estados del trabajo (reutilizado de la entidad)
+class EstadoTrabajo(str, enum.Enum):
+    PENDIENTE = "Pendiente"
+    EN_CURSO = "EnCurso"
+    COMPLETADO = "Completado"
+    FALLIDO = "Fallido"
+
+
+# Schema para la respuesta pública de un Trabajo
+class TrabajoPublic(BaseModel):
+    id: int
+    tipo: str
+    estado: EstadoTrabajo
+    progreso_actual: int = Field(..., description="Pasos terminados del intento en curso")
+    progreso_total: Optional[int] = Field(None, description="Pasos totales (None mientras no se conocen)")
+    intentos: int
+    creado_en: datetime
+    iniciado_en: Optional[datetime] = None
+    terminado_en: Optional[datetime] = None
+    ultimo_error: Optional[str] = Field(None, description="Error del último intento fallido")
+    resultado: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+"""
+Codificación de cursores de paginación (keyset).
+
+Un cursor es la clave de ordenación de la última fila de una página, serializada
+como JSON en base64 URL-safe. Para el cliente es un valor opaco.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence
+
+from app.core.exceptions import ValidationException
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Codifica la clave de ordenación (valores JSON-serializables) en un cursor."""
+    crudo = json.dumps(list(valores), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, num_valores: int) -> List[Any]:
+    """Decodifica un cursor; lanza ValidationException si no es válido."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError):
+        raise ValidationException("Cursor de paginación inválido.")
+    if not isinstance(valores, list) or len(valores) != num_valores:
+        raise ValidationException("Cursor de paginación inválido.")
+    # Solo escalares JSON: listas u objetos anidados nunca salen de codificar_cursor
+    if any(isinstance(v, (list, dict)) for v in valores):
+        raise ValidationException("Cursor de paginación inválido.")
+    return valores
@@ -0,0 +1,73 @@
+"""
+Job de mantenimiento de particiones de RegistroAsistencia.
+
+1. Pre-crea las particiones del mes actual y de los próximos
+   ASISTENCIA_PARTICIONES_ADELANTE meses.
+2. Archiva las particiones cuyo mes terminó hace más de
+   ASISTENCIA_RETENCION_MESES meses (DETACH al esquema `archivo`, o copia a la
+   tabla fría `archivo."RegistroAsistenciaHistorico"`).
+
+Uso (p. ej. desde cron, una vez al día):
+    python archivar_asistencia.py
+    python archivar_asistencia.py --modo frio --retencion-meses 18
+    python archivar_asistencia.py --dry-run
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import sys
+from datetime import date
+
+# --- Path Setup ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+# --- Windows + psycopg fix ---
+if platform.system() == "Windows":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+from app.core.config import settings
+from app.core.database import get_engine, close_db
+from app.core.logger import setup_logging, logger
+from app.infrastructure.persistence.particiones import (
+    listar_particiones, crear_particiones_futuras, archivar_particion, particion_para, sumar_meses
+)
+
+
+async def main(modo: str, retencion_meses: int, meses_adelante: int, dry_run: bool) -> None:
+    hoy = date.today()
+    # Se archivan las particiones que terminan antes del inicio de este mes límite
+    limite = particion_para(sumar_meses(hoy, -retencion_meses)).desde
+
+    try:
+        async with get_engine().begin() as conn:
+            if not dry_run:
+                await crear_particiones_futuras(conn, hoy, meses_adelante)
+
+            antiguas = [p for p in await listar_particiones(conn) if p.hasta <= limite]
+            if not antiguas:
+                logger.info(f"No hay particiones anteriores a {limite.isoformat()} para archivar")
+
+            for particion in antiguas:
+                if dry_run:
+                    logger.info(f"[dry-run] Se archivaría ({modo}): {particion.nombre}")
+                    continue
+                await archivar_particion(conn, particion, modo)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mantenimiento de particiones de RegistroAsistencia.")
+    parser.add_argument("--modo", choices=["detach", "frio"], default="detach",
+                        help="detach: mover la partición al esquema 'archivo'; frio: copiar a la tabla histórica y eliminarla")
+    parser.add_argument("--retencion-meses", type=int, default=settings.ASISTENCIA_RETENCION_MESES)
+    parser.add_argument("--meses-adelante", type=int, default=settings.ASISTENCIA_PARTICIONES_ADELANTE)
+    parser.add_argument("--dry-run", action="store_true", help="Solo listar lo que se archivaría")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(main(args.modo, args.retencion_meses, args.meses_adelante, args.dry_run))
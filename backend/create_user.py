@@ -32,6 +32,7 @@ async def main():
         )
 
         new_user = await use_case.execute(user_to_create)
+        await db.commit()
         print("User created successfully:")
         print(f"  ID: {new_user.id}")
         print(f"  Email: {new_user.email}")
@@ -0,0 +1,88 @@
+"""
+Punto de entrada de producción: lanza WORKERS procesos de uvicorn y reparte entre
+ellos el presupuesto de conexiones a PostgreSQL.
+
+Cada worker tiene su propio pool. Sin presupuesto, WORKERS × (DATABASE_POOL_SIZE +
+DATABASE_MAX_OVERFLOW) conexiones pueden superar `max_connections` del servidor;
+con DATABASE_MAX_CONEXIONES cada worker recibe su parte (ver
+Settings.database_pool_por_worker) y el total nunca la supera.
+
+Reinicio gradual (p. ej. tras desplegar): `kill -HUP <pid del proceso padre>`.
+Los workers se reinician de uno en uno; cada uno deja de aceptar conexiones,
+termina sus peticiones en curso (hasta SERVER_TIMEOUT_GRACEFUL_SEGUNDOS) y solo
+entonces arranca su reemplazo, así que el presupuesto se respeta también durante
+el reinicio. SIGTERM / SIGINT detienen todos los workers de la misma forma.
+
+Uso:
+    python servidor.py
+    python servidor.py --workers 8 --port 8000
+    python servidor.py --comprobar          # solo muestra el reparto del pool y sale
+"""
+
+import argparse
+import os
+import sys
+
+from app.core.config import settings
+
+
+def describir_pool(config) -> str:
+    pool_size, max_overflow = config.database_pool_por_worker
+    # La conexión LISTEN de los avisos de cambios va fuera del pool
+    avisos = 1 if config.ASISTENCIA_CAMBIOS_AVISOS else 0
+    por_worker = pool_size + max_overflow + avisos
+    lineas = [
+        f"Workers: {config.WORKERS}",
+        f"Pool por worker: pool_size={pool_size} max_overflow={max_overflow} "
+        f"(hasta {por_worker} conexiones{' con la de avisos' if avisos else ''}, "
+        f"timeout {config.DATABASE_POOL_TIMEOUT}s)",
+        f"Máximo de conexiones de todos los workers: {por_worker * config.WORKERS}"
+        + (" por servidor (primario y réplica)" if config.DATABASE_REPLICA_URL else ""),
+    ]
+    if config.DATABASE_MAX_CONEXIONES is not None:
+        lineas.append(
+            f"Presupuesto: {config.DATABASE_MAX_CONEXIONES} conexiones, "
+            f"{config.DATABASE_CONEXIONES_RESERVADAS} reservadas fuera de los workers"
+        )
+    else:
+        lineas.append("Sin presupuesto global (DATABASE_MAX_CONEXIONES): cada worker usa el pool completo")
+    if config.is_development:
+        lineas.append("ENVIRONMENT=development: los workers usan NullPool (sin límite de pool)")
+    return "\n".join(lineas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS, help="Procesos (por defecto WORKERS)")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--comprobar", action="store_true", help="Mostrar el reparto del pool y salir")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        sys.exit("--workers debe ser al menos 1")
+    # Los workers leen su configuración del entorno: WORKERS debe coincidir con los
+    # procesos lanzados para que cada uno calcule la misma parte del presupuesto
+    os.environ["WORKERS"] = str(args.workers)
+    config = settings.model_copy(update={"WORKERS": args.workers})
+    try:
+        print(describir_pool(config))
+    except ValueError as e:
+        sys.exit(f"Configuración del pool inválida: {e}")
+    if args.comprobar:
+        return
+
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=settings.SERVER_TIMEOUT_GRACEFUL_SEGUNDOS,
+        log_level=settings.LOG_LEVEL.lower()
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Lector NFC simulado: abre el canal WebSocket de un dispositivo y envía taps.
+
+Sirve para probar en local la ingesta por WebSocket y medir la latencia tap -> ack.
+No importa la aplicación (no necesita DATABASE_URL); solo requiere `websockets`
+(incluido con uvicorn[standard]).
+
+Uso:
+    python simular_lector.py --uid 04:A1:B2:C3 --uid 04:D4:E5:F6
+    python simular_lector.py --uids-archivo uids.txt --repeticiones 5 --intervalo-ms 50
+    python simular_lector.py --dispositivo aula-101 --url ws://servidor:8000 --api-key ...
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Dict, List
+
+from websockets.asyncio.client import connect
+
+
+async def simular(url: str, api_key: str, uids: List[str], repeticiones: int, intervalo_ms: float) -> None:
+    enviados: Dict[int, float] = {}
+    latencias: List[float] = []
+    resultados: Dict[str, int] = {}
+    total = len(uids) * repeticiones
+
+    async with connect(url, additional_headers={"X-API-Key": api_key}) as ws:
+        async def recibir() -> None:
+            while len(latencias) < total:
+                ack = json.loads(await ws.recv())
+                if ack.get("id") not in enviados:
+                    print(f"  trama rechazada: {ack}")
+                    continue
+                latencias.append((time.perf_counter() - enviados.pop(ack["id"])) * 1000)
+                if ack.get("encolado"):
+                    clave = "encolado"  # BD no disponible: el servidor lo guardó en su spool
+                else:
+                    clave = ack.get("estado") if ack["ok"] else f"error {ack.get('codigo')}"
+                resultados[clave] = resultados.get(clave, 0) + 1
+                print(f"  #{ack['id']:>5} {'OK ' if ack['ok'] else 'ERR'} "
+                      f"{clave if ack['ok'] else ack.get('error')} ({latencias[-1]:.1f} ms)")
+
+        receptor = asyncio.create_task(recibir())
+        secuencia = 0
+        for _ in range(repeticiones):
+            for uid in uids:
+                secuencia += 1
+                enviados[secuencia] = time.perf_counter()
+                await ws.send(json.dumps({"id": secuencia, "uid": uid}))
+                if intervalo_ms:
+                    await asyncio.sleep(intervalo_ms / 1000)
+        await receptor
+
+    if latencias:
+        latencias.sort()
+        p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+        print(f"\n{len(latencias)} taps: " + ", ".join(f"{k}={v}" for k, v in resultados.items()))
+        print(f"Latencia tap -> ack: p50={statistics.median(latencias):.1f} ms, p99={p99:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lector NFC simulado (canal WebSocket)")
+    parser.add_argument("--url", default="ws://localhost:8000", help="URL base del servidor")
+    parser.add_argument("--dispositivo", default="lector-simulado", help="ID del dispositivo")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY", "aulatap-super-secret-key-for-dev"))
+    parser.add_argument("--uid", action="append", default=[], help="UID de una tarjeta (repetible)")
+    parser.add_argument("--uids-archivo", help="Archivo con un UID por línea")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Veces que se envía cada UID")
+    parser.add_argument("--intervalo-ms", type=float, default=0.0, help="Pausa entre taps")
+    args = parser.parse_args()
+
+    uids = list(args.uid)
+    if args.uids_archivo:
+        with open(args.uids_archivo, encoding="utf-8") as f:
+            uids.extend(linea.strip() for linea in f if linea.strip())
+    if not uids:
+        parser.error("Indique al menos un --uid o un --uids-archivo")
+
+    url = f"{args.url.rstrip('/')}/api/v1/lectores/{args.dispositivo}/ws"
+    asyncio.run(simular(url, args.api_key, uids, args.repeticiones, args.intervalo_ms))
+
+
+if __name__ == "__main__":
+    main()
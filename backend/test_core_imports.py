@@ -42,7 +42,8 @@ async def main():
         from app.core.config import settings
 
         # Ahora que 'settings' está cargado, podemos obtener el logger
-        from app.core.logger import get_logger
+        from app.core.logger import get_logger, setup_logging
+        setup_logging()
         logger = get_logger("aulatap")  # Obtener el logger principal
 
         print(f"    -> OK. Config cargada. APP_NAME: {settings.APP_NAME}")
@@ -65,9 +66,10 @@ async def main():
 
         # 3. Importar Database (Prueba de Base y Conexión)
         print("\n3. Importando database y probando conexión...")
-        from app.core.database import get_db, engine, Base
+        from app.core.database import get_db, get_engine
+        from app.infrastructure.persistence.models import Base
 
-        async with engine.connect() as conn:
+        async with get_engine().connect() as conn:
             await conn.run_sync(lambda sync_conn: print("    -> OK. Conexión a DB exitosa."))
 
         # 4. Probar que la 'Base' (metadata) de Alembic se cargó